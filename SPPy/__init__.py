@@ -7,16 +7,24 @@ __status__ = 'deployed'
 
 
 from SPPy.battery_components.battery_cell import BatteryCell, ECMBatteryCell
-from SPPy.solvers.battery_solver import SPPySolver
+from SPPy.solvers.battery_solver import SPPySolver, eSPSolver
+from SPPy.solvers.batch_solver import BatchSPPySolver
+from SPPy.solvers.step_control import AdaptiveStepControl
+from SPPy.solvers.checkpoint import CheckpointControl
+from SPPy.solvers.electrolyte_conc import ElectrolyteSettings
 from SPPy.solvers.ECM_solvers import DTSolver
 from SPPy.cycler.cc import CC, CCCV, CCNoFirstRest, DischargeRestCharge, DischargeRestChargeRest
 from SPPy.cycler.charge import Charge, ChargeRest
 from SPPy.cycler.discharge import Discharge, DischargeRest, CustomDischarge
 from SPPy.cycler.custom import CustomCycler
-from SPPy.sol_and_visualization.solution import Solution, ECMSolution
+from SPPy.sol_and_visualization.solution import Solution, ECMSolution, BatchSolution
+from SPPy.sol_and_visualization.recording import RecordAll, RecordEveryNth, RecordTimeGrid, RecordOnChange, \
+    RecordStepBoundaries
+from SPPy.sol_and_visualization.streaming import SolutionSink
 
 from SPPy.calc_helpers.computational_intelligence_algorithms import GA
 from SPPy.calc_helpers.random_vectors import NormalRandomVector
-from SPPy.calc_helpers.kalman_filter import SPKF
+from SPPy.calc_helpers.kalman_filter import SPKF, BatchSPKF
+from SPPy.calc_helpers.tabulation import TabulationSettings
 
 from SPPy.sol_and_visualization.plots import Plots
@@ -9,11 +9,12 @@ __copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights reserved.'
 __status__ = 'deployed'
 
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Optional
 
 import numpy as np
 
 from SPPy.calc_helpers import constants
+from SPPy.calc_helpers.tabulation import TabulationSettings
 from SPPy.battery_components.parameter_set_manager import ParameterSets
 from SPPy.battery_components import electrolyte, electrode
 
@@ -56,12 +57,30 @@ class BatteryCellBase:
     def T_amb(self):
         return self.T_amb_
 
+    def tabulate_OCP(self, settings: Optional[TabulationSettings] = None) -> None:
+        """
+        Replaces the OCP and dOCPdT functions of both electrodes with their tabulated surrogates.
+        :param settings: (TabulationSettings) tabulation settings. If None, the default settings are used.
+        """
+        self.elec_p.tabulate_OCP(settings)
+        self.elec_n.tabulate_OCP(settings)
+
 
 class BatteryCell(BatteryCellBase):
     """
     Class for the BatteryCell object and contains the relevant parameters.
     """
-    def __init__(self, parameter_set_name: str, SOC_init_p: float, SOC_init_n: float, T: float):
+    def __init__(self, parameter_set_name: str, SOC_init_p: float, SOC_init_n: float, T: float,
+                 OCP_tabulation: Optional[TabulationSettings] = None):
+        """
+        BatteryCell class constructor.
+        :param parameter_set_name: (str) name of the parameter set.
+        :param SOC_init_p: (float) initial SOC of the positive electrode.
+        :param SOC_init_n: (float) initial SOC of the negative electrode.
+        :param T: (float) initial battery cell temperature [K]
+        :param OCP_tabulation: (TabulationSettings) if provided, the electrode OCP and dOCPdT functions are replaced
+        with their tabulated surrogates.
+        """
         param_set = ParameterSets(name=parameter_set_name)
         df = ParameterSets.parse_csv(file_path=param_set.BATTERY_CELL_DIR)
         rho = df['Density [kg m^-3]']
@@ -90,9 +109,12 @@ class BatteryCell(BatteryCellBase):
                                           rho_SEI=param_set.rho_SEI, kappa_SEI=param_set.kappa_SEI,
                                           SOC_init=SOC_init_n, T=T)
         obj_electrolyte = electrolyte.Electrolyte(L=param_set.L_es, conc=param_set.conc_es, kappa=param_set.kappa_es,
-                                                  epsilon=param_set.epsilon_es, brugg=param_set.brugg_es)
+                                                  epsilon=param_set.epsilon_es, brugg=param_set.brugg_es,
+                                                  func_D_e=param_set.func_D_e_)
         super().__init__(T_=T, rho=rho, Vol=Vol, C_p=C_p, h=h, A=A, cap=cap, V_max=V_max, V_min=V_min,
                          elec_p=obj_elec_p, elec_n=obj_elec_n, electrolyte=obj_electrolyte)
+        if OCP_tabulation is not None:
+            self.tabulate_OCP(OCP_tabulation)
 
     def __repr__(self):
         return repr(self.elec_n)
@@ -15,6 +15,7 @@ import collections
 import numpy as np
 
 from SPPy.calc_helpers import constants
+from SPPy.calc_helpers.tabulation import TabulationSettings, TabulatedFunction, tabulate
 from SPPy.warnings_and_exceptions import custom_exceptions
 
 
@@ -75,6 +76,30 @@ class Electrode:
         else:
             raise TypeError("func_dOCPdT needs to be a None or Function type")
 
+        # Caches of the derived properties. The values that only depend on the temperature (e.g., D and k) are stored
+        # in _cache_T, and the ones that also depend on the SOC (e.g., OCP and i_0) in _cache_SOC. See __setattr__.
+        object.__setattr__(self, '_cache_T', {})
+        object.__setattr__(self, '_cache_SOC', {})
+
+    def __setattr__(self, name, value):
+        """
+        Sets the attribute and invalidates the caches of the derived properties. Setting the SOC only invalidates the
+        SOC-dependent values, while setting the temperature or any other attribute (e.g., the electrode parameters)
+        invalidates all of them. Setting the SOC or the temperature to its present value does not invalidate the
+        caches.
+        """
+        if (name == 'SOC_') or (name == 'T'):
+            if self.__dict__.get(name) == value:
+                return
+        object.__setattr__(self, name, value)
+        if name == 'SOC':
+            return  # the SOC property sets the SOC_ attribute, which invalidates the caches if the SOC changes.
+        cache_SOC = self.__dict__.get('_cache_SOC')
+        if cache_SOC is not None:  # the caches do not exist during the construction.
+            cache_SOC.clear()
+            if name != 'SOC_':
+                self._cache_T.clear()
+
     @property
     def a_s(self) -> float:
         """
@@ -95,22 +120,71 @@ class Electrode:
 
     @property
     def D(self):
-        return self.D_ref * np.exp(-1 * self.Ea_D / constants.Constants.R * (1 / self.T - 1 / self.T_ref))
+        try:
+            return self._cache_T['D']
+        except KeyError:
+            D = self.D_ref * np.exp(-1 * self.Ea_D / constants.Constants.R * (1 / self.T - 1 / self.T_ref))
+            self._cache_T['D'] = D
+            return D
 
     @property
     def k(self):
-        return self.k_ref * np.exp(self.Ea_R / constants.Constants.R * (1 / self.T_ref - 1 / self.T))
+        try:
+            return self._cache_T['k']
+        except KeyError:
+            k = self.k_ref * np.exp(self.Ea_R / constants.Constants.R * (1 / self.T_ref - 1 / self.T))
+            self._cache_T['k'] = k
+            return k
 
     @property
     def dOCPdT(self):
-        return self.func_dOCPdT(self.SOC)
+        try:
+            return self._cache_SOC['dOCPdT']
+        except KeyError:
+            dOCPdT = self.func_dOCPdT(self.SOC)
+            self._cache_SOC['dOCPdT'] = dOCPdT
+            return dOCPdT
 
     @property
     def OCP(self):
-        return self.func_OCP(self.SOC) + self.dOCPdT * (self.T - self.T_ref)
+        try:
+            return self._cache_SOC['OCP']
+        except KeyError:
+            OCP = self.func_OCP(self.SOC) + self.dOCPdT * (self.T - self.T_ref)
+            self._cache_SOC['OCP'] = OCP
+            return OCP
+
+    @property
+    def dOCPdSOC(self):
+        """
+        Change of the reference OCP with SOC [V]. It is evaluated from the tabulated OCP, if available, or else
+        using the central difference.
+        :return: (float) derivative of the reference OCP with respect to SOC.
+        """
+        if isinstance(self.func_OCP, TabulatedFunction):
+            return self.func_OCP.derivative(self.SOC)
+        return (self.func_OCP(self.SOC + 1e-6) - self.func_OCP(self.SOC - 1e-6)) / 2e-6
+
+    def tabulate_OCP(self, settings: Optional[TabulationSettings] = None) -> None:
+        """
+        Replaces the func_OCP and func_dOCPdT with their tabulated surrogates, which are sampled once on a dense SOC
+        grid and are cheaper to evaluate.
+        :param settings: (TabulationSettings) tabulation settings. If None, the default settings are used.
+        """
+        if not isinstance(self.func_OCP, TabulatedFunction):
+            self.func_OCP = tabulate(self.func_OCP, settings)
+        if not isinstance(self.func_dOCPdT, TabulatedFunction):
+            self.func_dOCPdT = tabulate(self.func_dOCPdT, settings)
 
     def i_0(self, c_e):
-        return self.k * self.max_conc * (c_e ** 0.5) * ((1 - self.SOC)**0.5) * (self.SOC ** 0.5)
+        if not isinstance(c_e, float):
+            return self.k * self.max_conc * (c_e ** 0.5) * ((1 - self.SOC)**0.5) * (self.SOC ** 0.5)
+        cached = self._cache_SOC.get('i_0')
+        if (cached is not None) and (cached[0] == c_e):
+            return cached[1]
+        i_0 = self.k * self.max_conc * (c_e ** 0.5) * ((1 - self.SOC)**0.5) * (self.SOC ** 0.5)
+        self._cache_SOC['i_0'] = (c_e, i_0)
+        return i_0
 
 
 @dataclass
@@ -1,12 +1,18 @@
-from SPPy.calc_helpers.optimizations import timer
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
 
 import numpy as np
 import numpy.typing as npt
+import matplotlib.pyplot as plt
 
+from SPPy.calc_helpers.optimizations import timer
 
 
 class GA:
-    def __init__(self, n_chromosomes, bounds, obj_func, n_pool, n_elite, n_generations, mutating_factor=0.8):
+    def __init__(self, n_chromosomes, bounds, obj_func, n_pool, n_elite, n_generations, mutating_factor=0.8,
+                 batch_obj_func: Optional[Callable] = None, n_workers: Optional[int] = 1,
+                 tol: Optional[float] = None, n_stall: Optional[int] = None):
         """
         Initializes the population by drawing numbers from a uniform distribution, within the bounds.
         :params n_chromosomes: (float) the number of parameter sets per generation
@@ -19,6 +25,15 @@ class GA:
         :params n_elite: (int) number of elite population.
         :param n_generations: (int) number of generations.
         :params mutating_factor: (float) the ratio of population (excluding the elite chromosomes) to mutate.
+        :params batch_obj_func: (func) optional function that takes in the 2D numpy array of the chromosomes (one per
+                         row) and returns the 1D numpy array of their objective function values. If provided, it is
+                         used instead of obj_func for the fitness calculations, e.g., to run the simulations in batch.
+        :params n_workers: (int) number of worker processes used to evaluate obj_func. If 1, the chromosomes are
+                         evaluated in the main process and if None, the number of processors is used. The obj_func
+                         needs to be picklable (e.g., a module level function) for more than one worker.
+        :params tol: (float) the optimization stops once the objective function value is less than or equal to tol.
+        :params n_stall: (int) the optimization stops if the objective function value does not improve for n_stall
+                         consecutive generations.
         """
 
         if isinstance(n_chromosomes, int):
@@ -76,31 +91,51 @@ class GA:
         else:
             TypeError("mutating factor needs to be a float.")
 
+        if (batch_obj_func is not None) and (not callable(batch_obj_func)):
+            raise TypeError("batch_obj_func needs to be a func.")
+        self.batch_obj_func = batch_obj_func
+
+        if (n_workers is not None) and ((not isinstance(n_workers, int)) or (n_workers < 1)):
+            raise ValueError("n_workers needs to be a positive integer.")
+        self.n_workers = n_workers
+
+        self.tol = tol
+        if (n_stall is not None) and ((not isinstance(n_stall, int)) or (n_stall < 1)):
+            raise ValueError("n_stall needs to be a positive integer.")
+        self.n_stall = n_stall
+
+        self.n_evaluations = 0  # number of the chromosomes evaluated by the objective function.
+        self._executor = None  # process pool used during the solve method.
+
     def initialize_population(self):
         """
         Initializes the population by drawing numbers from a uniform distribution, within the bounds.
         :returns: (Numpy array) a numpy array of populations. Each row contains the chromosomes (i.e. parameter set)
                 and each column contains the genes (i.e., parameter values)
         """
-        pop = np.zeros((self.n_chromosomes, self.n_genes)) # each row will be a parameter set
-        for chromo_index in range(self.n_chromosomes):
-            for gene_index in range(self.n_genes):
-                a = np.random.uniform(self.bounds[gene_index][0], self.bounds[gene_index][1])
-                pop[chromo_index, gene_index] = a
-        return pop
+        # each row will be a parameter set
+        return np.random.uniform(self.bounds[:, 0], self.bounds[:, 1], size=(self.n_chromosomes, self.n_genes))
 
     def calc_fitness(self, population):
         """
-        Calculates the fitness of the parameters. In each iteration, the chromosomes are passed into the objective
-        function and the fitness value is calculated.
+        Calculates the fitness of the parameters. The whole population is passed to the batch_obj_func, if provided.
+        Otherwise, the chromosomes are passed into the objective function, either in the main process or in the
+        worker processes.
         :param population: (Numpy array) population where the row indicates the chromosome.
         :return fitness_array: (Numpy array): a array containing the fitness from each chromosome.
         """
-        fitness_array = np.array([])
-        for chromosome in population:
-            fitness = self.obj_func(chromosome)
-            fitness_array = np.append(fitness_array, fitness)
-        return fitness_array
+        self.n_evaluations += len(population)
+        if len(population) == 0:
+            return np.zeros(0)
+        if self.batch_obj_func is not None:
+            fitness_array = np.asarray(self.batch_obj_func(population), dtype=float).reshape(-1)
+            if len(fitness_array) != len(population):
+                raise ValueError("batch_obj_func needs to return one value per chromosome.")
+            return fitness_array
+        if self._executor is not None:
+            return np.fromiter(self._executor.map(self.obj_func, population), dtype=float, count=len(population))
+        return np.fromiter((self.obj_func(chromosome) for chromosome in population), dtype=float,
+                           count=len(population))
 
     def sorting(self, population, fitness_array):
         """
@@ -119,54 +154,79 @@ class GA:
     def create_new_population(self, mating_population):
         # create a numpy array for elite population
         elite_population = mating_population[:self.n_elite]
-        # initiate a numpy array for children population
-        children_population = np.zeros([self.n_chromosomes-self.n_elite, self.n_genes])
-        for new_chromosome in range(self.n_chromosomes - self.n_elite):
-            random_index = np.random.choice(self.n_pool, 2, replace=False)
-            alpha = np.random.uniform(0, 1)
-            for gene in range(self.n_genes):
-                # cross-over operation
-                child = alpha * mating_population[random_index[0], gene] + (1 - alpha) * \
-                        mating_population[random_index[1], gene]
-                children_population[new_chromosome, gene] = child
+        # cross-over operation, where each child is the weighted average of two distinct parents.
+        n_children = self.n_chromosomes - self.n_elite
+        parent1_index = np.random.randint(self.n_pool, size=n_children)
+        parent2_index = (parent1_index + np.random.randint(1, self.n_pool, size=n_children)) % self.n_pool
+        alpha = np.random.uniform(0, 1, size=(n_children, 1))
+        children_population = alpha * mating_population[parent1_index] + \
+                              (1 - alpha) * mating_population[parent2_index]
         # Append elite and children populations
         return np.concatenate((elite_population, children_population), axis=0)
 
     def mutate(self, population) -> npt.ArrayLike:
-        # calc. the population to mutate.
-        chromosome_i_to_choose_from = np.arange(start=self.n_chromosomes - self.n_mutatation, stop=self.n_chromosomes)
-        for chromsome_i in chromosome_i_to_choose_from:
-            for gene_i in range(self.n_genes):
-                population[chromsome_i, gene_i] = population[chromsome_i, gene_i] \
-                                                  + np.std(population[:,gene_i]) * np.random.uniform(0, 1)
+        # the last n_mutation chromosomes are mutated using the standard deviation of the genes in the population.
+        array_std = np.std(population, axis=0)
+        population[self.n_chromosomes - self.n_mutatation:] += \
+            array_std * np.random.uniform(0, 1, size=(self.n_mutatation, self.n_genes))
         return population
 
     @timer
     def solve(self) -> tuple:
         """
-        Performs the genetic algorithm.
+        Performs the genetic algorithm. The elite chromosomes carry over to the next generation unchanged and hence,
+        their fitness is not re-evaluated.
         :returns: a tuple of Numpy arrays of optimized parameters and objective function's value after each generation.
         """
-        obj_func_value_array = np.array([]) # stores the objective function values after each generation.
+        self.n_evaluations = 0
+        if (self.batch_obj_func is None) and (self.n_workers != 1):
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers)
+        try:
+            return self._solve()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _solve(self) -> tuple:
+        lst_obj_func_value = []  # stores the objective function values after each generation.
         # First, initialize the population
         population = self.initialize_population()
+        fitness_array = np.full(self.n_chromosomes, np.nan)  # nan indicates the chromosomes yet to be evaluated.
+        best_chromosome, best_obj_func_value = None, np.inf
+        n_stalled_generations = 0
         for generation_i in range(self.n_generations+1):
             # information for the user.
             print("Generation: ", generation_i)
-            # Then, calculate the fitness
-            fitness_array = self.calc_fitness(population=population)
+            # Then, calculate the fitness of the new chromosomes
+            new_index = np.isnan(fitness_array)
+            fitness_array[new_index] = self.calc_fitness(population=population[new_index])
             # Create the mating population
-            population = self.mating_population(population=population, fitness_array=fitness_array)
-            # Create new population based on elite populations, crossover, and mutations
-            population = self.create_new_population(mating_population=population)
-            population = self.mutate(population=population) # This population is used for the next iteration.
-            # Update arrays
-            obj_func_value = self.obj_func(population[0])
-            obj_func_value_array = np.append(obj_func_value_array, obj_func_value)
+            sorted_fitness_array_index, sorted_fitness_array, sorted_population = \
+                self.sorting(population=population, fitness_array=fitness_array)
+            # Update the best chromosome
+            obj_func_value = sorted_fitness_array[0]
+            if obj_func_value < best_obj_func_value:
+                best_chromosome, best_obj_func_value = sorted_population[0].copy(), obj_func_value
+                n_stalled_generations = 0
+            else:
+                n_stalled_generations += 1
+            lst_obj_func_value.append(best_obj_func_value)
             # Display information to the user.
-            print(f"Optimized parameter list for generation {generation_i}: ", population[0])
-            print(f"objective function output: {obj_func_value}")
-        return population[0], obj_func_value_array
+            print(f"Optimized parameter list for generation {generation_i}: ", best_chromosome)
+            print(f"objective function output: {best_obj_func_value}")
+            if (self.tol is not None) and (best_obj_func_value <= self.tol):
+                break
+            if (self.n_stall is not None) and (n_stalled_generations >= self.n_stall):
+                break
+            if generation_i == self.n_generations:
+                break
+            # Create new population based on elite populations, crossover, and mutations
+            population = self.create_new_population(mating_population=sorted_population[:self.n_pool])
+            population = self.mutate(population=population)  # This population is used for the next iteration.
+            fitness_array = np.full(self.n_chromosomes, np.nan)
+            fitness_array[:self.n_elite] = sorted_fitness_array[:self.n_elite]
+        return best_chromosome, np.array(lst_obj_func_value)
 
     def plot(self, obj_func_value_array:npt.ArrayLike) -> None:
         """
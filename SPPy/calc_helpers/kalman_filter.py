@@ -2,14 +2,15 @@
 Contains the classes and functionalities for the implementing kalman filter
 """
 
-__all__ = ['InvalidKFMethodType', 'SPKF']
+__all__ = ['InvalidKFMethodType', 'SPKF', 'BatchSPKF']
 
 __author__ = 'Moin Ahmed'
 __copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights reserved.'
 __status__ = 'Development'
 
 
-from typing import Callable
+import math
+from typing import Callable, Optional
 
 import numpy as np
 import numpy.typing as npt
@@ -21,14 +22,23 @@ from SPPy.calc_helpers.random_vectors import NormalRandomVector
 
 class InvalidKFMethodType(Exception):
     def __init__(self):
-        msg = "Available method type(s) available now are: CDKF"
+        msg = "Available method type(s) available now are: CDKF, SR-CDKF"
         super().__init__(msg)
 
 
 class SPKF:
     """
-    The class for sigma-point Kalman filter
+    The class for sigma-point Kalman filter.
+
+    With method_type='SR-CDKF', the square-root form is used, where the Cholesky factor of the state covariance is
+    propagated directly using the QR decomposition and the rank-1 Cholesky updates. The covariance matrix of the x
+    random vector is still updated after every step, but it is not factorized again (unless it is changed
+    externally). The Cholesky factors of the w and v covariance matrices are computed once, for as long as their
+    covariance matrices do not change. The cached covariance matrices are compared by value and hence, the in-place
+    changes of the covariance matrices are also detected.
     """
+    METHOD_TYPES = ('CDKF', 'SR-CDKF')
+
     def __init__(self, x: NormalRandomVector, w: NormalRandomVector, v: NormalRandomVector,
                  y_dim: int,
                  func_f: Callable, func_h: Callable,
@@ -48,14 +58,62 @@ class SPKF:
         self.L = (self.Nx + self.Nw + self.Nv)  # dimensions of the augmented covariance state matrix.
         self.p = 2 * self.L  # number of sigma points - 1
 
-        if method_type != 'CDKF':
+        if method_type not in self.METHOD_TYPES:
             raise InvalidKFMethodType
         self.method_type = method_type
 
+        # The weights only depend on the method type and dimensions and hence, they are computed once.
+        self._array_alpha_m = np.append(self.alpha_m_0, np.tile(self.alpha_m, self.p)).reshape(-1, 1)
+        self._array_alpha_c = np.append(self.alpha_c_0, np.tile(self.alpha_c, self.p)).reshape(-1, 1)
+        self._row_alpha_m = self._array_alpha_m.flatten()
+        self._row_alpha_c = self._array_alpha_c.flatten()
+
+        self._x_sp_step = None  # sigma points of the current time step.
+        self._dict_sqrt_cov = {}  # covariance matrices and their Cholesky factors, with the random vectors as keys.
+
     @classmethod
     def calc_sqrt_matrix(cls, matrix: npt.ArrayLike) -> npt.ArrayLike:
         return scipy.linalg.cholesky(matrix, lower=True)
 
+    @classmethod
+    def calc_chol_update(cls, sqrt_matrix: npt.ArrayLike, vector: npt.ArrayLike, sign: float = 1.0) -> npt.ArrayLike:
+        """
+        Performs the rank-1 update (sign=1) or downdate (sign=-1) of the lower triangular Cholesky factor, S, such
+        that the result S' satisfies S' @ S'.T = S @ S.T + sign * vector @ vector.T
+        :param sqrt_matrix: lower triangular Cholesky factor.
+        :param vector: update vector.
+        :param sign: 1 for the update and -1 for the downdate.
+        :return: updated lower triangular Cholesky factor.
+        """
+        # The state dimensions are typically small and hence, the update is performed on Python floats.
+        S = np.asarray(sqrt_matrix, dtype=float).tolist()
+        x = np.asarray(vector, dtype=float).flatten().tolist()
+        n = len(x)
+        for k in range(n):
+            S_kk = S[k][k]
+            r_squared = S_kk * S_kk + sign * x[k] * x[k]
+            if r_squared <= 0:
+                raise np.linalg.LinAlgError("The Cholesky downdate results in a matrix that is not positive definite.")
+            r = math.sqrt(r_squared)
+            c = r / S_kk
+            s = x[k] / S_kk
+            S[k][k] = r
+            for i in range(k + 1, n):
+                S[i][k] = (S[i][k] + sign * s * x[i]) / c
+                x[i] = c * x[i] - s * S[i][k]
+        return np.array(S)
+
+    @classmethod
+    def calc_sqrt_from_factor(cls, matrix_a: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Returns the lower triangular Cholesky factor of matrix_a @ matrix_a.T using the QR decomposition of matrix_a.T
+        :param matrix_a: matrix with at least as many columns as rows.
+        :return: lower triangular Cholesky factor with positive diagonal entries.
+        """
+        R = np.linalg.qr(matrix_a.transpose(), mode='r')
+        array_sign = np.where(np.diag(R) < 0, -1.0, 1.0)
+        return R.transpose() * array_sign
+
     @classmethod
     def plot(cls, t_array, measurement_array, sigma_array=None, truth_array=None):
         # Plots
@@ -99,7 +157,7 @@ class SPKF:
         A tuning parameter for SPKF. For Guassian distributions, gamma is sqrt(3)
         :return: the turning parameter
         """
-        if self.method_type == 'CDKF':
+        if self.method_type in self.METHOD_TYPES:
             return np.sqrt(3)
         else:
             raise InvalidKFMethodType
@@ -110,21 +168,21 @@ class SPKF:
         A tuning parameter for SPKF. For Guassian distributions, gamma is sqrt(3)
         :return: h tunning parameter
         """
-        if self.method_type == 'CDKF':
+        if self.method_type in self.METHOD_TYPES:
             return np.sqrt(3)
         else:
             raise InvalidKFMethodType
 
     @property
     def alpha_m_0(self) -> float:
-        if self.method_type == 'CDKF':
+        if self.method_type in self.METHOD_TYPES:
             return (self.h ** 2 - self.L) / self.h ** 2
         else:
             raise InvalidKFMethodType
 
     @property
     def alpha_m(self) -> float:
-        if self.method_type == 'CDKF':
+        if self.method_type in self.METHOD_TYPES:
             return 1 / (2 * self.h ** 2)
         else:
             raise InvalidKFMethodType
@@ -135,19 +193,18 @@ class SPKF:
         Row vector of all alpha_m entries.
         :return:
         """
-        alpha_m_vec = np.array(np.tile(self.alpha_m, self.p))  # vector of all alpha_m, excluding alpha_c_0
-        return np.append(self.alpha_m_0, alpha_m_vec).reshape(-1, 1)
+        return self._array_alpha_m.copy()
 
     @property
     def alpha_c_0(self) -> float:
-        if self.method_type == 'CDKF':
+        if self.method_type in self.METHOD_TYPES:
             return (self.h ** 2 - self.L) / self.h ** 2
         else:
             raise InvalidKFMethodType
 
     @property
     def alpha_c(self) -> float:
-        if self.method_type == 'CDKF':
+        if self.method_type in self.METHOD_TYPES:
             return 1 / (2 * self.h ** 2)
         else:
             raise InvalidKFMethodType
@@ -157,8 +214,7 @@ class SPKF:
         """
         row vector for all the entries in alpha c
         """
-        array_ = np.array(np.tile(self.alpha_c, self.p))
-        return np.append(self.alpha_c_0, array_).reshape(-1, 1)
+        return self._array_alpha_c.copy()
 
     @property
     def x_sp(self) -> npt.ArrayLike:
@@ -166,10 +222,57 @@ class SPKF:
         Returns the matrix that represents the augmented sigma points.
         :return: augmented sigma points
         """
-        result_matrix = np.tile(self.aug_vector, [1, self.p + 1])
-        return result_matrix + self.gamma * np.append(np.zeros(self.aug_vector.shape),
-                                                      np.append(self.calc_sqrt_matrix(self.aug_cov),
-                                                                -self.calc_sqrt_matrix(self.aug_cov), axis=1), axis=1)
+        return self.calc_sigma_points()
+
+    def calc_sigma_points(self) -> npt.ArrayLike:
+        """
+        Calculates the augmented sigma points. As the augmented covariance matrix is block diagonal, its Cholesky
+        factor is assembled from the Cholesky factors of the x, w, and v covariance matrices.
+        :return: augmented sigma points
+        """
+        Nxw = self.Nx + self.Nw
+        result_matrix = np.zeros((self.L, self.p + 1))
+        result_matrix[:self.Nx, 0:1] = self.x.get_vector()
+        result_matrix[self.Nx:Nxw, 0:1] = self.w.get_vector()
+        result_matrix[Nxw:, 0:1] = self.v.get_vector()
+        result_matrix[:self.Nx, 1:self.Nx + 1] = self.gamma * self._get_sqrt_cov(self.x)
+        result_matrix[self.Nx:Nxw, self.Nx + 1:Nxw + 1] = self.gamma * self._get_sqrt_cov(self.w)
+        result_matrix[Nxw:, Nxw + 1:self.L + 1] = self.gamma * self._get_sqrt_cov(self.v)
+        result_matrix[:, self.L + 1:] = -result_matrix[:, 1:self.L + 1]
+        result_matrix[:, 1:] += result_matrix[:, :1]
+        return result_matrix
+
+    def _get_sqrt_cov(self, rv: NormalRandomVector) -> npt.ArrayLike:
+        """
+        Returns the Cholesky factor of the random vector's covariance matrix. The factor is reused for as long as the
+        covariance matrix has the same values as the copy stored with the factor.
+        """
+        cov = rv.get_cov()
+        cov_cached, sqrt_cov = self._dict_sqrt_cov.get(id(rv), (None, None))
+        if (cov_cached is None) or (not np.array_equal(cov, cov_cached)):
+            sqrt_cov = self.calc_sqrt_matrix(cov)
+            self._dict_sqrt_cov[id(rv)] = (np.array(cov, copy=True), sqrt_cov)
+        return sqrt_cov
+
+    def _set_sqrt_cov_x(self, sqrt_cov: npt.ArrayLike) -> None:
+        """
+        Sets the covariance matrix of the x random vector from its Cholesky factor, which is stored for the next step.
+        """
+        cov = sqrt_cov @ sqrt_cov.transpose()
+        self.x.set_cov(cov)
+        self._dict_sqrt_cov[id(self.x)] = (cov.copy(), sqrt_cov)
+
+    def __calc_sqrt_weighted_cov(self, a: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Returns the Cholesky factor of a @ diag(alpha_c) @ a.T. The QR decomposition is used for the (positively
+        weighted) sigma points 1 to p and the zeroth sigma point is added using the rank-1 update or downdate,
+        depending on the sign of alpha_c_0.
+        """
+        alpha_c_0, alpha_c = self._row_alpha_c[0], self._row_alpha_c[1]
+        S = self.calc_sqrt_from_factor(math.sqrt(alpha_c) * a[:, 1:])
+        if alpha_c_0 != 0:
+            S = self.calc_chol_update(S, math.sqrt(abs(alpha_c_0)) * a[:, 0], math.copysign(1.0, alpha_c_0))
+        return S
 
     @property
     def x_sp_x(self):
@@ -183,6 +286,12 @@ class SPKF:
     def x_sp_v(self):
         return self.x_sp[self.Nx + self.Nw:, :]
 
+    def __weighted_cov(self, a: npt.ArrayLike, b: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Returns a @ diag(alpha_c) @ b.T without forming the diagonal matrix.
+        """
+        return (a * self._row_alpha_c) @ b.transpose()
+
     def __state_prediction(self, u: float) -> tuple[npt.ArrayLike, npt.ArrayLike]:
         """
         This is the step 1a (first step) of the process. The state estimate is performed in this step.
@@ -190,9 +299,11 @@ class SPKF:
         :return: tuple containing the augmented state matrix and the resultant state estimate. Note that the second
         element is in the numpy matrix form and hence need indexing to extract its individual elements.
         """
+        # The sigma points are calculated once per time step and are also used in the output estimate.
+        self._x_sp_step = self.calc_sigma_points()
         # Pass the input elements of the sigma point into the state function. Then the mean estimate is calculated
-        Xx = self.func_f(self.x_sp_x, u, self.x_sp_w)
-        self.x.set_vector(Xx @ self.array_alpha_m)  # outputs are augmented xhat matrix and state estimate vector
+        Xx = self.func_f(self._x_sp_step[:self.Nx, :], u, self._x_sp_step[self.Nx: self.Nx + self.Nw, :])
+        self.x.set_vector(Xx @ self._array_alpha_m)  # outputs are augmented xhat matrix and state estimate vector
         return Xx
 
     def __cov_prediction(self, Xx: npt.ArrayLike) -> npt.ArrayLike:
@@ -202,8 +313,8 @@ class SPKF:
         :param xhat: state vector estimate as calculated from step 1a.
         :return:
         """
-        Xs = Xx - np.tile(self.x.get_vector(), [1, self.p + 1])
-        self.x.set_cov(Xs @ np.diag(self.array_alpha_c.flatten()) @ Xs.transpose())
+        Xs = Xx - self.x.get_vector()
+        self.x.set_cov(self.__weighted_cov(Xs, Xs))
         return Xs
 
     def __output_estimate(self, Xx: npt.ArrayLike, u: float):
@@ -213,8 +324,10 @@ class SPKF:
         :param u:
         :return:
         """
-        Y = self.func_h(Xx, u, self.x_sp_v)
-        return Y, Y @ self.array_alpha_m
+        # The v sigma points do not depend on the state prediction and hence, those of the current time step are used.
+        x_sp_v = self.x_sp_v if self._x_sp_step is None else self._x_sp_step[self.Nx + self.Nw:, :]
+        Y = self.func_h(Xx, u, x_sp_v)
+        return Y, Y @ self._array_alpha_m
 
     def __estimator_gain_matrix(self, y: npt.ArrayLike, yhat: npt.ArrayLike, xs: npt.ArrayLike) -> \
             tuple[npt.ArrayLike, npt.ArrayLike]:
@@ -225,10 +338,11 @@ class SPKF:
         :param Xs: difference between sigma points and state variable
         :return: SigmaY and gain estimator, Lx
         """
-        Ys = y - np.tile(yhat, [1, self.p + 1])
-        SigmaXY = xs @ np.diag(self.array_alpha_c.flatten()) @ Ys.transpose()
-        SigmaY = Ys @ np.diag(self.array_alpha_c.flatten()) @ Ys.transpose()
-        L = SigmaXY @ np.linalg.inv(SigmaY)
+        Ys = np.reshape(y, (-1, self.p + 1)) - np.reshape(yhat, (-1, 1))
+        SigmaXY = self.__weighted_cov(xs, Ys)
+        SigmaY = self.__weighted_cov(Ys, Ys)
+        # L = SigmaXY @ inv(SigmaY) is calculated by solving SigmaY @ L.T = SigmaXY.T, as SigmaY is symmetric.
+        L = np.linalg.solve(SigmaY, SigmaXY.transpose()).transpose()
         return SigmaY, L
 
     def __state_update(self, L: npt.ArrayLike, ytrue: npt.ArrayLike, yhat: npt.ArrayLike) -> None:
@@ -237,7 +351,43 @@ class SPKF:
     def __cov_measurement_update(self, Lx, SigmaY) -> None:
         self.x.set_cov(self.x.get_cov() - Lx @ SigmaY @ Lx.transpose())
 
+    def __solve_sqrt(self, u: float, y_true: float) -> None:
+        """
+        Performs the square-root (SR-CDKF) form of the steps 1a to 2c.
+        """
+        x_sp = self.calc_sigma_points()
+        # Step 1a and 1b
+        Xx = self.func_f(x_sp[:self.Nx, :], u, x_sp[self.Nx: self.Nx + self.Nw, :])
+        xhat = Xx @ self._array_alpha_m
+        Xs = Xx - xhat
+        Sx = self.__calc_sqrt_weighted_cov(Xs)
+        # Step 1c
+        y = self.func_h(Xx, 0, x_sp[self.Nx + self.Nw:, :])
+        yhat = y @ self._array_alpha_m
+        Ys = np.reshape(y, (-1, self.p + 1)) - np.reshape(yhat, (-1, 1))
+        Sy = self.__calc_sqrt_weighted_cov(Ys)
+        # Step 2a, L = SigmaXY @ inv(Sy @ Sy.T)
+        SigmaXY = self.__weighted_cov(Xs, Ys)
+        L = scipy.linalg.cho_solve((Sy, True), SigmaXY.transpose()).transpose()
+        # Step 2b
+        self.x.set_vector(xhat + (L @ (y_true - yhat)).reshape(-1, 1))
+        # Step 2c, Sx @ Sx.T - (L @ Sy) @ (L @ Sy).T using the rank-1 downdates
+        U = L @ Sy
+        try:
+            for i in range(U.shape[1]):
+                Sx = self.calc_chol_update(Sx, U[:, i], -1.0)
+        except np.linalg.LinAlgError:
+            # The covariance is projected onto the positive definite matrices in case of the failed downdate.
+            cov = Sx @ Sx.transpose() - U @ U.transpose()
+            array_eig, matrix_eig = np.linalg.eigh(0.5 * (cov + cov.transpose()))
+            array_eig = np.maximum(array_eig, np.finfo(float).eps * max(np.max(np.abs(array_eig)), 1e-300))
+            Sx = self.calc_sqrt_from_factor(matrix_eig * np.sqrt(array_eig))
+        self._set_sqrt_cov_x(Sx)
+
     def solve(self, u: float, y_true: float) -> None:
+        if self.method_type == 'SR-CDKF':
+            self.__solve_sqrt(u=u, y_true=y_true)
+            return
         Xx = self.__state_prediction(u=u)  # Step 1a
         Xs = self.__cov_prediction(Xx=Xx)  # Step 1b
         y, y_hat = self.__output_estimate(Xx=Xx, u=0)  # Step 1c
@@ -245,4 +395,135 @@ class SPKF:
         SigmaY, Lx = self.__estimator_gain_matrix(y=y, yhat=y_hat, xs=Xs)  # Step 2a
         self.__state_update(L=Lx, ytrue=y_true, yhat=y_hat)  # Step 2b
         self.__cov_measurement_update(Lx=Lx, SigmaY=SigmaY)  # Step 2c
+        self._x_sp_step = None
+
+
+class BatchSPKF:
+    """
+    The class for the sigma-point Kalman filter (CDKF) that estimates the states of a batch of systems (e.g., battery
+    cells) sharing the same model but driven by different data. The state vectors and covariance matrices of all the
+    systems are stacked in the arrays of shape [systems, Nx] and [systems, Nx, Nx], respectively, and the state and
+    output functions are evaluated on the sigma points of all the systems in a single call. The process and sensor
+    noises are common to all the systems.
+
+    The state and output functions take in the sigma points of the shape [systems, Nx, p + 1], the inputs of the
+    shape [systems], and the noise sigma points of the shapes [systems, Nw, p + 1] and [systems, Nv, p + 1]. They
+    return arrays of shapes [systems, Nx, p + 1] and [systems, y_dim, p + 1], respectively.
+    """
+    def __init__(self, array_x: npt.ArrayLike, array_cov_x: npt.ArrayLike, w: NormalRandomVector,
+                 v: NormalRandomVector, y_dim: int, func_f: Callable, func_h: Callable) -> None:
+        """
+        BatchSPKF class constructor.
+        :param array_x: initial state vectors, shape [systems, Nx]
+        :param array_cov_x: initial state covariance matrices, shape [systems, Nx, Nx]
+        :param w: (NormalRandomVector) process noise.
+        :param v: (NormalRandomVector) sensor noise.
+        :param y_dim: (int) number of outputs.
+        :param func_f: batched state function.
+        :param func_h: batched output function.
+        """
+        self.array_x = np.array(array_x, dtype=float)
+        self.array_cov_x = np.array(array_cov_x, dtype=float)
+        if self.array_x.ndim != 2:
+            raise ValueError("array_x needs to be of the shape [systems, Nx].")
+        self.num_systems, self.Nx = self.array_x.shape
+        if self.array_cov_x.shape != (self.num_systems, self.Nx, self.Nx):
+            raise ValueError("array_cov_x needs to be of the shape [systems, Nx, Nx].")
+        if (not isinstance(w, NormalRandomVector)) or (not isinstance(v, NormalRandomVector)):
+            raise TypeError("w and v need to be NormalRandomVector objects.")
+        self.w = w
+        self.v = v
+        self.y_dim = y_dim
+        self.func_f = func_f
+        self.func_h = func_h
+
+        self.Nw = self.w.get_vector().shape[0]
+        self.Nv = self.v.get_vector().shape[0]
+        self.L = self.Nx + self.Nw + self.Nv
+        self.p = 2 * self.L
+
+        # CDKF tuning parameter and weights
+        self.gamma = np.sqrt(3)
+        h = np.sqrt(3)
+        self.row_alpha_m = np.append((h ** 2 - self.L) / h ** 2, np.tile(1 / (2 * h ** 2), self.p))
+        self.row_alpha_c = self.row_alpha_m.copy()
 
+        # The noise sigma points are only recomputed when the mean or covariance of the noise changes.
+        self._dict_noise_sp = {}  # noise offset -> (mean, covariance matrix, sigma points)
+
+    @property
+    def x_sp_w(self) -> npt.ArrayLike:
+        return self.__get_noise_sigma_points(rv=self.w, offset=self.Nx)
+
+    @property
+    def x_sp_v(self) -> npt.ArrayLike:
+        return self.__get_noise_sigma_points(rv=self.v, offset=self.Nx + self.Nw)
+
+    def __get_noise_sigma_points(self, rv: NormalRandomVector, offset: int) -> npt.ArrayLike:
+        """
+        Returns the sigma points of the noise vector, shape [systems, N, p + 1], where the noise deviations occupy the
+        columns of the noise within the augmented vector. The sigma points are reused for as long as the noise's mean
+        and covariance matrix have the same values as the copies stored with them.
+        :param rv: (NormalRandomVector) noise random vector.
+        :param offset: (int) index of the noise's first element within the augmented vector.
+        """
+        vector, cov = rv.get_vector(), rv.get_cov()
+        vector_cached, cov_cached, x_sp = self._dict_noise_sp.get(offset, (None, None, None))
+        if (x_sp is None) or (not np.array_equal(vector, vector_cached)) or (not np.array_equal(cov, cov_cached)):
+            N = vector.shape[0]
+            sqrt_cov = self.gamma * SPKF.calc_sqrt_matrix(cov)
+            x_sp = np.tile(np.asarray(vector, dtype=float), (1, self.p + 1))
+            x_sp[:, 1 + offset: 1 + offset + N] += sqrt_cov
+            x_sp[:, 1 + self.L + offset: 1 + self.L + offset + N] -= sqrt_cov
+            x_sp = np.broadcast_to(x_sp, (self.num_systems, N, self.p + 1))
+            self._dict_noise_sp[offset] = (np.array(vector, copy=True), np.array(cov, copy=True), x_sp)
+        return x_sp
+
+    def calc_sigma_points(self) -> npt.ArrayLike:
+        """
+        Returns the state sigma points of all the systems, shape [systems, Nx, p + 1].
+        """
+        sqrt_cov = self.gamma * np.linalg.cholesky(self.array_cov_x)
+        x_sp = np.repeat(self.array_x[:, :, np.newaxis], self.p + 1, axis=2)
+        x_sp[:, :, 1: self.Nx + 1] += sqrt_cov
+        x_sp[:, :, self.L + 1: self.L + self.Nx + 1] -= sqrt_cov
+        return x_sp
+
+    def solve(self, u: npt.ArrayLike, y_true: npt.ArrayLike, mask: Optional[npt.ArrayLike] = None) -> None:
+        """
+        Performs the state prediction and measurement update for all the systems.
+        :param u: inputs, shape [systems]
+        :param y_true: measured outputs, shape [systems] or [systems, y_dim]
+        :param mask: boolean array, shape [systems], of the systems to update. The states of the other systems (e.g.,
+        those whose logs have ended) are left unchanged. If None, all the systems are updated.
+        """
+        u = np.broadcast_to(np.asarray(u, dtype=float), (self.num_systems,))
+        y_true = np.asarray(y_true, dtype=float).reshape(self.num_systems, -1)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            # the inputs and outputs of the masked out systems can be nan (e.g., padding) and are replaced.
+            u = np.where(mask, u, 0.0)
+            y_true = np.where(mask[:, np.newaxis], y_true, 0.0)
+
+        # Step 1a and 1b, state and covariance predictions
+        Xx = self.func_f(self.calc_sigma_points(), u, self.x_sp_w)
+        xhat = Xx @ self.row_alpha_m
+        Xs = Xx - xhat[:, :, np.newaxis]
+        cov_x = (Xs * self.row_alpha_c) @ Xs.transpose(0, 2, 1)
+        # Step 1c, output estimate. Similar to the SPKF class, the input is not passed into the output function.
+        Y = np.reshape(self.func_h(Xx, np.zeros(self.num_systems), self.x_sp_v), (self.num_systems, -1, self.p + 1))
+        yhat = Y @ self.row_alpha_m
+        Ys = Y - yhat[:, :, np.newaxis]
+        # Step 2a, estimator gain matrix, L = SigmaXY @ inv(SigmaY)
+        SigmaXY = (Xs * self.row_alpha_c) @ Ys.transpose(0, 2, 1)
+        SigmaY = (Ys * self.row_alpha_c) @ Ys.transpose(0, 2, 1)
+        L = np.linalg.solve(SigmaY, SigmaXY.transpose(0, 2, 1)).transpose(0, 2, 1)
+        # Step 2b and 2c, state and covariance updates
+        x_new = xhat + (L @ (y_true - yhat)[:, :, np.newaxis])[:, :, 0]
+        cov_x_new = cov_x - L @ SigmaY @ L.transpose(0, 2, 1)
+
+        if mask is None:
+            self.array_x, self.array_cov_x = x_new, cov_x_new
+        else:
+            self.array_x = np.where(mask[:, np.newaxis], x_new, self.array_x)
+            self.array_cov_x = np.where(mask[:, np.newaxis, np.newaxis], cov_x_new, self.array_cov_x)
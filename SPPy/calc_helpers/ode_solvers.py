@@ -1,47 +1,197 @@
-from typing import Callable
+from typing import Callable, Union
 
 import numpy as np
 import numpy.typing as npt
 
+from SPPy.calc_helpers.tridiagonal import solve_tridiagonal
 
-def euler(func, t_prev, y_prev, step_size):
-    return y_prev + func(y_prev, t_prev) * step_size
 
+def euler(func, t_prev, y_prev, step_size, args: tuple = ()):
+    return y_prev + func(y_prev, t_prev, *args) * step_size
 
-def rk4(func: Callable, t_prev: float, y_prev: float, step_size: float):
+
+def heun(func: Callable, t_prev: float, y_prev: npt.ArrayLike, step_size: float, args: tuple = ()) -> npt.ArrayLike:
+    """
+    Solves for the value of y in the next time step for a ODE, dy/dt = f(y,t), using the Heun's (explicit trapezoidal)
+    method.
+    :param func: (Callable) function that takes y, t, and the args as its input arguments (in that order).
+    :param t_prev: The value of time in the previous time step [s]
+    :param y_prev: The value of y in the previous time step
+    :param step_size: the difference in time between the current and previous time steps [s]
+    :param args: (tuple) additional arguments of func.
+    :return: The value of y at the next time step
+    """
+    k1 = func(y_prev, t_prev, *args)
+    k2 = func(y_prev + k1 * step_size, t_prev + step_size, *args)
+    return y_prev + 0.5 * (k1 + k2) * step_size
+
+
+def rk4(func: Callable, t_prev: float, y_prev: float, step_size: float, args: tuple = ()):
     """
     Solves for the value of y in the next time step for a ODE
                 dy/dt = f(y,t)
-    :param func: (Callable) function that takes y and t as its input arguments (in that order).
+    y can be a scalar or a numpy array of any shape, in which case all of its elements are advanced in a single call.
+    :param func: (Callable) function that takes y, t, and the args as its input arguments (in that order).
     :param t_prev: The value of time in the previous time step [s]
     :param y_prev: The value of y in the previous time step
     :param step_size: the difference in time between the current and previous time steps [s]
+    :param args: (tuple) additional arguments of func. Passing the per-step inputs here avoids creating a closure
+    each time step.
     :return: The value of y at the next time step
     """
-    k1 = func(y_prev, t_prev)
-    k2 = func(y_prev + 0.5*k1*step_size, t_prev + 0.5*step_size)
-    k3 = func(y_prev + 0.5*k2*step_size, t_prev + 0.5*step_size)
-    k4 = func(y_prev + k3*step_size, t_prev + step_size)
+    k1 = func(y_prev, t_prev, *args)
+    k2 = func(y_prev + 0.5*k1*step_size, t_prev + 0.5*step_size, *args)
+    k3 = func(y_prev + 0.5*k2*step_size, t_prev + 0.5*step_size, *args)
+    k4 = func(y_prev + k3*step_size, t_prev + step_size, *args)
     return y_prev + (1/6.0) * (k1 + 2*k2 + 2*k3 + k4) * step_size
 
 
+# Butcher tableau of the Dormand-Prince method. The last row of DP_A is the fifth-order solution, which is also
+# evaluated at the end of the step (first same as last).
+DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+DP_A = ((),
+        (1 / 5,),
+        (3 / 40, 9 / 40),
+        (44 / 45, -56 / 15, 32 / 9),
+        (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+        (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+        (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84))
+# difference between the fifth- and fourth-order weights
+DP_E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+def dormand_prince(func: Callable, t_prev: float, y_prev: npt.ArrayLike, step_size: float,
+                   args: tuple = ()) -> tuple[npt.ArrayLike, npt.ArrayLike]:
+    """
+    Solves for the value of y in the next time step for a ODE, dy/dt = f(y,t), using the fifth-order Dormand-Prince
+    method. The embedded fourth-order solution provides the estimate of the local error.
+    :param func: (Callable) function that takes y, t, and the args as its input arguments (in that order).
+    :param t_prev: The value of time in the previous time step [s]
+    :param y_prev: The value of y in the previous time step
+    :param step_size: the difference in time between the current and previous time steps [s]
+    :param args: (tuple) additional arguments of func.
+    :return: tuple containing the value of y at the next time step and its local error estimate.
+    """
+    lst_k = [func(y_prev, t_prev, *args)]
+    for c, a in zip(DP_C[1:], DP_A[1:]):
+        y = y_prev + step_size * sum(a_i * k_i for a_i, k_i in zip(a, lst_k) if a_i != 0)
+        lst_k.append(func(y, t_prev + c * step_size, *args))
+    return y, step_size * sum(e_i * k_i for e_i, k_i in zip(DP_E, lst_k) if e_i != 0)
+
+
+class StateVectorIntegrator:
+    """
+    Advances a stacked state vector with the explicit Runge-Kutta methods. The models register their states as named
+    blocks together with their right-hand side functions, func(y, t, *args), and all the blocks are advanced with a
+    single integrator call per time step. The per-step inputs of the blocks (e.g., the molar fluxes or the applied
+    current) are passed as args instead of creating closures.
+
+    The blocks can carry the trailing batch dimensions (batch_shape), e.g., the battery cells of a batch simulation, in
+    which case the state vector is of shape [num_states, *batch_shape] and the time step can be an array broadcastable
+    to batch_shape.
+
+    The methods are the forward Euler ('euler'), Heun ('heun'), fourth-order Runge-Kutta ('rk4'), and the
+    Dormand-Prince ('dopri5') methods. With the last, the local error estimate of the last step is stored in the error
+    attribute.
+    """
+    METHODS = {'euler': euler, 'heun': heun, 'rk4': rk4, 'dopri5': dormand_prince}
+
+    def __init__(self, method: str = 'rk4', batch_shape: tuple = ()):
+        """
+        StateVectorIntegrator class constructor.
+        :param method: (str) 'euler', 'heun', 'rk4', or 'dopri5'.
+        :param batch_shape: (tuple) trailing batch dimensions of all the blocks.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method needs to be one of {tuple(self.METHODS)}.")
+        self.method = method
+        self.batch_shape = tuple(batch_shape)
+        self.y = np.zeros((0,) + self.batch_shape)  # stacked state vector
+        self.error = None  # local error estimate of the last step (only for 'dopri5')
+        self._dict_blocks = {}  # block name -> (slice, block shape, rhs function, args)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._dict_blocks)
+
+    def register(self, name: str, func_rhs: Callable, y_init: npt.ArrayLike, args: tuple = ()) -> None:
+        """
+        Registers the block of states.
+        :param name: (str) unique name of the block
+        :param func_rhs: (Callable) function that takes the block states, t, and the args and returns the time
+        derivatives of the block states.
+        :param y_init: (npt.ArrayLike) initial block states of shape [*block_shape, *batch_shape].
+        :param args: (tuple) initial additional arguments of func_rhs.
+        """
+        if name in self._dict_blocks:
+            raise ValueError(f"{name} is already registered.")
+        if not callable(func_rhs):
+            raise TypeError("func_rhs needs to be callable.")
+        y_init = np.asarray(y_init, dtype=float)
+        num_batch_dims = len(self.batch_shape)
+        if (y_init.ndim < num_batch_dims) or (y_init.shape[y_init.ndim - num_batch_dims:] != self.batch_shape):
+            raise ValueError(f"y_init needs to end with the batch shape {self.batch_shape}.")
+        block_shape = y_init.shape[:y_init.ndim - num_batch_dims]
+        start = self.y.shape[0]
+        self.y = np.concatenate([self.y, y_init.reshape((-1,) + self.batch_shape)])
+        self._dict_blocks[name] = (slice(start, self.y.shape[0]), block_shape, func_rhs, tuple(args))
+
+    def set_args(self, name: str, *args) -> None:
+        """
+        Sets the additional arguments of the right-hand side function of the block for the upcoming time steps.
+        """
+        slice_, block_shape, func_rhs, _ = self._dict_blocks[name]
+        self._dict_blocks[name] = (slice_, block_shape, func_rhs, args)
+
+    def __getitem__(self, name: str) -> npt.ArrayLike:
+        slice_, block_shape, _, _ = self._dict_blocks[name]
+        return self.y[slice_].reshape(block_shape + self.batch_shape)
+
+    def __setitem__(self, name: str, value: npt.ArrayLike) -> None:
+        slice_, block_shape, _, _ = self._dict_blocks[name]
+        self.y[slice_] = np.broadcast_to(value, block_shape + self.batch_shape).reshape((-1,) + self.batch_shape)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._dict_blocks
+
+    def rhs(self, y: npt.ArrayLike, t: float) -> npt.ArrayLike:
+        """
+        Evaluates the right-hand side functions of all the blocks on the stacked state vector.
+        :param y: (npt.ArrayLike) stacked state vector
+        :param t: (float) time [s]
+        :return: (npt.ArrayLike) time derivatives of the stacked state vector.
+        """
+        dydt = np.empty(np.broadcast_shapes(y.shape, self.y.shape))
+        for slice_, block_shape, func_rhs, args in self._dict_blocks.values():
+            # the scalar and 1D blocks do not need to be reshaped, as the stacked vector already has their layout.
+            if len(block_shape) == 0:
+                dydt[slice_.start] = func_rhs(y[slice_.start], t, *args)
+            elif len(block_shape) == 1:
+                dydt[slice_] = func_rhs(y[slice_], t, *args)
+            else:
+                y_block = y[slice_].reshape(block_shape + y.shape[1:])
+                dydt[slice_] = np.reshape(np.broadcast_to(func_rhs(y_block, t, *args), y_block.shape),
+                                          (-1,) + y.shape[1:])
+        return dydt
+
+    def step(self, t_prev: float, dt: Union[float, npt.ArrayLike]) -> npt.ArrayLike:
+        """
+        Advances all the blocks by the time step.
+        :param t_prev: (float) time at the previous time step [s]
+        :param dt: (float or npt.ArrayLike) time step [s], which is broadcastable to the batch shape.
+        :return: (npt.ArrayLike) stacked state vector at the next time step.
+        """
+        y_next = self.METHODS[self.method](func=self.rhs, t_prev=t_prev, y_prev=self.y, step_size=dt)
+        if self.method == 'dopri5':
+            y_next, self.error = y_next
+        self.y = y_next
+        return self.y
+
+
 def TDMAsolver(l_diag: npt.ArrayLike, diag: npt.ArrayLike, u_diag: npt.ArrayLike, col_vec: npt.ArrayLike) \
         -> npt.ArrayLike:
     '''
-    TDMA (a.k.a Thomas algorithm) solver for tridiagonal system of equations.
-    Code Modified from:
-    https://gist.github.com/cbellei/8ab3ab8551b8dfc8b081c518ccd9ada9?permalink_comment_id=3109807
+    TDMA (a.k.a Thomas algorithm) solver for tridiagonal system of equations. It delegates to the LAPACK factor and
+    solve routines in SPPy.calc_helpers.tridiagonal.
     '''
-    nf = len(col_vec)  # number of equations
-    c_l_diag, c_diag, c_u_diag, c_col_vec = map(np.array, (l_diag, diag, u_diag, col_vec))  # copy arrays
-    for it in range(1, nf):
-        mc = c_l_diag[it - 1] / c_diag[it - 1]
-        c_diag[it] = c_diag[it] - mc * c_u_diag[it - 1]
-        c_col_vec[it] = c_col_vec[it] - mc * c_col_vec[it - 1]
-
-    xc = c_diag
-    xc[-1] = c_col_vec[-1] / c_diag[-1]
-
-    for il in range(nf - 2, -1, -1):
-        xc[il] = (c_col_vec[il] - c_u_diag[il] * xc[il + 1]) / c_diag[il]
-    return xc
+    return solve_tridiagonal(l_diag=l_diag, diag=diag, u_diag=u_diag, b=col_vec)
@@ -0,0 +1,186 @@
+""" tabulation
+Contains the classes and functionalities for replacing the expensive functions of a single variable (e.g., the
+electrode OCP functions) with their tabulated surrogates.
+"""
+
+__all__ = ['TabulationSettings', 'TabulatedFunction', 'tabulate']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+import functools
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+from scipy import interpolate
+
+
+@dataclass(frozen=True)
+class TabulationSettings:
+    """
+    Stores the settings for the tabulation of the functions. The function is sampled on a uniform grid of num_points
+    points between x_min and x_max and is interpolated using either the cubic spline ('cubic') or the linear
+    ('linear') interpolation. The tabulation is checked against the function at several points within every grid
+    interval and an error is raised if the difference anywhere is greater than tol * (|f| + f_typ), where f_typ is the
+    median of |f| over the checked points. Hence, tol acts as the relative tolerance with respect to the function's
+    typical magnitude, also near the zeros of the function and for the functions of small magnitudes (e.g., the
+    dOCPdT). Outside the grid, the function itself is evaluated.
+    """
+    num_points: int = 2001  # number of grid points
+    x_min: float = 1e-3  # lower bound of the grid
+    x_max: float = 1 - 1e-3  # upper bound of the grid
+    kind: str = 'cubic'  # interpolation type, 'cubic' or 'linear'
+    tol: float = 1e-4  # tolerance of the accuracy check
+
+    def __post_init__(self):
+        if (not isinstance(self.num_points, int)) or (self.num_points < 4):
+            raise ValueError("num_points needs to be an integer greater than or equal to 4.")
+        if self.x_min >= self.x_max:
+            raise ValueError("x_min needs to be less than x_max.")
+        if self.kind not in ('cubic', 'linear'):
+            raise ValueError("kind needs to be either 'cubic' or 'linear'.")
+        if self.tol <= 0:
+            raise ValueError("tol needs to be positive.")
+
+
+class TabulatedFunction:
+    """
+    Tabulated surrogate of a function of a single variable. The surrogate is a piecewise cubic polynomial on a uniform
+    grid and hence, its value at any point only requires the index computation and one Horner evaluation. The scalar
+    inputs are evaluated using Python floats and the array inputs using numpy operations.
+    """
+    num_check_points = 4  # number of points within every grid interval at which the tabulation is checked
+
+    def __init__(self, func: Callable, settings: Optional[TabulationSettings] = None):
+        """
+        TabulatedFunction class constructor.
+        :param func: function that takes in a float (or preferably a numpy array) and returns a float (or numpy array).
+        :param settings: (TabulationSettings) tabulation settings. If None, the default settings are used.
+        """
+        if not callable(func):
+            raise TypeError("func needs to be a function.")
+        if settings is None:
+            settings = TabulationSettings()
+        elif not isinstance(settings, TabulationSettings):
+            raise TypeError("settings needs to be a TabulationSettings object.")
+        self.func = func
+        self.settings = settings
+
+        self.x_min = settings.x_min
+        self.array_x = np.linspace(settings.x_min, settings.x_max, settings.num_points)
+        self.h = self.array_x[1] - self.array_x[0]
+        self.inv_h = 1 / self.h
+        self.num_intervals = settings.num_points - 1
+        array_y = self._sample(self.array_x)
+        if settings.kind == 'cubic':
+            # polynomial coefficients (highest power first) of every interval.
+            self.array_coeff = np.ascontiguousarray(interpolate.CubicSpline(self.array_x, array_y).c.T)
+        else:
+            self.array_coeff = np.zeros((self.num_intervals, 4))
+            self.array_coeff[:, 2] = np.diff(array_y) / self.h
+            self.array_coeff[:, 3] = array_y[:-1]
+        self.lst_x = self.array_x.tolist()
+        self.lst_coeff = [tuple(coeff) for coeff in self.array_coeff.tolist()]
+
+        self.max_error = self.calc_max_error()
+        if self.max_error > settings.tol:
+            raise ValueError(f"The tabulation error of {getattr(func, '__name__', 'the function')} "
+                             f"({self.max_error}) is greater than the tolerance ({settings.tol}).")
+
+    def _sample(self, array_x: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Evaluates the function at the inputted points. In case the function does not support the numpy arrays, it is
+        evaluated point by point.
+        """
+        try:
+            array_y = np.asarray(self.func(array_x), dtype=float)
+            if array_y.shape != array_x.shape:
+                raise ValueError
+        except (TypeError, ValueError):
+            array_y = np.array([self.func(x) for x in array_x], dtype=float)
+        return array_y
+
+    def calc_max_error(self) -> float:
+        """
+        Returns the maximum scaled difference, |f_tabulated - f| / (|f| + f_typ), between the tabulation and the
+        function at num_check_points equally spaced points within every grid interval. Here, f_typ is the median of |f|
+        over these points (or the maximum of |f| if the median is zero).
+        :return: (float) maximum scaled error.
+        """
+        array_frac = np.arange(1, self.num_check_points + 1) / (self.num_check_points + 1)
+        array_x_check = (self.array_x[:-1, np.newaxis] + self.h * array_frac).flatten()
+        array_y_check = self._sample(array_x_check)
+        array_y_abs = np.abs(array_y_check)
+        f_typ = np.median(array_y_abs)
+        if f_typ == 0:
+            f_typ = np.max(array_y_abs) if np.max(array_y_abs) > 0 else 1.0
+        return float(np.max(np.abs(self(array_x_check) - array_y_check) / (array_y_abs + f_typ)))
+
+    def __call__(self, x: Union[float, npt.ArrayLike]) -> Union[float, npt.ArrayLike]:
+        """
+        Returns the tabulated function value.
+        :param x: float or numpy array.
+        :return: float or numpy array
+        """
+        if isinstance(x, (float, int)):
+            u = (x - self.x_min) * self.inv_h
+            if not (0 <= u < self.num_intervals):
+                return self.func(x)
+            i = int(u)
+            dx = x - self.lst_x[i]
+            c3, c2, c1, c0 = self.lst_coeff[i]
+            return ((c3 * dx + c2) * dx + c1) * dx + c0
+        return self._call_array(x, derivative=False)
+
+    def derivative(self, x: Union[float, npt.ArrayLike]) -> Union[float, npt.ArrayLike]:
+        """
+        Returns the derivative of the tabulated function. Outside the grid, it is estimated using the central
+        difference of the function.
+        :param x: float or numpy array.
+        :return: float or numpy array
+        """
+        if isinstance(x, (float, int)):
+            u = (x - self.x_min) * self.inv_h
+            if not (0 <= u < self.num_intervals):
+                return (self.func(x + 1e-6) - self.func(x - 1e-6)) / 2e-6
+            i = int(u)
+            dx = x - self.lst_x[i]
+            c3, c2, c1, c0 = self.lst_coeff[i]
+            return (3 * c3 * dx + 2 * c2) * dx + c1
+        return self._call_array(x, derivative=True)
+
+    def _call_array(self, x: npt.ArrayLike, derivative: bool) -> npt.ArrayLike:
+        x = np.asarray(x, dtype=float)
+        u = (x - self.x_min) * self.inv_h
+        inside = (u >= 0) & (u < self.num_intervals)
+        i = np.where(inside, u, 0).astype(int)
+        dx = x - self.array_x[i]
+        c = self.array_coeff[i]
+        if derivative:
+            y = (3 * c[..., 0] * dx + 2 * c[..., 1]) * dx + c[..., 2]
+        else:
+            y = ((c[..., 0] * dx + c[..., 1]) * dx + c[..., 2]) * dx + c[..., 3]
+        if not np.all(inside):
+            x_outside = x[~inside]
+            if derivative:
+                y[~inside] = (self._sample(x_outside + 1e-6) - self._sample(x_outside - 1e-6)) / 2e-6
+            else:
+                y[~inside] = self._sample(x_outside)
+        return y[()] if y.ndim == 0 else y
+
+
+@functools.lru_cache(maxsize=None)
+def tabulate(func: Callable, settings: Optional[TabulationSettings] = None) -> TabulatedFunction:
+    """
+    Returns the tabulated surrogate of the function. The surrogates are cached and hence, the battery cells sharing the
+    same function and settings also share the same surrogate.
+    :param func: function to tabulate.
+    :param settings: (TabulationSettings) tabulation settings. If None, the default settings are used.
+    :return: (TabulatedFunction) tabulated surrogate.
+    """
+    if settings is None:
+        return tabulate(func, TabulationSettings())
+    return TabulatedFunction(func=func, settings=settings)
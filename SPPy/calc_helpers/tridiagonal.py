@@ -0,0 +1,146 @@
+""" tridiagonal
+Contains the solvers for the tridiagonal systems of equations. A tridiagonal matrix is factored once and the
+factorization is reused for any number of right-hand sides. Many independent tridiagonal systems of the same size can
+be solved at once as a batch.
+"""
+
+__all__ = ['TridiagonalSolver', 'solve_tridiagonal']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+from scipy.linalg import get_lapack_funcs
+
+
+class TridiagonalSolver:
+    """
+    Factors the tridiagonal matrix (or a batch of tridiagonal matrices) once and solves for any number of right-hand
+    sides.
+
+    A single system (1D diagonals) is factored with the LAPACK routine gttrf (LU factorization with partial pivoting)
+    and solved with gttrs, i.e., the factor and solve halves of the routine used by scipy.linalg.solve_banded for the
+    tridiagonal matrices.
+
+    A batch of independent systems (2D diagonals of shape [batch, n]) is solved with the Thomas algorithm, where the
+    forward and back sweeps are vectorized across the batch dimension. The Thomas algorithm does not pivot and hence,
+    the batch falls back to the per-system LAPACK factorizations when n is greater than MAX_BATCH_THOMAS_N or when a
+    zero pivot is encountered.
+    """
+    MAX_BATCH_THOMAS_N = 256  # largest system size for the vectorized Thomas sweeps across the batch
+
+    def __init__(self, l_diag: npt.ArrayLike, diag: npt.ArrayLike, u_diag: npt.ArrayLike):
+        """
+        TridiagonalSolver class constructor.
+        :param l_diag: (npt.ArrayLike) lower diagonal of shape [n-1] or [batch, n-1]
+        :param diag: (npt.ArrayLike) main diagonal of shape [n] or [batch, n]
+        :param u_diag: (npt.ArrayLike) upper diagonal of shape [n-1] or [batch, n-1]
+        """
+        diag = np.asarray(diag)
+        l_diag = np.asarray(l_diag)
+        u_diag = np.asarray(u_diag)
+        if diag.ndim not in (1, 2):
+            raise ValueError("diag needs to be a 1D array or a 2D array of shape [batch, n].")
+        if (diag.shape[-1] < 1) or (l_diag.shape != u_diag.shape) or \
+                (l_diag.shape != diag.shape[:-1] + (diag.shape[-1] - 1,)):
+            raise ValueError("l_diag and u_diag need to have one less element than diag along the last axis.")
+        dtype = np.result_type(l_diag, diag, u_diag, float)
+        self.is_batch = (diag.ndim == 2)
+        self.n = diag.shape[-1]
+        self.batch_size = diag.shape[0] if self.is_batch else None
+        self._lst_factor = None  # list of the per-system factorizations
+        self._thomas = None  # tuple of the Thomas algorithm factors (lower diagonal, inverse pivots, upper diagonal)
+        l_diag, diag, u_diag = (array.astype(dtype) for array in (l_diag, diag, u_diag))
+        if self.is_batch and (self.n <= self.MAX_BATCH_THOMAS_N):
+            self._thomas = self.__thomas_factor(l_diag=l_diag, diag=diag, u_diag=u_diag)
+        if self._thomas is None:
+            self.__gttrf, self.__gttrs = get_lapack_funcs(('gttrf', 'gttrs'), dtype=dtype)
+            if self.is_batch:
+                self._lst_factor = [self.__factor(l_diag[i], diag[i], u_diag[i]) for i in range(self.batch_size)]
+            else:
+                self._lst_factor = [self.__factor(l_diag, diag, u_diag)]
+
+    def __factor(self, l_diag: npt.ArrayLike, diag: npt.ArrayLike, u_diag: npt.ArrayLike) -> tuple:
+        """
+        Returns the LAPACK factorization of the matrix. The systems with less than three equations, which the gttrf
+        wrapper does not take, are stored as the dense matrices.
+        """
+        if self.n < 3:
+            return (np.diag(diag) + np.diag(l_diag, -1) + np.diag(u_diag, 1),)
+        *lu, info = self.__gttrf(l_diag, diag, u_diag)
+        if info > 0:
+            raise np.linalg.LinAlgError("The tridiagonal matrix is singular.")
+        return tuple(lu)
+
+    def __solve_factor(self, factor: tuple, b: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Solves using the factorization from __factor, where b is of shape [n] or [n, k].
+        """
+        if self.n < 3:
+            return np.linalg.solve(factor[0], b)
+        return self.__gttrs(*factor, b)[0]
+
+    @staticmethod
+    def __thomas_factor(l_diag: npt.ArrayLike, diag: npt.ArrayLike, u_diag: npt.ArrayLike) -> Optional[tuple]:
+        """
+        Performs the forward elimination of the Thomas algorithm on the matrices. Returns None if a zero pivot is
+        encountered.
+        """
+        array_inv_pivot = np.empty_like(diag)
+        pivot = diag[:, 0]
+        for i in range(diag.shape[1]):
+            if i > 0:
+                pivot = diag[:, i] - l_diag[:, i - 1] * array_inv_pivot[:, i - 1] * u_diag[:, i - 1]
+            if not np.all(pivot != 0):
+                return None
+            array_inv_pivot[:, i] = 1 / pivot
+        return l_diag, array_inv_pivot, u_diag
+
+    def __solve_thomas(self, b: npt.ArrayLike) -> npt.ArrayLike:
+        l_diag, array_inv_pivot, u_diag = self._thomas
+        x = np.empty(b.shape, dtype=np.result_type(b, array_inv_pivot))
+        x[:, 0] = b[:, 0]
+        for i in range(1, self.n):
+            x[:, i] = b[:, i] - l_diag[:, i - 1] * array_inv_pivot[:, i - 1] * x[:, i - 1]
+        x[:, -1] *= array_inv_pivot[:, -1]
+        for i in range(self.n - 2, -1, -1):
+            x[:, i] = (x[:, i] - u_diag[:, i] * x[:, i + 1]) * array_inv_pivot[:, i]
+        return x
+
+    def solve(self, b: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Solves the tridiagonal system(s) of equations.
+
+        For a single system, b can be of shape [n] (one right-hand side) or [k, n] (k right-hand sides). For a batch of
+        systems, b needs to be of shape [batch, n], where each row is the right-hand side of the corresponding system.
+        :param b: (npt.ArrayLike) right-hand side(s)
+        :return: (npt.ArrayLike) solution with the same shape as b.
+        """
+        b = np.asarray(b)
+        if self.is_batch:
+            if b.shape != (self.batch_size, self.n):
+                raise ValueError(f"b needs to be of shape ({self.batch_size}, {self.n}).")
+            if self._thomas is not None:
+                return self.__solve_thomas(b)
+            return np.stack([self.__solve_factor(factor, b[i]) for i, factor in enumerate(self._lst_factor)])
+        if (b.ndim not in (1, 2)) or (b.shape[-1] != self.n):
+            raise ValueError(f"b needs to be of shape ({self.n},) or (k, {self.n}).")
+        return self.__solve_factor(self._lst_factor[0], b.T).T
+
+
+def solve_tridiagonal(l_diag: npt.ArrayLike, diag: npt.ArrayLike, u_diag: npt.ArrayLike,
+                      b: npt.ArrayLike) -> npt.ArrayLike:
+    """
+    Solves the tridiagonal system(s) of equations without keeping the factorization. Refer to TridiagonalSolver for
+    the shapes of the arrays.
+    :param l_diag: (npt.ArrayLike) lower diagonal of shape [n-1] or [batch, n-1]
+    :param diag: (npt.ArrayLike) main diagonal of shape [n] or [batch, n]
+    :param u_diag: (npt.ArrayLike) upper diagonal of shape [n-1] or [batch, n-1]
+    :param b: (npt.ArrayLike) right-hand side(s)
+    :return: (npt.ArrayLike) solution with the same shape as b.
+    """
+    return TridiagonalSolver(l_diag=l_diag, diag=diag, u_diag=u_diag).solve(b)
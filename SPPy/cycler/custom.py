@@ -1,7 +1,8 @@
+import bisect
+
 import matplotlib.pyplot as plt
 import numpy as np
 import numpy.typing as npt
-from scipy import interpolate
 from SPPy.cycler.base import BaseCycler
 
 
@@ -30,6 +31,15 @@ class CustomCycler(BaseCycler):
         self.V_min = V_min
         self.V_max = V_max
 
+        # The time-sorted lookup table for the current values is built once below. The lists are used for the scalar
+        # lookups (get_current) and the arrays for the vectorized lookups (get_current_array).
+        array_idx = np.argsort(np.asarray(self.array_t, dtype=float), kind='stable')
+        self._array_t_lookup = np.asarray(self.array_t, dtype=float)[array_idx]
+        self._array_I_lookup = np.asarray(self.array_I, dtype=float)[array_idx]
+        self._lst_t_lookup = self._array_t_lookup.tolist()
+        self._lst_I_lookup = self._array_I_lookup.tolist()
+        self._cursor = 0  # index of the time interval of the last lookup.
+
     @property
     def t_max(self):
         """
@@ -46,14 +56,46 @@ class CustomCycler(BaseCycler):
         :param t: time [s]
         :returns: current value [A]
         """
-        i_app = interpolate.interp1d(self.array_t, self.array_I, kind='previous', fill_value='extrapolate')(t)
-        if np.isnan(i_app):
+        idx = self._lookup_index(t)
+        if idx < 0:
             return 0.0
-        return i_app
+        return self._lst_I_lookup[idx]
+
+    def _lookup_index(self, t: float) -> int:
+        """
+        Returns the index of the last time value that is less than or equal to t, or -1 if t is less than the first
+        time value. Since the solvers query the time values in sequence, the time interval of the last lookup and the
+        one after it are checked first, which makes the lookup O(1). Otherwise, a binary search is performed.
+        :param t: time [s]
+        :return: (int) index of the time value.
+        """
+        lst_t = self._lst_t_lookup
+        i = self._cursor
+        if lst_t[i] <= t:
+            if (i + 1 == len(lst_t)) or (t < lst_t[i + 1]):
+                return i
+            if (i + 2 == len(lst_t)) or (t < lst_t[i + 2]):
+                self._cursor = i + 1
+                return i + 1
+        idx = bisect.bisect_right(lst_t, t) - 1
+        if idx >= 0:
+            self._cursor = idx
+        return idx
+
+    def get_current_array(self, array_t: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Returns the current values at the inputted time values. It is the vectorized version of the get_current
+        method.
+        :param array_t: time values [s]
+        :return: (npt.ArrayLike) current values [A]
+        """
+        array_idx = np.searchsorted(self._array_t_lookup, array_t, side='right') - 1
+        return np.where(array_idx >= 0, self._array_I_lookup[np.maximum(array_idx, 0)], 0.0)
 
     def reset(self) -> None:
         self.time_elapsed = 0.0
         self.SOC_LIB = self.SOC_LIB_init
+        self._cursor = 0
 
     def plot(self):
         """
@@ -1,29 +1,68 @@
+import functools
 import os
 
 import pandas as pd
 import numpy as np
+import numpy.typing as npt
 
 from SPPy.calc_helpers.constants import Constants
 
 
-def extract_OCP(x, specie_name, T):
-    # function calculations
-    df = pd.read_csv(os.path.join(os.path.dirname(__file__), 'coefficents.csv'), index_col=0)[specie_name]
-    A_list = [df[index_name] for index_name in df.index if index_name[0] == 'A']
-    K = df['K']
+@functools.lru_cache(maxsize=None)
+def _read_coefficients() -> pd.DataFrame:
+    """
+    Reads the Redlich-Kister coefficients of all the species. The csv file is only read once.
+    :return: (pd.DataFrame) dataframe containing the coefficients, with the species as its columns.
+    """
+    return pd.read_csv(os.path.join(os.path.dirname(__file__), 'coefficents.csv'), index_col=0)
+
+
+@functools.lru_cache(maxsize=None)
+def get_coefficients(specie_name: str) -> tuple[float, float, npt.ArrayLike]:
+    """
+    Returns the Redlich-Kister coefficients of the specie. The coefficients are cached after the first call.
+    :param specie_name: (str) name of the specie, e.g., 'NMC' or 'LCO'.
+    :return: tuple containing U0 [V], K, and the (read-only) array of the coefficients A1, A2, ... [J/mol]
+    """
+    df = _read_coefficients()[specie_name]
+    array_A = np.array([df[index_name] for index_name in df.index if index_name[0] == 'A'])
+    array_A.flags.writeable = False
+    return float(df['U0']), float(df['K']), array_A
+
+
+def redlich_kister_OCP(x: npt.ArrayLike, U0: float, K: float, array_A: npt.ArrayLike, T: float) -> npt.ArrayLike:
+    """
+    Calculates the OCP using the Redlich-Kister expansion. With y = 2x - 1 and the polynomial P(y) = sum_i (A_i/F) y^i,
+    the two Redlich-Kister sums reduce to P(y) and its derivative P'(y), which are both evaluated in a single Horner
+    pass over the coefficients.
+    :param x: electrode SOC, float or numpy array.
+    :param U0: (float) reference potential [V]
+    :param K: (float) Redlich-Kister constant
+    :param array_A: array of the Redlich-Kister coefficients [J/mol]
+    :param T: temperature [K]
+    :return: OCP [V]
+    """
     R = Constants.R
     F = Constants.F
+    x = np.asarray(x, dtype=float)
+    y = 2 * x - 1
+    w = x * (1 - x)
+    # Horner evaluation of P(y) and P'(y)
+    p = np.zeros_like(y)
+    dp = np.zeros_like(y)
+    for A in array_A[::-1]:
+        dp = dp * y + p
+        p = p * y + A / F
     # second term
-    sec_term = (R*T / F) * np.log((1-x)/x)
-    # third term
-    pre_term = 1/(K * (2*x-1) + 1)**2
-    post_term = 0
-    for i, A in enumerate(A_list):
-        post_term += (A/F) * ((2*x-1)**(i+1) - 2*i*x*(1-x) / (2*x-1)**(1-i))
-    third_term = pre_term * post_term
-    # fourth term
-    post_term = 0
-    for i, A in enumerate(A_list):
-        post_term += (A/F) * ((2*x-1) ** i) * (2*(i+1)*(x**2) - 2*(i+1)*x + 1)
-    fou_term = K * post_term
-    return df['U0'] + sec_term + third_term + fou_term
\ No newline at end of file
+    sec_term = (R * T / F) * np.log((1 - x) / x)
+    # third term: sum_i (A_i/F) * (y^(i+1) - 2*i*x*(1-x)*y^(i-1))
+    third_term = (y * p - 2 * w * dp) / (K * y + 1) ** 2
+    # fourth term: K * sum_i (A_i/F) * y^i * (1 - 2*(i+1)*x*(1-x))
+    fou_term = K * (p - 2 * w * (p + y * dp))
+    OCP = U0 + sec_term + third_term + fou_term
+    return OCP[()] if OCP.ndim == 0 else OCP
+
+
+def extract_OCP(x, specie_name, T):
+    U0, K, array_A = get_coefficients(specie_name)
+    return redlich_kister_OCP(x=x, U0=U0, K=K, array_A=array_A, T=T)
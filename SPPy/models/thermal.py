@@ -29,6 +29,21 @@ class Lumped:
             return main_coeff * (self.reversible_heat(I=I, T=T) + self.irreversible_heat(I=I, V=V) - self.heat_flux(T=T))
         return func_heat_balance
 
+    def rhs(self, T, t, V, I, OCV, dOCVdT):
+        """
+        Right-hand side of the heat balance ODE, where the OCV and its temperature derivative are evaluated once per
+        time step by the caller.
+        :param T: battery cell temperature [K]
+        :param t: time [s]
+        :param V: battery cell terminal voltage [V]
+        :param I: applied current [A]
+        :param OCV: open-circuit voltage [V]
+        :param dOCVdT: change of OCV with respect to the change in temperature [V/K]
+        :return: time derivative of the battery cell temperature [K/s]
+        """
+        main_coeff = 1 / (self.b_cell.rho * self.b_cell.Vol * self.b_cell.C_p)
+        return main_coeff * (I * T * dOCVdT + I * (V - OCV) - self.heat_flux(T=T))
+
 
 class ECMLumped:
     def reversible_heat(self, I: float, T: float, dOCVdT: float) -> float:
@@ -47,3 +62,13 @@ class ECMLumped:
                                  self.irreversible_heat(I=I, V=V, OCV=OCV) - \
                                  self.heat_flux(T=T, h=h, A=A, T_amb=T_amb))
         return func_heat_balance
+
+    def rhs(self, T, t, V, I, rho, Vol, C_p, OCV, dOCVdT, h, A, T_amb):
+        """
+        Right-hand side of the heat balance ODE. The per-step inputs are passed as the arguments so that the ODE
+        solvers do not need a closure each time step.
+        """
+        main_coeff = 1 / (rho * Vol * C_p)
+        return main_coeff * (self.reversible_heat(I=I, T=T, dOCVdT=dOCVdT) +
+                             self.irreversible_heat(I=I, V=V, OCV=OCV) -
+                             self.heat_flux(T=T, h=h, A=A, T_amb=T_amb))
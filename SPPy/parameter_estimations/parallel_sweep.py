@@ -0,0 +1,243 @@
+""" parallel_sweep
+Contains the classes and functionality for running the cycling simulations over the combinations of the battery cell
+parameters in parallel.
+"""
+
+__all__ = ['ParameterSweep']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+import copy
+import csv
+import functools
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from SPPy.battery_components.battery_cell import BatteryCell
+from SPPy.cycler.base import BaseCycler
+from SPPy.solvers.battery_solver import SPPySolver
+from SPPy.sol_and_visualization.solution import Solution, SolutionRecorder
+from SPPy.sol_and_visualization.streaming import SolutionSink
+
+
+# The battery cell, cycler, and the solver settings shared by all the simulations of a worker process. They are set
+# once per worker by the _init_worker function.
+_worker_state = {}
+
+
+def _set_attr(obj, attr_path: str, value) -> None:
+    """
+    Sets the (dotted) attribute of the object, e.g., 'elec_p.D_ref'.
+    """
+    lst_attr = attr_path.split('.')
+    setattr(functools.reduce(getattr, lst_attr[:-1], obj), lst_attr[-1], value)
+
+
+def _simulate(b_cell: BatteryCell, cycler: BaseCycler, solver_params: dict, solve_params: dict,
+              dict_param_values: dict) -> tuple[dict[str, npt.ArrayLike], list, bool]:
+    """
+    Performs the cycling simulation on the copy of the battery cell with the inputted parameter values.
+    :return: tuple containing the dictionary of the recorded columns, the cycling step names, and the boolean
+    indicating if the negative electrode molar fluxes are recorded.
+    """
+    b_cell = copy.deepcopy(b_cell)
+    for attr_path, value in dict_param_values.items():
+        _set_attr(b_cell, attr_path, value)
+    cycler = copy.deepcopy(cycler)
+    cycler.reset()
+    solver = SPPySolver(b_cell=b_cell, **solver_params)
+    solver.solve(cycler_instance=cycler, **solve_params)
+    recorder = solver.sol_init
+    dict_columns = {'cycle_num': recorder.column('cycle_num'), 'cycle_step': recorder.column('cycle_step')}
+    dict_columns.update({column: recorder.column(column) for column in SolutionRecorder.FLOAT_COLUMNS})
+    return dict_columns, recorder.step_names, recorder.has_degradation
+
+
+def _init_worker(b_cell: BatteryCell, cycler: BaseCycler, solver_params: dict, solve_params: dict) -> None:
+    _worker_state.update(b_cell=b_cell, cycler=cycler, solver_params=solver_params, solve_params=solve_params)
+
+
+def _run_worker(task: tuple[int, dict]) -> tuple[int, tuple]:
+    run_id, dict_param_values = task
+    return run_id, _simulate(dict_param_values=dict_param_values, **_worker_state)
+
+
+class ParameterSweep:
+    """
+    Runs the cycling simulations for all the combinations of the battery cell parameter values using a pool of worker
+    processes. The parameter set is parsed only once, in the main process, and the resulting battery cell is shared with
+    the worker processes, which only copy it and set the swept parameters for each simulation.
+
+    The results of all the simulations are gathered in a single directory, which contains the results in the
+    SolutionSink format (with an additional run_id column) and the index.csv file that maps each run to its parameter
+    values and its rows. A run is added to the index only after its results are written and hence, an interrupted
+    sweep can be resumed by calling the run method again, which skips the runs already in the index.
+    """
+    INDEX_FILE_NAME = 'index.csv'
+
+    def __init__(self, parameter_set_name: str, SOC_init_p: float, SOC_init_n: float, T: float, cycler: BaseCycler,
+                 dict_params: dict[str, npt.ArrayLike], solver_params: Optional[dict] = None,
+                 solve_params: Optional[dict] = None):
+        """
+        ParameterSweep class constructor.
+        :param parameter_set_name: (str) name of the parameter set.
+        :param SOC_init_p: (float) initial SOC of the positive electrode.
+        :param SOC_init_n: (float) initial SOC of the negative electrode.
+        :param T: (float) battery cell temperature [K]
+        :param cycler: (BaseCycler) cycler instance. Each simulation uses its own (reset) copy.
+        :param dict_params: (dict) dictionary with the battery cell attribute names as its keys (e.g., 'elec_p.D_ref'
+        or 'R_cell') and the arrays of their values as its values. All the combinations are simulated and the first
+        attribute varies the slowest.
+        :param solver_params: (dict) keyword arguments of the SPPySolver constructor (except b_cell).
+        :param solve_params: (dict) keyword arguments of the SPPySolver's solve method (except cycler_instance).
+        """
+        if not isinstance(cycler, BaseCycler):
+            raise TypeError("cycler needs to be a BaseCycler object.")
+        if len(dict_params) == 0:
+            raise ValueError("dict_params needs to contain at least one parameter.")
+        self.b_cell = BatteryCell(parameter_set_name=parameter_set_name, SOC_init_p=SOC_init_p,
+                                  SOC_init_n=SOC_init_n, T=T)
+        for attr_path in dict_params:
+            try:
+                functools.reduce(getattr, attr_path.split('.'), self.b_cell)
+            except AttributeError:
+                raise ValueError(f"{attr_path} is not a battery cell attribute.")
+        self.cycler = cycler
+        self.dict_params = {attr_path: np.asarray(array_values) for attr_path, array_values in dict_params.items()}
+        self.solver_params = {} if solver_params is None else dict(solver_params)
+        self.solve_params = {} if solve_params is None else dict(solve_params)
+
+    @property
+    def num_runs(self) -> int:
+        return int(np.prod([len(array_values) for array_values in self.dict_params.values()]))
+
+    def combinations(self) -> Iterator[tuple[int, dict]]:
+        """
+        Iterates over the parameter combinations.
+        :return: iterator of the tuples containing the run id and the dictionary of the parameter values.
+        """
+        lst_attr_path = list(self.dict_params)
+        for run_id, values in enumerate(itertools.product(*self.dict_params.values())):
+            yield run_id, {attr_path: value.item() for attr_path, value in zip(lst_attr_path, values)}
+
+    @classmethod
+    def index_path(cls, dir_name: str) -> str:
+        return os.path.join(dir_name, cls.INDEX_FILE_NAME)
+
+    @classmethod
+    def read_index(cls, dir_name: str) -> pd.DataFrame:
+        """
+        Reads the index of the completed runs.
+        :param dir_name: (str) directory containing the sweep results.
+        :return: (pd.DataFrame) dataframe with the run ids as its index and the parameter values, the starting row,
+        and the number of rows of each run as its columns.
+        """
+        return pd.read_csv(cls.index_path(dir_name), index_col='run_id')
+
+    def _open_store(self, dir_name: str, chunk_size: int) -> tuple[SolutionSink, set]:
+        """
+        Creates the results directory or, if it already contains the results, opens it and discards the rows that were
+        written after the last indexed run.
+        :return: tuple containing the sink and the set of the completed run ids.
+        """
+        if not os.path.exists(self.index_path(dir_name)):
+            sink = SolutionSink(dir_path=dir_name, chunk_size=chunk_size, overwrite=True)
+            with open(self.index_path(dir_name), 'w', newline='') as f:
+                csv.writer(f).writerow(['run_id'] + list(self.dict_params) + ['row_start', 'num_rows'])
+            return sink, set()
+
+        df_index = self.read_index(dir_name)
+        if list(df_index.columns[:-2]) != list(self.dict_params):
+            raise ValueError(f"{dir_name} contains the results of a sweep over different parameters.")
+        sink = SolutionSink.reopen(dir_path=dir_name, chunk_size=chunk_size)
+        sink.num_rows = int((df_index['row_start'] + df_index['num_rows']).max()) if len(df_index) > 0 else 0
+        sink.truncate()
+        return sink, set(df_index.index)
+
+    def _store_run(self, sink: SolutionSink, dir_name: str, run_id: int, dict_param_values: dict,
+                   result: tuple) -> None:
+        """
+        Appends the results of the run to the sink and then adds the run to the index.
+        """
+        dict_columns, step_names, has_degradation = result
+        lst_step_names = sink.attrs.get('step_names', [])
+        for step_name in step_names:
+            if step_name not in lst_step_names:
+                lst_step_names.append(step_name)
+        # map the run's cycling step codes to those of the stored results.
+        array_code_map = np.array([lst_step_names.index(step_name) for step_name in step_names], dtype=np.int8)
+        dict_columns = dict(dict_columns)
+        if len(array_code_map) > 0:
+            dict_columns['cycle_step'] = array_code_map[dict_columns['cycle_step']]
+        num_rows = len(dict_columns['t'])
+        dict_columns['run_id'] = np.full(num_rows, run_id, dtype=np.int64)
+
+        row_start = sink.num_rows
+        sink.write(dict_columns=dict_columns,
+                   attrs={'step_names': lst_step_names,
+                          'has_degradation': sink.attrs.get('has_degradation', False) or has_degradation})
+        with open(self.index_path(dir_name), 'a', newline='') as f:
+            csv.writer(f).writerow([run_id] + list(dict_param_values.values()) + [row_start, num_rows])
+            f.flush()
+            os.fsync(f.fileno())
+
+    def run(self, dir_name: str, num_workers: Optional[int] = None, chunksize: int = 1) -> int:
+        """
+        Runs the simulations of the parameter combinations that are not in the results directory yet.
+        :param dir_name: (str) directory where the results are stored.
+        :param num_workers: (int) number of worker processes. If None, the number of processors is used. If 1, the
+        simulations are run in the main process.
+        :param chunksize: (int) number of the simulations sent to a worker process at a time.
+        :return: (int) number of the simulations performed.
+        """
+        if (num_workers is not None) and ((not isinstance(num_workers, int)) or (num_workers < 1)):
+            raise ValueError("num_workers needs to be a positive integer.")
+        if (not isinstance(chunksize, int)) or (chunksize < 1):
+            raise ValueError("chunksize needs to be a positive integer.")
+        sink, set_completed = self._open_store(dir_name=dir_name, chunk_size=1)
+        lst_tasks = [(run_id, dict_param_values) for run_id, dict_param_values in self.combinations()
+                     if run_id not in set_completed]
+        dict_tasks = dict(lst_tasks)
+
+        if num_workers == 1:
+            for run_id, dict_param_values in lst_tasks:
+                result = _simulate(b_cell=self.b_cell, cycler=self.cycler, solver_params=self.solver_params,
+                                   solve_params=self.solve_params, dict_param_values=dict_param_values)
+                self._store_run(sink=sink, dir_name=dir_name, run_id=run_id, dict_param_values=dict_param_values,
+                                result=result)
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker,
+                                     initargs=(self.b_cell, self.cycler, self.solver_params,
+                                               self.solve_params)) as executor:
+                for run_id, result in executor.map(_run_worker, lst_tasks, chunksize=chunksize):
+                    self._store_run(sink=sink, dir_name=dir_name, run_id=run_id,
+                                    dict_param_values=dict_tasks[run_id], result=result)
+        return len(lst_tasks)
+
+    @classmethod
+    def load_solution(cls, dir_name: str, run_id: int, name: Optional[str] = None) -> Solution:
+        """
+        Creates the Solution object of the run. Its arrays are memory-mapped.
+        :param dir_name: (str) directory containing the sweep results.
+        :param run_id: (int) run id.
+        :param name: (str) name of the solution.
+        :return: (Solution) Solution object.
+        """
+        df_index = cls.read_index(dir_name)
+        if run_id not in df_index.index:
+            raise ValueError(f"run {run_id} is not in {dir_name}.")
+        row_start, num_rows = int(df_index.loc[run_id, 'row_start']), int(df_index.loc[run_id, 'num_rows'])
+        dict_columns, attrs = SolutionSink.read(dir_name)
+        dict_columns = {column: array[row_start:row_start + num_rows] for column, array in dict_columns.items()}
+        recorder = SolutionRecorder.from_arrays(dict_columns=dict_columns, step_names=attrs['step_names'],
+                                                has_degradation=attrs['has_degradation'])
+        return Solution(base_solution_instance=recorder, name=name)
@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 import SPPy
 from SPPy.cycler.base import BaseCycler
 from SPPy.calc_helpers.numerical_diff import first_centered_FD
+from SPPy.parameter_estimations.parallel_sweep import ParameterSweep
 
 
 class GridSearch:
@@ -71,6 +72,31 @@ class GridSearch:
                                 # Update loop variables below
                                 index += 1
 
+    def generate_data_parallel(self,
+                               array_R_p: npt.ArrayLike, array_R_n: npt.ArrayLike,
+                               array_c_pmax: npt.ArrayLike, array_c_nmax: npt.ArrayLike,
+                               array_D_p: npt.ArrayLike, array_D_n: npt.ArrayLike,
+                               dir_name: str = 'grid_search_results', num_workers: Optional[int] = None,
+                               chunksize: int = 1) -> ParameterSweep:
+        """
+        Performs the same simulations as the generate_data method using a pool of worker processes. The results are
+        stored in the ParameterSweep format and an interrupted search is resumed by calling this method again.
+        :param dir_name: (str) directory where the results are stored.
+        :param num_workers: (int) number of worker processes. If None, the number of processors is used.
+        :param chunksize: (int) number of the simulations sent to a worker process at a time.
+        :return: (ParameterSweep) ParameterSweep instance, which can be used to load the solutions.
+        """
+        sweep = ParameterSweep(parameter_set_name=self.parameter_set_name, SOC_init_p=self.SOC_init_p,
+                               SOC_init_n=self.SOC_init_n, T=self.T, cycler=self.i_cycler,
+                               dict_params={'elec_p.R': array_R_p, 'elec_n.R': array_R_n,
+                                            'elec_p.max_conc': array_c_pmax, 'elec_n.max_conc': array_c_nmax,
+                                            'elec_p.D_ref': array_D_p, 'elec_n.D_ref': array_D_n},
+                               solver_params={'N': 5, 'isothermal': True, 'degradation': False,
+                                              'electrode_SOC_solver': 'poly'},
+                               solve_params={'t_increment': 1})
+        sweep.run(dir_name=dir_name, num_workers=num_workers, chunksize=chunksize)
+        return sweep
+
     @classmethod
     def plot_generated_data(cls, lst_sol_num: list, file_dir: str = "grid_search_results/",
                             t_exp: Optional[npt.ArrayLike] = None, V_exp: Optional[npt.ArrayLike] = None,
@@ -0,0 +1,155 @@
+""" recording.py
+Contains the recording policies that decide which time steps of the simulation are stored in the solution.
+"""
+
+__all__ = ['BaseRecordingPolicy', 'RecordAll', 'RecordEveryNth', 'RecordTimeGrid', 'RecordOnChange',
+           'RecordStepBoundaries']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+
+class BaseRecordingPolicy(ABC):
+    """
+    Base class for the recording policies. The solvers call the policy at every time step and only store the results
+    when the policy returns True. The last time step of every cycling step is always stored.
+    """
+    def reset(self) -> None:
+        """
+        Resets the policy's internal states at the start of a simulation.
+        """
+        pass
+
+    def __call__(self, t: float, V: float, T: float, step_end: bool = False) -> bool:
+        """
+        Returns True if the results of the current time step are to be stored.
+        :param t: time elapsed [s]
+        :param V: battery cell terminal voltage [V]
+        :param T: battery cell temperature [K]
+        :param step_end: (bool) True if the time step is the last one of the cycling step.
+        :return: (bool) True if the time step is to be stored.
+        """
+        record = self.should_record(t=t, V=V, T=T) or step_end
+        if record:
+            self.on_record(t=t, V=V, T=T)
+        return record
+
+    @abstractmethod
+    def should_record(self, t: float, V: float, T: float) -> bool:
+        """
+        Returns True if the time step (which is not the last one of the cycling step) is to be stored.
+        """
+        pass
+
+    def on_record(self, t: float, V: float, T: float) -> None:
+        """
+        Updates the policy's internal states after a time step is stored.
+        """
+        pass
+
+
+class RecordAll(BaseRecordingPolicy):
+    """
+    Stores every time step.
+    """
+    def should_record(self, t: float, V: float, T: float) -> bool:
+        return True
+
+
+class RecordEveryNth(BaseRecordingPolicy):
+    """
+    Stores every nth time step.
+    """
+    def __init__(self, n: int):
+        """
+        RecordEveryNth class constructor.
+        :param n: (int) the results are stored once every n time steps.
+        """
+        if (not isinstance(n, int)) or (n < 1):
+            raise ValueError("n needs to be a positive integer.")
+        self.n = n
+        self.iter_no = 0
+
+    def reset(self) -> None:
+        self.iter_no = 0
+
+    def should_record(self, t: float, V: float, T: float) -> bool:
+        self.iter_no += 1
+        return self.iter_no % self.n == 0
+
+
+class RecordTimeGrid(BaseRecordingPolicy):
+    """
+    Stores the first time step at or after every point of the uniform output time grid.
+    """
+    def __init__(self, dt_output: float, t_start: float = 0.0):
+        """
+        RecordTimeGrid class constructor.
+        :param dt_output: (float) time interval of the output time grid [s].
+        :param t_start: (float) first point of the output time grid [s].
+        """
+        if dt_output <= 0:
+            raise ValueError("dt_output needs to be positive.")
+        self.dt_output = dt_output
+        self.t_start = t_start
+        self.t_next = t_start
+
+    def reset(self) -> None:
+        self.t_next = self.t_start
+
+    def should_record(self, t: float, V: float, T: float) -> bool:
+        return t >= self.t_next
+
+    def on_record(self, t: float, V: float, T: float) -> None:
+        if t >= self.t_next:
+            self.t_next = self.t_start + (np.floor((t - self.t_start) / self.dt_output) + 1) * self.dt_output
+
+
+class RecordOnChange(BaseRecordingPolicy):
+    """
+    Stores the time step when the terminal voltage or the temperature has changed by more than their thresholds since
+    the last stored time step.
+    """
+    def __init__(self, V_threshold: float = 1e-3, T_threshold: Optional[float] = None):
+        """
+        RecordOnChange class constructor.
+        :param V_threshold: (float) terminal voltage threshold [V].
+        :param T_threshold: (float) temperature threshold [K]. If None, the temperature is not considered.
+        """
+        if V_threshold <= 0:
+            raise ValueError("V_threshold needs to be positive.")
+        if (T_threshold is not None) and (T_threshold <= 0):
+            raise ValueError("T_threshold needs to be positive.")
+        self.V_threshold = V_threshold
+        self.T_threshold = T_threshold
+        self.V_last = None  # terminal voltage at the last stored time step [V]
+        self.T_last = None  # temperature at the last stored time step [K]
+
+    def reset(self) -> None:
+        self.V_last = self.T_last = None
+
+    def should_record(self, t: float, V: float, T: float) -> bool:
+        if self.V_last is None:
+            return True
+        if abs(V - self.V_last) > self.V_threshold:
+            return True
+        return (self.T_threshold is not None) and (abs(T - self.T_last) > self.T_threshold)
+
+    def on_record(self, t: float, V: float, T: float) -> None:
+        self.V_last, self.T_last = V, T
+
+
+class RecordStepBoundaries(BaseRecordingPolicy):
+    """
+    Stores only the last time step of every cycling step, which contains the summary of the cycling step (e.g., its
+    charge or discharge capacity).
+    """
+    def should_record(self, t: float, V: float, T: float) -> bool:
+        return False
@@ -2,7 +2,7 @@
 Contains the classes and functionality to store and plot the simulation results.
 """
 
-__all__ = ['ECMSolution', 'SolutionInitializer', 'Solution']
+__all__ = ['ECMSolution', 'SolutionInitializer', 'SolutionRecorder', 'Solution', 'BatchSolution']
 
 __author__ = 'Moin Ahmed'
 __copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
@@ -19,11 +19,17 @@ import matplotlib.pyplot as plt
 import matplotlib as mpl
 
 from SPPy.calc_helpers.constants import Constants
+from SPPy.sol_and_visualization.streaming import SolutionSink
 from dataclasses import dataclass, field
 
 
 @dataclass
 class ECMSolution:
+    """
+    Stores the ECM simulation results. The update method stores the results in preallocated buffers, the capacity of
+    which grows geometrically when full, and the array attributes are views of the stored rows. The trim method
+    replaces the views with compact copies once the simulation is complete.
+    """
     array_t: np.ndarray = field(default_factory=lambda: np.array([]))  # solution time [s]
     array_I: np.ndarray = field(default_factory=lambda: np.array([]))  # applied current [A]
     array_V: np.ndarray = field(default_factory=lambda: np.array([]))  # cell terminal potential [V]
@@ -31,6 +37,77 @@ class ECMSolution:
     array_soc: np.ndarray = field(default_factory=lambda: np.array([]))  # np array containing the battery cell soc
     array_I_R1: np.ndarray = field(default_factory=lambda: np.array([]))  # current across the R1 resistor
 
+    COLUMNS = ('array_t', 'array_I', 'array_V', 'array_temp', 'array_soc', 'array_I_R1')
+    INIT_CAPACITY = 1024  # initial number of rows of the buffers
+    GROWTH_FACTOR = 2.0  # factor by which the capacity of the buffers grows when full
+
+    def __post_init__(self):
+        self._dict_buffer = None  # buffers of the columns, created on the first update
+        self._dict_view = {}  # views of the buffers, which are set as the array attributes
+        self._num_rows = 0  # number of rows stored in the buffers
+
+    def __getstate__(self) -> dict:
+        # only the stored rows are pickled.
+        state = self.__dict__.copy()
+        state.update({column: np.array(getattr(self, column)) if getattr(self, column) is not None else None
+                      for column in self.COLUMNS})
+        state.update(_dict_buffer=None, _dict_view={}, _num_rows=0)
+        return state
+
+    def __buffer_is_current(self) -> bool:
+        """
+        Checks if the array attributes are still the views of the buffers (i.e., they were not replaced).
+        """
+        if self._dict_buffer is None:
+            return False
+        return all(getattr(self, column) is self._dict_view[column] for column in self.COLUMNS)
+
+    def __init_buffer(self) -> None:
+        """
+        Creates the buffers and copies the current arrays into them.
+        """
+        dict_array = {column: np.array([]) if getattr(self, column) is None else np.asarray(getattr(self, column),
+                                                                                               dtype=float)
+                      for column in self.COLUMNS}
+        set_len = {len(array) for array in dict_array.values() if len(array) > 0}
+        if len(set_len) > 1:
+            raise ValueError("All the non-empty arrays need to be of the same length to be updated.")
+        self._num_rows = set_len.pop() if set_len else 0
+        # the empty arrays (e.g., the soc of the experimental data) are filled with nan.
+        dict_array = {column: array if len(array) > 0 else np.full(self._num_rows, np.nan)
+                      for column, array in dict_array.items()}
+        capacity = max(self.INIT_CAPACITY, int(self._num_rows * self.GROWTH_FACTOR))
+        self._dict_buffer = {}
+        for column, array in dict_array.items():
+            self._dict_buffer[column] = np.zeros(capacity)
+            self._dict_buffer[column][:self._num_rows] = array
+        self.__set_views()
+
+    def __set_views(self) -> None:
+        for column, buffer in self._dict_buffer.items():
+            view = buffer[:self._num_rows]
+            self._dict_view[column] = view
+            setattr(self, column, view)
+
+    def __grow(self) -> None:
+        """
+        Increases the capacity of all the buffers by the growth factor.
+        """
+        capacity = int(len(self._dict_buffer['array_t']) * self.GROWTH_FACTOR) + 1
+        for column, buffer in self._dict_buffer.items():
+            buffer_new = np.zeros(capacity)
+            buffer_new[:self._num_rows] = buffer[:self._num_rows]
+            self._dict_buffer[column] = buffer_new
+
+    def trim(self) -> None:
+        """
+        Replaces the views of the buffers with the compact copies of the stored rows and releases the buffers.
+        """
+        if self.__buffer_is_current():
+            for column in self.COLUMNS:
+                setattr(self, column, self._dict_buffer[column][:self._num_rows].copy())
+        self._dict_buffer, self._dict_view, self._num_rows = None, {}, 0
+
     @classmethod
     def read_from_csv_file(cls, filepath: str) -> Self:
         """
@@ -59,6 +136,33 @@ class ECMSolution:
         """
         return cls(array_t=array_t, array_I=array_i, array_V=array_v, array_temp=array_temp, array_soc=array_soc)
 
+    @classmethod
+    def read_from_sink(cls, dir_path: str) -> Self:
+        """
+        Creates the ECMSolution object from the results streamed to the disk by a SolutionSink. The arrays are
+        memory-mapped.
+        :param dir_path: (str) directory containing the streamed results.
+        :return: (ECMSolution) ECMSolution object.
+        """
+        dict_columns, attrs = SolutionSink.read(dir_path)
+        return cls(**dict_columns)
+
+    def write_to_sink(self, sink: SolutionSink) -> None:
+        """
+        Writes the stored arrays to the sink and empties them.
+        :param sink: (SolutionSink) sink object.
+        """
+        sink.write(dict_columns={'array_t': self.array_t, 'array_I': self.array_I, 'array_V': self.array_V,
+                                 'array_temp': self.array_temp, 'array_soc': self.array_soc,
+                                 'array_I_R1': self.array_I_R1})
+        if self.__buffer_is_current():
+            # the written rows are discarded and the buffers are reused.
+            self._num_rows = 0
+            self.__set_views()
+        else:
+            self.array_t, self.array_I, self.array_V = np.array([]), np.array([]), np.array([])
+            self.array_temp, self.array_soc, self.array_I_R1 = np.array([]), np.array([]), np.array([])
+
     @classmethod
     def __set_matplotlib_settings(cls) -> None:
         mpl.rcParams['lines.linewidth'] = 3
@@ -78,15 +182,23 @@ class ECMSolution:
         :param i_r1: current across the R1 resistor [A].
         :return: None
         """
-        self.__set_matplotlib_settings()
-        self.array_t = np.append(self.array_t, t)
-        self.array_I = np.append(self.array_I, i_app)
-        self.array_V = np.append(self.array_V, v)
-        self.array_temp = np.append(self.array_temp, temp)
-        self.array_soc = np.append(self.array_soc, soc)
-        self.array_I_R1 = np.append(self.array_I_R1, i_r1)
+        if not self.__buffer_is_current():
+            self.__init_buffer()
+        i = self._num_rows
+        if i == len(self._dict_buffer['array_t']):
+            self.__grow()
+        dict_buffer = self._dict_buffer
+        dict_buffer['array_t'][i] = t
+        dict_buffer['array_I'][i] = i_app
+        dict_buffer['array_V'][i] = v
+        dict_buffer['array_temp'][i] = temp
+        dict_buffer['array_soc'][i] = soc
+        dict_buffer['array_I_R1'][i] = i_r1
+        self._num_rows = i + 1
+        self.__set_views()
 
     def comprehensive_plot(self, sol_exp: Optional[Self] = None, save_dir: Optional[str]=None):
+        self.__set_matplotlib_settings()
         fig = plt.figure(figsize=(6.4, 6), dpi=300)
 
         x_axis = self.array_t
@@ -185,12 +297,276 @@ class SolutionInitializer:
         self.lst_V = lst_V
 
 
+class SolutionRecorder:
+    """
+    Columnar storage of the simulation results. Each variable is stored in its own preallocated numpy array, the
+    capacity of which grows geometrically when full. The cycling step names are stored as small integer codes, which
+    are mapped to the step names using the step_names list. Compared to the SolutionInitializer, it avoids storing the
+    results as Python floats and the Solution object wraps its arrays without copying.
+
+    If a SolutionSink is attached, the recorded rows are written to the disk whenever the number of rows reaches the
+    sink's chunk size and the arrays are then emptied, keeping the memory bounded.
+    """
+    FLOAT_COLUMNS = ('t', 'I', 'V', 'OCV_LIB', 'x_surf_p', 'x_surf_n', 'cap', 'cap_charge', 'cap_discharge',
+                     'SOC_LIB', 'battery_cap', 'temp', 'R_cell', 'j_tot', 'j_i', 'j_s')
+
+    def __init__(self, capacity: int = 1024, growth_factor: float = 2.0):
+        """
+        SolutionRecorder class constructor.
+        :param capacity: (int) initial number of rows of the arrays.
+        :param growth_factor: (float) factor by which the capacity grows when the arrays are full.
+        """
+        if (not isinstance(capacity, int)) or (capacity < 1):
+            raise ValueError("capacity needs to be a positive integer.")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor needs to be greater than 1.")
+        self.capacity = capacity
+        self.growth_factor = growth_factor
+        self.num_rows = 0  # number of recorded rows
+        self.step_names = []  # cycle step names, whose indices are the stored step codes.
+        self.has_degradation = False  # True if the molar fluxes of the negative electrode are recorded.
+        self.sink = None  # SolutionSink object to which the rows are flushed.
+
+        self.array_cycle_num = np.zeros(self.capacity, dtype=np.int64)
+        self.array_cycle_step = np.zeros(self.capacity, dtype=np.int8)
+        self.dict_array = {column: np.zeros(self.capacity) for column in self.FLOAT_COLUMNS}
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getstate__(self) -> dict:
+        # only the recorded rows are pickled (e.g., in the checkpoints).
+        state = self.__dict__.copy()
+        state['capacity'] = max(1, self.num_rows)
+        state['array_cycle_num'] = self.array_cycle_num[:state['capacity']].copy()
+        state['array_cycle_step'] = self.array_cycle_step[:state['capacity']].copy()
+        state['dict_array'] = {column: array[:state['capacity']].copy() for column, array in self.dict_array.items()}
+        return state
+
+    def _grow(self) -> None:
+        """
+        Increases the capacity of all the arrays by the growth factor.
+        """
+        self.capacity = max(self.capacity + 1, int(self.capacity * self.growth_factor))
+
+        def resized(array):
+            array_new = np.zeros(self.capacity, dtype=array.dtype)
+            array_new[:self.num_rows] = array[:self.num_rows]
+            return array_new
+
+        self.array_cycle_num = resized(self.array_cycle_num)
+        self.array_cycle_step = resized(self.array_cycle_step)
+        self.dict_array = {column: resized(array) for column, array in self.dict_array.items()}
+
+    def step_code(self, cycle_step: str) -> int:
+        """
+        Returns the integer code of the cycling step name. New step names are assigned the next available code.
+        :param cycle_step: (str) cycling step name.
+        :return: (int) integer code of the cycling step.
+        """
+        try:
+            return self.step_names.index(cycle_step)
+        except ValueError:
+            self.step_names.append(cycle_step)
+            return len(self.step_names) - 1
+
+    def update(self, cycle_num=0, cycle_step=0, t=0, I=0, V=0, OCV=0, x_surf_p=0, x_surf_n=0,
+               cap=0, cap_charge=0, cap_discharge=0, SOC_LIB=0,
+               battery_cap=0,
+               temp=0, R_cell=0) -> None:
+        """
+        Appends a row to the arrays. It has the same signature as the SolutionInitializer's update method.
+        """
+        if (self.sink is not None) and (self.num_rows >= self.sink.chunk_size):
+            self.flush()
+        if self.num_rows == self.capacity:
+            self._grow()
+        i = self.num_rows
+        self.array_cycle_num[i] = cycle_num
+        self.array_cycle_step[i] = self.step_code(cycle_step)
+        dict_array = self.dict_array
+        dict_array['t'][i] = t
+        dict_array['I'][i] = I
+        dict_array['V'][i] = V
+        dict_array['OCV_LIB'][i] = OCV
+        dict_array['x_surf_p'][i] = x_surf_p
+        dict_array['x_surf_n'][i] = x_surf_n
+        dict_array['cap'][i] = cap
+        dict_array['cap_charge'][i] = cap_charge
+        dict_array['cap_discharge'][i] = cap_discharge
+        dict_array['SOC_LIB'][i] = SOC_LIB
+        dict_array['battery_cap'][i] = battery_cap
+        dict_array['temp'][i] = temp
+        dict_array['R_cell'][i] = R_cell
+        self.num_rows += 1
+
+    def update_fluxes(self, j_tot: float, j_i: float, j_s: float) -> None:
+        """
+        Stores the molar fluxes of the negative electrode in the last recorded row.
+        :param j_tot: total molar flux at the negative electrode [mol/m2/s]
+        :param j_i: intercalation molar flux at the negative electrode [mol/m2/s]
+        :param j_s: side reaction molar flux at the negative electrode [mol/m2/s]
+        """
+        self.has_degradation = True
+        i = self.num_rows - 1
+        self.dict_array['j_tot'][i] = j_tot
+        self.dict_array['j_i'][i] = j_i
+        self.dict_array['j_s'][i] = j_s
+
+    def flush(self) -> None:
+        """
+        Writes the recorded rows to the attached sink and empties the arrays.
+        """
+        if self.sink is None:
+            raise ValueError("SolutionRecorder does not have a sink attached.")
+        self.write_to_sink(sink=self.sink)
+        self.num_rows = 0
+
+    def write_to_sink(self, sink: SolutionSink, start: int = 0) -> None:
+        """
+        Writes the recorded rows from the start row onwards to the sink. The rows are kept in the arrays.
+        :param sink: (SolutionSink) sink object.
+        :param start: (int) index of the first row to write.
+        """
+        dict_columns = {'cycle_num': self.column('cycle_num')[start:],
+                        'cycle_step': self.column('cycle_step')[start:]}
+        dict_columns.update({column: self.column(column)[start:] for column in self.FLOAT_COLUMNS})
+        sink.write(dict_columns=dict_columns,
+                   attrs={'step_names': self.step_names, 'has_degradation': self.has_degradation})
+
+    @classmethod
+    def read_from_sink(cls, dir_path: str) -> Self:
+        """
+        Creates a SolutionRecorder instance containing the copies of the rows stored by a SolutionSink, so that further
+        rows can be recorded.
+        :param dir_path: (str) directory containing the stored results.
+        :return: (SolutionRecorder) SolutionRecorder instance.
+        """
+        dict_columns, attrs = SolutionSink.read(dir_path)
+        num_rows = len(dict_columns['t']) if 't' in dict_columns else 0
+        recorder = cls(capacity=max(num_rows, 1))
+        recorder.step_names = list(attrs.get('step_names', []))
+        recorder.has_degradation = attrs.get('has_degradation', False)
+        if num_rows > 0:
+            recorder.array_cycle_num[:num_rows] = dict_columns['cycle_num']
+            recorder.array_cycle_step[:num_rows] = dict_columns['cycle_step']
+            for column in cls.FLOAT_COLUMNS:
+                recorder.dict_array[column][:num_rows] = dict_columns[column]
+        recorder.num_rows = num_rows
+        return recorder
+
+    @classmethod
+    def from_arrays(cls, dict_columns: dict[str, npt.ArrayLike], step_names: list,
+                    has_degradation: bool = False) -> Self:
+        """
+        Creates a SolutionRecorder instance which wraps the arrays (e.g., memory-mapped arrays) without copying them.
+        :param dict_columns: (dict) dictionary containing 'cycle_num', 'cycle_step', and the FLOAT_COLUMNS arrays.
+        :param step_names: (list) cycling step names.
+        :param has_degradation: (bool) True if the molar fluxes of the negative electrode are recorded.
+        :return: (SolutionRecorder) SolutionRecorder instance.
+        """
+        num_rows = len(dict_columns['t'])
+        recorder = cls(capacity=max(num_rows, 1))
+        recorder.num_rows = num_rows
+        recorder.step_names = list(step_names)
+        recorder.has_degradation = has_degradation
+        recorder.array_cycle_num = dict_columns['cycle_num']
+        recorder.array_cycle_step = dict_columns['cycle_step']
+        recorder.dict_array = {column: dict_columns[column] for column in cls.FLOAT_COLUMNS}
+        return recorder
+
+    def column(self, name: str) -> npt.ArrayLike:
+        """
+        Returns the view of the recorded values of the variable.
+        :param name: (str) variable name. It can be 'cycle_num', 'cycle_step' (integer codes), or any of the
+        FLOAT_COLUMNS.
+        :return: (npt.ArrayLike) view of the recorded values.
+        """
+        if name == 'cycle_num':
+            return self.array_cycle_num[:self.num_rows]
+        elif name == 'cycle_step':
+            return self.array_cycle_step[:self.num_rows]
+        return self.dict_array[name][:self.num_rows]
+
+
 class Solution:
-    def __init__(self, base_solution_instance: SolutionInitializer = SolutionInitializer(),
+    def __init__(self, base_solution_instance: SolutionInitializer | SolutionRecorder = SolutionInitializer(),
                  name=None, save_csv_dir=None):
-        if not isinstance(base_solution_instance, SolutionInitializer):
-            raise TypeError("base_solution_instance needs to be a SolutionInitializer object.")
+        if isinstance(base_solution_instance, SolutionRecorder):
+            self._init_from_recorder(recorder=base_solution_instance)
+        elif isinstance(base_solution_instance, SolutionInitializer):
+            self._init_from_initializer(base_solution_instance=base_solution_instance)
+        else:
+            raise TypeError("base_solution_instance needs to be a SolutionInitializer or SolutionRecorder object.")
 
+        self.name = name  # name of the solution
+
+        if save_csv_dir is not None:
+            self.save_csv_func(save_csv_dir)
+
+    @classmethod
+    def read_from_sink(cls, dir_path: str, name: Optional[str] = None) -> Self:
+        """
+        Creates the Solution object from the results streamed to the disk by a SolutionSink. The arrays are
+        memory-mapped.
+        :param dir_path: (str) directory containing the streamed results.
+        :param name: (str) name of the solution.
+        :return: (Solution) Solution object.
+        """
+        dict_columns, attrs = SolutionSink.read(dir_path)
+        recorder = SolutionRecorder.from_arrays(dict_columns=dict_columns, step_names=attrs['step_names'],
+                                                has_degradation=attrs['has_degradation'])
+        return cls(base_solution_instance=recorder, name=name)
+
+    def _init_from_recorder(self, recorder: SolutionRecorder) -> None:
+        """
+        Wraps the arrays of the SolutionRecorder instance without copying them.
+        """
+        self.cycle_num = recorder.column('cycle_num')
+        self.cycle_step_code = recorder.column('cycle_step')
+        self.step_names = list(recorder.step_names)
+        self.cycle_step_ = None  # decoded lazily
+        self.t = recorder.column('t')
+        self.I = recorder.column('I')
+        self.V = recorder.column('V')
+        self.OCV_LIB = recorder.column('OCV_LIB')
+        self.x_surf_p = recorder.column('x_surf_p')
+        self.x_surf_n = recorder.column('x_surf_n')
+        self.cap = recorder.column('cap')
+        self.cap_charge = recorder.column('cap_charge')
+        self.cap_discharge = recorder.column('cap_discharge')
+        self.SOC_LIB = recorder.column('SOC_LIB')
+        self.battery_cap = recorder.column('battery_cap')
+        self.T = recorder.column('temp')
+        self.R_cell = recorder.column('R_cell')
+        if recorder.has_degradation:
+            self.j_tot = recorder.column('j_tot')
+            self.j_i = recorder.column('j_i')
+            self.js = recorder.column('j_s')
+        else:
+            self.j_tot = self.j_i = self.js = np.array([])
+
+    @property
+    def cycle_step(self) -> npt.ArrayLike:
+        """
+        Array of the cycling step names.
+        :return: (npt.ArrayLike) array of the cycling step names.
+        """
+        if self.cycle_step_ is None:
+            if len(self.step_names) == 0:
+                self.cycle_step_ = np.array([], dtype=str)
+            else:
+                self.cycle_step_ = np.array(self.step_names)[self.cycle_step_code]
+        return self.cycle_step_
+
+    @cycle_step.setter
+    def cycle_step(self, array_cycle_step: npt.ArrayLike) -> None:
+        self.cycle_step_ = np.asarray(array_cycle_step)
+
+    def _init_from_initializer(self, base_solution_instance: SolutionInitializer) -> None:
+        """
+        Copies the lists of the SolutionInitializer instance into numpy arrays.
+        """
         # below preprocesses the attributes from the BaseSolution instance.
         self.cycle_num = np.array(base_solution_instance.lst_cycle_num)
         self.cycle_step = np.array(base_solution_instance.lst_cycle_step)
@@ -211,11 +587,6 @@ class Solution:
         self.j_i = np.array(base_solution_instance.lst_j_i)
         self.js = np.array(base_solution_instance.lst_j_s)
 
-        self.name = name  # name of the solution
-
-        if save_csv_dir is not None:
-            self.save_csv_func(save_csv_dir)
-
     @property
     def cycle_summary(self):
         """
@@ -275,8 +646,9 @@ class Solution:
             'Discharge cap. [Ahr]': self.cap_discharge,
             'R_cell [ohm]': self.R_cell,
             'Battery cap [Ahr]': self.battery_cap,
-            'j_s [A/m2]': self.js
         })
+        if len(self.js) == len(self.t):  # the molar fluxes are only recorded in the simulations with degradation.
+            df['j_s [A/m2]'] = self.js
         return df
 
     def save_csv_func(self, output_file_dir):
@@ -537,4 +909,88 @@ class Solution:
 
     def save_instance(self, file_name: str):
         with open(file_name, "wb") as output_file:
-            pickle.dump(self, output_file, pickle.HIGHEST_PROTOCOL)
\ No newline at end of file
+            pickle.dump(self, output_file, pickle.HIGHEST_PROTOCOL)
+
+
+class BatchSolution:
+    """
+    Stores the simulation results of a batch of battery cells. Each stored row contains the results of all the battery
+    cells at a time step and the boolean mask indicates the battery cells whose results are valid for that row (i.e.,
+    the battery cells that are still active in the cycling step).
+    """
+    COLUMNS = ('t', 'I', 'V', 'OCV', 'x_surf_p', 'x_surf_n', 'cap', 'cap_charge', 'cap_discharge', 'SOC_LIB', 'battery_cap',
+               'temp', 'R_cell')
+
+    def __init__(self, num_cells: int):
+        self.num_cells = num_cells
+        self.lst_cycle_num = []  # cycle number of each row
+        self.lst_cycle_step = []  # cycle step name of each row
+        self.lst_mask = []  # boolean array of the battery cells that are active in each row
+        self.dict_lst = {column_name: [] for column_name in self.COLUMNS}
+
+    def update(self, cycle_num: int, cycle_step: str, mask: npt.ArrayLike, **columns) -> None:
+        """
+        Stores the results of all the battery cells for the current time step.
+        :param cycle_num: (int) cycle number
+        :param cycle_step: (str) cycle step name
+        :param mask: (npt.ArrayLike) boolean array indicating the battery cells with valid results.
+        :param columns: arrays (or scalars common to all the battery cells) of the results.
+        """
+        self.lst_cycle_num.append(cycle_num)
+        self.lst_cycle_step.append(cycle_step)
+        self.lst_mask.append(np.array(mask, dtype=bool))
+        for column_name in self.COLUMNS:
+            self.dict_lst[column_name].append(np.broadcast_to(columns[column_name], (self.num_cells,)).copy())
+
+    @property
+    def mask(self) -> npt.ArrayLike:
+        """
+        Boolean mask with the shape [rows, battery cells].
+        """
+        return np.array(self.lst_mask).reshape(-1, self.num_cells)
+
+    def array(self, column_name: str) -> npt.ArrayLike:
+        """
+        Returns the results of the column as a numpy array of shape [rows, battery cells].
+        :param column_name: (str) name of the column
+        :return: (npt.ArrayLike) results of all the battery cells.
+        """
+        return np.array(self.dict_lst[column_name]).reshape(-1, self.num_cells)
+
+    @property
+    def V(self) -> npt.ArrayLike:
+        return self.array('V')
+
+    @property
+    def t(self) -> npt.ArrayLike:
+        return self.array('t')
+
+    @property
+    def T(self) -> npt.ArrayLike:
+        return self.array('temp')
+
+    def get_solution(self, cell_index: int, name: Optional[str] = None) -> Solution:
+        """
+        Returns the Solution object for the battery cell at the index.
+        :param cell_index: (int) index of the battery cell in the batch.
+        :param name: (str) name of the solution.
+        :return: (Solution) Solution object of the battery cell.
+        """
+        array_mask = self.mask[:, cell_index]
+        sol_init = SolutionInitializer()
+        sol_init.lst_cycle_num = list(np.array(self.lst_cycle_num)[array_mask])
+        sol_init.lst_cycle_step = list(np.array(self.lst_cycle_step)[array_mask])
+        sol_init.lst_t = list(self.array('t')[array_mask, cell_index])
+        sol_init.lst_I = list(self.array('I')[array_mask, cell_index])
+        sol_init.lst_V = list(self.array('V')[array_mask, cell_index])
+        sol_init.lst_OCV_LIB = list(self.array('OCV')[array_mask, cell_index])
+        sol_init.lst_x_surf_p = list(self.array('x_surf_p')[array_mask, cell_index])
+        sol_init.lst_x_surf_n = list(self.array('x_surf_n')[array_mask, cell_index])
+        sol_init.lst_cap = list(self.array('cap')[array_mask, cell_index])
+        sol_init.lst_cap_charge = list(self.array('cap_charge')[array_mask, cell_index])
+        sol_init.lst_cap_discharge = list(self.array('cap_discharge')[array_mask, cell_index])
+        sol_init.lst_SOC_LIB = list(self.array('SOC_LIB')[array_mask, cell_index])
+        sol_init.lst_battery_cap = list(self.array('battery_cap')[array_mask, cell_index])
+        sol_init.lst_temp = list(self.array('temp')[array_mask, cell_index])
+        sol_init.lst_R_cell = list(self.array('R_cell')[array_mask, cell_index])
+        return Solution(base_solution_instance=sol_init, name=name)
@@ -0,0 +1,167 @@
+""" streaming.py
+Contains the classes and functionality to stream the simulation results to the disk while the simulation runs.
+"""
+
+__all__ = ['SolutionSink']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+
+class SolutionSink:
+    """
+    Appends the simulation results to the disk in chunks. The results are stored in a directory in a columnar format,
+    where each column is a raw binary file (<column>.bin) and the meta.json file contains the column data types, the
+    number of rows written so far, and the solution attributes (e.g., the cycling step names).
+
+    The column files are appended before the meta.json file is (atomically) replaced. Hence, in case the simulation
+    crashes, the directory contains all the chunks written before the crash. The stored results can be
+    memory-mapped using the read method.
+    """
+    META_FILE_NAME = 'meta.json'
+    FORMAT_VERSION = 1
+
+    def __init__(self, dir_path: str, chunk_size: int = 10000, overwrite: bool = False):
+        """
+        SolutionSink class constructor.
+        :param dir_path: (str) directory where the results are stored.
+        :param chunk_size: (int) number of rows held in the memory before they are written to the disk.
+        :param overwrite: (bool) overwrites the results if the directory already contains them.
+        """
+        if (not isinstance(chunk_size, int)) or (chunk_size < 1):
+            raise ValueError("chunk_size needs to be a positive integer.")
+        self.dir_path = dir_path
+        self.chunk_size = chunk_size
+
+        os.makedirs(self.dir_path, exist_ok=True)
+        if os.path.exists(self.meta_path):
+            if not overwrite:
+                raise FileExistsError(f"{self.dir_path} already contains a solution.")
+            self._remove_files()
+
+        self.dict_dtype = {}  # data types of the columns
+        self.num_rows = 0  # number of rows written
+        self.num_chunks = 0  # number of chunks written
+        self.attrs = {}  # solution attributes
+        self._write_meta()
+
+    @classmethod
+    def reopen(cls, dir_path: str, chunk_size: int = 10000) -> 'SolutionSink':
+        """
+        Opens the solution stored in the directory so that further chunks can be appended to it.
+        :param dir_path: (str) directory containing the stored results.
+        :param chunk_size: (int) number of rows held in the memory before they are written to the disk.
+        :return: (SolutionSink) sink object.
+        """
+        if (not isinstance(chunk_size, int)) or (chunk_size < 1):
+            raise ValueError("chunk_size needs to be a positive integer.")
+        with open(os.path.join(dir_path, cls.META_FILE_NAME)) as f:
+            meta = json.load(f)
+        sink = cls.__new__(cls)
+        sink.dir_path = dir_path
+        sink.chunk_size = chunk_size
+        sink.dict_dtype = meta['columns']
+        sink.num_rows = meta['num_rows']
+        sink.num_chunks = meta['num_chunks']
+        sink.attrs = meta['attrs']
+        return sink
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.dir_path, self.META_FILE_NAME)
+
+    @staticmethod
+    def column_path(dir_path: str, column: str) -> str:
+        return os.path.join(dir_path, column + '.bin')
+
+    def _remove_files(self) -> None:
+        """
+        Removes the meta and column files of the previously stored solution.
+        """
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        for column in meta['columns']:
+            if os.path.exists(self.column_path(self.dir_path, column)):
+                os.remove(self.column_path(self.dir_path, column))
+        os.remove(self.meta_path)
+
+    def _write_meta(self) -> None:
+        """
+        Atomically replaces the meta.json file.
+        """
+        meta = {'format_version': self.FORMAT_VERSION, 'num_rows': self.num_rows, 'num_chunks': self.num_chunks,
+                'columns': self.dict_dtype, 'attrs': self.attrs}
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def write(self, dict_columns: dict[str, npt.ArrayLike], attrs: Optional[dict] = None) -> None:
+        """
+        Appends a chunk of rows to the column files.
+        :param dict_columns: (dict) dictionary containing the column names and their arrays. All the arrays need to
+        be of the same length and all the chunks need to contain the same columns.
+        :param attrs: (dict) JSON serializable solution attributes, which replace the previously stored attributes.
+        """
+        lst_len = [len(array) for array in dict_columns.values()]
+        if len(set(lst_len)) > 1:
+            raise ValueError("All the columns need to be of the same length.")
+        if self.num_chunks == 0:
+            self.dict_dtype = {column: np.asarray(array).dtype.str for column, array in dict_columns.items()}
+        elif set(dict_columns) != set(self.dict_dtype):
+            raise ValueError("All the chunks need to contain the same columns.")
+
+        for column, array in dict_columns.items():
+            with open(self.column_path(self.dir_path, column), 'ab') as f:
+                np.ascontiguousarray(array, dtype=self.dict_dtype[column]).tofile(f)
+        self.num_rows += lst_len[0] if lst_len else 0
+        self.num_chunks += 1
+        if attrs is not None:
+            self.attrs = attrs
+        self._write_meta()
+
+    def truncate(self) -> None:
+        """
+        Discards the rows written to the disk beyond the sink's num_rows, e.g., when the simulation is resumed from a
+        checkpoint that was taken before the last chunks were written.
+        """
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        for column in meta['columns']:
+            file_path = self.column_path(self.dir_path, column)
+            if not os.path.exists(file_path):
+                continue
+            if column in self.dict_dtype:
+                with open(file_path, 'r+b') as f:
+                    f.truncate(self.num_rows * np.dtype(self.dict_dtype[column]).itemsize)
+            else:
+                os.remove(file_path)
+        self._write_meta()
+
+    @classmethod
+    def read(cls, dir_path: str) -> tuple[dict[str, npt.ArrayLike], dict]:
+        """
+        Memory-maps the stored columns.
+        :param dir_path: (str) directory containing the stored results.
+        :return: tuple containing the dictionary of the (read-only) memory-mapped columns and the solution attributes.
+        """
+        with open(os.path.join(dir_path, cls.META_FILE_NAME)) as f:
+            meta = json.load(f)
+        num_rows = meta['num_rows']
+        dict_columns = {}
+        for column, dtype in meta['columns'].items():
+            if num_rows == 0:
+                dict_columns[column] = np.array([], dtype=dtype)
+            else:
+                dict_columns[column] = np.memmap(cls.column_path(dir_path, column), dtype=dtype, mode='r',
+                                                 shape=(num_rows,))
+        return dict_columns, meta['attrs']
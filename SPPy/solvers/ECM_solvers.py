@@ -6,6 +6,8 @@ from typing import Optional
 
 import tqdm
 import numpy as np
+import numpy.typing as npt
+import scipy.signal
 
 from SPPy.solvers.base import timer
 from SPPy.battery_components.battery_cell import ECMBatteryCell
@@ -14,9 +16,10 @@ from SPPy.cycler.base import BaseCycler
 from SPPy.cycler.custom import CustomCycler
 from SPPy.solvers.thermal_solvers import calc_cell_temp
 from SPPy.sol_and_visualization.solution import ECMSolution
+from SPPy.sol_and_visualization.streaming import SolutionSink
 
 from SPPy.calc_helpers.random_vectors import NormalRandomVector
-from SPPy.calc_helpers.kalman_filter import SPKF
+from SPPy.calc_helpers.kalman_filter import SPKF, BatchSPKF
 
 
 class BaseSolver:
@@ -59,6 +62,7 @@ class DTSolver(BaseSolver):
         """
         super().__init__(battery_cell_instance=battery_cell_instance, isothermal=isothermal)
         self.__dt = 0.0  # delta_t is required for SPKF solver.
+        self.__array_dt = np.array([])  # delta_t of each battery cell, required for the batch SPKF solver.
 
     def __calc_v(self, dt: float, i_app: float, i_r1_prev: float) -> tuple[float, float]:
         """
@@ -74,12 +78,26 @@ class DTSolver(BaseSolver):
                           R0=self.b_cell.R0, R1=self.b_cell.R1, i_R1=i_r1_prev)
         return i_r1_prev, v
 
-    def __solve_custom_step(self, cycling_step: CustomCycler, dt: float, verbose: bool):
+    @staticmethod
+    def __flush_to_sink(sol: ECMSolution, sink: Optional[SolutionSink]) -> None:
+        """
+        Writes the results to the sink once the number of stored time steps reaches its chunk size.
+        :param sol: (ECMSolution) solution object.
+        :param sink: (SolutionSink) sink object. If None, the results are kept in the memory.
+        """
+        if (sink is not None) and (len(sol.array_t) >= sink.chunk_size):
+            sol.write_to_sink(sink=sink)
+
+    def __solve_custom_step(self, cycling_step: CustomCycler, dt: float, verbose: bool,
+                            sink: Optional[SolutionSink] = None, t_init: Optional[float] = None,
+                            i_r1_init: float = 0.0):
         sol = ECMSolution()  # initialize the solution object
-        sol.update(t=0.0, i_app=0.0, v=self.b_cell.ocv, temp=self.b_cell.temp, soc=self.b_cell.soc, i_r1=0.0)
+        if t_init is None:
+            sol.update(t=0.0, i_app=0.0, v=self.b_cell.ocv, temp=self.b_cell.temp, soc=self.b_cell.soc, i_r1=0.0)
 
-        t_prev = 0.0  # [s]
-        i_r1_prev = 0.0  # [A]
+        # In case the simulation continues from an earlier time (t_init), its time step is not stored again.
+        t_prev = 0.0 if t_init is None else t_init  # [s]
+        i_r1_prev = i_r1_init  # [A]
         step_completed = False
 
         while not step_completed:
@@ -112,15 +130,136 @@ class DTSolver(BaseSolver):
 
             # update the sol object
             sol.update(t=t_curr, i_app=i_app_curr, v=v, temp=self.b_cell.temp, soc=self.b_cell.soc, i_r1=i_r1_prev)
+            self.__flush_to_sink(sol=sol, sink=sink)
             t_prev = t_curr
 
             if verbose == True:
                 print('t=', t_curr, ' i_app=', i_app_curr, ' v=', v, ' temp=', self.b_cell.temp,
                       ' soc=', self.b_cell.soc, ' i_R1=', i_r1_prev)
 
+        sol.trim()
         return sol
 
-    def __solve_standard_cycling_step(self, cycler: BaseCycler, dt: float) -> ECMSolution:
+    @staticmethod
+    def __eval_func_array(func, array_x: npt.ArrayLike, *args) -> npt.ArrayLike:
+        """
+        Evaluates the function on the array. In case the function does not support the numpy arrays, it is evaluated
+        element by element.
+        """
+        try:
+            array_y = np.asarray(func(array_x, *args), dtype=float)
+            return np.broadcast_to(array_y, array_x.shape)
+        except (TypeError, ValueError):
+            return np.array([func(x, *args) for x in array_x.tolist()], dtype=float)
+
+    def __solve_custom_step_vectorized(self, cycling_step: CustomCycler, dt: float, chunk_size: int = 100000,
+                                       max_iter: int = 20,
+                                       sink: Optional[SolutionSink] = None) -> Optional[ECMSolution]:
+        """
+        Isothermal version of the __solve_custom_step method, where the whole trajectory is calculated using numpy
+        operations instead of the time loop. With the known current profile, the SOC is the cumulative sum of its
+        increments and the i_R1 is the output of the first-order IIR filter of the applied current. The terminal
+        voltage limits are checked afterwards and the trajectory is truncated at the first time step outside of them.
+        The trajectory is calculated in chunks so that the early terminations do not require the calculation until
+        the cycler's last time value.
+
+        As the Columbic efficiency depends on the SOC, the SOC trajectory is iterated until the efficiencies no
+        longer change (in a single iteration for the constant efficiencies). If they do not converge within max_iter
+        iterations, None is returned and the battery cell is left unchanged.
+
+        If the sink is provided, the time steps are calculated in chunks of the sink's chunk size and each chunk is
+        written to the sink once calculated. In case the efficiencies do not converge after some of the chunks were
+        written, the rest of the simulation continues with the time loop.
+        :param cycling_step: (CustomCycler) custom cycler instance.
+        :param dt: (float) time step [s]
+        :param chunk_size: (int) number of time steps calculated at a time. The sink's chunk size is used instead, if
+        the sink is provided.
+        :param max_iter: (int) maximum number of iterations for the Columbic efficiencies.
+        :param sink: (SolutionSink) sink object. If None, the results are kept in the memory.
+        :return: (ECMSolution) solution object (containing the results not yet written to the sink) or None.
+        """
+        if sink is not None:
+            chunk_size = sink.chunk_size
+        is_written = False  # if any of the chunks were written to the sink
+        temp = self.b_cell.temp
+        Q = self.b_cell.cap
+        R0, R1, C1 = self.b_cell.R0, self.b_cell.R1, self.b_cell.C1
+        a = np.exp(-dt / (R1 * C1))
+
+        lst_t, lst_I, lst_V, lst_soc, lst_i_r1 = [np.array([0.0])], [np.array([0.0])], [np.array([self.b_cell.ocv])], \
+            [np.array([self.b_cell.soc])], [np.array([0.0])]
+        t_prev, soc_prev, i_r1_prev = 0.0, self.b_cell.soc, 0.0
+        step_completed = False
+        while not step_completed:
+            # time values are calculated by the repeated addition, as in the time loop. The chunk does not extend
+            # (much) beyond the cycler's last time value.
+            num_chunk = int(min(chunk_size, max(np.ceil((cycling_step.t_max - t_prev) / dt), 0) + 2))
+            array_t = np.cumsum(np.append(t_prev, np.full(num_chunk, dt)))
+            array_t_prev, array_t = array_t[:-1], array_t[1:]
+            array_i_app_prev = cycling_step.get_current_array(array_t_prev)
+            array_i_app_curr = cycling_step.get_current_array(array_t)
+
+            # SOC, with the Columbic efficiencies evaluated at the SOC of the previous time steps.
+            array_eta = np.full(num_chunk, self.__eval_func_array(self.b_cell.func_eta, np.array([soc_prev]),
+                                                                  temp)[0])
+            for _ in range(max_iter):
+                array_soc = np.cumsum(np.append(soc_prev, -(dt * array_eta * array_i_app_prev / (3600 * Q))))[1:]
+                array_eta_new = self.__eval_func_array(self.b_cell.func_eta,
+                                                       np.append(soc_prev, array_soc[:-1]), temp)
+                if np.array_equal(array_eta_new, array_eta):
+                    break
+                array_eta = array_eta_new
+            else:
+                if not is_written:
+                    return None
+                self.b_cell.soc = float(soc_prev)
+                return self.__solve_custom_step(cycling_step=cycling_step, dt=dt, verbose=False, sink=sink,
+                                                t_init=float(t_prev), i_r1_init=float(i_r1_prev))
+
+            # i_R1 [A] and terminal voltage [V]
+            array_i_r1 = scipy.signal.lfilter([1 - a], [1, -a], array_i_app_curr, zi=[a * i_r1_prev])[0]
+            array_v = Thevenin1RC.v(i_app=array_i_app_curr,
+                                    OCV=self.__eval_func_array(self.b_cell.func_ocv, array_soc),
+                                    R0=R0, R1=R1, i_R1=array_i_r1)
+
+            # loop termination criteria
+            array_completed = (array_v > cycling_step.V_max) | (array_v < cycling_step.V_min) | \
+                              (array_t > cycling_step.t_max)
+            num_steps = num_chunk
+            if np.any(array_completed):
+                num_steps = int(np.argmax(array_completed)) + 1
+                step_completed = True
+
+            lst_t.append(array_t[:num_steps])
+            lst_I.append(array_i_app_curr[:num_steps])
+            lst_V.append(array_v[:num_steps])
+            lst_soc.append(array_soc[:num_steps])
+            lst_i_r1.append(array_i_r1[:num_steps])
+            t_prev, soc_prev, i_r1_prev = array_t[num_steps - 1], array_soc[num_steps - 1], \
+                array_i_r1[num_steps - 1]
+            if sink is not None:
+                self.__lists_to_sol(lst_t, lst_I, lst_V, lst_soc, lst_i_r1, temp).write_to_sink(sink=sink)
+                lst_t, lst_I, lst_V, lst_soc, lst_i_r1 = [], [], [], [], []
+                is_written = True
+
+        self.b_cell.soc = float(soc_prev)
+        return self.__lists_to_sol(lst_t, lst_I, lst_V, lst_soc, lst_i_r1, temp)
+
+    @staticmethod
+    def __lists_to_sol(lst_t: list, lst_I: list, lst_V: list, lst_soc: list, lst_i_r1: list,
+                       temp: float) -> ECMSolution:
+        """
+        Creates the ECMSolution object from the lists of the array chunks.
+        """
+        if len(lst_t) == 0:
+            return ECMSolution()
+        array_soc = np.concatenate(lst_soc)
+        return ECMSolution(array_t=np.concatenate(lst_t), array_I=np.concatenate(lst_I),
+                           array_V=np.concatenate(lst_V), array_temp=np.full(len(array_soc), temp),
+                           array_soc=array_soc, array_I_R1=np.concatenate(lst_i_r1))
+
+    def __solve_standard_cycling_step(self, cycler: BaseCycler, dt: float,
+                                      sink: Optional[SolutionSink] = None) -> ECMSolution:
         sol = ECMSolution()
         # update the initial values of sol object below
         sol.update(t=0.0, i_app=0.0, v=self.b_cell.ocv, temp=self.b_cell.temp, soc=self.b_cell.soc, i_r1=0.0)
@@ -162,14 +301,38 @@ class DTSolver(BaseSolver):
 
                     # update solution object
                     sol.update(t=t_curr, i_app=i_app, v=v, temp=self.b_cell.temp, soc=self.b_cell.soc, i_r1=i_r1_prev)
+                    self.__flush_to_sink(sol=sol, sink=sink)
+        sol.trim()
         return sol
 
     @timer
-    def solve(self, cycling_step: BaseCycler, dt: float = 0.1, verbose: bool = False) -> ECMSolution:
+    def solve(self, cycling_step: BaseCycler, dt: float = 0.1, verbose: bool = False,
+              sink: Optional[SolutionSink] = None, vectorized: bool = True) -> ECMSolution:
+        """
+        Performs the cycling simulation.
+        :param cycling_step: (BaseCycler) cycler instance.
+        :param dt: (float) time step [s]
+        :param verbose: (bool) prints the simulation progress.
+        :param sink: (SolutionSink) if provided, the results are written to the disk in chunks during the simulation
+        and the returned ECMSolution object memory-maps them.
+        :param vectorized: (bool) if True, the isothermal simulations with the CustomCycler calculate the whole
+        trajectory using numpy operations instead of the time loop. It is not used when verbose is True.
+        :return: (ECMSolution) solution object.
+        """
+        if (sink is not None) and (not isinstance(sink, SolutionSink)):
+            raise TypeError("sink needs to be a SolutionSink object.")
         if isinstance(cycling_step, CustomCycler):
-            return self.__solve_custom_step(cycling_step=cycling_step, dt=dt, verbose=verbose)
+            sol = None
+            if vectorized and self.isothermal and (not verbose):
+                sol = self.__solve_custom_step_vectorized(cycling_step=cycling_step, dt=dt, sink=sink)
+            if sol is None:
+                sol = self.__solve_custom_step(cycling_step=cycling_step, dt=dt, verbose=verbose, sink=sink)
         else:
-            return self.__solve_standard_cycling_step(cycler=cycling_step, dt=dt)
+            sol = self.__solve_standard_cycling_step(cycler=cycling_step, dt=dt, sink=sink)
+        if sink is None:
+            return sol
+        sol.write_to_sink(sink=sink)
+        return ECMSolution.read_from_sink(dir_path=sink.dir_path)
 
     def __func_f(self, x_k, u_k, w_k):
         """
@@ -199,7 +362,7 @@ class DTSolver(BaseSolver):
 
     def solveSPKF(self, sol_exp: ECMSolution, cov_soc: float, cov_current: float, cov_process: float, cov_sensor: float,
                   v_min: float, v_max: float, soc_min: float, soc_max: float, soc_init: float,
-                  dt: Optional[float] = None):
+                  dt: Optional[float] = None, method_type: str = 'CDKF'):
         """
         Performs the Thevenin equivalent circuit model using the sigma point kalman filter
         :param sol_exp: Solution object from the experimental data.
@@ -214,6 +377,8 @@ class DTSolver(BaseSolver):
         :param soc_init: LIB SOC
         :param dt: time difference between calculation time step. If set to None, then the time difference
         from the experimental is used for each time step.
+        :param method_type: (str) SPKF method type, 'CDKF' or its square-root form, 'SR-CDKF', which is more robust
+        against the loss of the positive definiteness of the state covariance in the long runs.
         :return: (Solution) Solution object containing the results from the simulations.
         """
         sol = ECMSolution()
@@ -236,7 +401,8 @@ class DTSolver(BaseSolver):
         v = NormalRandomVector(vector_init=vector_v, cov_init=cov_v)
 
         # Create SPKF variable below
-        instance_spkf = SPKF(x=x, w=w, v=v, y_dim=1, func_f=self.__func_f, func_h=self.__func_h)
+        instance_spkf = SPKF(x=x, w=w, v=v, y_dim=1, func_f=self.__func_f, func_h=self.__func_h,
+                             method_type=method_type)
 
         # The solution loop is run below
         t_prev = 0.0  # [s]
@@ -274,4 +440,120 @@ class DTSolver(BaseSolver):
             t_prev = t_curr
             i += 1
 
+        sol.trim()
         return sol
+
+    def __batch_func_f(self, x_k, u_k, w_k):
+        """
+        State Equation for the sigma points of a batch of battery cells.
+        :param x_k: state sigma points, shape [cells, 2, sigma points]
+        :param u_k: applied currents, shape [cells]
+        :param w_k: process noise sigma points, shape [cells, 1, sigma points]
+        :return: state sigma points at the next time step.
+        """
+        array_dt = self.__array_dt[:, np.newaxis]
+        a = np.exp(-array_dt / (self.b_cell.R1 * self.b_cell.C1))
+        i_k = u_k[:, np.newaxis] + w_k[:, 0, :]
+        return np.stack([x_k[:, 0, :] - array_dt / (3600 * self.b_cell.cap) * i_k,
+                         a * x_k[:, 1, :] + (1 - a) * i_k], axis=1)
+
+    def __batch_func_h(self, x_k, u_k, v_k):
+        """
+        Output Equation for the sigma points of a batch of battery cells.
+        :param x_k: state sigma points, shape [cells, 2, sigma points]
+        :param u_k: applied currents, shape [cells]
+        :param v_k: sensor noise sigma points, shape [cells, 1, sigma points]
+        :return: output sigma points, shape [cells, 1, sigma points]
+        """
+        return (self.b_cell.func_ocv(x_k[:, 0, :]) - self.b_cell.R1 * x_k[:, 1, :] - self.b_cell.R0 * u_k[:, np.newaxis]
+                + v_k[:, 0, :])[:, np.newaxis, :]
+
+    def solveBatchSPKF(self, lst_sol_exp: list[ECMSolution], cov_soc: float, cov_current: float, cov_process: float,
+                       cov_sensor: float, v_min: float, v_max: float, array_soc_init: npt.ArrayLike,
+                       dt: Optional[float] = None) -> list[ECMSolution]:
+        """
+        Performs the state estimation of the solveSPKF method on the experimental data of many battery cells
+        simultaneously. The battery cells share the battery cell model (and its parameters) and the estimation of all
+        of them is advanced in a single iteration of the time loop using the BatchSPKF. The experimental data can be of
+        different lengths and the battery cells whose data has ended, or whose terminal voltage is outside the
+        voltage limits, are masked out for the remaining time steps. The func_ocv of the battery cell needs to
+        accept numpy arrays.
+        :param lst_sol_exp: (list) list of the ECMSolution objects from the experimental data of each battery cell.
+        :param cov_soc: covariance of the soc
+        :param cov_current: covariance of i_r1
+        :param cov_process: covariance of the system process
+        :param cov_sensor: covariance of the voltage sensor
+        :param v_min: threshold cell terminal voltage [V]
+        :param v_max: threshold cell terminal voltage [V]
+        :param array_soc_init: initial SOC estimates of the battery cells, shape [cells]
+        :param dt: time difference between calculation time step. If set to None, then the time difference
+        from the experimental is used for each time step.
+        :return: (list) list of the ECMSolution objects containing the results of each battery cell.
+        """
+        if (not isinstance(lst_sol_exp, (list, tuple))) or (len(lst_sol_exp) == 0):
+            raise TypeError("lst_sol_exp needs to be a non-empty list of ECMSolution objects.")
+        for sol_exp in lst_sol_exp:
+            if not isinstance(sol_exp, ECMSolution):
+                raise TypeError("lst_sol_exp needs to be a non-empty list of ECMSolution objects.")
+        num_cells = len(lst_sol_exp)
+        array_soc_init = np.broadcast_to(np.asarray(array_soc_init, dtype=float), (num_cells,))
+
+        # The experimental data are padded into arrays of shape [time steps, cells]
+        array_len = np.array([len(sol_exp.array_t) for sol_exp in lst_sol_exp])
+        num_steps = int(array_len.max())
+        array_t_exp, array_I_exp, array_V_exp = (np.full((num_steps, num_cells), np.nan) for _ in range(3))
+        for cell_index, sol_exp in enumerate(lst_sol_exp):
+            array_t_exp[:array_len[cell_index], cell_index] = sol_exp.array_t
+            array_I_exp[:array_len[cell_index], cell_index] = sol_exp.array_I
+            array_V_exp[:array_len[cell_index], cell_index] = sol_exp.array_V
+
+        # create the batch SPKF below
+        i_r1_init = 0.0  # [A]
+        array_x = np.stack([array_soc_init, np.full(num_cells, i_r1_init)], axis=1)
+        array_cov_x = np.broadcast_to(np.array([[cov_soc, 0], [0, cov_current]]), (num_cells, 2, 2))
+        w = NormalRandomVector(vector_init=np.array([[0]]), cov_init=np.array([[cov_process]]))
+        v = NormalRandomVector(vector_init=np.array([[0]]), cov_init=np.array([[cov_sensor]]))
+        instance_spkf = BatchSPKF(array_x=array_x, array_cov_x=array_cov_x, w=w, v=v, y_dim=1,
+                                  func_f=self.__batch_func_f, func_h=self.__batch_func_h)
+
+        # results of all the battery cells, shape [time steps, cells]
+        array_mask = np.zeros((num_steps, num_cells), dtype=bool)
+        array_V, array_soc, array_i_r1 = (np.zeros((num_steps, num_cells)) for _ in range(3))
+
+        # The solution loop is run below
+        array_completed = np.zeros(num_cells, dtype=bool)
+        for i in range(1, num_steps):
+            array_active = (i < array_len) & (~array_completed)
+            if not np.any(array_active):
+                break
+            array_dt = (array_t_exp[i] - array_t_exp[i - 1]) if dt is None else np.full(num_cells, dt)
+            self.__array_dt = np.where(array_active, array_dt, 0.0)
+            array_i_app_prev = np.where(array_active, array_I_exp[i - 1], 0.0)
+            array_i_app_curr = np.where(array_active, array_I_exp[i], 0.0)
+
+            instance_spkf.solve(u=array_i_app_prev, y_true=array_V_exp[i], mask=array_active)
+
+            soc = instance_spkf.array_x[:, 0]
+            i_r1 = instance_spkf.array_x[:, 1]
+            i_r1_next = Thevenin1RC.i_R1_next(dt=self.__array_dt, i_app=array_i_app_curr, i_R1_prev=i_r1,
+                                              R1=self.b_cell.R1, C1=self.b_cell.C1)
+            v = Thevenin1RC.v(i_app=array_i_app_curr, OCV=self.b_cell.func_ocv(soc), R0=self.b_cell.R0,
+                              R1=self.b_cell.R1, i_R1=i_r1_next)
+
+            # loop termination criteria
+            array_completed |= array_active & ((v > v_max) | (v < v_min))
+
+            # update the results
+            array_mask[i] = array_active
+            array_V[i], array_soc[i], array_i_r1[i] = v, soc, i_r1
+
+        lst_sol = []
+        for cell_index in range(num_cells):
+            array_cell_mask = array_mask[:, cell_index]
+            lst_sol.append(ECMSolution(array_t=array_t_exp[array_cell_mask, cell_index],
+                                       array_I=array_I_exp[array_cell_mask, cell_index],
+                                       array_V=array_V[array_cell_mask, cell_index],
+                                       array_temp=np.full(np.count_nonzero(array_cell_mask), self.b_cell.temp),
+                                       array_soc=array_soc[array_cell_mask, cell_index],
+                                       array_I_R1=array_i_r1[array_cell_mask, cell_index]))
+        return lst_sol
@@ -0,0 +1,387 @@
+""" batch_solver
+Contains the classes and functionality for simulating many battery cell variants simultaneously.
+"""
+
+__all__ = ['BatchSPPySolver']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+from tqdm import tqdm
+
+from SPPy.battery_components.battery_cell import BatteryCell
+from SPPy.calc_helpers.constants import Constants
+from SPPy.calc_helpers import ode_solvers
+from SPPy.models.battery import SPM
+from SPPy.models.thermal import ECMLumped
+from SPPy.solvers.base import timer
+from SPPy.solvers.electrode_surf_conc import EigenFuncExp, PolynomialApproximation
+from SPPy.sol_and_visualization.solution import BatchSolution
+
+from SPPy.cycler.base import BaseCycler
+from SPPy.cycler.custom import CustomCycler
+
+
+class BatchSPPySolver:
+    """
+    Solves the single particle model for a batch of battery cells. The battery cells are intended to be the parameter
+    variants (e.g., manufacturing spread in the particle radii, diffusivities, rate constants, and initial SOC) of the
+    same parameter set. The states of all the battery cells are stored in numpy arrays and all the battery cells are
+    advanced in a single iteration of the time loop.
+
+    The electrode SOC solvers (Eigen Function Expansion or the Polynomial Approximation), the single particle model,
+    and the lumped thermal balance are solved in their array forms. The battery cells which reach their cycling step's
+    termination criteria are masked out (by setting their time step to zero) until all the cells complete the cycling
+    step.
+
+    The SEI degradation and the Crank-Nicolson electrode SOC solver are not supported in the batch mode.
+    """
+    def __init__(self, lst_b_cell: list[BatteryCell], isothermal: bool = True, N: int = 5,
+                 electrode_SOC_solver: str = 'eigen', **electrode_SOC_solver_params):
+        """
+        BatchSPPySolver class constructor.
+        :param lst_b_cell: (list) list of BatteryCell objects.
+        :param isothermal: (bool) isothermal (True) or non-isothermal (False) simulations.
+        :param N: (int) number of terms in the solution series of the Eigen Function Expansion method.
+        :param electrode_SOC_solver: (str) Eigen Function Expansion ('eigen') or Polynomial Approximation ('poly').
+        :param electrode_SOC_solver_params: additional parameters for the electrode SOC solvers.
+        """
+        # Check for the input argument types.
+        if (not isinstance(lst_b_cell, (list, tuple))) or (len(lst_b_cell) == 0):
+            raise TypeError("lst_b_cell needs to be a non-empty list of BatteryCell objects.")
+        for b_cell in lst_b_cell:
+            if not isinstance(b_cell, BatteryCell):
+                raise TypeError("lst_b_cell needs to be a non-empty list of BatteryCell objects.")
+        if not isinstance(isothermal, bool):
+            raise TypeError("isothermal argument needs to be a bool type.")
+        if (electrode_SOC_solver != 'eigen') and (electrode_SOC_solver != 'poly'):
+            raise ValueError("Batch solver supports Eigen expansion method ('eigen') or Polynomial Approximation "
+                             "('poly').")
+
+        self.lst_b_cell = list(lst_b_cell)
+        self.num_cells = len(self.lst_b_cell)
+        self.bool_isothermal = isothermal
+        self.electrode_SOC_solver = electrode_SOC_solver
+        self.N = N
+
+        # The OCP functions are evaluated on the SOC arrays and hence need to be common to all battery cells.
+        self.func_OCP_p = self._common_func([b_cell.elec_p.func_OCP for b_cell in self.lst_b_cell])
+        self.func_dOCPdT_p = self._common_func([b_cell.elec_p.func_dOCPdT for b_cell in self.lst_b_cell])
+        self.func_OCP_n = self._common_func([b_cell.elec_n.func_OCP for b_cell in self.lst_b_cell])
+        self.func_dOCPdT_n = self._common_func([b_cell.elec_n.func_dOCPdT for b_cell in self.lst_b_cell])
+
+        # positive electrode parameters
+        self.R_p = self._stack(lambda b_cell: b_cell.elec_p.R)
+        self.S_p = self._stack(lambda b_cell: b_cell.elec_p.S)
+        self.c_smax_p = self._stack(lambda b_cell: b_cell.elec_p.max_conc)
+        self.D_ref_p = self._stack(lambda b_cell: b_cell.elec_p.D_ref)
+        self.Ea_D_p = self._stack(lambda b_cell: b_cell.elec_p.Ea_D)
+        self.k_ref_p = self._stack(lambda b_cell: b_cell.elec_p.k_ref)
+        self.Ea_R_p = self._stack(lambda b_cell: b_cell.elec_p.Ea_R)
+        self.T_ref_p = self._stack(lambda b_cell: b_cell.elec_p.T_ref)
+        # negative electrode parameters
+        self.R_n = self._stack(lambda b_cell: b_cell.elec_n.R)
+        self.S_n = self._stack(lambda b_cell: b_cell.elec_n.S)
+        self.c_smax_n = self._stack(lambda b_cell: b_cell.elec_n.max_conc)
+        self.D_ref_n = self._stack(lambda b_cell: b_cell.elec_n.D_ref)
+        self.Ea_D_n = self._stack(lambda b_cell: b_cell.elec_n.Ea_D)
+        self.k_ref_n = self._stack(lambda b_cell: b_cell.elec_n.k_ref)
+        self.Ea_R_n = self._stack(lambda b_cell: b_cell.elec_n.Ea_R)
+        self.T_ref_n = self._stack(lambda b_cell: b_cell.elec_n.T_ref)
+        # electrolyte and battery cell parameters
+        self.c_e = self._stack(lambda b_cell: b_cell.electrolyte.conc)
+        self.R_cell = self._stack(lambda b_cell: b_cell.R_cell)
+        self.rho = self._stack(lambda b_cell: b_cell.rho)
+        self.Vol = self._stack(lambda b_cell: b_cell.Vol)
+        self.C_p = self._stack(lambda b_cell: b_cell.C_p)
+        self.h = self._stack(lambda b_cell: b_cell.h)
+        self.A = self._stack(lambda b_cell: b_cell.A)
+        self.cap = self._stack(lambda b_cell: b_cell.cap)
+        self.T_amb = self._stack(lambda b_cell: b_cell.T_amb)
+
+        # battery cell states
+        self.SOC_p = self._stack(lambda b_cell: b_cell.elec_p.SOC)
+        self.SOC_n = self._stack(lambda b_cell: b_cell.elec_n.SOC)
+        self.T = self._stack(lambda b_cell: b_cell.T)
+        self.OCV = self.OCP_p - self.OCP_n
+
+        # initialize the electrode surface SOC solvers in their array forms.
+        if self.electrode_SOC_solver == 'eigen':
+            method = electrode_SOC_solver_params.get('method', 'rk4')
+            self.SOC_solver_p = EigenFuncExp(x_init=self.SOC_p.copy(), n=self.N, electrode_type='p', method=method)
+            self.SOC_solver_n = EigenFuncExp(x_init=self.SOC_n.copy(), n=self.N, electrode_type='n', method=method)
+        elif self.electrode_SOC_solver == 'poly':
+            if electrode_SOC_solver_params:
+                type = electrode_SOC_solver_params['type']
+            else:
+                type = 'higher'
+            self.SOC_solver_p = PolynomialApproximation(c_init=self.c_smax_p * self.SOC_p, electrode_type='p',
+                                                        type=type)
+            self.SOC_solver_n = PolynomialApproximation(c_init=self.c_smax_n * self.SOC_n, electrode_type='n',
+                                                        type=type)
+
+        self.b_model = SPM()  # initializes the single particle model instance.
+        self.t_model = ECMLumped()  # lumped thermal model with the parameters supplied as arrays.
+
+        # The ODE states of both the electrode SOC solvers are advanced in a single state-vector integrator call per
+        # time step. The temperatures have their own integrator as they are advanced once the terminal voltages of the
+        # time step are known.
+        self.SOC_integrator = ode_solvers.StateVectorIntegrator(method='rk4', batch_shape=(self.num_cells,))
+        self.SOC_solver_p.register_states(integrator=self.SOC_integrator, name='p')
+        self.SOC_solver_n.register_states(integrator=self.SOC_integrator, name='n')
+        self.T_integrator = ode_solvers.StateVectorIntegrator(method='rk4', batch_shape=(self.num_cells,))
+        self.T_integrator.register(name='T', func_rhs=self.t_model.rhs, y_init=self.T)
+
+    @staticmethod
+    def _common_func(lst_func: list[Callable]) -> Callable:
+        """
+        Checks that all the battery cells share the same function and returns it.
+        :param lst_func: (list) list containing the function from each battery cell.
+        :return: (Callable) the function common to all battery cells.
+        """
+        if any(func is not lst_func[0] for func in lst_func):
+            raise ValueError("All battery cells in the batch need to share the same OCP and dOCPdT functions.")
+        return lst_func[0]
+
+    def _stack(self, func_attr: Callable) -> npt.ArrayLike:
+        """
+        Returns the numpy array containing the attribute of every battery cell in the batch.
+        :param func_attr: (Callable) function that takes in the BatteryCell object and returns its attribute.
+        :return: (npt.ArrayLike) numpy array of the attribute values.
+        """
+        return np.array([func_attr(b_cell) for b_cell in self.lst_b_cell], dtype=float)
+
+    @property
+    def D_p(self) -> npt.ArrayLike:
+        return self.D_ref_p * np.exp(-1 * self.Ea_D_p / Constants.R * (1 / self.T - 1 / self.T_ref_p))
+
+    @property
+    def D_n(self) -> npt.ArrayLike:
+        return self.D_ref_n * np.exp(-1 * self.Ea_D_n / Constants.R * (1 / self.T - 1 / self.T_ref_n))
+
+    @property
+    def k_p(self) -> npt.ArrayLike:
+        return self.k_ref_p * np.exp(self.Ea_R_p / Constants.R * (1 / self.T_ref_p - 1 / self.T))
+
+    @property
+    def k_n(self) -> npt.ArrayLike:
+        return self.k_ref_n * np.exp(self.Ea_R_n / Constants.R * (1 / self.T_ref_n - 1 / self.T))
+
+    @property
+    def dOCPdT_p(self) -> npt.ArrayLike:
+        return self.func_dOCPdT_p(self.SOC_p)
+
+    @property
+    def dOCPdT_n(self) -> npt.ArrayLike:
+        return self.func_dOCPdT_n(self.SOC_n)
+
+    @property
+    def OCP_p(self) -> npt.ArrayLike:
+        return self.func_OCP_p(self.SOC_p) + self.dOCPdT_p * (self.T - self.T_ref_p)
+
+    @property
+    def OCP_n(self) -> npt.ArrayLike:
+        return self.func_OCP_n(self.SOC_n) + self.dOCPdT_n * (self.T - self.T_ref_n)
+
+    def calc_terminal_potential(self, I: float, OCP_p: Optional[npt.ArrayLike] = None,
+                                OCP_n: Optional[npt.ArrayLike] = None) -> npt.ArrayLike:
+        """
+        Returns the terminal potentials of all the battery cells [V]
+        :param I: applied current [A]
+        :param OCP_p: (optional) precomputed positive electrode OCPs [V]
+        :param OCP_n: (optional) precomputed negative electrode OCPs [V]
+        :return: (npt.ArrayLike) battery cell terminal potentials [V]
+        """
+        OCP_p = self.OCP_p if OCP_p is None else OCP_p
+        OCP_n = self.OCP_n if OCP_n is None else OCP_n
+        return self.b_model(OCP_p=OCP_p, OCP_n=OCP_n, R_cell=self.R_cell,
+                            k_p=self.k_p, S_p=self.S_p, c_smax_p=self.c_smax_p, SOC_p=self.SOC_p,
+                            k_n=self.k_n, S_n=self.S_n, c_smax_n=self.c_smax_n, SOC_n=self.SOC_n,
+                            c_e=self.c_e, T=self.T, I_p_i=I, I_n_i=I)
+
+    def calc_cell_temp(self, t_prev: float, dt: npt.ArrayLike, V: npt.ArrayLike, I: float,
+                       OCV: Optional[npt.ArrayLike] = None) -> npt.ArrayLike:
+        """
+        Solves for the lumped heat balance of all the battery cells using the rk4 method of the state-vector integrator.
+        :param t_prev: time value at the previous time step [s]
+        :param dt: array of the time differences between the current and previous time steps [s]
+        :param V: array of the cell terminal voltages [V]
+        :param I: applied current [A]
+        :param OCV: (optional) precomputed battery cell open-circuit voltages [V]
+        :return: (npt.ArrayLike) battery cell temperatures [K]
+        """
+        OCV = self.OCP_p - self.OCP_n if OCV is None else OCV
+        self.T_integrator['T'] = self.T
+        self.T_integrator.set_args('T', V, I, self.rho, self.Vol, self.C_p, OCV, self.dOCPdT_p - self.dOCPdT_n, self.h,
+                                   self.A, self.T_amb)
+        self.T_integrator.step(t_prev=t_prev, dt=dt)
+        return self.T_integrator['T']
+
+    def solve_iteration_one_step(self, t_prev: float, dt: npt.ArrayLike, I: float) -> tuple[npt.ArrayLike,
+                                                                                              npt.ArrayLike]:
+        """
+        Advances all the battery cells by one time step. The battery cells with zero time step retain their states.
+        :param t_prev: time value at the previous time step [s]
+        :param dt: array of the time differences for each battery cell [s]
+        :param I: applied current [A]
+        :return: tuple containing the array of the terminal voltages [V] and the boolean array indicating the battery
+        cells whose electrode SOC went beyond the 0-1 range.
+        """
+        D_p, D_n = self.D_p, self.D_n
+        # states at t_prev, which are restored for the battery cells with invalid electrode SOC.
+        y_prev, state_p, state_n = self.SOC_integrator.y, self.SOC_solver_p.get_state(), self.SOC_solver_n.get_state()
+        self.SOC_solver_p.set_state_args(i_app=I, R=self.R_p, S=self.S_p, D_s=D_p, c_smax=self.c_smax_p)
+        self.SOC_solver_n.set_state_args(i_app=I, R=self.R_n, S=self.S_n, D_s=D_n, c_smax=self.c_smax_n)
+        if self.SOC_integrator.names:
+            self.SOC_integrator.step(t_prev=t_prev, dt=dt)
+        SOC_p = self.SOC_solver_p.calc_SOC_surf_from_states(dt=dt, t_prev=t_prev, i_app=I, R=self.R_p, S=self.S_p,
+                                                            D_s=D_p, c_smax=self.c_smax_p)  # calc p surf SOC
+        SOC_n = self.SOC_solver_n.calc_SOC_surf_from_states(dt=dt, t_prev=t_prev, i_app=I, R=self.R_n, S=self.S_n,
+                                                            D_s=D_n, c_smax=self.c_smax_n)  # calc n surf SOC
+        # The masked battery cells and the battery cells with invalid electrode SOC retain their electrode SOC from the
+        # previous time step. The time step of the latter is undone, as in SPPySolver.
+        invalid_SOC = (SOC_p <= 0) | (SOC_p >= 1) | (SOC_n <= 0) | (SOC_n >= 1)
+        if np.any(invalid_SOC):
+            self.SOC_integrator.y = np.where(invalid_SOC, y_prev, self.SOC_integrator.y)
+            for SOC_solver, state in ((self.SOC_solver_p, state_p), (self.SOC_solver_n, state_n)):
+                SOC_solver.set_state({name: np.where(invalid_SOC, value, getattr(SOC_solver, name))
+                                      for name, value in state.items()})
+        array_frozen = invalid_SOC | (dt == 0)
+        self.SOC_p = np.where(array_frozen, self.SOC_p, SOC_p)
+        self.SOC_n = np.where(array_frozen, self.SOC_n, SOC_n)
+
+        # The OCPs are evaluated once per iteration and reused for the terminal voltage, the heat balance and the
+        # recorded open-circuit voltage.
+        OCP_p, OCP_n = self.OCP_p, self.OCP_n
+        self.OCV = OCP_p - OCP_n
+        V = self.calc_terminal_potential(I=I, OCP_p=OCP_p, OCP_n=OCP_n)  # calc battery cell terminal voltage
+
+        # Calc temp below and update the battery cell temperatures. The battery cells with invalid electrode SOC retain
+        # their temperatures.
+        if not self.bool_isothermal:
+            self.T = self.calc_cell_temp(t_prev=t_prev, dt=np.where(invalid_SOC, 0.0, dt), V=V, I=I, OCV=self.OCV)
+        return V, invalid_SOC
+
+    @classmethod
+    def delta_SOC_cap(cls, Q: npt.ArrayLike, I: float, dt: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        returns the delta SOC capacity [unit-less].
+        :param Q: battery cell capacities [Ahr]
+        :param I: Applied current [A]
+        :param dt: time differences between the current and previous time step [s].
+        :return: (npt.ArrayLike) change in the SOC
+        """
+        return (1 / 3600) * (np.abs(I) * dt / Q)
+
+    @classmethod
+    def delta_cap(cls, I: float, dt: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Measures the change in battery cell's capacity [Ahr]
+        :param I: applied current at the current time step [A]
+        :param dt: difference in time in the time step [s]
+        :return: change in battery cell capacity [Ahr]
+        """
+        return (1 / 3600) * (np.abs(I) * dt)
+
+    @timer
+    def solve(self, cycler_instance: BaseCycler, t_increment: float = 0.1, termination_criteria: str = 'V',
+              record_interval: int = 1, verbose: bool = False) -> BatchSolution:
+        """
+        Performs the cycling simulation for all the battery cells.
+        :param cycler_instance: (BaseCycler) cycler instance.
+        :param t_increment: (float) time step [s].
+        :param termination_criteria: (str) termination criteria for the charge and discharge steps. It can be
+        either 'V' or 'SOC'.
+        :param record_interval: (int) results are stored after every record_interval iterations. The iteration at
+        which a battery cell completes its cycling step is always stored.
+        :param verbose: (bool) prints the simulation progress.
+        :return: (BatchSolution) solution object containing the results of all the battery cells.
+        """
+        if not isinstance(cycler_instance, BaseCycler):
+            raise TypeError("cycler needs to be a Cycler object.")
+        if (termination_criteria != 'V') and (termination_criteria != 'SOC'):
+            raise ValueError("termination_criteria needs to be either 'V' or 'SOC'.")
+        if (not isinstance(record_interval, int)) or (record_interval < 1):
+            raise ValueError("record_interval needs to be a positive integer.")
+
+        sol = BatchSolution(num_cells=self.num_cells)
+        bool_custom = isinstance(cycler_instance, CustomCycler)
+
+        time_elapsed = cycler_instance.time_elapsed * np.ones(self.num_cells)
+        SOC_LIB = cycler_instance.SOC_LIB * np.ones(self.num_cells)
+
+        for cycle_no in tqdm(range(cycler_instance.num_cycles)):
+            for step in cycler_instance.cycle_steps:
+                cap = np.zeros(self.num_cells)
+                cap_charge = np.zeros(self.num_cells)
+                cap_discharge = np.zeros(self.num_cells)
+                t_prev = 0.0
+                iter_no = 0
+                array_active = np.ones(self.num_cells, dtype=bool)  # battery cells that are yet to complete the step
+                while np.any(array_active):
+                    t_curr = t_prev + t_increment
+                    if bool_custom:
+                        if t_curr > cycler_instance.t_max:
+                            break
+                        I = cycler_instance.get_current(step, t_curr)
+                    else:
+                        I = cycler_instance.get_current(step, t_prev)
+                    dt = np.where(array_active, t_increment, 0.0)  # masked battery cells retain their states.
+
+                    V, invalid_SOC = self.solve_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
+                    invalid_SOC &= array_active
+                    dt = np.where(invalid_SOC, 0.0, dt)
+
+                    # Calc charge capacity, discharge capacity, and overall LIB capacity
+                    delta_SOC_cap = self.delta_SOC_cap(Q=self.cap, I=I, dt=dt)
+                    cap += delta_SOC_cap
+                    if (step == "charge") or (bool_custom and (I > 0)):
+                        cap_charge += self.delta_cap(I=I, dt=dt)
+                        SOC_LIB += delta_SOC_cap
+                    elif (step == "discharge") or (bool_custom and (I < 0)):
+                        cap_discharge += self.delta_cap(I=I, dt=dt)
+                        SOC_LIB -= delta_SOC_cap
+
+                    # determine the battery cells that complete the cycling step in this iteration
+                    step_completed = invalid_SOC.copy()
+                    if (step == "rest") and (t_curr > cycler_instance.rest_time):
+                        step_completed[:] = True
+                    if termination_criteria == 'V':
+                        if step == "charge":
+                            step_completed |= (V > cycler_instance.V_max)
+                        elif step == "discharge":
+                            step_completed |= (V < cycler_instance.V_min)
+                    elif termination_criteria == 'SOC':
+                        if step == "charge":
+                            step_completed |= (SOC_LIB > cycler_instance.SOC_LIB_max)
+                        elif step == "discharge":
+                            step_completed |= (SOC_LIB < cycler_instance.SOC_LIB_min)
+                    step_completed &= array_active
+
+                    # update time
+                    time_elapsed += dt
+                    t_prev = t_curr
+                    iter_no += 1
+
+                    # update the results
+                    array_recorded = array_active & ~invalid_SOC
+                    if (iter_no % record_interval == 0) or np.any(step_completed):
+                        sol.update(cycle_num=cycle_no, cycle_step=step, mask=array_recorded,
+                                   t=time_elapsed, I=I, V=V, OCV=self.OCV,
+                                   x_surf_p=self.SOC_p, x_surf_n=self.SOC_n,
+                                   cap=cap, cap_charge=cap_charge, cap_discharge=cap_discharge,
+                                   SOC_LIB=SOC_LIB, battery_cap=self.cap, temp=self.T, R_cell=self.R_cell)
+
+                    if verbose:
+                        print("time [s]: ", t_curr, ", cycle_no: ", cycle_no, 'step: ', step,
+                              "current [A]", I, ", active cells: ", np.sum(array_active))
+
+                    array_active &= ~step_completed
+
+        return sol
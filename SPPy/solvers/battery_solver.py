@@ -2,6 +2,8 @@ __author__ = 'Moin Ahmed'
 __copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
 __status__ = 'deployed'
 
+from typing import Callable, Optional
+
 import numpy as np
 import numpy.typing as npt
 from tqdm import tqdm
@@ -9,16 +11,20 @@ from tqdm import tqdm
 from SPPy.battery_components.battery_cell import BatteryCell
 from SPPy.solvers.base import BaseSolver, timer
 from SPPy.calc_helpers import ode_solvers
-from SPPy.sol_and_visualization.solution import SolutionInitializer, Solution
+from SPPy.sol_and_visualization.solution import SolutionRecorder, Solution
+from SPPy.sol_and_visualization.recording import BaseRecordingPolicy, RecordAll
+from SPPy.sol_and_visualization.streaming import SolutionSink
 
 from SPPy.warnings_and_exceptions.custom_exceptions import *
 
 from SPPy.solvers.electrode_surf_conc import EigenFuncExp, CNSolver, PolynomialApproximation
 from SPPy.models.thermal import Lumped
 from SPPy.solvers.degradation_solvers import ROMSEISolver
+from SPPy.solvers.step_control import AdaptiveStepControl
+from SPPy.solvers.checkpoint import CheckpointControl, save_checkpoint, load_checkpoint
 
 from SPPy.models.battery import SPMe
-from SPPy.solvers.electrolyte_conc import ElectrolyteFVMCoordinates, ElectrolyteConcFVMSolver
+from SPPy.solvers.electrolyte_conc import ElectrolyteSettings, ElectrolyteFVMCoordinates, ElectrolyteConcFVMSolver
 
 from SPPy.cycler.base import BaseCycler
 from SPPy.cycler.discharge import CustomDischarge
@@ -33,6 +39,8 @@ class SPPySolver(BaseSolver):
     method to solve for the electrode surface SOC.
     The cell surface temperature is solved using the lumped cell thermal balance. The heat balance ODE is solved using
     the rk4 method.
+    The additional electrode SOC solver parameters are 'method' ('rk4' or 'exact') for the Eigen Expansion Function
+    method and 'type' for the Polynomial Approximation method.
     """
 
     def __init__(self, b_cell, isothermal: bool = True, degradation: bool = False, N: int = 5,
@@ -42,17 +50,22 @@ class SPPySolver(BaseSolver):
         self.N = N
 
         # initialize result storage lists below.
-        self.sol_init = SolutionInitializer()  # initializes the empty lists that will store the simulation results
+        self.sol_init = SolutionRecorder()  # initializes the arrays that will store the simulation results
+        self._row_log = None  # SolutionSink to which the recorded rows are appended at the checkpoints
 
         # initialize electrode surface SOC, temperature solvers, and degradation instances below.
         if self.electrode_SOC_solver == 'eigen':
-            self.SOC_solver_p = EigenFuncExp(x_init=self.b_cell.elec_p.SOC, n=self.N, electrode_type='p')
-            self.SOC_solver_n = EigenFuncExp(x_init=self.b_cell.elec_n.SOC, n=self.N, electrode_type='n')
+            method = electrode_SOC_solver_params.get('method', 'rk4')
+            self.SOC_solver_p = EigenFuncExp(x_init=self.b_cell.elec_p.SOC, n=self.N, electrode_type='p',
+                                             method=method)
+            self.SOC_solver_n = EigenFuncExp(x_init=self.b_cell.elec_n.SOC, n=self.N, electrode_type='n',
+                                             method=method)
         elif self.electrode_SOC_solver == 'cn':
+            # the diffusivities change with the temperature at every time step of the non-isothermal simulations.
             self.SOC_solver_p = CNSolver(c_init=self.b_cell.elec_p.max_conc * self.b_cell.elec_p.SOC_init,
-                                         electrode_type='p')
+                                         electrode_type='p', cache_LHS=self.bool_isothermal)
             self.SOC_solver_n = CNSolver(c_init=self.b_cell.elec_n.max_conc * self.b_cell.elec_n.SOC,
-                                         electrode_type='n')
+                                         electrode_type='n', cache_LHS=self.bool_isothermal)
         elif self.electrode_SOC_solver == "poly":
             if electrode_SOC_solver_params:
                 type = electrode_SOC_solver_params['type']
@@ -96,8 +109,11 @@ class SPPySolver(BaseSolver):
         """
         if not isinstance(t_model, Lumped):
             raise TypeError("t_model needs to be a Thermal Model")
-        func_heat_balance = t_model.heat_balance(V=V, I=I)
-        return ode_solvers.rk4(func=func_heat_balance, t_prev=t_prev, y_prev=temp_prev, step_size=dt)
+        # the OCV and its temperature derivative are evaluated once instead of at every rk4 stage.
+        OCV = t_model.b_cell.elec_p.OCP - t_model.b_cell.elec_n.OCP
+        dOCVdT = t_model.b_cell.elec_p.dOCPdT - t_model.b_cell.elec_n.dOCPdT
+        return ode_solvers.rk4(func=t_model.rhs, t_prev=t_prev, y_prev=temp_prev, step_size=dt,
+                               args=(V, I, OCV, dOCVdT))
 
     @classmethod
     def delta_SOC_cap(cls, Q: float, I: float, dt: float):
@@ -137,6 +153,8 @@ class SPPySolver(BaseSolver):
         else:
             I_i = I  # intercalation current is same at the input current
 
+        self.solve_electrolyte_one_step(dt=dt, I_p_i=I, I_n_i=I_i)
+
         # Calc. electrode surface SOC below and update the battery cell's instance attributes.
         # if self.electrode_SOC_solver == 'eigen':
         self.b_cell.elec_p.SOC = self.SOC_solver_p(dt=dt, t_prev=t_prev, i_app=I,
@@ -158,34 +176,422 @@ class SPPySolver(BaseSolver):
                                                 temp_prev=self.b_cell.T, V=V, I=I)
         return V
 
+    def solve_valid_iteration_one_step(self, t_prev: float, dt: float, I: float) -> float:
+        """
+        Advances the solver by one time step. In case the electrode SOC goes beyond its limits, the states are restored
+        to those at t_prev before the InvalidSOCException is raised again, so that the invalid time step does not
+        advance the electrode SOC solvers.
+        :param t_prev: time value at the previous time step [s]
+        :param dt: time step [s]
+        :param I: applied current [A]
+        :return: (float) battery cell terminal voltage [V]
+        """
+        state = self.get_state()
+        try:
+            return self.solve_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
+        except InvalidSOCException:
+            self.set_state(state)
+            raise
+
+    def solve_electrolyte_one_step(self, dt: float, I_p_i: float, I_n_i: float) -> None:
+        """
+        Advances the electrolyte states by the time step. The single particle model assumes an uniform electrolyte
+        concentration and hence, it does nothing. The solvers with the electrolyte dynamics override it.
+        :param dt: time step [s]
+        :param I_p_i: positive electrode intercalation current [A]
+        :param I_n_i: negative electrode intercalation current [A]
+        """
+        pass
+
+    def get_state(self) -> dict:
+        """
+        Returns the snapshot of the states of the battery cell, the electrode SOC solvers, and the SEI model. The
+        snapshot can be used to restore the solver to this point in time. Only the integrated states are copied and
+        not the solver objects, which also contain the cached variables.
+        :return: (dict) dictionary containing the states.
+        """
+        return {'SOC_solver_p': self.SOC_solver_p.get_state(),
+                'SOC_solver_n': self.SOC_solver_n.get_state(),
+                'SEI_model': self.SEI_model.get_state(),
+                'SOC_p': self.b_cell.elec_p.SOC,
+                'SOC_n': self.b_cell.elec_n.SOC,
+                'T': self.b_cell.T,
+                'R_cell': self.b_cell.R_cell,
+                'c_e': self.b_cell.electrolyte.conc}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the states of the battery cell, the electrode SOC solvers, and the SEI model from the snapshot. The
+        snapshot remains unchanged and hence can be restored multiple times.
+        :param state: (dict) snapshot returned by the get_state method.
+        """
+        self.SOC_solver_p.set_state(state['SOC_solver_p'])
+        self.SOC_solver_n.set_state(state['SOC_solver_n'])
+        self.SEI_model.set_state(state['SEI_model'])
+        self.b_cell.elec_p.SOC = state['SOC_p']
+        self.b_cell.elec_n.SOC = state['SOC_n']
+        self.b_cell.T = state['T']
+        self.b_cell.R_cell = state['R_cell']
+        self.b_cell.electrolyte.conc = state['c_e']
+
+    def _error_states(self, V: float) -> npt.ArrayLike:
+        """
+        Returns the array of the states used for the local error estimation of the adaptive time stepping.
+        :param V: battery cell terminal voltage [V]
+        :return: (npt.ArrayLike) array of the states.
+        """
+        return np.array([self.b_cell.elec_p.SOC, self.b_cell.elec_n.SOC, self.b_cell.T, V])
+
+    def solve_step_with_error(self, t_prev: float, dt: float, I: float, state: dict,
+                              step_control: AdaptiveStepControl) -> tuple[float, float]:
+        """
+        Advances the solver by the time step dt using two half time steps and estimates the local error by comparing
+        the states with those from one full time step (step doubling).
+        :param t_prev: time value at the previous time step [s]
+        :param dt: time step [s]
+        :param I: applied current [A]
+        :param state: snapshot of the states at t_prev.
+        :param step_control: (AdaptiveStepControl) adaptive time stepping settings.
+        :return: tuple containing the terminal voltage [V] and the scaled error norm.
+        """
+        V_coarse = self.solve_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
+        y_coarse = self._error_states(V=V_coarse)
+        self.set_state(state)
+        self.solve_iteration_one_step(t_prev=t_prev, dt=dt / 2, I=I)
+        V = self.solve_iteration_one_step(t_prev=t_prev + dt / 2, dt=dt / 2, I=I)
+        return V, step_control.error_norm(y_coarse=y_coarse, y_fine=self._error_states(V=V))
+
+    @staticmethod
+    def _cutoff_margin(cycler: BaseCycler, step: str, termination_criteria: str, V: float,
+                       SOC_LIB: float) -> Optional[float]:
+        """
+        Returns the distance of the battery cell from the cutoff of the cycling step. It is positive before the cutoff
+        and negative after the cutoff is crossed.
+        :return: (float) distance from the cutoff or None if the cycling step does not have any cutoff.
+        """
+        if termination_criteria == 'V':
+            if step == "charge":
+                return cycler.V_max - V
+            elif step == "discharge":
+                return V - cycler.V_min
+        elif termination_criteria == 'SOC':
+            if step == "charge":
+                return cycler.SOC_LIB_max - SOC_LIB
+            elif step == "discharge":
+                return SOC_LIB - cycler.SOC_LIB_min
+        return None
+
+    def locate_cutoff(self, t_prev: float, dt: float, V: float, I: float, state: dict, func_margin: Callable,
+                      step_control: AdaptiveStepControl) -> tuple[float, float]:
+        """
+        Locates the time step at which the battery cell reaches the cycling step's cutoff using the Illinois variant
+        of the regula falsi method. The cutoff is bracketed by the time steps 0 and dt. On return, the solver is
+        advanced to the located time step, which is just past the cutoff.
+        :param t_prev: time value at the previous time step [s]
+        :param dt: time step at which the cutoff was crossed [s]
+        :param V: terminal voltage after the time step dt [V]
+        :param I: applied current [A]
+        :param state: snapshot of the states at t_prev.
+        :param func_margin: function that takes in the terminal voltage and the time step and returns the distance
+        from the cutoff.
+        :param step_control: (AdaptiveStepControl) adaptive time stepping settings.
+        :return: tuple containing the located time step [s] and the terminal voltage [V].
+        """
+        dt_lo, g_lo = 0.0, None
+        dt_hi, g_hi = dt, func_margin(V, dt)
+        dt_crossed, V_crossed, state_crossed = dt, V, self.get_state()
+        side = 0
+        for _ in range(step_control.max_event_iter):
+            if dt_hi - dt_lo <= step_control.event_tol:
+                break
+            if (g_lo is None) or (g_hi is None) or (g_hi == g_lo):
+                dt_mid = 0.5 * (dt_lo + dt_hi)
+            else:
+                dt_mid = (dt_lo * g_hi - dt_hi * g_lo) / (g_hi - g_lo)
+                if not (dt_lo < dt_mid < dt_hi):
+                    dt_mid = 0.5 * (dt_lo + dt_hi)
+            self.set_state(state)
+            try:
+                V_mid = self.solve_iteration_one_step(t_prev=t_prev, dt=dt_mid, I=I)
+                g_mid = func_margin(V_mid, dt_mid)
+            except InvalidSOCException:
+                dt_hi, g_hi = dt_mid, None  # the electrode SOC goes beyond the limits only past the cutoff.
+                continue
+            if g_mid < 0:
+                dt_hi, g_hi = dt_mid, g_mid
+                dt_crossed, V_crossed, state_crossed = dt_mid, V_mid, self.get_state()
+                if (side == -1) and (g_lo is not None):
+                    g_lo /= 2
+                side = -1
+            else:
+                dt_lo, g_lo = dt_mid, g_mid
+                if (side == 1) and (g_hi is not None):
+                    g_hi /= 2
+                side = 1
+        self.set_state(state_crossed)
+        return dt_crossed, V_crossed
+
+    def _sol_row(self, cycle_num: int, cycle_step: str, t: float, I: float, V: float, cap: float,
+                 cap_charge: float, cap_discharge: float, SOC_LIB: float) -> dict:
+        """
+        Returns the results of the current time step as a dictionary, which can be stored later using the _record_row
+        method.
+        """
+        row = {'cycle_num': cycle_num, 'cycle_step': cycle_step, 't': t, 'I': I, 'V': V,
+               'OCV': self.b_cell.elec_p.OCP - self.b_cell.elec_n.OCP,
+               'x_surf_p': self.b_cell.elec_p.SOC, 'x_surf_n': self.b_cell.elec_n.SOC,
+               'cap': cap, 'cap_charge': cap_charge, 'cap_discharge': cap_discharge, 'SOC_LIB': SOC_LIB,
+               'battery_cap': self.b_cell.cap, 'temp': self.b_cell.T, 'R_cell': self.b_cell.R_cell}
+        if self.bool_degradation:
+            row['fluxes'] = {'j_tot': self.SEI_model.J_tot, 'j_i': self.SEI_model.J_i, 'j_s': self.SEI_model.J_s}
+        return row
+
+    def _record_row(self, row: dict) -> None:
+        """
+        Appends the results of a time step (see _sol_row) to the solution lists.
+        """
+        row = dict(row)
+        fluxes = row.pop('fluxes', None)
+        self.sol_init.update(**row)
+        if fluxes is not None:
+            self.sol_init.update_fluxes(**fluxes)
+
+    def _update_sol(self, cycle_num: int, cycle_step: str, t: float, I: float, V: float, cap: float,
+                    cap_charge: float, cap_discharge: float, SOC_LIB: float) -> None:
+        """
+        Appends the results of the current time step to the solution lists.
+        """
+        self._record_row(self._sol_row(cycle_num=cycle_num, cycle_step=cycle_step, t=t, I=I, V=V, cap=cap,
+                                       cap_charge=cap_charge, cap_discharge=cap_discharge, SOC_LIB=SOC_LIB))
+
+    def _record_step_end(self, recording_policy: BaseRecordingPolicy, row: Optional[dict]) -> None:
+        """
+        Stores the last valid time step of a cycling step that ended because the electrode SOC went beyond its limits,
+        in case the recording policy skipped it.
+        :param recording_policy: (BaseRecordingPolicy) recording policy of the simulation.
+        :param row: (dict) results of the last valid time step that was not stored, or None.
+        """
+        if row is not None:
+            recording_policy(t=row['t'], V=row['V'], T=row['temp'], step_end=True)
+            self._record_row(row)
+
+    def _create_solution(self, sol_name: str = None, save_csv_dir: str = None) -> Solution:
+        """
+        Creates the Solution object from the recorded results. In case a sink is attached, the remaining rows are
+        written to the disk, the sink is detached, and the Solution object memory-maps the streamed results.
+        :param sol_name: (str) name of the solution.
+        :param save_csv_dir: (str) directory where the solution is saved as csv file.
+        :return: (Solution) solution object.
+        """
+        if self.sol_init.sink is None:
+            return Solution(base_solution_instance=self.sol_init, name=sol_name, save_csv_dir=save_csv_dir)
+        self.sol_init.flush()
+        dir_path = self.sol_init.sink.dir_path
+        self.sol_init.sink = None
+        sol = Solution.read_from_sink(dir_path=dir_path, name=sol_name)
+        if save_csv_dir is not None:
+            sol.save_csv_func(save_csv_dir)
+        return sol
+
+    def _save_checkpoint(self, checkpoint_control: CheckpointControl, cycler: BaseCycler, settings: dict,
+                         position: dict) -> None:
+        """
+        Writes the checkpoint containing the solver states, the cycler, the solve settings, and the position within
+        the cycling loops.
+
+        The recorded results are not pickled as a whole in every checkpoint. In case a sink is attached, the
+        checkpoint contains the recorder with the rows not yet written to the sink (at most the sink's chunk size).
+        Otherwise, the rows recorded since the previous checkpoint are appended to the row log (a SolutionSink in the
+        <file_path>.rows directory) and the checkpoint only contains the number of rows in the row log.
+        :param checkpoint_control: (CheckpointControl) checkpoint settings.
+        :param cycler: (BaseCycler) cycler instance, which contains the elapsed time and the SOC_LIB.
+        :param settings: (dict) settings of the solve method needed to continue the simulation.
+        :param position: (dict) position within the cycling loops and the capacities of the current cycling step.
+        """
+        if self.sol_init.sink is not None:
+            recorder = {'recorder': self.sol_init}
+        else:
+            if self._row_log is None:
+                self._row_log = SolutionSink(dir_path=checkpoint_control.file_path + '.rows', overwrite=True)
+            self.sol_init.write_to_sink(sink=self._row_log, start=self._row_log.num_rows)
+            recorder = {'row_log_dir': self._row_log.dir_path, 'num_rows': self._row_log.num_rows}
+        save_checkpoint(file_path=checkpoint_control.file_path,
+                        checkpoint={'electrode_SOC_solver': self.electrode_SOC_solver,
+                                    'isothermal': self.bool_isothermal,
+                                    'degradation': self.bool_degradation,
+                                    'state': self.get_state(),
+                                    'cycler': cycler,
+                                    **recorder,
+                                    'settings': {**settings, 'checkpoint_control': checkpoint_control},
+                                    'position': position})
+
+    @timer
+    def resume(self, file_path: str, sol_name: str = None, save_csv_dir: str = None, verbose: bool = False,
+               checkpoint_control: Optional[CheckpointControl] = None):
+        """
+        Resumes the cycling simulation from the checkpoint written by the solve method. The solver needs to be
+        created with the same battery cell parameters and solver options as the one that wrote the checkpoint. The rows
+        written to the SolutionSink (or to the checkpoint's row log) after the checkpoint are discarded and the
+        recording continues from the checkpoint.
+        :param file_path: (str) path of the checkpoint file.
+        :param sol_name: (str) name of the solution.
+        :param save_csv_dir: (str) directory where the solution is saved as csv file.
+        :param verbose: (bool) prints the simulation progress.
+        :param checkpoint_control: (CheckpointControl) checkpoint settings for the rest of the simulation. If None, the
+        checkpoint settings of the interrupted simulation are used.
+        :return: (Solution) solution object.
+        """
+        checkpoint = load_checkpoint(file_path)
+        if (checkpoint['electrode_SOC_solver'] != self.electrode_SOC_solver) or \
+                (checkpoint['isothermal'] != self.bool_isothermal) or \
+                (checkpoint['degradation'] != self.bool_degradation):
+            raise ValueError("The checkpoint was written by a solver with different options.")
+        if (checkpoint_control is not None) and (not isinstance(checkpoint_control, CheckpointControl)):
+            raise TypeError("checkpoint_control needs to be a CheckpointControl object.")
+
+        self.set_state(checkpoint['state'])
+        if 'recorder' in checkpoint:
+            self.sol_init = checkpoint['recorder']
+            self._row_log = None
+            self.sol_init.sink.truncate()
+        else:
+            # the rows appended to the row log after the checkpoint are discarded.
+            self._row_log = SolutionSink.reopen(dir_path=checkpoint['row_log_dir'])
+            self._row_log.num_rows = checkpoint['num_rows']
+            self._row_log.truncate()
+            self.sol_init = SolutionRecorder.read_from_sink(dir_path=self._row_log.dir_path)
+        settings = checkpoint['settings']
+        if checkpoint_control is None:
+            checkpoint_control = settings['checkpoint_control']
+        return self._solve(cycler_instance=checkpoint['cycler'], sol_name=sol_name, save_csv_dir=save_csv_dir,
+                           verbose=verbose, t_increment=settings['t_increment'],
+                           termination_criteria=settings['termination_criteria'],
+                           step_control=settings['step_control'], recording_policy=settings['recording_policy'],
+                           checkpoint_control=checkpoint_control, position=checkpoint['position'])
+
     @timer
     def solve(self, cycler_instance: BaseCycler, sol_name: str = None, save_csv_dir: str = None, verbose: bool = False,
-              t_increment: float = 0.1, termination_criteria: float = 'V'):
+              t_increment: float = 0.1, termination_criteria: float = 'V',
+              step_control: Optional[AdaptiveStepControl] = None,
+              recording_policy: Optional[BaseRecordingPolicy] = None, sink: Optional[SolutionSink] = None,
+              checkpoint_control: Optional[CheckpointControl] = None):
+        """
+        Performs the cycling simulation.
+        :param cycler_instance: (BaseCycler) cycler instance.
+        :param sol_name: (str) name of the solution.
+        :param save_csv_dir: (str) directory where the solution is saved as csv file.
+        :param verbose: (bool) prints the simulation progress.
+        :param t_increment: (float) time step of the fixed time stepping [s].
+        :param termination_criteria: (str) termination criteria of the charge and discharge steps ('V', 'SOC', or
+        'time').
+        :param step_control: (AdaptiveStepControl) settings for the adaptive time stepping. If None, the fixed time
+        step of t_increment is used. Adaptive time stepping is only supported for the constant current cyclers.
+        :param recording_policy: (BaseRecordingPolicy) decides which time steps are stored in the solution. The last
+        time step of every cycling step is always stored. If None, every time step is stored.
+        :param sink: (SolutionSink) if provided, the results are written to the disk in chunks during the simulation
+        and the returned Solution object memory-maps them.
+        :param checkpoint_control: (CheckpointControl) if provided, checkpoints are written periodically during the
+        simulation, from which the simulation can be continued using the resume method.
+        :return: (Solution) solution object.
+        """
         # check for function input parameter types below.
         if not isinstance(cycler_instance, BaseCycler):
             raise TypeError("cycler needs to be a Cycler object.")
+        if recording_policy is None:
+            recording_policy = RecordAll()
+        elif not isinstance(recording_policy, BaseRecordingPolicy):
+            raise TypeError("recording_policy needs to be a BaseRecordingPolicy object.")
+        if step_control is not None:
+            if not isinstance(step_control, AdaptiveStepControl):
+                raise TypeError("step_control needs to be an AdaptiveStepControl object.")
+            if isinstance(cycler_instance, (CustomCycler, CustomDischarge)):
+                raise ValueError("Adaptive time stepping is only supported for the constant current cyclers.")
+        recording_policy.reset()
+        self._row_log = None
+        if sink is not None:
+            if not isinstance(sink, SolutionSink):
+                raise TypeError("sink needs to be a SolutionSink object.")
+            self.sol_init.sink = sink
+        if (checkpoint_control is not None) and (not isinstance(checkpoint_control, CheckpointControl)):
+            raise TypeError("checkpoint_control needs to be a CheckpointControl object.")
+
+        return self._solve(cycler_instance=cycler_instance, sol_name=sol_name, save_csv_dir=save_csv_dir,
+                           verbose=verbose, t_increment=t_increment, termination_criteria=termination_criteria,
+                           step_control=step_control, recording_policy=recording_policy,
+                           checkpoint_control=checkpoint_control)
+
+    def _solve(self, cycler_instance: BaseCycler, sol_name: str, save_csv_dir: str, verbose: bool,
+               t_increment: float, termination_criteria: str, step_control: Optional[AdaptiveStepControl],
+               recording_policy: BaseRecordingPolicy, checkpoint_control: Optional[CheckpointControl] = None,
+               position: Optional[dict] = None):
+        if checkpoint_control is not None:
+            checkpoint_control.reset()
+        try:
+            if step_control is not None:
+                return self._cycler_solve_adaptive(cycler=cycler_instance, step_control=step_control,
+                                                   sol_name=sol_name, save_csv_dir=save_csv_dir, verbose=verbose,
+                                                   termination_criteria=termination_criteria,
+                                                   recording_policy=recording_policy,
+                                                   checkpoint_control=checkpoint_control, position=position)
+
+            if isinstance(cycler_instance, CustomCycler):
+                return self._custom_cycler_solve(custom_cycler_instance=cycler_instance, sol_name=sol_name,
+                                                 save_csv_dir=save_csv_dir, verbose=verbose, t_increment=t_increment,
+                                                 termination_criteria=termination_criteria,
+                                                 recording_policy=recording_policy,
+                                                 checkpoint_control=checkpoint_control, position=position)
+            else:
+                return self._cycler_solve(cycler=cycler_instance, sol_name=sol_name,
+                                          save_csv_dir=save_csv_dir, verbose=verbose, t_increment=t_increment,
+                                          termination_criteria=termination_criteria,
+                                          recording_policy=recording_policy,
+                                          checkpoint_control=checkpoint_control, position=position)
+        except BaseException:
+            # write the results recorded till the error to the disk.
+            if self.sol_init.sink is not None:
+                self.sol_init.flush()
+                self.sol_init.sink = None
+            raise
 
-        if isinstance(cycler_instance, CustomCycler):
-            return self._custom_cycler_solve(custom_cycler_instance=cycler_instance, sol_name=sol_name,
-                                             save_csv_dir=save_csv_dir, verbose=verbose, t_increment=t_increment,
-                                             termination_criteria=termination_criteria)
-        else:
-            return self._cycler_solve(cycler=cycler_instance, sol_name=sol_name,
-                                      save_csv_dir=save_csv_dir, verbose=verbose, t_increment=t_increment,
-                                      termination_criteria=termination_criteria)
+    @staticmethod
+    def _skip_step(position: Optional[dict], cycle_no: int, step_idx: int) -> bool:
+        """
+        Returns True if the cycling step was completed before the checkpoint from which the simulation is resumed.
+        """
+        if position is None:
+            return False
+        if (cycle_no, step_idx) == (position['cycle_no'], position['step_idx']):
+            return position['step_completed']
+        return (cycle_no, step_idx) < (position['cycle_no'], position['step_idx'])
 
     def _cycler_solve(self, cycler: BaseCycler, sol_name: str = None, save_csv_dir: str = None, verbose: bool = False,
-                      t_increment: float = 0.1, termination_criteria: float = 'V'):
+                      t_increment: float = 0.1, termination_criteria: float = 'V',
+                      recording_policy: Optional[BaseRecordingPolicy] = None,
+                      checkpoint_control: Optional[CheckpointControl] = None, position: Optional[dict] = None):
         # cycling simulation below. The first two loops iterate over the cycle numbers and cycling steps,
         # respectively. The following while loops checks for termination conditions and breaks when it reaches it.
         # The termination criteria are specified within the cycler instance.
-        for cycle_no in tqdm(range(cycler.num_cycles)):
-            for step in cycler.cycle_steps:
-                cap = 0
-                cap_charge = 0
-                cap_discharge = 0
-                t_prev = 0
+        # In case the simulation is resumed from a checkpoint, the position contains the cycling step and its
+        # capacities at the time of the checkpoint.
+        if recording_policy is None:
+            recording_policy = RecordAll()
+        settings = {'t_increment': t_increment, 'termination_criteria': termination_criteria, 'step_control': None,
+                    'recording_policy': recording_policy}
+        for cycle_no in tqdm(range(0 if position is None else position['cycle_no'], cycler.num_cycles)):
+            for step_idx, step in enumerate(cycler.cycle_steps):
+                if self._skip_step(position=position, cycle_no=cycle_no, step_idx=step_idx):
+                    continue
+                if (position is not None) and ((cycle_no, step_idx) == (position['cycle_no'], position['step_idx'])):
+                    cap, cap_charge, cap_discharge = position['cap'], position['cap_charge'], position['cap_discharge']
+                    t_prev = position['t_prev']
+                else:
+                    cap = 0
+                    cap_charge = 0
+                    cap_discharge = 0
+                    t_prev = 0
+                position = None
                 step_completed = False
+                row_pending = None  # last time step that was not stored by the recording policy
                 while not step_completed:
                     if isinstance(cycler, CustomDischarge):
                         I = cycler.get_current(step, t_prev)
@@ -201,9 +607,10 @@ class SPPySolver(BaseSolver):
                     # All simulations parameters and battery cell attributes updates are done the in the code block
                     # below.
                     try:
-                        V = self.solve_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
+                        V = self.solve_valid_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
                     except InvalidSOCException as e:
                         print(e)
+                        self._record_step_end(recording_policy=recording_policy, row=row_pending)
                         break
 
                     # Calc charge capacity, discharge capacity, and overall LIB capacity
@@ -224,9 +631,9 @@ class SPPySolver(BaseSolver):
                             step_completed = True
                     # break condition for charge and discharge if stop criteria is SOC-based
                     elif termination_criteria == 'SOC':
-                        if ((step == "charge") and (cycler.SOC_LIB > cycler.SOC_max)):
+                        if ((step == "charge") and (cycler.SOC_LIB > cycler.SOC_LIB_max)):
                             step_completed = True
-                        if ((step == "discharge") and (cycler.SOC_LIB < cycler.SOC_min)):
+                        if ((step == "discharge") and (cycler.SOC_LIB < cycler.SOC_LIB_min)):
                             step_completed = True
                     # break condition for charge and discharge if stop criteria is time based
                     elif termination_criteria == 'time':
@@ -237,26 +644,13 @@ class SPPySolver(BaseSolver):
                     t_prev = t_curr
                     cycler.time_elapsed += t_increment
 
-                    # Update results lists
-                    self.sol_init.update(cycle_num=cycle_no,
-                                         cycle_step=step,
-                                         t=cycler.time_elapsed,
-                                         I=I,
-                                         V=V,
-                                         OCV=self.b_cell.elec_p.OCP - self.b_cell.elec_n.OCP,
-                                         x_surf_p=self.b_cell.elec_p.SOC,
-                                         x_surf_n=self.b_cell.elec_n.SOC,
-                                         cap=cap,
-                                         cap_charge=cap_charge,
-                                         cap_discharge=cap_discharge,
-                                         SOC_LIB=cycler.SOC_LIB,
-                                         battery_cap=self.b_cell.cap,
-                                         temp=self.b_cell.T,
-                                         R_cell=self.b_cell.R_cell)
-                    if self.bool_degradation:
-                        self.sol_init.lst_j_tot.append(self.SEI_model.J_tot)
-                        self.sol_init.lst_j_i.append(self.SEI_model.J_i)
-                        self.sol_init.lst_j_s.append(self.SEI_model.J_s)
+                    # Update results
+                    row_pending = self._sol_row(cycle_num=cycle_no, cycle_step=step, t=cycler.time_elapsed, I=I,
+                                                V=V, cap=cap, cap_charge=cap_charge, cap_discharge=cap_discharge,
+                                                SOC_LIB=cycler.SOC_LIB)
+                    if recording_policy(t=cycler.time_elapsed, V=V, T=self.b_cell.T, step_end=step_completed):
+                        self._record_row(row_pending)
+                        row_pending = None
 
                     if verbose:
                         print("time elapsed [s]: ", cycler.time_elapsed, ", cycle_no: ", cycle_no,
@@ -264,19 +658,155 @@ class SPPySolver(BaseSolver):
                               cycler.SOC_LIB,
                               "cap: ", cap)
 
-        return Solution(base_solution_instance=self.sol_init, name=sol_name, save_csv_dir=save_csv_dir)
+                    if (checkpoint_control is not None) and checkpoint_control.is_due():
+                        self._save_checkpoint(checkpoint_control=checkpoint_control, cycler=cycler,
+                                              settings=settings,
+                                              position={'cycle_no': cycle_no, 'step_idx': step_idx,
+                                                        'step_completed': step_completed, 'cap': cap,
+                                                        'cap_charge': cap_charge, 'cap_discharge': cap_discharge,
+                                                        't_prev': t_prev})
+
+        return self._create_solution(sol_name=sol_name, save_csv_dir=save_csv_dir)
+
+    def _cycler_solve_adaptive(self, cycler: BaseCycler, step_control: AdaptiveStepControl, sol_name: str = None,
+                               save_csv_dir: str = None, verbose: bool = False, termination_criteria: str = 'V',
+                               recording_policy: Optional[BaseRecordingPolicy] = None,
+                               checkpoint_control: Optional[CheckpointControl] = None,
+                               position: Optional[dict] = None):
+        """
+        Cycling simulation with adaptive time stepping. The time step grows during the rests and constant current
+        plateaus as long as the estimated local error is within the tolerances. The rest steps (and the time-based
+        termination) land exactly on their end times and the V or SOC cutoffs are located by root-finding.
+        """
+        if recording_policy is None:
+            recording_policy = RecordAll()
+        settings = {'t_increment': None, 'termination_criteria': termination_criteria, 'step_control': step_control,
+                    'recording_policy': recording_policy}
+        for cycle_no in tqdm(range(0 if position is None else position['cycle_no'], cycler.num_cycles)):
+            for step_idx, step in enumerate(cycler.cycle_steps):
+                if self._skip_step(position=position, cycle_no=cycle_no, step_idx=step_idx):
+                    continue
+                if (position is not None) and ((cycle_no, step_idx) == (position['cycle_no'], position['step_idx'])):
+                    cap, cap_charge, cap_discharge = position['cap'], position['cap_charge'], position['cap_discharge']
+                    t_prev, dt = position['t_prev'], position['dt']
+                else:
+                    cap = 0
+                    cap_charge = 0
+                    cap_discharge = 0
+                    t_prev = 0.0
+                    dt = step_control.dt_init
+                position = None
+                step_completed = False
+                row_pending = None  # last time step that was not stored by the recording policy
+                while not step_completed:
+                    I = cycler.get_current(step, t_prev)
+
+                    # limit the time step so that it does not overshoot the end of the rest or the maximum time.
+                    dt_limit = None
+                    if step == "rest":
+                        dt_limit = cycler.rest_time - t_prev
+                    elif (termination_criteria == 'time') and (step == "discharge"):
+                        dt_limit = cycler.t_max - cycler.time_elapsed
+                    if (dt_limit is not None) and (dt_limit <= 0):
+                        break
+                    dt_step = dt if dt_limit is None else min(dt, dt_limit)
+
+                    state = self.get_state()
+                    try:
+                        V, err = self.solve_step_with_error(t_prev=t_prev, dt=dt_step, I=I, state=state,
+                                                            step_control=step_control)
+                    except InvalidSOCException as e:
+                        self.set_state(state)
+                        if dt_step <= step_control.dt_min:
+                            print(e)
+                            self._record_step_end(recording_policy=recording_policy, row=row_pending)
+                            break
+                        dt = max(step_control.dt_min, dt_step * step_control.min_shrink)
+                        continue
+                    # reject the time step if the local error is beyond the tolerances.
+                    if (err > 1) and (dt_step > step_control.dt_min):
+                        self.set_state(state)
+                        dt = step_control.next_dt(dt=dt_step, err=err)
+                        continue
+
+                    def func_SOC_LIB(dt_):
+                        if step == "charge":
+                            return cycler.SOC_LIB + self.delta_SOC_cap(Q=self.b_cell.cap, I=I, dt=dt_)
+                        elif step == "discharge":
+                            return cycler.SOC_LIB - self.delta_SOC_cap(Q=self.b_cell.cap, I=I, dt=dt_)
+                        return cycler.SOC_LIB
+
+                    def func_margin(V_, dt_):
+                        return self._cutoff_margin(cycler=cycler, step=step, termination_criteria=termination_criteria,
+                                                   V=V_, SOC_LIB=func_SOC_LIB(dt_))
+
+                    margin = func_margin(V, dt_step)
+                    if (margin is not None) and (margin < 0):
+                        dt_step, V = self.locate_cutoff(t_prev=t_prev, dt=dt_step, V=V, I=I, state=state,
+                                                        func_margin=func_margin, step_control=step_control)
+                        step_completed = True
+                    elif (dt_limit is not None) and (dt_step >= dt_limit):
+                        step_completed = True
+
+                    # Calc charge capacity, discharge capacity, and overall LIB capacity
+                    cap = self.calc_SOC_cap(cap_prev=cap, Q=self.b_cell.cap, I=I, dt=dt_step)
+                    if step == "charge":
+                        cap_charge += self.delta_cap(I=I, dt=dt_step)
+                    elif step == "discharge":
+                        cap_discharge += self.delta_cap(I=I, dt=dt_step)
+                    cycler.SOC_LIB = func_SOC_LIB(dt_step)
+
+                    # update time
+                    t_prev += dt_step
+                    cycler.time_elapsed += dt_step
+
+                    row_pending = self._sol_row(cycle_num=cycle_no, cycle_step=step, t=cycler.time_elapsed, I=I,
+                                                V=V, cap=cap, cap_charge=cap_charge, cap_discharge=cap_discharge,
+                                                SOC_LIB=cycler.SOC_LIB)
+                    if recording_policy(t=cycler.time_elapsed, V=V, T=self.b_cell.T, step_end=step_completed):
+                        self._record_row(row_pending)
+                        row_pending = None
+
+                    if verbose:
+                        print("time elapsed [s]: ", cycler.time_elapsed, ", cycle_no: ", cycle_no,
+                              'step: ', step, "time step [s]: ", dt_step, "current [A]", I,
+                              ", terminal voltage [V]: ", V, ", SOC_LIB: ", cycler.SOC_LIB, "cap: ", cap)
+
+                    dt = step_control.next_dt(dt=dt_step, err=err)
+
+                    if (checkpoint_control is not None) and checkpoint_control.is_due():
+                        self._save_checkpoint(checkpoint_control=checkpoint_control, cycler=cycler,
+                                              settings=settings,
+                                              position={'cycle_no': cycle_no, 'step_idx': step_idx,
+                                                        'step_completed': step_completed, 'cap': cap,
+                                                        'cap_charge': cap_charge, 'cap_discharge': cap_discharge,
+                                                        't_prev': t_prev, 'dt': dt})
+
+        return self._create_solution(sol_name=sol_name, save_csv_dir=save_csv_dir)
 
     def _custom_cycler_solve(self, custom_cycler_instance: CustomCycler, sol_name: str = None, save_csv_dir: str = None,
-                             verbose: bool = False, t_increment: float = 0.1, termination_criteria: str = 'V'):
+                             verbose: bool = False, t_increment: float = 0.1, termination_criteria: str = 'V',
+                             recording_policy: Optional[BaseRecordingPolicy] = None,
+                             checkpoint_control: Optional[CheckpointControl] = None,
+                             position: Optional[dict] = None):
         if not isinstance(custom_cycler_instance, CustomCycler):
             raise TypeError('inputted cycler needs to be a CustomCycler object.')
 
+        if recording_policy is None:
+            recording_policy = RecordAll()
+        settings = {'t_increment': t_increment, 'termination_criteria': termination_criteria, 'step_control': None,
+                    'recording_policy': recording_policy}
         step_completed = False  # boolean that indicates if the cycling step is completed.
 
-        cap = 0
-        cap_charge = 0
-        cap_discharge = 0
-        t_curr = t_prev = 0.0  # time value of this current iteration step.
+        if position is not None:
+            cap, cap_charge, cap_discharge = position['cap'], position['cap_charge'], position['cap_discharge']
+            t_curr = t_prev = position['t_prev']
+        else:
+            cap = 0
+            cap_charge = 0
+            cap_discharge = 0
+            t_curr = t_prev = 0.0  # time value of this current iteration step.
+        row_pending = None  # last time step that was not stored by the recording policy
         while not step_completed:
             t_curr += t_increment
             dt = t_curr - t_prev
@@ -286,9 +816,10 @@ class SPPySolver(BaseSolver):
             # All simulations parameters and battery cell attributes updates are done the in the code block
             # below.
             try:
-                V = self.solve_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
+                V = self.solve_valid_iteration_one_step(t_prev=t_prev, dt=dt, I=I)
             except InvalidSOCException as e:
                 print(e)
+                self._record_step_end(recording_policy=recording_policy, row=row_pending)
                 break
 
             if t_curr > custom_cycler_instance.t_max:
@@ -315,74 +846,150 @@ class SPPySolver(BaseSolver):
             t_prev = t_curr
             custom_cycler_instance.time_elapsed += t_increment
 
-            # Update results lists
-            self.sol_init.update(cycle_num=1,
-                                 cycle_step='custom',
-                                 t=custom_cycler_instance.time_elapsed,
-                                 I=I,
-                                 V=V,
-                                 OCV=self.b_cell.elec_p.OCP - self.b_cell.elec_n.OCP,
-                                 x_surf_p=self.b_cell.elec_p.SOC,
-                                 x_surf_n=self.b_cell.elec_n.SOC,
-                                 cap=cap,
-                                 cap_charge=cap_charge,
-                                 cap_discharge=cap_discharge,
-                                 SOC_LIB=custom_cycler_instance.SOC_LIB,
-                                 battery_cap=self.b_cell.cap,
-                                 temp=self.b_cell.T,
-                                 R_cell=self.b_cell.R_cell)
-            if self.bool_degradation:
-                self.sol_init.lst_j_tot.append(self.SEI_model.J_tot)
-                self.sol_init.lst_j_i.append(self.SEI_model.J_i)
-                self.sol_init.lst_j_s.append(self.SEI_model.J_s)
-
-        return Solution(base_solution_instance=self.sol_init, name=sol_name, save_csv_dir=save_csv_dir)
-
-
-class eSPSolver(BaseSolver):
-    """
-    Solver for performing simulations using single-particle model with electrolyte dynamics.
-    """
+            # Update results. The next iteration goes beyond the last time value and hence, this is the last one.
+            step_end = t_curr + t_increment > custom_cycler_instance.t_max
+            row_pending = self._sol_row(cycle_num=1, cycle_step='custom', t=custom_cycler_instance.time_elapsed, I=I,
+                                        V=V, cap=cap, cap_charge=cap_charge, cap_discharge=cap_discharge,
+                                        SOC_LIB=custom_cycler_instance.SOC_LIB)
+            if recording_policy(t=custom_cycler_instance.time_elapsed, V=V, T=self.b_cell.T, step_end=step_end):
+                self._record_row(row_pending)
+                row_pending = None
 
-    def __init__(self, b_cell: BatteryCell, isothermal: bool, degradation: bool, electrode_soc_solver: str = 'poly'):
-        super().__init__(b_cell=b_cell, isothermal=isothermal, degradation=degradation,
-                         electrode_SOC_solver=electrode_soc_solver)
+            if (checkpoint_control is not None) and checkpoint_control.is_due():
+                self._save_checkpoint(checkpoint_control=checkpoint_control, cycler=custom_cycler_instance,
+                                      settings=settings,
+                                      position={'cap': cap, 'cap_charge': cap_charge, 'cap_discharge': cap_discharge,
+                                                't_prev': t_prev})
 
-        if electrode_soc_solver == 'poly':
-            self.soc_solver_p = PolynomialApproximation(c_init=self.b_cell.elec_p.SOC * self.b_cell.elec_p.max_conc,
-                                                        electrode_type='p')
-            self.soc_solver_n = PolynomialApproximation(c_init=self.b_cell.elec_n.SOC * self.b_cell.elec_n.max_conc,
-                                                        electrode_type='n')
+        return self._create_solution(sol_name=sol_name, save_csv_dir=save_csv_dir)
 
-    def solve_one_iteration(self):
-        pass
 
-    def solver(self, cycling_step: BaseCycler, dt: float = 0.1) -> npt.ArrayLike:
-        step_completed: bool = False
+class eSPSolver(SPPySolver):
+    """
+    Solver for performing simulations using single-particle model with electrolyte dynamics (SPMe) [1].
+    The electrolyte concentration across the battery cell thickness is solved using the finite volume method
+    (ElectrolyteConcFVMSolver) with the uniform molar fluxes of the single particle model as its source terms. The
+    electrode overpotentials use the average electrolyte concentrations of their regions, and the terminal voltage
+    includes the electrolyte concentration overpotential. The electrolyte ohmic potential drop is expressed through the
+    battery cell resistance, R_cell, so that the solver reduces to the SPPySolver for a large electrolyte diffusivity.
+    The electrolyte diffusivity is either constant or a function of the electrolyte concentration and temperature (the
+    func_D_e of the electrolyte settings or of the parameter set), see the ElectrolyteConcFVMSolver.
+    It supports the same cyclers and solve options (e.g., recording policies, adaptive time stepping, sinks, and
+    checkpoints) as the SPPySolver.
+
+    Reference:
+    [1] S. J. Moura, F. B. Argomedo, R. Klein, A. Mirtabatabaei and M. Krstic,
+    "Battery State Estimation for a Single Particle Model With Electrolyte Dynamics,"
+    in IEEE Transactions on Control Systems Technology, vol. 25, no. 2, pp. 453-468, March 2017,
+    doi: 10.1109/TCST.2016.2571663.
+    """
 
-        t_prev = 0
-        for cycle_no in cycling_step.num_cycles:
-            for step in cycling_step.cycle_steps:
-                while not step_completed:
-                    t_curr = t_prev + dt
-                    i_app = cycling_step.get_current(step_name=step, t=t_curr)
-
-                    # Calculate the electrode flux below
-                    j_p = SPMe.molar_flux_electrode(I=i_app, S=self.b_cell.elec_p.S, electrode_type='p')
-                    j_n = SPMe.molar_flux_electrode(I=i_app, S=self.b_cell.elec_n.S, electrode_type='n')
-
-                    # Solve for electrode SOC below
-                    self.b_cell.elec_p.SOC = self.SOC_solver_p(dt=dt, t_prev=t_prev, i_app=i_app,
-                                                               R=self.b_cell.elec_p.R,
-                                                               S=self.b_cell.elec_p.S,
-                                                               D_s=self.b_cell.elec_p.D,
-                                                               c_smax=self.b_cell.elec_p.max_conc)  # calc p surf SOC
-                    self.b_cell.elec_n.SOC = self.SOC_solver_n(dt=dt, t_prev=t_prev, i_app=i_app,
-                                                               R=self.b_cell.elec_n.R,
-                                                               S=self.b_cell.elec_n.S,
-                                                               D_s=self.b_cell.elec_n.D,
-                                                               c_smax=self.b_cell.elec_n.max_conc)  # calc n surf SOC
-
-                    # Solve for the electrolyte conc. below
-                    # electrolyte_co_ord = ElectrolyteFVMCoordinates(D_e=self.b_cell.electrolyte.D)
+    def __init__(self, b_cell: BatteryCell, isothermal: bool = True, degradation: bool = False,
+                 electrode_soc_solver: str = 'poly', N: int = 5,
+                 electrolyte_settings: Optional[ElectrolyteSettings] = None, **electrode_SOC_solver_params):
+        """
+        eSPSolver class constructor.
+        :param b_cell: (BatteryCell) battery cell object.
+        :param isothermal: (bool) if False, the battery cell temperature is solved using the lumped thermal model.
+        :param degradation: (bool) if True, the SEI growth is solved.
+        :param electrode_soc_solver: (str) electrode SOC solver, 'poly', 'eigen', or 'cn'.
+        :param N: (int) number of terms of the Eigen Expansion Function method.
+        :param electrolyte_settings: (ElectrolyteSettings) electrolyte parameters and discretization settings. If None,
+        the default settings are used.
+        :param electrode_SOC_solver_params: additional electrode SOC solver parameters (see SPPySolver).
+        """
+        super().__init__(b_cell=b_cell, isothermal=isothermal, degradation=degradation, N=N,
+                         electrode_SOC_solver=electrode_soc_solver, **electrode_SOC_solver_params)
+        if electrolyte_settings is None:
+            electrolyte_settings = ElectrolyteSettings()
+        elif not isinstance(electrolyte_settings, ElectrolyteSettings):
+            raise TypeError("electrolyte_settings needs to be an ElectrolyteSettings object.")
+        self.electrolyte_settings = electrolyte_settings
+
+        elec_p, elec_n, electrolyte = self.b_cell.elec_p, self.b_cell.elec_n, self.b_cell.electrolyte
+        epsilon_en = 1 - elec_n.epsilon if electrolyte_settings.epsilon_en is None else electrolyte_settings.epsilon_en
+        epsilon_ep = 1 - elec_p.epsilon if electrolyte_settings.epsilon_ep is None else electrolyte_settings.epsilon_ep
+        self.co_ords = ElectrolyteFVMCoordinates(D_e=electrolyte_settings.D_e, epsilon_ep=epsilon_ep,
+                                                 epsilon_esep=electrolyte.epsilon, epsilon_en=epsilon_en,
+                                                 brugg=electrolyte.brugg, L_p=elec_p.L, L_s=electrolyte.L,
+                                                 L_n=elec_n.L, num_grid_p=electrolyte_settings.num_grid_p,
+                                                 num_grid_s=electrolyte_settings.num_grid_s,
+                                                 num_grid_n=electrolyte_settings.num_grid_n)
+        func_D_e = electrolyte.func_D_e if electrolyte_settings.func_D_e is None else electrolyte_settings.func_D_e
+        self.electrolyte_solver = ElectrolyteConcFVMSolver(co_ords=self.co_ords, transference=electrolyte_settings.t_c,
+                                                           face_mean=electrolyte_settings.face_mean,
+                                                           func_D_e=func_D_e,
+                                                           nonlinear_method=electrolyte_settings.nonlinear_method,
+                                                           max_iter=electrolyte_settings.max_iter,
+                                                           tol=electrolyte_settings.tol)
+
+        # The specific interfacial areas are calculated from the electroactive areas so that the lithium-ion flux
+        # into the electrolyte equals the applied current.
+        num_n, num_s = len(self.co_ords.array_x_n), len(self.co_ords.array_x_s)
+        self._slice_n = slice(0, num_n)
+        self._slice_p = slice(num_n + num_s, len(self.co_ords.array_x))
+        self._array_a_s = np.zeros(len(self.co_ords.array_x))
+        self._array_a_s[self._slice_n] = elec_n.S / (elec_n.A * elec_n.L)
+        self._array_a_s[self._slice_p] = elec_p.S / (elec_p.A * elec_p.L)
+
+        self.array_c_e = electrolyte.conc * np.ones(len(self.co_ords.array_x))  # electrolyte conc. [mol/m3]
+
+    def solve_electrolyte_one_step(self, dt: float, I_p_i: float, I_n_i: float) -> None:
+        """
+        Solves for the electrolyte concentration at the end of the time step.
+        :param dt: time step [s]
+        :param I_p_i: positive electrode intercalation current [A]
+        :param I_n_i: negative electrode intercalation current [A]
+        """
+        array_j = np.zeros(len(self.co_ords.array_x))
+        array_j[self._slice_n] = SPMe.molar_flux_electrode(I=I_n_i, S=self.b_cell.elec_n.S, electrode_type='n')
+        array_j[self._slice_p] = SPMe.molar_flux_electrode(I=I_p_i, S=self.b_cell.elec_p.S, electrode_type='p')
+        array_c_e = self.electrolyte_solver.solve_ce(c_prev=self.array_c_e, j=array_j, dt=dt, a_s=self._array_a_s,
+                                                     temp=self.b_cell.T)
+        if array_c_e[self._slice_n].min() <= 0:
+            raise InvalidElectrolyteConcException('n')
+        if array_c_e[self._slice_p].min() <= 0:
+            raise InvalidElectrolyteConcException('p')
+        self.array_c_e = array_c_e
 
+    def calc_terminal_potential(self, I_p_i, I_n_i):
+        """
+        Returns the terminal potential [V]
+        :param I_p_i: positive electrode intercalation current [A]
+        :param I_n_i: negative electrode intercalation current [A]
+        :return: (float) battery cell terminal potential [V]
+        """
+        elec_p, elec_n, electrolyte = self.b_cell.elec_p, self.b_cell.elec_n, self.b_cell.electrolyte
+        i_0_p = SPMe.i_0(k=elec_p.k, c_s_max=elec_p.max_conc, c_e=np.mean(self.array_c_e[self._slice_p]),
+                         soc_surf=elec_p.SOC)
+        i_0_n = SPMe.i_0(k=elec_n.k, c_s_max=elec_n.max_conc, c_e=np.mean(self.array_c_e[self._slice_n]),
+                         soc_surf=elec_n.SOC)
+        eta_p = SPMe.eta(temp=self.b_cell.T, i_0_=i_0_p,
+                         j=SPMe.molar_flux_electrode(I=I_p_i, S=elec_p.S, electrode_type='p'))
+        eta_n = SPMe.eta(temp=self.b_cell.T, i_0_=i_0_n,
+                         j=SPMe.molar_flux_electrode(I=I_n_i, S=elec_n.S, electrode_type='n'))
+        # effective electrolyte conductivity that gives the battery cell resistance.
+        kappa_eff_avg = (elec_p.L + 2 * electrolyte.L + elec_n.L) / (2 * elec_n.A * self.b_cell.R_cell)
+        return SPMe.calc_terminal_voltage(ocp_p=elec_p.OCP, ocp_n=elec_n.OCP, eta_p=eta_p, eta_n=eta_n,
+                                          l_p=elec_p.L, l_sep=electrolyte.L, l_n=elec_n.L,
+                                          battery_cross_area=elec_n.A, kappa_eff_avg=kappa_eff_avg,
+                                          k_f_avg=self.electrolyte_settings.k_f_avg,
+                                          t_c=self.electrolyte_settings.t_c, R_p=0.0, R_n=0.0,
+                                          S_n=elec_n.S, S_p=elec_p.S,
+                                          c_e_n=self.array_c_e[0], c_e_p=self.array_c_e[-1],
+                                          temp=self.b_cell.T, i_app=I_p_i)
+
+    def get_state(self) -> dict:
+        """
+        Returns the snapshot of the states, including the electrolyte concentrations.
+        :return: (dict) dictionary containing the states.
+        """
+        return {**super().get_state(), 'array_c_e': self.array_c_e.copy()}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the states, including the electrolyte concentrations, from the snapshot.
+        :param state: snapshot returned by the get_state method.
+        """
+        super().set_state(state)
+        self.array_c_e = state['array_c_e'].copy()
@@ -0,0 +1,94 @@
+""" checkpoint
+Contains the classes and functions for checkpointing the cycling simulations so that they can be resumed after an
+interruption.
+"""
+
+__all__ = ['CheckpointControl', 'save_checkpoint', 'load_checkpoint']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+@dataclass
+class CheckpointControl:
+    """
+    Stores the settings for the periodic checkpointing of the cycling simulations. A checkpoint is written when either
+    interval_steps time steps or interval_time seconds (wall-clock) have passed since the last checkpoint. The
+    checkpoint file is replaced atomically and hence, it always contains a complete checkpoint even if the simulation
+    is interrupted while it is being written.
+    """
+    file_path: str  # path of the checkpoint file
+    interval_steps: Optional[int] = None  # number of time steps between the checkpoints
+    interval_time: Optional[float] = None  # wall-clock time between the checkpoints [s]
+    num_steps: int = field(default=0, init=False, repr=False)  # time steps since the last checkpoint
+    t_last: float = field(default=0.0, init=False, repr=False)  # wall-clock time of the last checkpoint [s]
+
+    def __post_init__(self):
+        if (self.interval_steps is None) and (self.interval_time is None):
+            raise ValueError("Either interval_steps or interval_time needs to be provided.")
+        if (self.interval_steps is not None) and ((not isinstance(self.interval_steps, int)) or
+                                                  (self.interval_steps < 1)):
+            raise ValueError("interval_steps needs to be a positive integer.")
+        if (self.interval_time is not None) and (self.interval_time <= 0):
+            raise ValueError("interval_time needs to be positive.")
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Resets the counters at the start of a simulation.
+        """
+        self.num_steps = 0
+        self.t_last = time.monotonic()
+
+    def is_due(self) -> bool:
+        """
+        Counts a time step and returns True if a checkpoint is to be written. The counters are reset when it returns
+        True.
+        :return: (bool) True if the checkpoint is due.
+        """
+        self.num_steps += 1
+        due = ((self.interval_steps is not None) and (self.num_steps >= self.interval_steps)) or \
+              ((self.interval_time is not None) and (time.monotonic() - self.t_last >= self.interval_time))
+        if due:
+            self.reset()
+        return due
+
+
+def save_checkpoint(file_path: str, checkpoint: dict) -> None:
+    """
+    Pickles the checkpoint to the file. The checkpoint is first written to a temporary file, which then atomically
+    replaces the checkpoint file.
+    :param file_path: (str) path of the checkpoint file.
+    :param checkpoint: (dict) picklable dictionary containing the checkpoint.
+    """
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'format_version': CHECKPOINT_FORMAT_VERSION, **checkpoint}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+
+def load_checkpoint(file_path: str) -> dict:
+    """
+    Loads the checkpoint from the file.
+    :param file_path: (str) path of the checkpoint file.
+    :return: (dict) dictionary containing the checkpoint.
+    """
+    with open(file_path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('format_version') != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"{file_path} is not a supported checkpoint file.")
+    return checkpoint
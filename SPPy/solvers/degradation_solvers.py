@@ -31,6 +31,22 @@ class ROMSEISolver(ROMSEI):
         self.J_s = 0  # SEI side reaction flux [mol/m2/s], initialized to zero
         self.cumulative_J_s = 0  # cumulative SEI side reaction flux [mol/m2], initialized to zero.
 
+    def get_state(self) -> dict:
+        """
+        Returns the SEI thickness and the lithium-ion fluxes, which are advanced by the time steps.
+        :return: (dict) dictionary containing the states.
+        """
+        return {'L': self.L, 'J_tot': self.J_tot, 'J_i': self.J_i, 'J_s': self.J_s,
+                'cumulative_J_s': self.cumulative_J_s}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the states from the snapshot returned by the get_state method.
+        :param state: (dict) snapshot returned by the get_state method.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def solve_current(self, SOC_n: float, OCP_n: float, temp: float, I: float, rel_tol: float = 1e-6,
                       max_iter_no: int = 10):
         """
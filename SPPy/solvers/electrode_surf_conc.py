@@ -3,24 +3,113 @@ __copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
 __status__ = 'deployed'
 
 
-from typing import Callable
+from typing import Callable, Optional
+import threading
+
 import numpy as np
 import numpy.typing as npt
 from scipy.optimize import bisect
+from scipy.linalg import lu_factor, lu_solve
 
 from SPPy.calc_helpers.constants import Constants
 from SPPy.calc_helpers import ode_solvers
+from SPPy.calc_helpers.tridiagonal import TridiagonalSolver
 from SPPy.warnings_and_exceptions.custom_exceptions import InvalidElectrodeType
 from SPPy.models.battery import SPM
 
 
 class BaseElectrodeConcSolver:
+    state_attrs = ()  # names of the attributes advanced by the time steps
+
     def __init__(self, electrode_type: str):
         if electrode_type == 'p' or electrode_type == 'n':
             self.electrode_type = electrode_type  # either positive electrode ('p') or negative electrode ('n').
         else:
             raise InvalidElectrodeType
 
+    @staticmethod
+    def _copy_state(value):
+        if isinstance(value, list):
+            return list(value)
+        elif isinstance(value, np.ndarray):
+            return value.copy()
+        return value
+
+    def get_state(self) -> dict:
+        """
+        Returns the copies of the attributes advanced by the time steps. The cached variables (e.g., the LHS matrix
+        factorizations or the exponential factors) are not part of the snapshot.
+        :return: (dict) dictionary containing the states.
+        """
+        return {name: self._copy_state(getattr(self, name)) for name in self.state_attrs}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the states from the snapshot returned by the get_state method. The snapshot remains unchanged and
+        hence can be restored multiple times.
+        :param state: (dict) snapshot returned by the get_state method.
+        """
+        for name, value in state.items():
+            setattr(self, name, self._copy_state(value))
+
+
+class EigenvalueTable:
+    """
+    Process-wide table of the eigenvalues of the algebraic equation, sin(lambda) - lambda * cos(lambda) = 0, used by
+    the Eigen Function Expansion method. The kth eigenvalue lies within (pi * (1 + k), pi * (2 + k)) and is solved
+    using the bisect method. The table is shared by all the EigenFuncExp instances and is lazily extended when a larger
+    number of eigenvalues is requested. The extension of the table is protected by a lock so that the table can be
+    used from multiple threads.
+    """
+    _lst_roots = []  # eigenvalues calculated so far
+    _array_roots = np.array([])  # eigenvalues as a read-only numpy array
+    _lock = threading.Lock()
+
+    @staticmethod
+    def lambda_func(lambda_k) -> float:
+        """
+        Algebraic equation from which the eigenvalues can be calculated.
+        :param lambda_k: (float) eigen value ot the kth term.
+        :return: (float) the value of the elgebraic equation.
+        """
+        return np.sin(lambda_k) - lambda_k * np.cos(lambda_k)
+
+    @classmethod
+    def _extend(cls, n: int) -> None:
+        """
+        Extends the table such that it contains atleast n eigenvalues.
+        :param n: (int) number of eigenvalues.
+        """
+        with cls._lock:
+            if len(cls._lst_roots) < n:
+                lst_roots = cls._lst_roots + [bisect(cls.lambda_func, np.pi * (1 + k), np.pi * (2 + k))
+                                              for k in range(len(cls._lst_roots), n)]
+                array_roots = np.array(lst_roots)
+                array_roots.flags.writeable = False
+                cls._lst_roots, cls._array_roots = lst_roots, array_roots
+
+    @classmethod
+    def roots(cls, n: int) -> list:
+        """
+        Returns the first n eigenvalues as a list.
+        :param n: (int) number of eigenvalues.
+        :return: (list) list of the eigenvalues.
+        """
+        if len(cls._lst_roots) < n:
+            cls._extend(n)
+        return cls._lst_roots[:n]
+
+    @classmethod
+    def array_roots(cls, n: int) -> npt.ArrayLike:
+        """
+        Returns the first n eigenvalues as a read-only numpy array.
+        :param n: (int) number of eigenvalues.
+        :return: (npt.ArrayLike) array of the eigenvalues.
+        """
+        if len(cls._array_roots) < n:
+            cls._extend(n)
+        return cls._array_roots[:n]
+
 
 class EigenFuncExp(BaseElectrodeConcSolver):
     """
@@ -35,18 +124,47 @@ class EigenFuncExp(BaseElectrodeConcSolver):
     In the above equation, the integration is performed from t=0 to the current time. Moreover, the summation is
     performed from k=1 to k=N. Here k represents the kth term of the solution series.
 
+    The eigenfunction ODEs, du_k/dt = -(lambda_k^2 * D / R^2) * u_k + 2 * D * j_scaled / R^2, are solved using either
+    the rk4 ODE solver ('rk4') or their exact discrete-time update ('exact'). As the ODEs are linear with constant
+    coefficients over a time step, the latter is
+        u_k = u_k_prev * exp(-lambda_k^2 * D * dt / R^2) + (2 * j_scaled / lambda_k^2) * (1 - exp(-lambda_k^2 * D * dt / R^2))
+    which is evaluated for all the terms in a single numpy operation and remains stable at large time steps.
+
     Reference:
     1. Guo, M., Sikha, G., & White, R. E. (2011). Single-Particle Model for a Lithium-Ion Cell: Thermal Behavior.
     Journal of The Electrochemical Society, 158(2), A122. https://doi.org/10.1149/1.3521314/XML
     """
 
-    def __init__(self, x_init: float, n: int, electrode_type: str):
+    state_attrs = ('lst_u_k', 'integ_term')
+
+    def __init__(self, x_init: float, n: int, electrode_type: str, method: str = 'rk4'):
+        """
+        EigenFuncExp class constructor.
+        :param x_init: initial electrode SOC
+        :param n: number of terms in the solution series
+        :param electrode_type: positive electrode ('p') or negative electrode ('n')
+        :param method: solution method of the eigenfunction ODEs, either rk4 ODE solver ('rk4') or the exact
+        exponential update ('exact').
+        """
+        if (method != 'rk4') and (method != 'exact'):
+            raise ValueError("method needs to be either 'rk4' or 'exact'.")
         self.x_init_ = x_init  # initial electrode SOC
         self.N_ = n  # the number of terms in the solution series
+        self.method = method
 
         self.integ_term = 0  # the integration term, which is initialized as zero
-        self.lst_u_k = [0 for i in range(self.N)]  # a list of solved values of eigenfunctions, the values of which are
-        # all initialized to zero.
+        if (self.method == 'rk4') and (np.ndim(x_init) == 0):
+            self.lst_u_k = [0 for i in range(self.N)]  # a list of solved values of eigenfunctions, the values of which
+            # are all initialized to zero.
+        else:
+            # the eigenfunction values are stored in an array with the solution terms along the first axis.
+            self.lst_u_k = np.zeros((self.N,) + np.shape(x_init))
+
+        # cached variables for the exact update, which are recalculated only when the dt, D, or R changes.
+        self.exp_factor_key_ = None
+        self.exp_factors_ = None
+
+        self.integrator_ = None  # tuple of the state-vector integrator and the name of the eigenfunction block
 
         super().__init__(electrode_type=electrode_type)
 
@@ -85,12 +203,11 @@ class EigenFuncExp(BaseElectrodeConcSolver):
     @property
     def lambda_roots(self) -> npt.ArrayLike:
         """
-        Uses the bisect method to solve for the eigenvalue algebraic equation within the bounds.
+        Returns the eigenvalues for all the solution terms from the shared eigenvalue table. The eigenvalues are solved
+        using the bisect method within the bounds only once per process.
         :return: (list) list containing the eigenvalues for all solution terms.
         """
-        bounds = self.lambda_bounds()
-        return [bisect(self.lambda_func, bounds[k][0], bounds[k][1]) for k in range(self.N)]  # k refers to the kth
-        # term of the series
+        return EigenvalueTable.roots(self.N)
 
     def j_scaled(self, i_app, R, S, D_s, c_smax) -> float:
         """
@@ -124,6 +241,21 @@ class EigenFuncExp(BaseElectrodeConcSolver):
             return -(lambda_k ** 2) * D * x / (R ** 2) + 2 * D * scaled_flux / (R ** 2)
         return u_k_odeFunc
 
+    @staticmethod
+    def rhs_u_k(u_k, t, lambda_sq, D, R, scaled_flux):
+        """
+        Right-hand side of the eigenfunction odes. It takes the array of the eigenfunctions and evaluates the odes of
+        all the solution terms at once.
+        :param u_k: eigenfunction values
+        :param t: time [s]
+        :param lambda_sq: squared eigenvalues, broadcastable to u_k
+        :param D: diffusivity [m2/s]
+        :param R: electrode particle radius [m]
+        :param scaled_flux: dimensionless scaled lithium-ion flux
+        :return: time derivatives of the eigenfunctions
+        """
+        return -lambda_sq * D * u_k / (R ** 2) + 2 * D * scaled_flux / (R ** 2)
+
     def solve_u_k(self, root_value, t_prev, dt, u_k_prev, i_app, R, S, D_s, c_smax) -> float:
         """
         Calculates the eigenfunction value from the eigen values using the ode function. This ode function is solved
@@ -135,8 +267,55 @@ class EigenFuncExp(BaseElectrodeConcSolver):
         :return:
         """
         j_scaled_ = self.j_scaled(i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
-        u_k_p_func = self.u_k_expression(lambda_k=root_value, D=D_s, R=R, scaled_flux=j_scaled_)
-        return ode_solvers.rk4(func=u_k_p_func, t_prev=t_prev, y_prev=u_k_prev, step_size=dt)
+        return ode_solvers.rk4(func=self.rhs_u_k, t_prev=t_prev, y_prev=u_k_prev, step_size=dt,
+                               args=(root_value ** 2, D_s, R, j_scaled_))
+
+    @staticmethod
+    def _is_same_value(value1, value2) -> bool:
+        """
+        Checks if the two (scalar or array) values are identical.
+        """
+        return (value1 is value2) or np.array_equal(value1, value2)
+
+    def exp_factors(self, dt, D, R) -> npt.ArrayLike:
+        """
+        Returns the exponential factors, exp(-lambda_k^2 * D * dt / R^2), of all the solution terms. The factors are
+        cached and recalculated only when the dt, D, or R changes.
+        :param dt: time difference between the current and previous time steps [s].
+        :param D: diffusivity [m2/s]
+        :param R: electrode particle radius [m]
+        :return: (npt.ArrayLike) array of the exponential factors with the solution terms along the first axis.
+        """
+        key = (dt, D, R)
+        if (self.exp_factor_key_ is None) or \
+                (not all(self._is_same_value(v1, v2) for v1, v2 in zip(key, self.exp_factor_key_))):
+            scaled_dt = np.asarray(D * dt / (R ** 2))
+            lambda_sq = self.array_roots.reshape((self.N,) + (1,) * scaled_dt.ndim) ** 2
+            self.exp_factors_ = np.exp(-lambda_sq * scaled_dt)
+            self.exp_factor_key_ = tuple(np.copy(v) if isinstance(v, np.ndarray) else v for v in key)
+        return self.exp_factors_
+
+    @property
+    def array_roots(self) -> npt.ArrayLike:
+        """
+        Eigenvalues of all the solution terms as a numpy array.
+        :return: (npt.ArrayLike) array of the eigenvalues.
+        """
+        return EigenvalueTable.array_roots(self.N)
+
+    def get_summation_term_exact(self, dt, i_app, R, S, D_s, c_smax) -> float:
+        """
+        Calculates and returns the summation term of the Eigen Expansion equation using the exact update of the
+        eigenfunctions.
+        :param dt: time difference between the current and previous time steps [s].
+        :return: the summation term.
+        """
+        j_scaled_ = self.j_scaled(i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
+        exp_factors = self.exp_factors(dt=dt, D=D_s, R=R)
+        lambda_sq = self.array_roots.reshape((self.N,) + (1,) * (exp_factors.ndim - 1)) ** 2
+        u_k_steady = 2 * j_scaled_ / lambda_sq
+        self.lst_u_k = self.lst_u_k * exp_factors + u_k_steady * (1 - exp_factors)
+        return np.sum(self.lst_u_k - u_k_steady, axis=0)
 
     def get_summation_term(self, dt, t_prev, i_app, R, S, D_s, c_smax) -> float:
         """
@@ -146,15 +325,22 @@ class EigenFuncExp(BaseElectrodeConcSolver):
         :param j_scaled:
         :return:
         """
-        sum_term = 0
-        # Solve for the eigenfunction for all roots using the iteration below:
+        if self.method == 'exact':
+            return self.get_summation_term_exact(dt=dt, i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
+
         j_scaled_ = self.j_scaled(i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
-        for iter_root, root_value in enumerate(self.lambda_roots):
-            self.lst_u_k[iter_root] = self.solve_u_k(root_value=root_value, t_prev=t_prev,
-                                                     u_k_prev=self.lst_u_k[iter_root], dt=dt,
-                                                     i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
-            sum_term += self.lst_u_k[iter_root] - (2 * j_scaled_ / (root_value ** 2))
-        return sum_term
+        if isinstance(self.lst_u_k, list):
+            # the eigenfunctions of a single battery cell are faster to solve as floats than as a small numpy array.
+            self.lst_u_k = [ode_solvers.rk4(func=self.rhs_u_k, t_prev=t_prev, y_prev=u_k_prev, step_size=dt,
+                                            args=(root_value ** 2, D_s, R, j_scaled_))
+                            for u_k_prev, root_value in zip(self.lst_u_k, self.lambda_roots)]
+            return sum(u_k - 2 * j_scaled_ / (root_value ** 2)
+                       for u_k, root_value in zip(self.lst_u_k, self.lambda_roots))
+        # Solve for the eigenfunctions of all roots (and battery cells) in a single rk4 call:
+        lambda_sq = self.array_roots.reshape((self.N,) + (1,) * (self.lst_u_k.ndim - 1)) ** 2
+        self.lst_u_k = ode_solvers.rk4(func=self.rhs_u_k, t_prev=t_prev, y_prev=self.lst_u_k, step_size=dt,
+                                       args=(lambda_sq, D_s, R, j_scaled_))
+        return np.sum(self.lst_u_k - 2 * j_scaled_ / lambda_sq, axis=0)
 
     def calc_SOC_surf(self, dt, t_prev, i_app, R, S, D_s, c_smax) -> float:
         """
@@ -168,6 +354,52 @@ class EigenFuncExp(BaseElectrodeConcSolver):
         self.update_integ_term(dt=dt, i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
         return self.x_init + j_scaled_ / 5 + self.integ_term + sum_term
 
+    def register_states(self, integrator: ode_solvers.StateVectorIntegrator, name: str) -> None:
+        """
+        Registers the eigenfunctions as a state block of the state-vector integrator, which then advances them together
+        with the other registered states. The time step is then performed using the set_state_args method, the
+        integrator's step method, and the calc_SOC_surf_from_states method. With the exact method, there are no states
+        to integrate and the eigenfunctions are updated in the calc_SOC_surf_from_states method.
+        :param integrator: (StateVectorIntegrator) state-vector integrator.
+        :param name: (str) name of the eigenfunction block.
+        """
+        if self.method == 'rk4':
+            if isinstance(self.lst_u_k, list):
+                raise ValueError("The state-vector integrator requires the array form of the eigenfunctions.")
+            integrator.register(name=name, func_rhs=self.rhs_u_k, y_init=self.lst_u_k)
+        self.integrator_ = (integrator, name)
+
+    def _lambda_sq(self) -> npt.ArrayLike:
+        """
+        Squared eigenvalues, which broadcast to the array of the eigenfunctions.
+        """
+        return self.array_roots.reshape((self.N,) + (1,) * (np.ndim(self.lst_u_k) - 1)) ** 2
+
+    def set_state_args(self, i_app, R, S, D_s, c_smax) -> None:
+        """
+        Sets the arguments of the eigenfunction odes in the state-vector integrator for the upcoming time step.
+        """
+        if self.method == 'rk4':
+            integrator, name = self.integrator_
+            integrator.set_args(name, self._lambda_sq(), D_s, R,
+                                self.j_scaled(i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax))
+
+    def calc_SOC_surf_from_states(self, dt, t_prev, i_app, R, S, D_s, c_smax) -> float:
+        """
+        Calculates the electrode surface SOC once the state-vector integrator has advanced the eigenfunctions.
+        :param dt: The time difference between the current and the previous time steps [s].
+        :param t_prev: Time value of the previous time step [s].
+        :return: (float) The electrode's surface SOC.
+        """
+        if self.method == 'exact':
+            return self.calc_SOC_surf(dt=dt, t_prev=t_prev, i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
+        integrator, name = self.integrator_
+        self.lst_u_k = integrator[name]
+        j_scaled_ = self.j_scaled(i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
+        sum_term = np.sum(self.lst_u_k - 2 * j_scaled_ / self._lambda_sq(), axis=0)
+        self.update_integ_term(dt=dt, i_app=i_app, R=R, S=S, D_s=D_s, c_smax=c_smax)
+        return self.x_init + j_scaled_ / 5 + self.integ_term + sum_term
+
     def __call__(self, dt, t_prev, i_app, R, S, D_s, c_smax) -> float:
         """
         This method calculates the electrode surface SOC
@@ -194,11 +426,22 @@ class CNSolver(BaseElectrodeConcSolver):
     with BC:
     dx/dr_scaled = 0 at r_scaled=0
     dx/dr_scaled = -jR/D*c_smax at r_scaled=1
+
+    The LHS matrix only depends on dt, R, and D. Hence, its diagonals and the factorization used by the solver method
+    are cached and only recalculated when any of these change. In case D changes at every time step (e.g., the
+    non-isothermal simulations), the caching can be turned off using the cache_LHS argument.
     """
-    def __init__(self, c_init: float, electrode_type: str, spatial_grid_points: int = 100):
+    state_attrs = ('c_prev',)
+
+    def __init__(self, c_init: float, electrode_type: str, spatial_grid_points: int = 100, cache_LHS: bool = True):
         super().__init__(electrode_type=electrode_type)
         self.K = spatial_grid_points  # number of spatial grid points
         self.c_prev = c_init * np.ones(self.K).reshape(-1, 1)  # column vector used for storing concentrations at t_prev
+        self.cache_LHS = cache_LHS  # if True, the LHS matrix variables are cached
+
+        self.array_R_cache_ = (None, None)  # tuple of the particle radius and its radial grid points
+        self.LHS_key_ = None  # (dt, R, D) values of the cached LHS matrix
+        self.LHS_cache_ = {}  # cached diagonals, matrix, and factorizations of the LHS matrix
 
     def dr(self, R: float) -> float:
         """
@@ -227,7 +470,11 @@ class CNSolver(BaseElectrodeConcSolver):
         Array containing the values of r at every grid point.
         :return: Array containing the values of r at every grid point.
         """
-        return np.linspace(0, R, self.K)
+        if self.array_R_cache_[0] != R:
+            array_R = np.linspace(0, R, self.K)
+            array_R.flags.writeable = False
+            self.array_R_cache_ = (R, array_R)
+        return self.array_R_cache_[1]
 
     def _LHS_diag_elements(self, dt: float, R: float, D: float) -> npt.ArrayLike:
         A_ = self.A(dt=dt, R=R, D=D)
@@ -255,18 +502,42 @@ class CNSolver(BaseElectrodeConcSolver):
                np.diag(self._LHS_lower_diag(dt=dt, R=R, D=D), -1) + \
                np.diag(self._LHS_upper_diag(dt=dt, R=R, D=D), 1)
 
+    def LHS_cache(self, dt: float, R: float, D: float, solver_method: Optional[str] = None) -> dict:
+        """
+        Returns the dictionary containing the diagonals ('l_diag', 'diag', 'u_diag') of the LHS matrix and the
+        variables needed by the solver method: the matrix ('M') for 'inverse', the matrix and its LU factorization
+        ('LU') for 'LU', and the tridiagonal factorization ('TDMA') for 'TDMA'. The variables are only calculated when
+        first needed and recalculated when the dt, R, or D changes.
+        :param dt: (float) time difference [s]
+        :param R: (float) electrode particle radius [m]
+        :param D: (float) electrode diffusivity [m2/s]
+        :param solver_method: (str) 'inverse', 'TDMA', 'LU', or None (only the diagonals).
+        :return: (dict) dictionary containing the LHS matrix variables.
+        """
+        if (not self.cache_LHS) or (self.LHS_key_ != (dt, R, D)):
+            self.LHS_cache_ = {'l_diag': self._LHS_lower_diag(dt=dt, R=R, D=D),
+                               'diag': self._LHS_diag_elements(dt=dt, R=R, D=D),
+                               'u_diag': self._LHS_upper_diag(dt=dt, R=R, D=D)}
+            self.LHS_key_ = (dt, R, D) if self.cache_LHS else None
+        LHS = self.LHS_cache_
+        if (solver_method in ('inverse', 'LU')) and ('M' not in LHS):
+            LHS['M'] = np.diag(LHS['diag']) + np.diag(LHS['l_diag'], -1) + np.diag(LHS['u_diag'], 1)
+        if (solver_method == 'LU') and ('LU' not in LHS):
+            LHS['LU'] = lu_factor(LHS['M'])
+        elif (solver_method == 'TDMA') and ('TDMA' not in LHS):
+            LHS['TDMA'] = TridiagonalSolver(l_diag=LHS['l_diag'], diag=LHS['diag'], u_diag=LHS['u_diag'])
+        return LHS
+
     def _RHS_array(self, j: float, dt: float, R: float, D: float):
         A_ = self.A(dt=dt, R=R, D=D)
         B_ = self.B(dt=dt, R=R, D=D)
-        array_c_temp = np.zeros(self.K).reshape(-1,1)
-        array_c_temp[0][0] = (1-3*A_)*self.c_prev[0][0] + 3*A_*self.c_prev[1][0]  # for the symmetry boundary condition
-        # at r=0
-        array_c_temp[-1][0] = (1-A_) * self.c_prev[-1][0] - (A_+B_/R) * (2*self.dr(R=R)*j/D) + \
-                              A_ * self.c_prev[-2][0]  # for the boundary condition at r=R
-        for i in range(1, len(array_c_temp) - 1):
-            array_c_temp[i][0] = (1 - A_) * self.c_prev[i][0] + \
-                                 (A_ / 2 + B_ / self.array_R(R=R)[i]) * self.c_prev[i + 1][0] + \
-                                 (A_ / 2 - B_ / self.array_R(R=R)[i]) * self.c_prev[i - 1][0]
+        c_prev = self.c_prev[:, 0]
+        B_r = B_ / self.array_R(R=R)[1:-1]
+        array_c_temp = np.empty((self.K, 1))
+        array_c_temp[0, 0] = (1-3*A_)*c_prev[0] + 3*A_*c_prev[1]  # for the symmetry boundary condition at r=0
+        array_c_temp[-1, 0] = (1-A_) * c_prev[-1] - (A_+B_/R) * (2*self.dr(R=R)*j/D) + \
+                              A_ * c_prev[-2]  # for the boundary condition at r=R
+        array_c_temp[1:-1, 0] = (1 - A_) * c_prev[1:-1] + (A_ / 2 + B_r) * c_prev[2:] + (A_ / 2 - B_r) * c_prev[:-2]
         return array_c_temp
 
     def solve(self, dt: float, i_app: float, R: float, S: float, D: float, solver_method:str):
@@ -277,21 +548,26 @@ class CNSolver(BaseElectrodeConcSolver):
         :param dt: (float) time difference [s]
         :param R: (float) electrode particle radius [m]
         :param D: (float) electrode diffusivity [m2/s]
+        :param solver_method: (str) matrix inverse ('inverse'), TDMA ('TDMA'), or the cached LU factorization ('LU').
         :return:
         """
         j = SPM.molar_flux_electrode(I=i_app, S=S, electrode_type=self.electrode_type)
+        LHS = self.LHS_cache(dt=dt, R=R, D=D, solver_method=solver_method)
         if solver_method == "inverse":
-            self.c_prev = np.linalg.inv(self.M(dt=dt, R=R, D=D)) @ self._RHS_array(j=j, dt=dt, R=R, D=D)
+            self.c_prev = np.linalg.inv(LHS['M']) @ self._RHS_array(j=j, dt=dt, R=R, D=D)
         elif solver_method == "TDMA":
-            self.c_prev = ode_solvers.TDMAsolver(l_diag=self._LHS_lower_diag(dt=dt, R=R, D=D),
-                                                 diag=self._LHS_diag_elements(dt=dt, R=R, D=D),
-                                                 u_diag=self._LHS_upper_diag(dt=dt, R=R, D=D),
-                                                 col_vec=self._RHS_array(j=j, dt=dt, R=R, D=D)).flatten().reshape(-1, 1)
+            self.c_prev = LHS['TDMA'].solve(self._RHS_array(j=j, dt=dt, R=R, D=D).flatten()).reshape(-1, 1)
+        elif solver_method == "LU":
+            self.c_prev = lu_solve(LHS['LU'], self._RHS_array(j=j, dt=dt, R=R, D=D))
+        else:
+            raise ValueError("solver_method needs to be either 'inverse', 'TDMA', or 'LU'.")
 
     def __call__(self, dt: float, t_prev: float, i_app:float, R: float, S:float, D_s: float, c_smax: float,
                  solver_method: str = "TDMA") -> float:
         """
         Returns the electrode surface SOC
+        :param solver_method: (str) the cached tridiagonal factorization ('TDMA'), which is the fastest, the dense LU
+        factorization ('LU'), or the matrix inverse ('inverse').
         """
         self.solve(dt=dt, i_app=i_app, R=R, S=S, D=D_s, solver_method=solver_method)
         return self.c_prev[-1][0] / c_smax
@@ -316,8 +592,11 @@ class PolynomialApproximation(BaseElectrodeConcSolver):
             self.type = type
         else:
             raise ValueError(f"{type} is not recognized as a solver type")
+        self.state_attrs = ('c_s_avg_prev', 'c_surf')
         if self.type == 'higher':
             self.q = 0
+            self.state_attrs += ('q',)
+        self.integrator_ = None  # tuple of the state-vector integrator and the name prefix of the state blocks
 
     def func_c_s_avg(self, j: float, R: float) -> Callable:
         def wrapper(r, t):
@@ -329,16 +608,67 @@ class PolynomialApproximation(BaseElectrodeConcSolver):
             return -30 * (D/R**2) * x - (45*j/(2 * R**2))
         return wrapper
 
-    def solve(self, dt: float, t_prev: float, i_app: float, R: float, S: float, D: float):
-        j = SPM.molar_flux_electrode(I=i_app, S=S, electrode_type=self.electrode_type)
-        self.c_s_avg_prev = ode_solvers.rk4(func=self.func_c_s_avg(j=j, R=R), t_prev=t_prev,
-                                             y_prev=self.c_s_avg_prev, step_size=dt)
+    @staticmethod
+    def rhs_c_s_avg(c_s_avg, t, j, R):
+        return -3 * j / R
+
+    @staticmethod
+    def rhs_q(q, t, j, R, D):
+        return -30 * (D/R**2) * q - (45*j/(2 * R**2))
+
+    def _update_c_surf(self, j: float, R: float, D: float) -> None:
         if self.type != 'two':
-            self.q = ode_solvers.rk4(self.func_q(j=j, R=R, D=D), t_prev=t_prev, y_prev=self.q, step_size=dt)
             self.c_surf = -(j*R)/(35*D) + 8 * R * self.q / 35 + self.c_s_avg_prev
         else:
             self.c_surf = -(R/D) * (j/5) + self.c_s_avg_prev
 
+    def solve(self, dt: float, t_prev: float, i_app: float, R: float, S: float, D: float):
+        j = SPM.molar_flux_electrode(I=i_app, S=S, electrode_type=self.electrode_type)
+        self.c_s_avg_prev = ode_solvers.rk4(func=self.rhs_c_s_avg, t_prev=t_prev, y_prev=self.c_s_avg_prev,
+                                            step_size=dt, args=(j, R))
+        if self.type != 'two':
+            self.q = ode_solvers.rk4(func=self.rhs_q, t_prev=t_prev, y_prev=self.q, step_size=dt, args=(j, R, D))
+        self._update_c_surf(j=j, R=R, D=D)
+
+    def register_states(self, integrator: ode_solvers.StateVectorIntegrator, name: str) -> None:
+        """
+        Registers the volume-averaged concentration (and the volume-averaged concentration flux for the 'higher' type)
+        as the state blocks '<name>_c_s_avg' (and '<name>_q') of the state-vector integrator, which then advances them
+        together with the other registered states. The time step is then performed using the set_state_args method,
+        the integrator's step method, and the calc_SOC_surf_from_states method.
+        :param integrator: (StateVectorIntegrator) state-vector integrator.
+        :param name: (str) name prefix of the state blocks.
+        """
+        integrator.register(name=name + '_c_s_avg', func_rhs=self.rhs_c_s_avg,
+                            y_init=np.broadcast_to(self.c_s_avg_prev, integrator.batch_shape))
+        if self.type != 'two':
+            integrator.register(name=name + '_q', func_rhs=self.rhs_q,
+                                y_init=np.broadcast_to(self.q, integrator.batch_shape))
+        self.integrator_ = (integrator, name)
+
+    def set_state_args(self, i_app: float, R: float, S: float, D_s: float, c_smax: float) -> None:
+        """
+        Sets the arguments of the odes in the state-vector integrator for the upcoming time step.
+        """
+        integrator, name = self.integrator_
+        j = SPM.molar_flux_electrode(I=i_app, S=S, electrode_type=self.electrode_type)
+        integrator.set_args(name + '_c_s_avg', j, R)
+        if self.type != 'two':
+            integrator.set_args(name + '_q', j, R, D_s)
+
+    def calc_SOC_surf_from_states(self, dt: float, t_prev: float, i_app: float, R: float, S: float, D_s: float,
+                                  c_smax: float) -> float:
+        """
+        Calculates the electrode surface SOC once the state-vector integrator has advanced the states.
+        """
+        integrator, name = self.integrator_
+        self.c_s_avg_prev = integrator[name + '_c_s_avg']
+        if self.type != 'two':
+            self.q = integrator[name + '_q']
+        self._update_c_surf(j=SPM.molar_flux_electrode(I=i_app, S=S, electrode_type=self.electrode_type), R=R,
+                            D=D_s)
+        return self.c_surf / c_smax
+
     def __call__(self, dt: float, t_prev: float, i_app: float, R: float, S: float, D_s: float, c_smax: float) -> float:
         self.solve(dt=dt, i_app=i_app, t_prev=t_prev, R=R, S=S, D=D_s)
         return self.c_surf / c_smax
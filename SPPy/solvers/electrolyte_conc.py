@@ -1,9 +1,70 @@
+""" electrolyte_conc
+Contains the classes for the finite volume discretization and the solution of the electrolyte concentration across the
+battery cell thickness.
+"""
+
+__all__ = ['ElectrolyteSettings', 'ElectrolyteFVMCoordinates', 'ElectrolyteConcFVMSolver']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+import warnings
 from dataclasses import dataclass
+from typing import Callable, Optional
 
 import numpy as np
 import numpy.typing as npt
 
-from SPPy.calc_helpers.matrix_operations import TDMAsolver
+from SPPy.calc_helpers.tridiagonal import TridiagonalSolver, solve_tridiagonal
+
+
+@dataclass
+class ElectrolyteSettings:
+    """
+    Stores the electrolyte parameters and the discretization settings of the single particle model with electrolyte
+    dynamics (eSPSolver), which are not part of the parameter sets. The electrolyte volume fractions of the electrode
+    regions default to one minus the active material volume fraction of the electrodes, and that of the seperator is
+    taken from the parameter set.
+    """
+    D_e: float = 7.5e-10  # electrolyte diffusivity [m^2 / s]
+    t_c: float = 0.38  # transference number
+    k_f_avg: float = 1.0  # average activity coefficient term, 1 + dln(f)/dln(c_e)
+    epsilon_en: Optional[float] = None  # volume fraction of electrolyte in the negative electrode region
+    epsilon_ep: Optional[float] = None  # volume fraction of electrolyte in the positive electrode region
+    num_grid_n: int = 10  # number of finite volumes in the negative electrode region
+    num_grid_s: int = 10  # number of finite volumes in the seperator region
+    num_grid_p: int = 10  # number of finite volumes in positive electrode region
+    face_mean: str = 'harmonic'  # mean of the diffusivities at the faces of the finite volumes
+    # function of the electrolyte concentration [mol/m3] and temperature [K] that returns the electrolyte diffusivity
+    # [m2/s]. If None, the func_D_e of the battery cell's electrolyte is used and if that is also None, D_e is used.
+    func_D_e: Optional[Callable] = None
+    nonlinear_method: str = 'picard'  # linearization of the concentration-dependent diffusivity, 'picard' or 'newton'
+    max_iter: int = 10  # maximum number of Newton iterations per time step
+    tol: float = 1e-10  # relative tolerance of the Newton iterations
+
+    def __post_init__(self):
+        if self.D_e <= 0:
+            raise ValueError("D_e needs to be positive.")
+        if not (0 <= self.t_c < 1):
+            raise ValueError("t_c needs to be between 0 and 1.")
+        for epsilon in (self.epsilon_en, self.epsilon_ep):
+            if (epsilon is not None) and (not (0 < epsilon <= 1)):
+                raise ValueError("electrolyte volume fractions need to be between 0 and 1.")
+        for num_grid in (self.num_grid_n, self.num_grid_s, self.num_grid_p):
+            if (not isinstance(num_grid, int)) or (num_grid < 1):
+                raise ValueError("number of finite volumes needs to be a positive integer.")
+        if self.face_mean not in ElectrolyteConcFVMSolver.FACE_MEAN_TYPES:
+            raise ValueError(f"face_mean needs to be one of {ElectrolyteConcFVMSolver.FACE_MEAN_TYPES}.")
+        if (self.func_D_e is not None) and (not callable(self.func_D_e)):
+            raise TypeError("func_D_e needs to be a function.")
+        if self.nonlinear_method not in ElectrolyteConcFVMSolver.NONLINEAR_METHODS:
+            raise ValueError(f"nonlinear_method needs to be one of {ElectrolyteConcFVMSolver.NONLINEAR_METHODS}.")
+        if (not isinstance(self.max_iter, int)) or (self.max_iter < 1):
+            raise ValueError("max_iter needs to be a positive integer.")
+        if self.tol <= 0:
+            raise ValueError("tol needs to be positive.")
 
 
 @dataclass
@@ -24,9 +85,48 @@ class ElectrolyteFVMCoordinates:
     num_grid_n: int = 10  # number of finite volumes in the negative electrode region
 
     def __post_init__(self):
-        self.dx_n = self.L_n / self.num_grid_n  # dx in the negative electrode region
-        self.dx_s = self.L_s / self.num_grid_s  # dx in the seperator region
-        self.dx_p = self.L_p / self.num_grid_p  # dx in the positive electrode region
+        self.__build_grid()
+
+    def __setattr__(self, name, value):
+        """
+        Sets the attribute and rebuilds the grid arrays if the attribute is one of the grid parameters (e.g., D_e or
+        num_grid_p).
+        """
+        object.__setattr__(self, name, value)
+        if (name in self.__dataclass_fields__) and ('_version' in self.__dict__):
+            self.__build_grid()
+
+    @staticmethod
+    def __frozen(array: npt.ArrayLike) -> npt.ArrayLike:
+        array.flags.writeable = False
+        return array
+
+    def __build_grid(self) -> None:
+        """
+        Calculates the grid arrays. They are read-only and are only rebuilt when a grid parameter is set. The version
+        is incremented on every rebuild so that the dependent calculations (e.g., the matrix diagonals of the
+        ElectrolyteConcFVMSolver) can detect the change.
+        """
+        d = self.__dict__
+        d['dx_n'] = self.L_n / self.num_grid_n  # dx in the negative electrode region
+        d['dx_s'] = self.L_s / self.num_grid_s  # dx in the seperator region
+        d['dx_p'] = self.L_p / self.num_grid_p  # dx in the positive electrode region
+
+        array_x_n = np.arange(self.dx_n/2, self.L_n, self.dx_n)
+        array_x_s = np.arange(self.L_n + self.dx_s/2, self.L_n + self.L_s, self.dx_s)
+        array_x_p = np.arange(self.L_n + self.L_s + self.dx_p/2, self.L_n + self.L_s + self.L_p, self.dx_p)
+        lst_len = [len(array_x_n), len(array_x_s), len(array_x_p)]
+
+        d['_array_x_n'] = self.__frozen(array_x_n)
+        d['_array_x_s'] = self.__frozen(array_x_s)
+        d['_array_x_p'] = self.__frozen(array_x_p)
+        d['_array_x'] = self.__frozen(np.concatenate((array_x_n, array_x_s, array_x_p)))
+        d['_array_dx'] = self.__frozen(np.repeat([self.dx_n, self.dx_s, self.dx_p], lst_len))
+        array_epsilon_e = np.repeat([self.epsilon_en, self.epsilon_esep, self.epsilon_ep], lst_len)
+        d['_array_epsilon_e'] = self.__frozen(array_epsilon_e)
+        d['_array_brugg_factor'] = self.__frozen(array_epsilon_e ** self.brugg)
+        d['_array_D_eff'] = self.__frozen(self.D_e * self._array_brugg_factor)
+        d['_version'] = d.get('_version', -1) + 1
 
     @property
     def array_x_n(self) -> npt.ArrayLike:
@@ -34,7 +134,7 @@ class ElectrolyteFVMCoordinates:
         Returns the location of center of the finite volumes in the negative electrode region.
         :return: array containing the centers of the finite volumes.
         """
-        return np.arange(self.dx_n/2, self.L_n, self.dx_n)
+        return self._array_x_n
 
     @property
     def array_x_s(self) -> npt.ArrayLike:
@@ -42,7 +142,7 @@ class ElectrolyteFVMCoordinates:
         Array containing the location of the nodes in the finite volume in the seperator region.
         :return: Array containing the location of the nodes in the finite volume in the seperator region.
         """
-        return np.arange(self.L_n + self.dx_s/2, self.L_n + self.L_s, self.dx_s)
+        return self._array_x_s
 
     @property
     def array_x_p(self) -> npt.ArrayLike:
@@ -50,7 +150,7 @@ class ElectrolyteFVMCoordinates:
         Array containing the locations of the center of the finite volumes in the positive electrode region.
         :return: Array containing the locations of the center of the finite volumes in the positive electrode region.
         """
-        return np.arange(self.L_n + self.L_s + self.dx_p/2, self.L_n + self.L_s + self.L_p, self.dx_p)
+        return self._array_x_p
 
     @property
     def array_x(self) -> npt.ArrayLike:
@@ -58,7 +158,7 @@ class ElectrolyteFVMCoordinates:
         Array containing the locations of the center of the finite volumes.
         :return: Array containing the locations of the center of the finite volumes.
         """
-        return np.append(np.append(self.array_x_n, self.array_x_s), self.array_x_p)
+        return self._array_x
 
     @property
     def array_dx(self) -> npt.ArrayLike:
@@ -66,10 +166,7 @@ class ElectrolyteFVMCoordinates:
         Array containing the width of the finite volumes.
         :return: Array containing the width of the finite volumes.
         """
-        array_dx_n = self.dx_n * np.ones(len(self.array_x_n))
-        array_dx_s = self.dx_s * np.ones(len(self.array_x_s))
-        array_dx_p = self.dx_p * np.ones(len(self.array_x_p))
-        return np.append(np.append(array_dx_n, array_dx_s), array_dx_p)
+        return self._array_dx
 
     @property
     def array_epsilon_e(self) -> npt.ArrayLike:
@@ -77,10 +174,7 @@ class ElectrolyteFVMCoordinates:
         Returns an array containing the volume fraction of the electrolyte at each spatial region
         :return:
         """
-        array_epsilon_n = self.epsilon_en * np.ones(len(self.array_x_n))
-        array_epsilon_s = self.epsilon_esep * np.ones(len(self.array_x_s))
-        array_epsilon_p = self.epsilon_ep * np.ones(len(self.array_x_p))
-        return np.append(np.append(array_epsilon_n, array_epsilon_s), array_epsilon_p)
+        return self._array_epsilon_e
 
     @property
     def array_D_eff(self) -> npt.ArrayLike:
@@ -88,48 +182,150 @@ class ElectrolyteFVMCoordinates:
         Returns an array containing the effective electrolyte diffusivity at spatial FVM points.
         :return:
         """
-        array_D_eff_n = self.D_e * (self.epsilon_en ** self.brugg) * np.ones(len(self.array_x_n))
-        array_D_eff_s = self.D_e * (self.epsilon_esep ** self.brugg) * np.ones(len(self.array_x_s))
-        array_D_eff_p = self.D_e * (self.epsilon_ep ** self.brugg) * np.ones(len(self.array_x_p))
-        return np.append(np.append(array_D_eff_n, array_D_eff_s), array_D_eff_p)
+        return self._array_D_eff
+
+    def calc_D_eff(self, array_D_e: npt.ArrayLike) -> npt.ArrayLike:
+        """
+        Calculates the effective electrolyte diffusivity from the electrolyte diffusivities of the finite volumes.
+        :param array_D_e: (npt.ArrayLike) electrolyte diffusivity of each finite volume [m^2 / s]
+        :return: (npt.ArrayLike) effective electrolyte diffusivity of each finite volume [m^2 / s]
+        """
+        return array_D_e * self._array_brugg_factor
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the number of times the grid arrays were rebuilt after the construction.
+        :return: (int) version of the grid arrays.
+        """
+        return self._version
 
 
 class ElectrolyteConcFVMSolver:
-    def __init__(self, co_ords: ElectrolyteFVMCoordinates, transference: float):
+    """
+    Solves for the electrolyte concentration using the finite volume method and the implicit (backward Euler) time
+    scheme. The electrolyte diffusivity is either constant (the D_e of the finite volume grid), in which case each time
+    step is a single tridiagonal solve with the cached matrix, or a function of the electrolyte concentration and the
+    temperature. In the latter case, the diffusivities are either evaluated at the concentrations of the previous time
+    step ('picard', i.e., lagged coefficients), which still needs a single tridiagonal solve per time step, or the
+    nonlinear system is solved using the Newton's method ('newton'), which starts from the lagged-coefficient solution
+    and needs one tridiagonal solve per iteration.
+    """
+    FACE_MEAN_TYPES = ('harmonic', 'arithmetic')
+    NONLINEAR_METHODS = ('picard', 'newton')
+
+    def __init__(self, co_ords: ElectrolyteFVMCoordinates, transference: float, face_mean: str = 'harmonic',
+                 func_D_e: Optional[Callable] = None, nonlinear_method: str = 'picard', max_iter: int = 10,
+                 tol: float = 1e-10):
+        """
+        ElectrolyteConcFVMSolver class constructor.
+        :param co_ords: (ElectrolyteFVMCoordinates) finite volume grid.
+        :param transference: (float) transference number of the electrolyte.
+        :param face_mean: (str) mean used for the effective diffusivity at the faces between the finite volumes. The
+        'harmonic' mean is weighted by the widths of the adjacent finite volumes and ensures the flux continuity at the
+        region interfaces. The 'arithmetic' mean is the simple average of the adjacent diffusivities.
+        :param func_D_e: (Callable) function that takes in the array of the electrolyte concentrations [mol/m3] and
+        the temperature [K] and returns the array of the electrolyte diffusivities [m2/s]. If None, the D_e of the
+        finite volume grid is used.
+        :param nonlinear_method: (str) 'picard' or 'newton'. Only used with func_D_e.
+        :param max_iter: (int) maximum number of the Newton iterations per time step.
+        :param tol: (float) the Newton iterations stop when the max. change in the concentrations is less than tol
+        times the max. concentration.
+        """
+        if face_mean not in self.FACE_MEAN_TYPES:
+            raise ValueError(f"face_mean needs to be one of {self.FACE_MEAN_TYPES}.")
+        if (func_D_e is not None) and (not callable(func_D_e)):
+            raise TypeError("func_D_e needs to be a function.")
+        if nonlinear_method not in self.NONLINEAR_METHODS:
+            raise ValueError(f"nonlinear_method needs to be one of {self.NONLINEAR_METHODS}.")
+        if (not isinstance(max_iter, int)) or (max_iter < 1):
+            raise ValueError("max_iter needs to be a positive integer.")
         self.t_c = transference
         self.co_ords = co_ords
+        self.face_mean = face_mean
+        self.func_D_e = func_D_e
+        self.nonlinear_method = nonlinear_method
+        self.max_iter = max_iter
+        self.tol = tol
+        self.num_iter = 0  # number of Newton iterations of the last time step
+        self._diags_cache = None  # tuple containing the cache key (dt, grid version, face mean), the diagonals, and
+        # their factorization.
 
-    def diags(self, dt: float):
-        # initialize the diagonals
-        diag_elements = []
-        upper_diag_elements = []
-        lower_diag_elements = []
-        # update first elements
-        dx = (self.co_ords.array_x[1] - self.co_ords.array_x[0])
-        D1 = self.co_ords.array_D_eff[0]
-        D2 = self.co_ords.array_D_eff[1]
-        A = dt / (2 * self.co_ords.array_dx[0])
-        diag_elements.append(self.co_ords.array_epsilon_e[0] + A * (D2 + D1) / dx)
-        upper_diag_elements.append(-A * (D2 + D1) / dx)
-        for i in range(1, len(self.co_ords.array_x) - 1):
-            dx1 = self.co_ords.array_x[i] - self.co_ords.array_x[i - 1]
-            dx2 = self.co_ords.array_x[i + 1] - self.co_ords.array_x[i]
-            D1 = self.co_ords.array_D_eff[i - 1]
-            D2 = self.co_ords.array_D_eff[i]
-            D3 = self.co_ords.array_D_eff[i + 1]
-            A = dt / (2 * self.co_ords.array_dx[i])
-            diag_elements.append(self.co_ords.array_epsilon_e[i] + A * ((D1 + D2) / dx1 + (D2 + D3) / dx2))
-            upper_diag_elements.append(-A * (D3 + D2) / dx2)
-            lower_diag_elements.append(-A * (D1 + D2) / dx1)
-        # update last elements
-        dx = (self.co_ords.array_x[-1] - self.co_ords.array_x[-2])
-        D1 = self.co_ords.array_D_eff[-1]
-        D2 = self.co_ords.array_D_eff[-1]
-        A = dt / (2 * self.co_ords.array_dx[-1])
-        diag_elements.append(self.co_ords.array_epsilon_e[-1] + A * (D2 + D1) / dx)
-        lower_diag_elements.append(-A * (D2 + D1) / dx)
+    def face_D_eff(self, array_D_eff: Optional[npt.ArrayLike] = None) -> npt.ArrayLike:
+        """
+        Calculates the effective electrolyte diffusivity at the internal faces of the finite volumes.
+        :param array_D_eff: (npt.ArrayLike) effective diffusivity of each finite volume. If None, the effective
+        diffusivities of the finite volume grid are used.
+        :return: (npt.ArrayLike) array of length num_volumes - 1.
+        """
+        if array_D_eff is None:
+            array_D_eff = self.co_ords.array_D_eff
+        D_left, D_right = array_D_eff[:-1], array_D_eff[1:]
+        if self.face_mean == 'arithmetic':
+            return (D_left + D_right) / 2
+        dx_left, dx_right = self.co_ords.array_dx[:-1], self.co_ords.array_dx[1:]
+        return (dx_left + dx_right) / (dx_left / D_left + dx_right / D_right)
+
+    def __face_D_eff_derivatives(self, array_D_eff: npt.ArrayLike) -> tuple[npt.ArrayLike, npt.ArrayLike]:
+        """
+        Calculates the derivatives of the face diffusivities with respect to the diffusivities of the finite volumes
+        on the left and the right of the faces.
+        """
+        if self.face_mean == 'arithmetic':
+            return 0.5 * np.ones(len(array_D_eff) - 1), 0.5 * np.ones(len(array_D_eff) - 1)
+        D_left, D_right = array_D_eff[:-1], array_D_eff[1:]
+        dx_left, dx_right = self.co_ords.array_dx[:-1], self.co_ords.array_dx[1:]
+        denom = (dx_left / D_left + dx_right / D_right) ** 2
+        return (dx_left + dx_right) * dx_left / D_left ** 2 / denom, \
+            (dx_left + dx_right) * dx_right / D_right ** 2 / denom
+
+    def calc_diags(self, dt: float, array_D_eff: npt.ArrayLike) -> tuple[npt.ArrayLike, npt.ArrayLike, npt.ArrayLike]:
+        """
+        Calculates the diagonals of the tridiagonal matrix of the implicit scheme for the inputted effective
+        diffusivities.
+        :param dt: (float) time step [s]
+        :param array_D_eff: (npt.ArrayLike) effective diffusivity of each finite volume [m2/s]
+        :return: tuple containing the lower, main, and upper diagonals.
+        """
+        array_dx = self.co_ords.array_dx
+        # flux coefficients of the internal faces
+        array_g = dt * self.face_D_eff(array_D_eff) / np.diff(self.co_ords.array_x)
+        upper_diag_elements = -array_g / array_dx[:-1]
+        lower_diag_elements = -array_g / array_dx[1:]
+        diag_elements = np.array(self.co_ords.array_epsilon_e)
+        diag_elements[:-1] -= upper_diag_elements
+        diag_elements[1:] -= lower_diag_elements
         return lower_diag_elements, diag_elements, upper_diag_elements
 
+    def diags(self, dt: float) -> tuple[npt.ArrayLike, npt.ArrayLike, npt.ArrayLike]:
+        """
+        Calculates the diagonals of the tridiagonal matrix of the implicit scheme with the effective diffusivities of
+        the finite volume grid. The diagonals are cached and are only recalculated when dt or the grid changes. The
+        returned arrays are read-only.
+        :param dt: (float) time step [s]
+        :return: tuple containing the lower, main, and upper diagonals.
+        """
+        return self.__cached_diags(dt)[0]
+
+    def tridiagonal_solver(self, dt: float) -> TridiagonalSolver:
+        """
+        Returns the factorization of the tridiagonal matrix of the implicit scheme. It is cached along with the
+        diagonals (see diags).
+        :param dt: (float) time step [s]
+        :return: (TridiagonalSolver) factorized tridiagonal matrix
+        """
+        return self.__cached_diags(dt)[1]
+
+    def __cached_diags(self, dt: float) -> tuple:
+        key = (dt, self.co_ords.version, self.face_mean)
+        if (self._diags_cache is None) or (self._diags_cache[0] != key):
+            diags = self.calc_diags(dt=dt, array_D_eff=self.co_ords.array_D_eff)
+            for array in diags:
+                array.flags.writeable = False
+            l_diag, diag, u_diag = diags
+            self._diags_cache = (key, diags, TridiagonalSolver(l_diag=l_diag, diag=diag, u_diag=u_diag))
+        return self._diags_cache[1:]
+
     def M_ce(self, dt) -> npt.ArrayLike:
         l_diag, diag, u_diag = self.diags(dt)
         return np.diag(diag) + np.diag(u_diag, 1) + np.diag(l_diag, -1)
@@ -139,12 +335,105 @@ class ElectrolyteConcFVMSolver:
         ce_j_vec_2_ = ((1 - self.t_c) * a_s  * j * dt).reshape(-1, 1)
         return ce_j_vec_1_ + ce_j_vec_2_
 
+    @staticmethod
+    def __solve_tridiagonal(l_diag: npt.ArrayLike, diag: npt.ArrayLike, u_diag: npt.ArrayLike, b: npt.ArrayLike,
+                            solver_method: str) -> npt.ArrayLike:
+        if solver_method == 'TDMA':
+            return solve_tridiagonal(l_diag=l_diag, diag=diag, u_diag=u_diag, b=b)
+        elif solver_method == 'inverse':
+            return np.linalg.solve(np.diag(diag) + np.diag(u_diag, 1) + np.diag(l_diag, -1), b)
+        raise ValueError("solver_method needs to be 'TDMA' or 'inverse'.")
+
+    def calc_D_eff(self, c: npt.ArrayLike, temp: float) -> npt.ArrayLike:
+        """
+        Calculates the effective electrolyte diffusivities of the finite volumes using func_D_e.
+        :param c: (npt.ArrayLike) electrolyte concentrations [mol/m3]
+        :param temp: (float) temperature [K]
+        :return: (npt.ArrayLike) effective electrolyte diffusivities [m2/s]
+        """
+        return self.co_ords.calc_D_eff(np.broadcast_to(self.func_D_e(c, temp), np.shape(c)))
+
+    def residual(self, c: npt.ArrayLike, b: npt.ArrayLike, dt: float, temp: float) -> npt.ArrayLike:
+        """
+        Calculates the residual of the implicit scheme with the concentration-dependent diffusivities.
+        :param c: (npt.ArrayLike) electrolyte concentrations at the end of the time step [mol/m3]
+        :param b: (npt.ArrayLike) right-hand side of the implicit scheme (see ce_j_vec).
+        :param dt: (float) time step [s]
+        :param temp: (float) temperature [K]
+        :return: (npt.ArrayLike) residual
+        """
+        array_flux = self.face_D_eff(self.calc_D_eff(c=c, temp=temp)) * np.diff(c) / np.diff(self.co_ords.array_x)
+        array_res = self.co_ords.array_epsilon_e * c - b
+        array_res[:-1] -= dt * array_flux / self.co_ords.array_dx[:-1]
+        array_res[1:] += dt * array_flux / self.co_ords.array_dx[1:]
+        return array_res
+
+    def __jacobian_diags(self, c: npt.ArrayLike, dt: float,
+                         temp: float) -> tuple[npt.ArrayLike, npt.ArrayLike, npt.ArrayLike]:
+        """
+        Calculates the diagonals of the Jacobian of the residual. The derivatives of the diffusivities are approximated
+        using the forward differences.
+        """
+        array_D_eff = self.calc_D_eff(c=c, temp=temp)
+        h = 1e-7 * np.maximum(np.abs(c), 1.0)
+        array_dD_eff = (self.calc_D_eff(c=c + h, temp=temp) - array_D_eff) / h
+        dD_face_left, dD_face_right = self.__face_D_eff_derivatives(array_D_eff)
+        array_dx_face = np.diff(self.co_ords.array_x)
+        array_grad = np.diff(c) / array_dx_face
+        D_face = self.face_D_eff(array_D_eff) / array_dx_face
+        # derivatives of the face fluxes with respect to the concentrations on the left and the right of the faces
+        dflux_left = -D_face + dD_face_left * array_dD_eff[:-1] * array_grad
+        dflux_right = D_face + dD_face_right * array_dD_eff[1:] * array_grad
+
+        array_dx = self.co_ords.array_dx
+        upper_diag_elements = -dt * dflux_right / array_dx[:-1]
+        lower_diag_elements = dt * dflux_left / array_dx[1:]
+        diag_elements = np.array(self.co_ords.array_epsilon_e)
+        diag_elements[:-1] -= dt * dflux_left / array_dx[:-1]
+        diag_elements[1:] += dt * dflux_right / array_dx[1:]
+        return lower_diag_elements, diag_elements, upper_diag_elements
+
+    def __solve_ce_nonlinear(self, c_prev: npt.ArrayLike, b: npt.ArrayLike, dt: float, temp: float,
+                             solver_method: str) -> npt.ArrayLike:
+        """
+        Solves the implicit scheme with the concentration-dependent diffusivities.
+        """
+        l_diag, diag, u_diag = self.calc_diags(dt=dt, array_D_eff=self.calc_D_eff(c=c_prev, temp=temp))
+        c = self.__solve_tridiagonal(l_diag=l_diag, diag=diag, u_diag=u_diag, b=b, solver_method=solver_method)
+        self.num_iter = 0
+        if self.nonlinear_method == 'picard':
+            return c
+        for self.num_iter in range(1, self.max_iter + 1):
+            l_diag, diag, u_diag = self.__jacobian_diags(c=c, dt=dt, temp=temp)
+            delta_c = self.__solve_tridiagonal(l_diag=l_diag, diag=diag, u_diag=u_diag,
+                                               b=-self.residual(c=c, b=b, dt=dt, temp=temp),
+                                               solver_method=solver_method)
+            c = c + delta_c
+            if np.max(np.abs(delta_c)) <= self.tol * np.max(np.abs(c)):
+                return c
+        warnings.warn(f"Newton iterations did not converge in {self.max_iter} iterations.", RuntimeWarning)
+        return c
+
     def solve_ce(self, c_prev: npt.ArrayLike, j: npt.ArrayLike, dt: float, a_s: npt.ArrayLike,
-                 solver_method: str = 'TDMA') -> npt.ArrayLike:
+                 solver_method: str = 'TDMA', temp: Optional[float] = None) -> npt.ArrayLike:
+        """
+        Solves for the electrolyte concentrations at the end of the time step.
+        :param c_prev: (npt.ArrayLike) electrolyte concentrations at the previous time step [mol/m3]
+        :param j: (npt.ArrayLike) molar flux of each finite volume [mol/m2/s]
+        :param dt: (float) time step [s]
+        :param a_s: (npt.ArrayLike) specific interfacial area of each finite volume [m2/m3]
+        :param solver_method: (str) 'TDMA' or 'inverse'.
+        :param temp: (float) temperature [K]. It is needed with func_D_e.
+        :return: (npt.ArrayLike) electrolyte concentrations [mol/m3]
+        """
         b = self.ce_j_vec(c_prev=c_prev, j=j, dt=dt, a_s=a_s)
+        if self.func_D_e is not None:
+            if temp is None:
+                raise ValueError("temp is needed for the concentration-dependent diffusivity.")
+            return self.__solve_ce_nonlinear(c_prev=np.asarray(c_prev, dtype=float), b=np.ndarray.flatten(b), dt=dt,
+                                             temp=temp, solver_method=solver_method)
         if solver_method == 'TDMA':
-            l_diag, diag, u_diag = self.diags(dt)
-            return TDMAsolver(l_diag=l_diag, diag=diag, u_diag=u_diag, col_vec=b)
+            return self.tridiagonal_solver(dt).solve(np.ndarray.flatten(b))
         elif solver_method == 'inverse':
             M = np.linalg.inv(self.M_ce(dt=dt))
             return np.ndarray.flatten(M @ b)
@@ -0,0 +1,77 @@
+""" step_control
+Contains the classes for the adaptive time stepping of the battery cell solvers.
+"""
+
+__all__ = ['AdaptiveStepControl']
+
+__author__ = 'Moin Ahmed'
+__copywrite__ = 'Copywrite 2023 by Moin Ahmed. All rights are reserved.'
+__status__ = 'deployed'
+
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+
+@dataclass
+class AdaptiveStepControl:
+    """
+    Stores the settings for the adaptive time stepping. The local error of a time step is estimated using step doubling,
+    i.e., by comparing the states after one full time step with the states after two half time steps. The time step is
+    accepted when the scaled error norm is less than or equal to one and the time step is then grown (or shrunk) using
+    the standard controller,
+        dt_new = dt * clip(safety * err ** (-1 / (order + 1)), min_shrink, max_growth)
+    The cycling step cutoffs (V_min, V_max, SOC_LIB_min, and SOC_LIB_max) are located by root-finding on the time step
+    size till the time step bracket is smaller than event_tol.
+    """
+    rel_tol: float = 1e-4  # relative tolerance of the states
+    abs_tol: float = 1e-6  # absolute tolerance of the states
+    dt_init: float = 0.1  # initial time step at the start of every cycling step [s]
+    dt_min: float = 1e-3  # minimum time step [s]
+    dt_max: float = 600.0  # maximum time step [s]
+    safety: float = 0.9  # safety factor of the step size controller
+    min_shrink: float = 0.2  # minimum factor by which the time step can shrink
+    max_growth: float = 5.0  # maximum factor by which the time step can grow
+    order: int = 1  # order of the local error used in the step size controller
+    event_tol: float = 1e-3  # time tolerance for the location of the cutoffs [s]
+    max_event_iter: int = 50  # maximum number of iterations for the location of the cutoffs
+
+    def __post_init__(self):
+        if (self.rel_tol <= 0) or (self.abs_tol <= 0):
+            raise ValueError("rel_tol and abs_tol need to be positive.")
+        if not (0 < self.dt_min <= self.dt_init <= self.dt_max):
+            raise ValueError("time steps need to satisfy 0 < dt_min <= dt_init <= dt_max.")
+        if not (0 < self.safety <= 1):
+            raise ValueError("safety needs to be between 0 and 1.")
+        if not (0 < self.min_shrink < 1 < self.max_growth):
+            raise ValueError("min_shrink needs to be between 0 and 1, and max_growth needs to be greater than 1.")
+        if (not isinstance(self.order, int)) or (self.order < 1):
+            raise ValueError("order needs to be a positive integer.")
+        if self.event_tol <= 0:
+            raise ValueError("event_tol needs to be positive.")
+
+    def error_norm(self, y_coarse: npt.ArrayLike, y_fine: npt.ArrayLike) -> float:
+        """
+        Returns the scaled (max.) norm of the difference between the coarse and fine estimates of the states.
+        :param y_coarse: states after one full time step.
+        :param y_fine: states after two half time steps.
+        :return: (float) scaled error norm. The time step is acceptable if it is less than or equal to one.
+        """
+        y_coarse, y_fine = np.asarray(y_coarse, dtype=float), np.asarray(y_fine, dtype=float)
+        scale = self.abs_tol + self.rel_tol * np.abs(y_fine)
+        return float(np.max(np.abs(y_coarse - y_fine) / scale))
+
+    def next_dt(self, dt: float, err: float) -> float:
+        """
+        Returns the time step for the next iteration.
+        :param dt: (float) current time step [s]
+        :param err: (float) scaled error norm of the current time step.
+        :return: (float) next time step [s]
+        """
+        if err == 0:
+            factor = self.max_growth
+        else:
+            factor = min(self.max_growth, max(self.min_shrink, self.safety * err ** (-1 / (self.order + 1))))
+        return min(self.dt_max, max(self.dt_min, dt * factor))
@@ -26,9 +26,7 @@ def calc_cell_temp(t_prev: float, dt: float, temp_prev: float, V: float, I: floa
     :param T_amb: ambient temperature [K]
     :return: (float) Battery cell temperature [K]
     """
-    t_model = ECMLumped()
-    func_heat_balance = t_model.heat_balance(V=V, I=I, rho=rho, Vol=Vol, C_p=C_p, OCV=OCV, dOCVdT=dOCVdT, h=h, A=A,
-                                             T_amb=T_amb)
-    return rk4(func=func_heat_balance, t_prev=t_prev, y_prev=temp_prev, step_size=dt)
+    return rk4(func=ECMLumped().rhs, t_prev=t_prev, y_prev=temp_prev, step_size=dt,
+               args=(V, I, rho, Vol, C_p, OCV, dOCVdT, h, A, T_amb))
 
 
@@ -10,6 +10,12 @@ class InvalidSOCException(Exception):
         super().__init__(self.msg)
 
 
+class InvalidElectrolyteConcException(InvalidSOCException):
+    "Raised when the electrolyte concentration is not positive. It is handled like the electrode SOC being beyond 0-1."
+    def __init__(self, region):
+        self.msg = f"electrolyte conc. in the {region} region is not positive"
+        Exception.__init__(self, self.msg)
+
 
 class InsufficientInputOperatingConditions(Exception):
     "Raised when time and current arrays are not present in the input argument."
@@ -89,6 +89,20 @@ class TestBatteryCell(unittest.TestCase):
         test_cell.T = new_T
         self.assertEqual(test_cell.T_amb, orig_T)
 
+    def test_OCP_tabulation(self):
+        test_cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=self.SOC_init_p,
+                                     SOC_init_n=self.SOC_init_n, T=310.0, OCP_tabulation=SPPy.TabulationSettings())
+        ref_cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=self.SOC_init_p,
+                                    SOC_init_n=self.SOC_init_n, T=310.0)
+        self.assertAlmostEqual(ref_cell.elec_p.OCP, test_cell.elec_p.OCP, places=6)
+        self.assertAlmostEqual(ref_cell.elec_n.OCP, test_cell.elec_n.OCP, places=6)
+        self.assertAlmostEqual(ref_cell.elec_p.dOCPdT, test_cell.elec_p.dOCPdT, places=9)
+        self.assertAlmostEqual(ref_cell.elec_n.dOCPdSOC, test_cell.elec_n.dOCPdSOC, places=4)
+        # battery cells with the same settings share the tabulated functions.
+        test_cell2 = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=self.SOC_init_p,
+                                      SOC_init_n=self.SOC_init_n, T=310.0, OCP_tabulation=SPPy.TabulationSettings())
+        self.assertIs(test_cell.elec_p.func_OCP, test_cell2.elec_p.func_OCP)
+
 
 class TestECMBatteryCell(unittest.TestCase):
     test_cell = SPPy.ECMBatteryCell(R0_ref=0.225, R1_ref=0.001, C1=0.03, temp_ref=298.15, Ea_R1=400, Ea_R0=400,
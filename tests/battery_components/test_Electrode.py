@@ -63,6 +63,36 @@ class testElectrode(unittest.TestCase):
                                 SOC_init=SOC_init,
                                 alpha=0.5, func_OCP=funcs.OCP_ref_p, func_dOCPdT=13)
 
+    def test_derived_property_cache(self):
+        """
+        This test method checks that the cached derived properties are updated when the SOC, temperature, or
+        electrode parameters change.
+        """
+        elec = electrode.Electrode(L=self.L, A=self.A, max_conc=self.max_conc, epsilon=self.epsilon, kappa=self.kappa,
+                                   S=self.S, R=self.R, T_ref=self.T_ref, D_ref=self.D_ref, k_ref=self.k_ref,
+                                   Ea_D=self.Ea_D, Ea_R=self.Ea_R, brugg=self.brugg, T=self.T,
+                                   SOC_init=self.SOC_init, alpha=0.5, func_OCP=funcs.OCP_ref_p,
+                                   func_dOCPdT=funcs.dOCPdT_p)
+        self.assertEqual(self.D_ref, elec.D)
+        self.assertEqual(funcs.OCP_ref_p(self.SOC_init), elec.OCP)
+        i_0 = elec.i_0(c_e=1000.0)
+
+        elec.SOC = 0.7
+        self.assertEqual(funcs.OCP_ref_p(0.7), elec.OCP)
+        self.assertNotEqual(i_0, elec.i_0(c_e=1000.0))
+        self.assertNotEqual(elec.i_0(c_e=1000.0), elec.i_0(c_e=1200.0))
+        self.assertIn('D', elec._cache_T)  # setting the SOC does not invalidate D and k.
+        elec.SOC = elec.SOC  # setting the SOC to its present value does not invalidate the caches.
+        self.assertIn('OCP', elec._cache_SOC)
+
+        elec.T = 310.0
+        self.assertLess(self.D_ref, elec.D)
+        self.assertAlmostEqual(funcs.OCP_ref_p(0.7) + funcs.dOCPdT_p(0.7) * (310.0 - self.T_ref), elec.OCP)
+
+        D = elec.D
+        elec.D_ref = 2 * self.D_ref
+        self.assertAlmostEqual(2 * D, elec.D, delta=1e-20)
+
     def test_SOC_setter(self):
         """
         This test method checks if the SOC attribute of the Electrode object can be changes correctly.
@@ -0,0 +1,97 @@
+"""
+Contains the unit test for the genetic algorithm
+"""
+
+import unittest
+
+import numpy as np
+
+from SPPy import GA
+
+
+def sphere(chromosome):
+    return float(np.sum(np.square(chromosome - 0.5)))
+
+
+class TestGA(unittest.TestCase):
+    bounds = np.array([[-2.0, 2.0], [-2.0, 2.0]])
+    ga_params = dict(n_chromosomes=20, bounds=bounds, obj_func=sphere, n_pool=10, n_elite=2, n_generations=30)
+
+    def test_constructor(self):
+        with self.assertRaises(TypeError):
+            GA(**self.ga_params, batch_obj_func=0)
+        with self.assertRaises(ValueError):
+            GA(**self.ga_params, n_workers=0)
+        with self.assertRaises(ValueError):
+            GA(**self.ga_params, n_stall=0)
+
+    def test_operators(self):
+        np.random.seed(0)
+        ga = GA(**self.ga_params)
+        population = ga.initialize_population()
+        self.assertEqual((20, 2), population.shape)
+        self.assertTrue(np.all(population >= -2.0) and np.all(population <= 2.0))
+
+        mating_population = ga.mating_population(population=population, fitness_array=ga.calc_fitness(population))
+        new_population = ga.create_new_population(mating_population=mating_population)
+        self.assertEqual((20, 2), new_population.shape)
+        self.assertTrue(np.array_equal(mating_population[:2], new_population[:2]))
+        # children are the convex combinations of the mating population.
+        self.assertTrue(np.all(new_population.min(axis=0) >= mating_population.min(axis=0)))
+        self.assertTrue(np.all(new_population.max(axis=0) <= mating_population.max(axis=0)))
+
+        mutated_population = ga.mutate(population=new_population.copy())
+        self.assertTrue(np.array_equal(new_population[:10], mutated_population[:10]))
+        self.assertTrue(np.all(mutated_population[10:] >= new_population[10:]))
+
+    def test_solve(self):
+        np.random.seed(0)
+        ga = GA(**self.ga_params)
+        chromosome, array_obj_func_value = ga.solve()
+        self.assertEqual(31, len(array_obj_func_value))
+        self.assertTrue(np.all(np.diff(array_obj_func_value) <= 0))
+        self.assertAlmostEqual(sphere(chromosome), array_obj_func_value[-1])
+        self.assertLess(array_obj_func_value[-1], 1e-2)
+        # the elite chromosomes are only evaluated once.
+        self.assertEqual(20 + 30 * 18, ga.n_evaluations)
+
+    def test_batch_obj_func(self):
+        lst_shape = []
+
+        def batch_sphere(population):
+            lst_shape.append(population.shape)
+            return np.sum(np.square(population - 0.5), axis=1)
+
+        np.random.seed(0)
+        chromosome, array_obj_func_value = GA(**self.ga_params).solve()
+        np.random.seed(0)
+        chromosome_batch, array_obj_func_value_batch = GA(**self.ga_params, batch_obj_func=batch_sphere).solve()
+        self.assertTrue(np.allclose(chromosome, chromosome_batch))
+        self.assertTrue(np.allclose(array_obj_func_value, array_obj_func_value_batch))
+        self.assertEqual([(20, 2)] + [(18, 2)] * 30, lst_shape)
+
+    def test_n_workers(self):
+        np.random.seed(0)
+        chromosome, array_obj_func_value = GA(**self.ga_params).solve()
+        np.random.seed(0)
+        chromosome_parallel, array_obj_func_value_parallel = GA(**self.ga_params, n_workers=2).solve()
+        self.assertTrue(np.array_equal(chromosome, chromosome_parallel))
+        self.assertTrue(np.array_equal(array_obj_func_value, array_obj_func_value_parallel))
+
+    def test_early_stop(self):
+        np.random.seed(0)
+        ga = GA(**self.ga_params, tol=1e-1)
+        chromosome, array_obj_func_value = ga.solve()
+        self.assertLessEqual(array_obj_func_value[-1], 1e-1)
+        self.assertTrue(np.all(array_obj_func_value[:-1] > 1e-1))
+        self.assertLess(len(array_obj_func_value), 31)
+
+        np.random.seed(0)
+        ga = GA(n_chromosomes=20, bounds=self.bounds, obj_func=lambda chromosome: 1.0, n_pool=10, n_elite=2,
+                n_generations=30, n_stall=3)
+        chromosome, array_obj_func_value = ga.solve()
+        self.assertEqual(4, len(array_obj_func_value))
+
+
+if __name__ == '__main__':
+    unittest.main()
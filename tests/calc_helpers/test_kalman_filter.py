@@ -6,7 +6,8 @@ import unittest
 
 import numpy as np
 
-from SPPy import NormalRandomVector, SPKF
+from SPPy import NormalRandomVector, SPKF, BatchSPKF
+from SPPy.calc_helpers.kalman_filter import InvalidKFMethodType
 
 
 class TestSPKFProperties(unittest.TestCase):
@@ -188,3 +189,187 @@ class TestSPKFSolve(unittest.TestCase):
         SigmaX = spkf_instance1._SPKF__cov_measurement_update(Lx, SigmaY=SigmaY)
         self.assertAlmostEqual(cov_update_actual, spkf_instance1.x.get_cov()[0, 0])
 
+
+    def test_solve(self):
+        def func_f(x_k, u_k, w_k):
+            return np.vstack([0.99 * x_k[0] + 0.1 * np.sin(x_k[1]) + w_k[0], 0.9 * x_k[1] + u_k + w_k[1]])
+
+        def func_h(x_k, u_k, v_k):
+            return x_k[0] ** 2 + x_k[1] + v_k[0]
+
+        lst_spkf = []
+        for _ in range(2):
+            x = NormalRandomVector(vector_init=np.array([[0.5], [0.1]]), cov_init=np.array([[0.1, 0.02],
+                                                                                          [0.02, 0.1]]))
+            w = NormalRandomVector(vector_init=np.zeros((2, 1)), cov_init=np.eye(2) * 1e-3)
+            v = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-2]]))
+            lst_spkf.append(SPKF(x=x, w=w, v=v, y_dim=1, func_f=func_f, func_h=func_h))
+        spkf_instance, x_ref = lst_spkf
+        # sigma points from the Cholesky factor of the whole augmented covariance matrix
+        sqrt_aug_cov = spkf_instance.calc_sqrt_matrix(spkf_instance.aug_cov)
+        x_sp = spkf_instance.aug_vector + spkf_instance.gamma * np.hstack([np.zeros((spkf_instance.L, 1)),
+                                                                           sqrt_aug_cov, -sqrt_aug_cov])
+        self.assertTrue(np.allclose(x_sp, spkf_instance.x_sp))
+
+        # reference implementation using the dense weight matrices and the matrix inverse
+        array_alpha_m = x_ref.array_alpha_m
+        matrix_alpha_c = np.diag(x_ref.array_alpha_c.flatten())
+        for y_true in [0.3, 0.35, 0.32]:
+            Xx = func_f(x_ref.x_sp_x, 0.01, x_ref.x_sp_w)
+            x_sp_v = x_ref.x_sp_v
+            xhat = Xx @ array_alpha_m
+            Xs = Xx - xhat
+            cov = Xs @ matrix_alpha_c @ Xs.T
+            Y = func_h(Xx, 0.0, x_sp_v).reshape(1, -1)
+            yhat = Y @ array_alpha_m
+            Ys = Y - yhat
+            L = (Xs @ matrix_alpha_c @ Ys.T) @ np.linalg.inv(Ys @ matrix_alpha_c @ Ys.T)
+            x_ref.x.set_vector(xhat + L @ (y_true - yhat))
+            x_ref.x.set_cov(cov - L @ (Ys @ matrix_alpha_c @ Ys.T) @ L.T)
+
+            spkf_instance.solve(u=0.01, y_true=y_true)
+            self.assertTrue(np.allclose(x_ref.x.get_vector(), spkf_instance.x.get_vector()))
+            self.assertTrue(np.allclose(x_ref.x.get_cov(), spkf_instance.x.get_cov()))
+
+
+class TestSRSPKF(unittest.TestCase):
+    x_init = np.array([[0.5], [0.1], [0.1]])
+
+    def test_constructor(self):
+        x = NormalRandomVector(vector_init=self.x_init, cov_init=np.eye(3))
+        w = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-4]]))
+        v = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.eye(1))
+        with self.assertRaises(InvalidKFMethodType):
+            SPKF(x=x, w=w, v=v, y_dim=1, func_f=None, func_h=None, method_type='UKF')
+
+    def test_calc_chol_update(self):
+        matrix = np.array([[4, 12, -16], [12, 37, -43], [-16, -43, 98]])
+        vector = np.array([1.0, -2.0, 0.5])
+        S = SPKF.calc_sqrt_matrix(matrix)
+        self.assertTrue(np.allclose(np.linalg.cholesky(matrix + np.outer(vector, vector)),
+                                    SPKF.calc_chol_update(S, vector)))
+        self.assertTrue(np.allclose(S, SPKF.calc_chol_update(SPKF.calc_chol_update(S, vector), vector, -1.0)))
+        with self.assertRaises(np.linalg.LinAlgError):
+            SPKF.calc_chol_update(S, 10 * vector, -1.0)
+
+    def test_solve(self):
+        def func_f(x_k, u_k, w_k):
+            return np.vstack([0.99 * x_k[0] + 0.1 * np.sin(x_k[1]) + w_k[0], 0.9 * x_k[1] + u_k, x_k[2]])
+
+        def func_h(x_k, u_k, v_k):
+            return x_k[0] ** 2 + x_k[1] + x_k[2] + v_k[0]
+
+        cov_x = np.array([[0.1, 0.02, 0.0], [0.02, 0.1, 0.0], [0.0, 0.0, 0.05]])
+        lst_spkf = []
+        for method_type in ('CDKF', 'SR-CDKF'):
+            x = NormalRandomVector(vector_init=self.x_init, cov_init=cov_x.copy())
+            w = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-4]]))
+            v = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-2]]))
+            lst_spkf.append(SPKF(x=x, w=w, v=v, y_dim=1, func_f=func_f, func_h=func_h, method_type=method_type))
+        spkf_instance, srspkf_instance = lst_spkf
+        for y_true in np.linspace(0.8, 0.6, 50):
+            spkf_instance.solve(u=0.01, y_true=y_true)
+            srspkf_instance.solve(u=0.01, y_true=y_true)
+            self.assertTrue(np.allclose(spkf_instance.x.get_vector(), srspkf_instance.x.get_vector()))
+            self.assertTrue(np.allclose(spkf_instance.x.get_cov(), srspkf_instance.x.get_cov()))
+
+    def test_in_place_cov_change(self):
+        def func_f(x_k, u_k, w_k):
+            return np.vstack([0.99 * x_k[0] + 0.1 * np.sin(x_k[1]) + w_k[0], 0.9 * x_k[1] + u_k, x_k[2]])
+
+        def func_h(x_k, u_k, v_k):
+            return x_k[0] ** 2 + x_k[1] + x_k[2] + v_k[0]
+
+        cov_x = np.array([[0.1, 0.02, 0.0], [0.02, 0.1, 0.0], [0.0, 0.0, 0.05]])
+        for method_type in ('CDKF', 'SR-CDKF'):
+            lst_spkf = []
+            for _ in range(2):
+                x = NormalRandomVector(vector_init=self.x_init, cov_init=cov_x.copy())
+                w = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-4]]))
+                v = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-2]]))
+                lst_spkf.append(SPKF(x=x, w=w, v=v, y_dim=1, func_f=func_f, func_h=func_h, method_type=method_type))
+            spkf_set, spkf_in_place = lst_spkf
+            for y_true in np.linspace(0.8, 0.6, 20):
+                if y_true < 0.7:
+                    # the process noise is retuned by replacing the covariance matrix or by changing it in place.
+                    spkf_set.w.set_cov(np.array([[1.0]]))
+                    spkf_in_place.w.get_cov()[0, 0] = 1.0
+                    spkf_in_place.x.get_cov()[2, 2] = spkf_set.x.get_cov()[2, 2] = 0.5
+                spkf_set.solve(u=0.01, y_true=y_true)
+                spkf_in_place.solve(u=0.01, y_true=y_true)
+            self.assertTrue(np.allclose(spkf_set.x.get_vector(), spkf_in_place.x.get_vector()))
+            self.assertTrue(np.allclose(spkf_set.x.get_cov(), spkf_in_place.x.get_cov()))
+
+    def test_ill_conditioned(self):
+        # precise measurement of the state variables of very different scales.
+        def func_f(x_k, u_k, w_k):
+            return np.vstack([x_k[0] + w_k[0], x_k[1], x_k[2]])
+
+        def func_h(x_k, u_k, v_k):
+            return x_k[0] + 1e4 * x_k[1] + 1e-4 * x_k[2] + v_k[0]
+
+        cov_x = np.diag([1.0, 1e-8, 1e4])
+        lst_spkf = []
+        for method_type in ('CDKF', 'SR-CDKF'):
+            x = NormalRandomVector(vector_init=self.x_init, cov_init=cov_x.copy())
+            w = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-4]]))
+            v = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-16]]))
+            lst_spkf.append(SPKF(x=x, w=w, v=v, y_dim=1, func_f=func_f, func_h=func_h, method_type=method_type))
+        spkf_instance, srspkf_instance = lst_spkf
+        with self.assertRaises(np.linalg.LinAlgError):
+            for i in range(100):
+                spkf_instance.solve(u=0.0, y_true=0.5 + np.sin(i))
+        for i in range(100):
+            srspkf_instance.solve(u=0.0, y_true=0.5 + np.sin(i))
+        self.assertTrue(np.all(np.isfinite(srspkf_instance.x.get_vector())))
+        self.assertTrue(np.all(np.isfinite(srspkf_instance.x.get_cov())))
+
+
+class TestBatchSPKF(unittest.TestCase):
+    def test_solve(self):
+        def func_f(x_k, u_k, w_k):
+            return np.stack([0.99 * x_k[:, 0] + 0.1 * np.sin(x_k[:, 1]) + w_k[:, 0],
+                             0.9 * x_k[:, 1] + u_k[:, np.newaxis]], axis=1)
+
+        def func_h(x_k, u_k, v_k):
+            return (x_k[:, 0] ** 2 + x_k[:, 1] + v_k[:, 0])[:, np.newaxis, :]
+
+        # the process and sensor noises given by the same object occupy their own columns of the augmented vector.
+        noise = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-3]]))
+        for w, v in [(NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-3]])),
+                      NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-2]]))),
+                     (noise, noise)]:
+            array_x = np.array([[0.5, 0.1], [0.3, -0.2]])
+            array_cov_x = np.array([[[0.1, 0.02], [0.02, 0.1]], [[0.2, 0.0], [0.0, 0.05]]])
+            batch_spkf = BatchSPKF(array_x=array_x, array_cov_x=array_cov_x, w=w, v=v, y_dim=1, func_f=func_f,
+                                   func_h=func_h)
+            lst_spkf = [SPKF(x=NormalRandomVector(vector_init=array_x[i].reshape(-1, 1), cov_init=array_cov_x[i]),
+                             w=w, v=v, y_dim=1,
+                             func_f=lambda x_k, u_k, w_k: func_f(x_k[np.newaxis], np.array([u_k]), w_k[np.newaxis])[0],
+                             func_h=lambda x_k, u_k, v_k: func_h(x_k[np.newaxis], np.array([u_k]), v_k[np.newaxis])[0])
+                        for i in range(2)]
+
+            array_u = np.array([0.01, -0.02])
+            for step, y_true in enumerate(np.linspace(0.8, 0.6, 10)):
+                # the second system's data ends after 5 time steps.
+                mask = np.array([True, step < 5])
+                if step == 7:
+                    # the process noise is retuned in place.
+                    w.get_cov()[0, 0] *= 2
+                batch_spkf.solve(u=np.where(mask, array_u, np.nan), y_true=np.where(mask, y_true, np.nan), mask=mask)
+                for i in np.flatnonzero(mask):
+                    lst_spkf[i].solve(u=array_u[i], y_true=y_true)
+                for i in range(2):
+                    self.assertTrue(np.allclose(lst_spkf[i].x.get_vector().flatten(), batch_spkf.array_x[i]))
+                    self.assertTrue(np.allclose(lst_spkf[i].x.get_cov(), batch_spkf.array_cov_x[i]))
+
+    def test_constructor(self):
+        w = NormalRandomVector(vector_init=np.zeros((1, 1)), cov_init=np.array([[1e-3]]))
+        with self.assertRaises(ValueError):
+            BatchSPKF(array_x=np.zeros(2), array_cov_x=np.zeros((2, 2)), w=w, v=w, y_dim=1, func_f=None, func_h=None)
+        with self.assertRaises(ValueError):
+            BatchSPKF(array_x=np.zeros((3, 2)), array_cov_x=np.zeros((2, 2, 2)), w=w, v=w, y_dim=1, func_f=None,
+                      func_h=None)
+        with self.assertRaises(TypeError):
+            BatchSPKF(array_x=np.zeros((2, 2)), array_cov_x=np.zeros((2, 2, 2)), w=None, v=w, y_dim=1,
+                      func_f=None, func_h=None)
@@ -1,7 +1,7 @@
 import unittest
 import numpy as np
 
-from SPPy.calc_helpers.ode_solvers import euler, rk4
+from SPPy.calc_helpers.ode_solvers import euler, heun, rk4, dormand_prince, StateVectorIntegrator
 
 
 class TestEuler(unittest.TestCase):
@@ -29,3 +29,102 @@ class TestEuler(unittest.TestCase):
         y_prev = 2.0
         dt = 1.0
         self.assertEqual(rk4(func=func, t_prev=t_prev, y_prev=y_prev, step_size=dt), 6.201037072414292)
+
+    def test_rk4_args(self):
+        def func(y, t, a, b):
+            return a * np.exp(0.8 * t) - b * y
+        y = rk4(func=func, t_prev=0.0, y_prev=np.array([2.0, 2.0]), step_size=1.0, args=(np.array([4.0, 4.0]), 0.5))
+        self.assertTrue(np.array_equal(np.array([6.201037072414292, 6.201037072414292]), y))
+
+
+class TestExplicitRungeKutta(unittest.TestCase):
+    @staticmethod
+    def func(y, t):
+        return -0.5 * y + np.sin(t)
+
+    @staticmethod
+    def exact(t):
+        # solution of dy/dt = -0.5 * y + sin(t) with y(0) = 1
+        return 1.8 * np.exp(-0.5 * t) + 0.4 * np.sin(t) - 0.8 * np.cos(t)
+
+    def global_error(self, method, num_steps):
+        y, dt = 1.0, 2.0 / num_steps
+        for i in range(num_steps):
+            y = method(func=self.func, t_prev=i * dt, y_prev=y, step_size=dt)
+            if isinstance(y, tuple):
+                y = y[0]
+        return abs(y - self.exact(2.0))
+
+    def test_order(self):
+        for method, order in ((euler, 1), (heun, 2), (rk4, 4), (dormand_prince, 5)):
+            ratio = self.global_error(method, 20) / self.global_error(method, 40)
+            self.assertGreater(np.log2(ratio), order - 0.2)
+
+    def test_dormand_prince_error(self):
+        y, error = dormand_prince(func=self.func, t_prev=0.0, y_prev=np.array([1.0, 1.0]), step_size=0.5)
+        self.assertEqual((2,), error.shape)
+        self.assertLess(abs(error[0]), 1e-4)
+        self.assertLess(abs(y[0] - self.exact(0.5)), 1e-6)
+        _, error_half = dormand_prince(func=self.func, t_prev=0.0, y_prev=1.0, step_size=0.25)
+        self.assertLess(abs(error_half), abs(error[0]) / 10)
+
+
+class TestStateVectorIntegrator(unittest.TestCase):
+    @staticmethod
+    def rhs_decay(y, t, k):
+        return -k * y
+
+    @staticmethod
+    def rhs_source(y, t, s):
+        return s
+
+    def test_register(self):
+        integrator = StateVectorIntegrator()
+        integrator.register('decay', self.rhs_decay, y_init=np.ones(3), args=(np.array([1.0, 2.0, 3.0]),))
+        integrator.register('source', self.rhs_source, y_init=0.0, args=(1.0,))
+        self.assertEqual(['decay', 'source'], integrator.names)
+        self.assertEqual((4,), integrator.y.shape)
+        self.assertTrue('source' in integrator)
+        self.assertEqual((), integrator['source'].shape)
+        with self.assertRaises(ValueError):
+            integrator.register('source', self.rhs_source, y_init=0.0)
+        with self.assertRaises(TypeError):
+            integrator.register('invalid', 1.0, y_init=0.0)
+        with self.assertRaises(ValueError):
+            StateVectorIntegrator(method='rk45')
+        with self.assertRaises(ValueError):
+            StateVectorIntegrator(batch_shape=(2,)).register('decay', self.rhs_decay, y_init=np.ones(3))
+
+    def test_step(self):
+        for method in StateVectorIntegrator.METHODS:
+            integrator = StateVectorIntegrator(method=method)
+            integrator.register('decay', self.rhs_decay, y_init=np.ones(3), args=(np.array([1.0, 2.0, 3.0]),))
+            integrator.register('source', self.rhs_source, y_init=0.0, args=(1.0,))
+            y_decay = np.ones(3)
+            for i in range(10):
+                integrator.step(t_prev=0.1 * i, dt=0.1)
+                y_decay = StateVectorIntegrator.METHODS[method](func=self.rhs_decay, t_prev=0.1 * i, y_prev=y_decay,
+                                                                step_size=0.1, args=(np.array([1.0, 2.0, 3.0]),))
+                if method == 'dopri5':
+                    y_decay = y_decay[0]
+            self.assertTrue(np.allclose(y_decay, integrator['decay'], rtol=1e-14))
+            self.assertAlmostEqual(1.0, integrator['source'])
+            self.assertEqual(method == 'dopri5', integrator.error is not None)
+
+        integrator.set_args('source', 2.0)
+        integrator['decay'] = 0.0
+        integrator.step(t_prev=1.0, dt=0.5)
+        self.assertTrue(np.array_equal(np.zeros(3), integrator['decay']))
+        self.assertAlmostEqual(2.0, integrator['source'])
+
+    def test_batch(self):
+        integrator = StateVectorIntegrator(batch_shape=(2,))
+        integrator.register('decay', self.rhs_decay, y_init=np.ones((3, 2)),
+                            args=(np.array([1.0, 2.0, 3.0]).reshape(-1, 1),))
+        integrator.register('source', self.rhs_source, y_init=np.zeros(2), args=(np.array([1.0, -1.0]),))
+        self.assertEqual((4, 2), integrator.y.shape)
+        integrator.step(t_prev=0.0, dt=np.array([0.1, 0.0]))
+        self.assertTrue(np.allclose(rk4(func=self.rhs_decay, t_prev=0.0, y_prev=np.ones(3), step_size=0.1,
+                                        args=(np.array([1.0, 2.0, 3.0]),)), integrator['decay'][:, 0]))
+        self.assertTrue(np.array_equal(np.ones(3), integrator['decay'][:, 1]))
+        self.assertTrue(np.allclose([0.1, 0.0], integrator['source']))
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from SPPy.calc_helpers.tabulation import TabulationSettings, TabulatedFunction, tabulate
+
+
+def func_cubic(x):
+    return 2 * x ** 3 - x ** 2 + 0.5 * x - 1
+
+
+def func_scalar_only(x):
+    return float(np.exp(-5 * x))
+
+
+class TestTabulationSettings(unittest.TestCase):
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            TabulationSettings(num_points=2)
+        with self.assertRaises(ValueError):
+            TabulationSettings(x_min=0.9, x_max=0.1)
+        with self.assertRaises(ValueError):
+            TabulationSettings(kind='quadratic')
+        with self.assertRaises(ValueError):
+            TabulationSettings(tol=0)
+
+
+class TestTabulatedFunction(unittest.TestCase):
+    array_x = np.linspace(0.01, 0.99, 37)
+
+    def test_cubic(self):
+        func = TabulatedFunction(func=func_cubic, settings=TabulationSettings(num_points=11))
+        self.assertTrue(np.allclose(func_cubic(self.array_x), func(self.array_x)))
+        self.assertTrue(np.allclose(6 * self.array_x ** 2 - 2 * self.array_x + 0.5, func.derivative(self.array_x)))
+        self.assertAlmostEqual(func_cubic(0.37), func(0.37))
+        self.assertAlmostEqual(6 * 0.37 ** 2 - 2 * 0.37 + 0.5, func.derivative(0.37))
+
+    def test_linear(self):
+        settings = TabulationSettings(num_points=1001, kind='linear', tol=1e-4)
+        func = TabulatedFunction(func=func_scalar_only, settings=settings)
+        self.assertTrue(np.allclose(np.exp(-5 * self.array_x), func(self.array_x), atol=1e-4))
+        self.assertLessEqual(func.max_error, 1e-4)
+
+    def test_scalar_and_array_inputs(self):
+        func = TabulatedFunction(func=func_cubic)
+        for x in self.array_x:
+            self.assertAlmostEqual(func(float(x)), func(np.array([x]))[0])
+        self.assertTrue(np.isscalar(func(np.array(0.5))))
+
+    def test_outside_grid(self):
+        func = TabulatedFunction(func=func_cubic, settings=TabulationSettings(num_points=11, x_min=0.2, x_max=0.8))
+        self.assertEqual(func_cubic(0.1), func(0.1))
+        self.assertEqual(func_cubic(0.9), func(0.9))
+        self.assertTrue(np.allclose(func_cubic(np.array([0.1, 0.5, 0.9])), func(np.array([0.1, 0.5, 0.9]))))
+        self.assertAlmostEqual(6 * 0.9 ** 2 - 2 * 0.9 + 0.5, func.derivative(0.9), places=5)
+
+    def test_accuracy_check(self):
+        with self.assertRaises(ValueError):
+            TabulatedFunction(func=func_scalar_only, settings=TabulationSettings(num_points=5, kind='linear'))
+        # the tolerance is relative to the magnitude of the function.
+        with self.assertRaises(ValueError):
+            TabulatedFunction(func=lambda x: 1e-4 * np.cos(6 * x),
+                              settings=TabulationSettings(num_points=5, kind='linear'))
+        self.assertLessEqual(TabulatedFunction(func=lambda x: 1e-4 * np.cos(6 * x)).max_error, 1e-4)
+        # the function is exact at the grid points and their midpoints, but not in between.
+        settings = TabulationSettings(num_points=5, kind='linear')
+        h = (settings.x_max - settings.x_min) / (settings.num_points - 1)
+        with self.assertRaises(ValueError):
+            TabulatedFunction(func=lambda x: 1 + 0.1 * np.sin(2 * np.pi * (x - settings.x_min) / h), settings=settings)
+
+    def test_tabulate_cache(self):
+        self.assertIs(tabulate(func_cubic), tabulate(func_cubic, TabulationSettings()))
+        self.assertIsNot(tabulate(func_cubic), tabulate(func_cubic, TabulationSettings(num_points=101)))
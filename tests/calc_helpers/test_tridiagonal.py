@@ -0,0 +1,81 @@
+"""
+Contains the unit tests for the tridiagonal solvers
+"""
+
+import unittest
+
+import numpy as np
+
+from SPPy.calc_helpers.tridiagonal import TridiagonalSolver, solve_tridiagonal
+from SPPy.calc_helpers.matrix_operations import TDMAsolver
+
+
+def dense(l_diag, diag, u_diag):
+    return np.diag(diag) + np.diag(l_diag, -1) + np.diag(u_diag, 1)
+
+
+class TestTridiagonalSolver(unittest.TestCase):
+    rng = np.random.default_rng(0)
+
+    def random_diags(self, shape):
+        l_diag = self.rng.random(shape[:-1] + (shape[-1] - 1,))
+        u_diag = self.rng.random(shape[:-1] + (shape[-1] - 1,))
+        diag = 3 + self.rng.random(shape)
+        return l_diag, diag, u_diag
+
+    def test_constructor(self):
+        with self.assertRaises(ValueError):
+            TridiagonalSolver(l_diag=np.ones(3), diag=np.ones(3), u_diag=np.ones(2))
+        with self.assertRaises(ValueError):
+            TridiagonalSolver(l_diag=np.ones((2, 2, 2)), diag=np.ones((2, 2, 3)), u_diag=np.ones((2, 2, 2)))
+        with self.assertRaises(np.linalg.LinAlgError):
+            TridiagonalSolver(l_diag=np.ones(3), diag=np.zeros(4), u_diag=np.zeros(3))
+
+    def test_single_system(self):
+        for n in (1, 2, 3, 30, 500):
+            l_diag, diag, u_diag = self.random_diags((n,))
+            l_diag_copy = l_diag.copy()
+            solver = TridiagonalSolver(l_diag=l_diag, diag=diag, u_diag=u_diag)
+            b = self.rng.random(n)
+            self.assertTrue(np.allclose(b, dense(l_diag, diag, u_diag) @ solver.solve(b)))
+            # many right-hand sides
+            array_b = self.rng.random((4, n))
+            array_x = solver.solve(array_b)
+            self.assertEqual((4, n), array_x.shape)
+            self.assertTrue(np.allclose(array_b.T, dense(l_diag, diag, u_diag) @ array_x.T))
+            # the inputs are not overwritten.
+            self.assertTrue(np.array_equal(l_diag_copy, l_diag))
+        with self.assertRaises(ValueError):
+            solver.solve(np.ones(n + 1))
+
+    def test_pivoting(self):
+        # the Thomas algorithm fails for the zero first diagonal element.
+        l_diag, diag, u_diag = np.array([1.0, 1.0]), np.array([0.0, 1.0, 1.0]), np.array([1.0, 1.0])
+        b = np.array([1.0, 2.0, 3.0])
+        self.assertTrue(np.allclose(b, dense(l_diag, diag, u_diag) @ solve_tridiagonal(l_diag, diag, u_diag, b)))
+        array_x = solve_tridiagonal(np.tile(l_diag, (2, 1)), np.tile(diag, (2, 1)), np.tile(u_diag, (2, 1)),
+                                    np.tile(b, (2, 1)))
+        self.assertTrue(np.allclose(b, dense(l_diag, diag, u_diag) @ array_x[1]))
+
+    def test_batch(self):
+        for n in (1, 5, 30, TridiagonalSolver.MAX_BATCH_THOMAS_N + 1):
+            l_diag, diag, u_diag = self.random_diags((7, n))
+            solver = TridiagonalSolver(l_diag=l_diag, diag=diag, u_diag=u_diag)
+            self.assertTrue(solver.is_batch)
+            self.assertEqual(7, solver.batch_size)
+            array_b = self.rng.random((7, n))
+            array_x = solver.solve(array_b)
+            for i in range(7):
+                self.assertTrue(np.allclose(array_b[i], dense(l_diag[i], diag[i], u_diag[i]) @ array_x[i]))
+        with self.assertRaises(ValueError):
+            solver.solve(np.ones(n))
+
+    def test_TDMAsolver(self):
+        l_diag, diag, u_diag = self.random_diags((10,))
+        b = self.rng.random(10)
+        self.assertTrue(np.allclose(np.linalg.solve(dense(l_diag, diag, u_diag), b),
+                                    TDMAsolver(l_diag=l_diag, diag=diag, u_diag=u_diag, col_vec=b)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -52,6 +52,28 @@ class TestCustomCycler(unittest.TestCase):
 
         self.assertEqual(self.I_array[-1], cycler.get_current(step_name='discharge', t=4.1))
 
+    def test_get_current_before_first_time(self):
+        cycler = CustomCycler(array_t=self.t_array + 1.0, array_I=self.I_array, V_min=self.V_min, V_max=self.V_max)
+        self.assertEqual(0.0, cycler.get_current(step_name='custom', t=0.5))
+        self.assertEqual(self.I_array[0], cycler.get_current(step_name='custom', t=1.0))
 
+    def test_get_current_out_of_sequence(self):
+        cycler = CustomCycler(array_t=self.t_array, array_I=self.I_array, V_min=self.V_min, V_max=self.V_max)
+        for t in [3.5, 0.5, 4.5, 1.0, 1.0, 2.5, -1.0, 0.0]:
+            self.assertEqual(cycler.get_current_array(np.array([t]))[0], cycler.get_current(step_name='custom', t=t))
 
+    def test_get_current_unsorted(self):
+        array_idx = np.array([3, 0, 4, 1, 2])
+        cycler = CustomCycler(array_t=self.t_array[array_idx], array_I=self.I_array[array_idx], V_min=self.V_min,
+                              V_max=self.V_max)
+        self.assertEqual(self.I_array[2], cycler.get_current(step_name='custom', t=2.5))
+        self.assertEqual(self.I_array[-1], cycler.get_current(step_name='custom', t=4.1))
 
+    def test_get_current_array(self):
+        cycler = CustomCycler(array_t=self.t_array, array_I=self.I_array, V_min=self.V_min, V_max=self.V_max)
+        array_t = np.arange(-1, 5.5, 0.1)
+        array_I = cycler.get_current_array(array_t)
+        self.assertEqual(array_t.shape, array_I.shape)
+        self.assertTrue(np.array_equal([cycler.get_current(step_name='custom', t=t) for t in array_t], array_I))
+        self.assertEqual(0.0, array_I[0])
+        self.assertEqual(self.I_array[-1], array_I[-1])
@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from SPPy.general_OCP import funcs, LCO, MCMB, hard_carbon
+
+
+class TestExtractOCP(unittest.TestCase):
+    array_x = np.array([0.05, 0.2, 0.35, 0.45, 0.55, 0.7, 0.85, 0.95])
+
+    def test_reference_functions(self):
+        self.assertTrue(np.allclose(LCO.OCP_ref_p(self.array_x),
+                                    funcs.extract_OCP(self.array_x, specie_name='LCO', T=298.15)))
+        self.assertTrue(np.allclose(MCMB.OCP_ref_n(self.array_x),
+                                    funcs.extract_OCP(self.array_x, specie_name='MCMB', T=298.15)))
+        self.assertTrue(np.allclose(hard_carbon.OCP_ref_n(self.array_x),
+                                    funcs.extract_OCP(self.array_x, specie_name='Hard_carbon', T=298.15)))
+
+    def test_scalar_input(self):
+        array_OCP = funcs.extract_OCP(self.array_x, specie_name='NMC', T=298.15)
+        for x, OCP in zip(self.array_x, array_OCP):
+            OCP_scalar = funcs.extract_OCP(x, specie_name='NMC', T=298.15)
+            self.assertTrue(np.isscalar(OCP_scalar))
+            self.assertAlmostEqual(OCP, OCP_scalar)
+
+    def test_coefficients(self):
+        U0, K, array_A = funcs.get_coefficients('NMC')
+        self.assertAlmostEqual(3.755472, U0)
+        self.assertAlmostEqual(-0.635961, K)
+        self.assertEqual(15, len(array_A))
+        self.assertAlmostEqual(-1306.411, array_A[0])
+        self.assertIs(array_A, funcs.get_coefficients('NMC')[2])
+        with self.assertRaises(ValueError):
+            array_A[0] = 0.0
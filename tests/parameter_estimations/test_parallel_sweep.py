@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import SPPy
+from SPPy.parameter_estimations.parallel_sweep import ParameterSweep
+
+
+class TestParameterSweep(unittest.TestCase):
+    SOC_init_p = 0.4956
+    SOC_init_n = 0.7568
+    T = 298.15
+    array_D_p = np.array([1e-14, 2e-14])
+    array_D_n = np.array([3.9e-14, 5e-14])
+    dc = SPPy.Discharge(discharge_current=1.656, V_min=4.0, SOC_LIB_min=0.1, SOC_LIB=0.9)
+    sweep = ParameterSweep(parameter_set_name='test', SOC_init_p=SOC_init_p, SOC_init_n=SOC_init_n, T=T, cycler=dc,
+                           dict_params={'elec_p.D_ref': array_D_p, 'elec_n.D_ref': array_D_n},
+                           solver_params={'N': 5, 'isothermal': True, 'degradation': False},
+                           solve_params={'t_increment': 1})
+
+    def test_constructor(self):
+        with self.assertRaises(TypeError):
+            ParameterSweep(parameter_set_name='test', SOC_init_p=self.SOC_init_p, SOC_init_n=self.SOC_init_n,
+                           T=self.T, cycler=0, dict_params={'elec_p.D_ref': self.array_D_p})
+        with self.assertRaises(ValueError):
+            ParameterSweep(parameter_set_name='test', SOC_init_p=self.SOC_init_p, SOC_init_n=self.SOC_init_n,
+                           T=self.T, cycler=self.dc, dict_params={})
+        with self.assertRaises(ValueError):
+            ParameterSweep(parameter_set_name='test', SOC_init_p=self.SOC_init_p, SOC_init_n=self.SOC_init_n,
+                           T=self.T, cycler=self.dc, dict_params={'elec_p.not_an_attribute': self.array_D_p})
+
+        self.assertEqual(4, self.sweep.num_runs)
+        self.assertEqual((1, {'elec_p.D_ref': 1e-14, 'elec_n.D_ref': 5e-14}), list(self.sweep.combinations())[1])
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            dir_serial = os.path.join(dir_path, 'serial')
+            dir_parallel = os.path.join(dir_path, 'parallel')
+            self.assertEqual(4, self.sweep.run(dir_name=dir_serial, num_workers=1))
+            self.assertEqual(4, self.sweep.run(dir_name=dir_parallel, num_workers=2))
+
+            df_index = ParameterSweep.read_index(dir_parallel)
+            self.assertEqual([0, 1, 2, 3], list(df_index.index))
+            self.assertTrue(np.allclose(np.repeat(self.array_D_p, 2), df_index['elec_p.D_ref']))
+
+            for run_id, dict_param_values in self.sweep.combinations():
+                sol_serial = ParameterSweep.load_solution(dir_name=dir_serial, run_id=run_id)
+                sol_parallel = ParameterSweep.load_solution(dir_name=dir_parallel, run_id=run_id)
+                # compare against the direct simulation
+                cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=self.SOC_init_p,
+                                        SOC_init_n=self.SOC_init_n, T=self.T)
+                cell.elec_p.D_ref = dict_param_values['elec_p.D_ref']
+                cell.elec_n.D_ref = dict_param_values['elec_n.D_ref']
+                dc = SPPy.Discharge(discharge_current=1.656, V_min=4.0, SOC_LIB_min=0.1, SOC_LIB=0.9)
+                sol = SPPy.SPPySolver(b_cell=cell, N=5, isothermal=True, degradation=False).solve(
+                    cycler_instance=dc, t_increment=1)
+                self.assertTrue(np.array_equal(sol.V, sol_serial.V))
+                self.assertTrue(np.array_equal(sol.V, sol_parallel.V))
+                self.assertTrue(np.array_equal(sol.t, sol_parallel.t))
+                self.assertEqual(list(sol.cycle_step), list(sol_parallel.cycle_step))
+
+            with self.assertRaises(ValueError):
+                ParameterSweep.load_solution(dir_name=dir_parallel, run_id=4)
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            self.assertEqual(4, self.sweep.run(dir_name=dir_path, num_workers=1))
+            V_last = np.array(ParameterSweep.load_solution(dir_name=dir_path, run_id=3).V)
+            # simulate the interruption during the last run, after some of its rows were written.
+            with open(ParameterSweep.index_path(dir_path)) as f:
+                lst_lines = f.readlines()
+            with open(ParameterSweep.index_path(dir_path), 'w') as f:
+                f.writelines(lst_lines[:-1])
+
+            self.assertEqual(1, self.sweep.run(dir_name=dir_path, num_workers=1))
+            self.assertEqual(0, self.sweep.run(dir_name=dir_path, num_workers=1))
+            df_index = ParameterSweep.read_index(dir_path)
+            self.assertEqual(4, len(df_index))
+            dict_columns, _ = SPPy.SolutionSink.read(dir_path)
+            self.assertEqual(df_index['num_rows'].sum(), len(dict_columns['t']))
+            self.assertTrue(np.array_equal(V_last, ParameterSweep.load_solution(dir_name=dir_path, run_id=3).V))
+
+
+if __name__ == '__main__':
+    unittest.main()
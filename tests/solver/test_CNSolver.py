@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+from SPPy.solvers.electrode_surf_conc import CNSolver
+
+
+class TestCNSolver(unittest.TestCase):
+    i_app = -1.656
+    r = 8.5e-6
+    s = 1.1167
+    d = 1e-14
+    max_conc = 51410
+    dt = 0.1
+
+    def test_RHS_array(self):
+        """
+        Compares the RHS array with its element-wise calculation.
+        """
+        solver = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p')
+        solver.c_prev = solver.c_prev * np.linspace(0.9, 1.1, solver.K).reshape(-1, 1)
+        j = 1e-5
+        A_ = solver.A(dt=self.dt, R=self.r, D=self.d)
+        B_ = solver.B(dt=self.dt, R=self.r, D=self.d)
+        array_r = np.linspace(0, self.r, solver.K)
+        c = solver.c_prev[:, 0]
+        array_expected = np.zeros(solver.K)
+        array_expected[0] = (1 - 3 * A_) * c[0] + 3 * A_ * c[1]
+        array_expected[-1] = (1 - A_) * c[-1] - (A_ + B_ / self.r) * (2 * solver.dr(R=self.r) * j / self.d) + \
+            A_ * c[-2]
+        for i in range(1, solver.K - 1):
+            array_expected[i] = (1 - A_) * c[i] + (A_ / 2 + B_ / array_r[i]) * c[i + 1] + \
+                                (A_ / 2 - B_ / array_r[i]) * c[i - 1]
+        array_RHS = solver._RHS_array(j=j, dt=self.dt, R=self.r, D=self.d)
+        self.assertEqual((solver.K, 1), array_RHS.shape)
+        self.assertTrue(np.allclose(array_expected, array_RHS[:, 0], rtol=1e-14))
+
+    def test_LHS_cache(self):
+        solver = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p')
+        LHS = solver.LHS_cache(dt=self.dt, R=self.r, D=self.d, solver_method='inverse')
+        self.assertIs(LHS, solver.LHS_cache(dt=self.dt, R=self.r, D=self.d))
+        self.assertTrue(np.array_equal(solver.M(dt=self.dt, R=self.r, D=self.d), LHS['M']))
+        self.assertIsNot(LHS, solver.LHS_cache(dt=2 * self.dt, R=self.r, D=self.d))
+
+    def test_LHS_cache_lazy(self):
+        # only the variables needed by the solver method are calculated.
+        solver = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p')
+        LHS = solver.LHS_cache(dt=self.dt, R=self.r, D=self.d, solver_method='inverse')
+        self.assertIn('M', LHS)
+        self.assertNotIn('LU', LHS)
+        self.assertNotIn('TDMA', LHS)
+        LHS = solver.LHS_cache(dt=self.dt, R=self.r, D=self.d, solver_method='LU')
+        self.assertIn('LU', LHS)
+        self.assertNotIn('TDMA', LHS)
+        LHS = solver.LHS_cache(dt=2 * self.dt, R=self.r, D=self.d, solver_method='TDMA')
+        self.assertIn('TDMA', LHS)
+        self.assertNotIn('M', LHS)
+        # the default solver method is the cached tridiagonal factorization.
+        solver = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p')
+        solver(dt=self.dt, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d, c_smax=self.max_conc)
+        self.assertIn('TDMA', solver.LHS_cache_)
+        self.assertNotIn('M', solver.LHS_cache_)
+
+    def test_LHS_cache_off(self):
+        solver = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p', cache_LHS=False)
+        LHS = solver.LHS_cache(dt=self.dt, R=self.r, D=self.d, solver_method='LU')
+        self.assertIsNot(LHS, solver.LHS_cache(dt=self.dt, R=self.r, D=self.d, solver_method='LU'))
+        self.assertIsNone(solver.LHS_key_)
+        # the results do not depend on the caching.
+        solver_cached = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p')
+        for i in range(5):
+            D = self.d * (1 + 0.1 * i)
+            SOC = solver(dt=self.dt, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=D, c_smax=self.max_conc)
+            SOC_cached = solver_cached(dt=self.dt, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=D,
+                                       c_smax=self.max_conc)
+            self.assertEqual(SOC_cached, SOC)
+
+    def test_solver_methods(self):
+        lst_SOC = []
+        for solver_method in ('inverse', 'TDMA', 'LU'):
+            solver = CNSolver(c_init=0.4956 * self.max_conc, electrode_type='p')
+            for _ in range(10):
+                SOC = solver(dt=self.dt, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d,
+                             c_smax=self.max_conc, solver_method=solver_method)
+            lst_SOC.append(SOC)
+        self.assertTrue(np.allclose(lst_SOC[0], lst_SOC[1:]))
+        self.assertTrue(lst_SOC[0] > 0.4956)
+
+        with self.assertRaises(ValueError):
+            solver(dt=self.dt, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d,
+                   c_smax=self.max_conc, solver_method='Newton')
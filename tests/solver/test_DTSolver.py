@@ -0,0 +1,151 @@
+import copy
+import tempfile
+import unittest
+
+import numpy as np
+
+import SPPy
+
+
+def create_cell(soc_init: float = 0.6, func_eta=lambda SOC, temp: 1) -> SPPy.ECMBatteryCell:
+    return SPPy.ECMBatteryCell(R0_ref=0.005, R1_ref=0.001, C1=0.03, temp_ref=298.15, Ea_R0=4000, Ea_R1=4000,
+                               rho=1626, vol=3.38e-5, c_p=750, h=1, area=0.085, cap=1.65, v_max=4.2, v_min=2.5,
+                               soc_init=soc_init, temp_init=298.15, func_eta=func_eta,
+                               func_ocv=lambda SOC: 3.0 + SOC - 0.1 * SOC ** 2,
+                               func_docvdtemp=lambda SOC: 0.0)
+
+
+class TestDTSolverBatchSPKF(unittest.TestCase):
+    @staticmethod
+    def create_sol_exp(num_steps: int, phase: float) -> SPPy.ECMSolution:
+        array_t = np.arange(num_steps, dtype=float)
+        array_I = 1.65 * (1 + np.sin(0.05 * array_t + phase))
+        array_V = 3.6 - 0.0005 * array_t - 0.005 * array_I
+        return SPPy.ECMSolution(array_t=array_t, array_I=array_I, array_V=array_V)
+
+    def test_solveBatchSPKF(self):
+        lst_sol_exp = [self.create_sol_exp(num_steps=200, phase=0.0), self.create_sol_exp(num_steps=120, phase=1.0),
+                       self.create_sol_exp(num_steps=250, phase=2.0)]
+        lst_soc_init = [0.6, 0.5, 0.7]
+        spkf_params = dict(cov_soc=1e-3, cov_current=1e-3, cov_process=1e-3, cov_sensor=1e-3, v_min=3.0, v_max=4.2)
+
+        solver = SPPy.DTSolver(battery_cell_instance=create_cell(soc_init=0.6), isothermal=True)
+        lst_sol = solver.solveBatchSPKF(lst_sol_exp=lst_sol_exp, array_soc_init=lst_soc_init, **spkf_params)
+        self.assertEqual(3, len(lst_sol))
+
+        for sol_exp, soc_init, sol in zip(lst_sol_exp, lst_soc_init, lst_sol):
+            solver = SPPy.DTSolver(battery_cell_instance=create_cell(soc_init=soc_init), isothermal=True)
+            sol_ref = solver.solveSPKF(sol_exp=sol_exp, soc_min=0.0, soc_max=1.0, soc_init=soc_init, **spkf_params)
+            self.assertEqual(len(sol_ref.array_t), len(sol.array_t))
+            self.assertTrue(np.allclose(sol_ref.array_t, sol.array_t))
+            self.assertTrue(np.allclose(sol_ref.array_V, sol.array_V))
+            self.assertTrue(np.allclose(sol_ref.array_soc, sol.array_soc))
+            self.assertTrue(np.allclose(sol_ref.array_I_R1, sol.array_I_R1))
+
+    def test_solveBatchSPKF_voltage_limits(self):
+        lst_sol_exp = [self.create_sol_exp(num_steps=200, phase=0.0)]
+        solver = SPPy.DTSolver(battery_cell_instance=create_cell(soc_init=0.6), isothermal=True)
+        lst_sol = solver.solveBatchSPKF(lst_sol_exp=lst_sol_exp, array_soc_init=[0.6], cov_soc=1e-3, cov_current=1e-3,
+                                        cov_process=1e-3, cov_sensor=1e-3, v_min=3.0, v_max=3.5)
+        # the estimation stops at the first time step whose terminal voltage is outside the limits.
+        self.assertLess(len(lst_sol[0].array_V), 199)
+        self.assertTrue(np.all(lst_sol[0].array_V[:-1] <= 3.5))
+        self.assertGreater(lst_sol[0].array_V[-1], 3.5)
+
+        with self.assertRaises(TypeError):
+            solver.solveBatchSPKF(lst_sol_exp=[], array_soc_init=[0.6], cov_soc=1e-3, cov_current=1e-3,
+                                  cov_process=1e-3, cov_sensor=1e-3, v_min=3.0, v_max=3.5)
+
+
+class TestDTSolverCustomCyclerVectorized(unittest.TestCase):
+    array_t = np.arange(0.0, 1000.0, 10.0)
+    array_I = 1.65 * np.sin(0.01 * array_t) + 0.5
+    cycler = SPPy.CustomCycler(array_t=array_t, array_I=array_I, V_min=3.0, V_max=4.2)
+
+    def test_solve(self):
+        # the efficiency function in the second case does not support the numpy arrays.
+        for func_eta, V_min in [(lambda SOC, temp: 1, 3.0), (lambda SOC, temp: 1.0 if SOC < 0.55 else 0.98, 3.0),
+                                (lambda SOC, temp: 1, 3.5)]:
+            cell = create_cell(func_eta=func_eta)
+            sol_ref = SPPy.DTSolver(battery_cell_instance=cell, isothermal=True).solve(
+                cycling_step=SPPy.CustomCycler(array_t=self.array_t, array_I=self.array_I, V_min=V_min, V_max=4.2),
+                dt=0.7, vectorized=False)
+            cell_vectorized = create_cell(func_eta=func_eta)
+            sol = SPPy.DTSolver(battery_cell_instance=cell_vectorized, isothermal=True).solve(
+                cycling_step=SPPy.CustomCycler(array_t=self.array_t, array_I=self.array_I, V_min=V_min, V_max=4.2),
+                dt=0.7)
+            self.assertEqual(len(sol_ref.array_t), len(sol.array_t))
+            for array_ref, array in [(sol_ref.array_t, sol.array_t), (sol_ref.array_I, sol.array_I),
+                                     (sol_ref.array_V, sol.array_V), (sol_ref.array_soc, sol.array_soc),
+                                     (sol_ref.array_I_R1, sol.array_I_R1), (sol_ref.array_temp, sol.array_temp)]:
+                self.assertTrue(np.allclose(array_ref, array, rtol=0, atol=1e-12))
+            self.assertAlmostEqual(cell.soc, cell_vectorized.soc, places=12)
+            if V_min == 3.0:
+                self.assertGreater(sol.array_t[-1], 990.0)
+            else:
+                # the simulation stops at the first time step below the minimum voltage.
+                self.assertLess(sol.array_V[-1], V_min)
+                self.assertTrue(np.all(sol.array_V[:-1] >= V_min))
+
+    def test_chunks(self):
+        cell = create_cell()
+        sol_ref = SPPy.DTSolver(battery_cell_instance=cell, isothermal=True).solve(
+            cycling_step=copy.deepcopy(self.cycler), dt=0.7, vectorized=False)
+        solver = SPPy.DTSolver(battery_cell_instance=create_cell(), isothermal=True)
+        sol = solver._DTSolver__solve_custom_step_vectorized(cycling_step=copy.deepcopy(self.cycler), dt=0.7,
+                                                             chunk_size=7)
+        self.assertTrue(np.allclose(sol_ref.array_V, sol.array_V, rtol=0, atol=1e-12))
+        # the efficiencies that do not converge within max_iter iterations
+        solver = SPPy.DTSolver(battery_cell_instance=create_cell(func_eta=lambda SOC, temp: SOC), isothermal=True)
+        self.assertIsNone(solver._DTSolver__solve_custom_step_vectorized(cycling_step=copy.deepcopy(self.cycler),
+                                                                         dt=0.7, max_iter=2))
+        self.assertEqual(0.6, solver.b_cell.soc)
+
+    def test_sink(self):
+        class RecordingSink(SPPy.SolutionSink):
+            # keeps the number of rows of each written chunk.
+            def write(self, dict_columns, attrs=None):
+                self.lst_chunk_len.append(len(dict_columns['array_t']))
+                super().write(dict_columns=dict_columns, attrs=attrs)
+
+        cell = create_cell()
+        sol_ref = SPPy.DTSolver(battery_cell_instance=cell, isothermal=True).solve(
+            cycling_step=copy.deepcopy(self.cycler), dt=0.7, vectorized=False)
+        with tempfile.TemporaryDirectory() as dir_path:
+            sink = RecordingSink(dir_path=dir_path, chunk_size=100)
+            sink.lst_chunk_len = []
+            sol = SPPy.DTSolver(battery_cell_instance=create_cell(), isothermal=True).solve(
+                cycling_step=copy.deepcopy(self.cycler), dt=0.7, sink=sink)
+            # the rows are written in chunks during the simulation rather than once at its end.
+            self.assertGreater(len(sink.lst_chunk_len), 10)
+            self.assertTrue(all(chunk_len <= 101 for chunk_len in sink.lst_chunk_len))
+            self.assertIsInstance(sol.array_V, np.memmap)
+            self.assertTrue(np.allclose(sol_ref.array_t, sol.array_t, rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(sol_ref.array_V, sol.array_V, rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(sol_ref.array_soc, sol.array_soc, rtol=0, atol=1e-12))
+            del sol
+
+    def test_sink_non_converging_efficiency(self):
+        # the efficiencies do not converge once the SOC falls below 0.58, after some chunks were written. The rest of
+        # the simulation continues with the time loop.
+        func_eta = lambda SOC, temp: 1.0 if SOC > 0.58 else 0.9 + 0.1 * SOC
+        sol_ref = SPPy.DTSolver(battery_cell_instance=create_cell(func_eta=func_eta), isothermal=True).solve(
+            cycling_step=copy.deepcopy(self.cycler), dt=0.7, vectorized=False)
+        with tempfile.TemporaryDirectory() as dir_path:
+            sink = SPPy.SolutionSink(dir_path=dir_path, chunk_size=100)
+            solver = SPPy.DTSolver(battery_cell_instance=create_cell(func_eta=func_eta), isothermal=True)
+            sol = solver._DTSolver__solve_custom_step_vectorized(cycling_step=copy.deepcopy(self.cycler), dt=0.7,
+                                                                 max_iter=2, sink=sink)
+            self.assertGreater(sink.num_rows, 0)
+            sol.write_to_sink(sink=sink)
+            sol = SPPy.ECMSolution.read_from_sink(dir_path=dir_path)
+            self.assertEqual(len(sol_ref.array_t), len(sol.array_t))
+            self.assertTrue(np.allclose(sol_ref.array_t, sol.array_t, rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(sol_ref.array_V, sol.array_V, rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(sol_ref.array_soc, sol.array_soc, rtol=0, atol=1e-12))
+            self.assertAlmostEqual(sol_ref.array_soc[-1], solver.b_cell.soc, places=12)
+            del sol
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
 import unittest
-from SPPy.solvers.electrode_surf_conc import EigenFuncExp
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from SPPy.solvers.electrode_surf_conc import EigenFuncExp, EigenvalueTable
 
 
 class TestEigenFuncForPositiveElectrode(unittest.TestCase):
@@ -101,6 +105,93 @@ class TestEigenFuncForPositiveElectrode(unittest.TestCase):
         self.assertEqual(0.5042699076691792, SOC_second_iter)
 
 
+class TestEigenFuncExpExactMethod(unittest.TestCase):
+    """
+    Tests for the exact exponential update of the eigenfunctions.
+    """
+    i_app = -1.656
+    r = 8.5e-6
+    s = 1.1167
+    d = 1e-14
+    max_conc = 51410
+
+    def test_constructor(self):
+        electrode_SOC = EigenFuncExp(x_init=0.4956, n=5, electrode_type='p', method='exact')
+        self.assertEqual('exact', electrode_SOC.method)
+        self.assertEqual((5,), electrode_SOC.lst_u_k.shape)
+        with self.assertRaises(ValueError):
+            EigenFuncExp(x_init=0.4956, n=5, electrode_type='p', method='euler')
+
+    def test_SOC_calc_two_iteration_positive_electrode(self):
+        electrode_SOC = EigenFuncExp(x_init=0.4956, n=5, electrode_type='p', method='exact')
+        SOC_first_iter = electrode_SOC(dt=0.1, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d,
+                                       c_smax=self.max_conc)
+        self.assertAlmostEqual(0.5042242859771239, SOC_first_iter, places=12)
+        SOC_second_iter = electrode_SOC(dt=0.1, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d,
+                                        c_smax=self.max_conc)
+        self.assertAlmostEqual(0.5042699076691792, SOC_second_iter, places=12)
+
+    def test_exp_factors_cache(self):
+        electrode_SOC = EigenFuncExp(x_init=0.4956, n=5, electrode_type='p', method='exact')
+        factors = electrode_SOC.exp_factors(dt=0.1, D=self.d, R=self.r)
+        self.assertIs(factors, electrode_SOC.exp_factors(dt=0.1, D=self.d, R=self.r))
+        self.assertIsNot(factors, electrode_SOC.exp_factors(dt=0.2, D=self.d, R=self.r))
+        self.assertTrue(np.allclose(np.exp(-electrode_SOC.array_roots ** 2 * self.d * 0.1 / self.r ** 2), factors))
+
+    def test_large_time_step(self):
+        """
+        The eigenfunctions approach their steady-state values at large time steps.
+        """
+        electrode_SOC = EigenFuncExp(x_init=0.4956, n=5, electrode_type='p', method='exact')
+        electrode_SOC(dt=1e6, t_prev=0, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d, c_smax=self.max_conc)
+        j_scaled = electrode_SOC.j_scaled(i_app=self.i_app, R=self.r, S=self.s, D_s=self.d, c_smax=self.max_conc)
+        self.assertTrue(np.allclose(2 * j_scaled / electrode_SOC.array_roots ** 2, electrode_SOC.lst_u_k))
+
+    def test_array_inputs(self):
+        array_x_init = np.array([0.4956, 0.5])
+        electrode_SOC = EigenFuncExp(x_init=array_x_init, n=5, electrode_type='p', method='exact')
+        SOC = electrode_SOC(dt=np.array([0.1, 0.0]), t_prev=0, i_app=self.i_app, R=self.r, S=self.s,
+                            D_s=np.array([self.d, self.d]), c_smax=self.max_conc)
+        self.assertEqual((5, 2), electrode_SOC.lst_u_k.shape)
+        self.assertAlmostEqual(0.5042242859771239, SOC[0], places=12)
+
+    def test_array_inputs_rk4(self):
+        # the eigenfunctions of all the battery cells are solved in a single rk4 call.
+        electrode_SOC = EigenFuncExp(x_init=np.array([0.4956, 0.5]), n=5, electrode_type='p', method='rk4')
+        electrode_SOC_scalar = EigenFuncExp(x_init=0.4956, n=5, electrode_type='p', method='rk4')
+        for i in range(3):
+            SOC = electrode_SOC(dt=np.array([0.1, 0.0]), t_prev=0.1 * i, i_app=self.i_app, R=self.r, S=self.s,
+                                D_s=np.array([self.d, self.d]), c_smax=self.max_conc)
+            SOC_scalar = electrode_SOC_scalar(dt=0.1, t_prev=0.1 * i, i_app=self.i_app, R=self.r, S=self.s, D_s=self.d,
+                                              c_smax=self.max_conc)
+        self.assertEqual((5, 2), electrode_SOC.lst_u_k.shape)
+        self.assertAlmostEqual(SOC_scalar, SOC[0], places=12)
+        self.assertTrue(np.allclose(electrode_SOC_scalar.lst_u_k, electrode_SOC.lst_u_k[:, 0], rtol=1e-12))
+
+
+class TestEigenvalueTable(unittest.TestCase):
+    def test_shared_roots(self):
+        electrode_SOC_p = EigenFuncExp(x_init=0.4956, n=5, electrode_type='p')
+        electrode_SOC_n = EigenFuncExp(x_init=0.7568, n=3, electrode_type='n')
+        self.assertEqual(electrode_SOC_p.lambda_roots[:3], electrode_SOC_n.lambda_roots)
+        self.assertEqual(EigenvalueTable.roots(5), electrode_SOC_p.lambda_roots)
+
+    def test_extension(self):
+        array_roots = EigenvalueTable.array_roots(30)
+        self.assertEqual(30, len(array_roots))
+        self.assertTrue(np.all(np.diff(array_roots) > 0))
+        self.assertTrue(np.allclose(0, EigenvalueTable.lambda_func(array_roots), atol=1e-9))
+        self.assertEqual(4.493409457910043, array_roots[0])
+        with self.assertRaises(ValueError):
+            array_roots[0] = 0.0
+
+    def test_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            lst_roots = list(executor.map(EigenvalueTable.roots, [40, 45, 50, 55]))
+        for roots in lst_roots:
+            self.assertEqual(roots, EigenvalueTable.roots(len(roots)))
+
+
 class TestEigenFuncExpForIncorrectElectrode(unittest.TestCase):
     def test_constuctor(self):
         """
@@ -1,3 +1,4 @@
+import copy
 import unittest
 import numpy as np
 
@@ -139,3 +140,71 @@ class TestSppySolverNonIsothermal(unittest.TestCase):
         self.assertEqual(298.1502973477614, self.sol.T[3])
         self.assertEqual(298.1503680083491, self.sol.T[4])
 
+
+class TestSPPySolverAdaptive(unittest.TestCase):
+    """
+    Tests the adaptive time stepping against the fixed time stepping.
+    """
+    N = 5
+    SOC_init_p = 0.4956
+    SOC_init_n = 0.7568
+    I = 1.656
+    T = 298.15
+    V_min = 4.0
+    SOC_min = 0.1
+    SOC_LIB = 0.9
+    rest_time = 600
+    test_cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=SOC_init_p, SOC_init_n=SOC_init_n, T=T)
+    dc = SPPy.DischargeRest(discharge_current=I, rest_time=rest_time, V_min=V_min, SOC_LIB_min=SOC_min,
+                            SOC_LIB=SOC_LIB, SOC_LIB_max=1.0)
+
+    def test_invalid_arguments(self):
+        test_solver = SPPy.SPPySolver(b_cell=copy.deepcopy(self.test_cell), N=self.N, isothermal=False,
+                                      degradation=False, method='exact')
+        with self.assertRaises(TypeError):
+            test_solver.solve(cycler_instance=copy.deepcopy(self.dc), step_control=0.1)
+        custom_cycler = SPPy.CustomDischarge(t_array=np.array([0.0, 0.1]), I_array=np.array([1.0, 1.0]),
+                                             V_min=self.V_min)
+        with self.assertRaises(ValueError):
+            test_solver.solve(cycler_instance=custom_cycler, step_control=SPPy.AdaptiveStepControl())
+
+    def test_discharge_rest(self):
+        test_solver = SPPy.SPPySolver(b_cell=copy.deepcopy(self.test_cell), N=self.N, isothermal=False,
+                                      degradation=False, method='exact')
+        sol_fixed = test_solver.solve(cycler_instance=copy.deepcopy(self.dc))
+        test_solver = SPPy.SPPySolver(b_cell=copy.deepcopy(self.test_cell), N=self.N, isothermal=False,
+                                      degradation=False, method='exact')
+        sol_adaptive = test_solver.solve(cycler_instance=copy.deepcopy(self.dc),
+                                         step_control=SPPy.AdaptiveStepControl())
+        self.assertLess(len(sol_adaptive.t), len(sol_fixed.t) / 10)
+
+        # the discharge step lands on the cutoff voltage.
+        array_step = np.array(sol_adaptive.cycle_step)
+        index_discharge_end = np.where(array_step == 'discharge')[0][-1]
+        t_discharge_end = sol_adaptive.t[index_discharge_end]
+        self.assertAlmostEqual(self.V_min, sol_adaptive.V[index_discharge_end], places=4)
+        self.assertLess(sol_adaptive.V[index_discharge_end], self.V_min)
+        t_fixed_end = sol_fixed.t[np.where(np.array(sol_fixed.cycle_step) == 'discharge')[0][-1]]
+        self.assertAlmostEqual(t_fixed_end, t_discharge_end, delta=0.2)
+
+        # the rest step ends exactly at the rest time.
+        self.assertAlmostEqual(t_discharge_end + self.rest_time, sol_adaptive.t[-1], places=6)
+
+        # the voltages are close to the fixed time step solution.
+        V_interp = np.interp(sol_adaptive.t, sol_fixed.t, sol_fixed.V)
+        self.assertTrue(np.allclose(V_interp[:index_discharge_end], sol_adaptive.V[:index_discharge_end],
+                                    atol=1e-3))
+        self.assertAlmostEqual(sol_fixed.V[-1], sol_adaptive.V[-1], places=3)
+
+    def test_state_snapshot(self):
+        for electrode_SOC_solver in ('eigen', 'cn', 'poly'):
+            solver = SPPy.SPPySolver(b_cell=copy.deepcopy(self.test_cell), isothermal=False, degradation=False,
+                                     electrode_SOC_solver=electrode_SOC_solver)
+            solver.solve_iteration_one_step(t_prev=0.0, dt=1.0, I=self.I)
+            state = solver.get_state()
+            V = solver.solve_iteration_one_step(t_prev=1.0, dt=1.0, I=self.I)
+            solver.set_state(state)
+            self.assertEqual(V, solver.solve_iteration_one_step(t_prev=1.0, dt=1.0, I=self.I))
+            # the snapshot contains the integrated states and not the solver objects with their cached variables.
+            self.assertIsInstance(state['SOC_solver_p'], dict)
+            self.assertIsInstance(state['SEI_model'], dict)
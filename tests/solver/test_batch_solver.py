@@ -0,0 +1,151 @@
+import copy
+import unittest
+import numpy as np
+
+import SPPy
+from SPPy.calc_helpers import ode_solvers
+from SPPy.models.thermal import ECMLumped
+from SPPy.solvers.electrode_surf_conc import EigenFuncExp, PolynomialApproximation
+
+
+T = 298.15
+SOC_init_p = 0.4956
+SOC_init_n = 0.7568
+
+
+def create_cells():
+    """
+    Returns three battery cell variants, where the second one has a larger positive electrode particle radius and the
+    third one a smaller negative electrode diffusivity.
+    """
+    lst_cell = [SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=SOC_init_p, SOC_init_n=SOC_init_n, T=T)
+                for _ in range(3)]
+    lst_cell[1].elec_p.R *= 1.2
+    lst_cell[2].elec_n.D_ref *= 0.5
+    return lst_cell
+
+
+class TestBatchSPPySolverBasic(unittest.TestCase):
+    lst_cell = create_cells()
+
+    def test_constructor(self):
+        test_solver = SPPy.BatchSPPySolver(lst_b_cell=self.lst_cell, isothermal=True)
+        self.assertEqual(3, test_solver.num_cells)
+        self.assertEqual((3,), test_solver.SOC_p.shape)
+        self.assertTrue(np.all(test_solver.SOC_p == SOC_init_p))
+        self.assertTrue(np.all(test_solver.T == T))
+        self.assertEqual(1.2 * self.lst_cell[0].elec_p.R, test_solver.R_p[1])
+
+    def test_invalid_constructor_arguments(self):
+        with self.assertRaises(TypeError):
+            SPPy.BatchSPPySolver(lst_b_cell=[])
+        with self.assertRaises(TypeError):
+            SPPy.BatchSPPySolver(lst_b_cell=[0])
+        with self.assertRaises(TypeError):
+            SPPy.BatchSPPySolver(lst_b_cell=self.lst_cell, isothermal=13)
+        with self.assertRaises(ValueError):
+            SPPy.BatchSPPySolver(lst_b_cell=self.lst_cell, electrode_SOC_solver='CN')
+
+
+class TestBatchSPPySolverDischarge(unittest.TestCase):
+    """
+    Compares the batch simulation with the single battery cell simulations in a single discharge step.
+    """
+    I = 1.656
+    V_min = 4.0
+    SOC_min = 0.1
+    SOC_LIB = 0.9
+
+    def compare_with_single_cell(self, isothermal, electrode_SOC_solver, cycler=None, t_increment=0.1):
+        if cycler is None:
+            cycler = SPPy.Discharge(discharge_current=self.I, V_min=self.V_min, SOC_LIB_min=self.SOC_min,
+                                    SOC_LIB=self.SOC_LIB)
+        batch_sol = SPPy.BatchSPPySolver(lst_b_cell=create_cells(), isothermal=isothermal,
+                                         electrode_SOC_solver=electrode_SOC_solver).solve(
+            cycler_instance=copy.deepcopy(cycler), t_increment=t_increment)
+        for cell_index, b_cell in enumerate(create_cells()):
+            sol = SPPy.SPPySolver(b_cell=b_cell, isothermal=isothermal, degradation=False,
+                                  electrode_SOC_solver=electrode_SOC_solver).solve(
+                cycler_instance=copy.deepcopy(cycler), t_increment=t_increment)
+            cell_sol = batch_sol.get_solution(cell_index=cell_index)
+            self.assertEqual(len(sol.V), len(cell_sol.V))
+            self.assertTrue(np.allclose(sol.t, cell_sol.t))
+            self.assertTrue(np.allclose(sol.V, cell_sol.V))
+            self.assertTrue(np.allclose(sol.T, cell_sol.T))
+            self.assertTrue(np.allclose(sol.cap, cell_sol.cap))
+
+    def test_isothermal_eigen(self):
+        self.compare_with_single_cell(isothermal=True, electrode_SOC_solver='eigen')
+
+    def test_non_isothermal_poly(self):
+        self.compare_with_single_cell(isothermal=False, electrode_SOC_solver='poly')
+
+    def test_electrode_SOC_limit(self):
+        # the discharge step ends once the electrode SOC goes beyond its limits and is followed by the rest step.
+        cycler = SPPy.DischargeRest(discharge_current=8.28, V_min=0.5, SOC_LIB_min=0.0, rest_time=20, SOC_LIB=1.0,
+                                    SOC_LIB_max=1.0)
+        self.compare_with_single_cell(isothermal=False, electrode_SOC_solver='poly', cycler=cycler, t_increment=1.0)
+        self.compare_with_single_cell(isothermal=False, electrode_SOC_solver='eigen', cycler=cycler, t_increment=1.0)
+
+    def test_record_interval(self):
+        dc = SPPy.Discharge(discharge_current=self.I, V_min=self.V_min, SOC_LIB_min=self.SOC_min,
+                            SOC_LIB=self.SOC_LIB)
+        test_solver = SPPy.BatchSPPySolver(lst_b_cell=create_cells())
+        with self.assertRaises(ValueError):
+            test_solver.solve(cycler_instance=dc, record_interval=0)
+        sol = test_solver.solve(cycler_instance=dc, record_interval=10)
+        self.assertEqual(sol.V.shape, sol.mask.shape)
+        self.assertEqual(3, sol.V.shape[1])
+
+
+class TestBatchSPPySolverIntegrator(unittest.TestCase):
+    """
+    Compares the time steps performed by the state-vector integrators with the electrode SOC solvers' own time steps and
+    the rk4 solution of the heat balance.
+    """
+    I = 1.656
+
+    def check_steps(self, electrode_SOC_solver, **electrode_SOC_solver_params):
+        solver = SPPy.BatchSPPySolver(lst_b_cell=create_cells(), isothermal=False,
+                                      electrode_SOC_solver=electrode_SOC_solver, **electrode_SOC_solver_params)
+        if electrode_SOC_solver == 'eigen':
+            method = electrode_SOC_solver_params.get('method', 'rk4')
+            ref_p = EigenFuncExp(x_init=solver.SOC_p.copy(), n=solver.N, electrode_type='p', method=method)
+            ref_n = EigenFuncExp(x_init=solver.SOC_n.copy(), n=solver.N, electrode_type='n', method=method)
+        else:
+            type = electrode_SOC_solver_params.get('type', 'higher')
+            ref_p = PolynomialApproximation(c_init=solver.c_smax_p * solver.SOC_p, electrode_type='p', type=type)
+            ref_n = PolynomialApproximation(c_init=solver.c_smax_n * solver.SOC_n, electrode_type='n', type=type)
+
+        t_prev = 0.0
+        for step in range(50):
+            # the last battery cell is masked out after 20 time steps, after which it retains its states.
+            dt = np.array([1.0, 1.0, 1.0 if step < 20 else 0.0])
+            active = dt > 0
+            D_p, D_n, T_prev = solver.D_p, solver.D_n, solver.T.copy()
+            SOC_p_prev = solver.SOC_p.copy()
+            SOC_p = ref_p(dt=dt, t_prev=t_prev, i_app=self.I, R=solver.R_p, S=solver.S_p, D_s=D_p,
+                          c_smax=solver.c_smax_p)
+            SOC_n = ref_n(dt=dt, t_prev=t_prev, i_app=self.I, R=solver.R_n, S=solver.S_n, D_s=D_n,
+                          c_smax=solver.c_smax_n)
+            V, _ = solver.solve_iteration_one_step(t_prev=t_prev, dt=dt, I=self.I)
+            T = ode_solvers.rk4(func=ECMLumped().rhs, t_prev=t_prev, y_prev=T_prev, step_size=dt,
+                                args=(V, self.I, solver.rho, solver.Vol, solver.C_p, solver.OCV,
+                                      solver.dOCPdT_p - solver.dOCPdT_n, solver.h, solver.A, solver.T_amb))
+            self.assertTrue(np.allclose(SOC_p[active], solver.SOC_p[active], rtol=1e-13, atol=0))
+            self.assertTrue(np.allclose(SOC_n[active], solver.SOC_n[active], rtol=1e-13, atol=0))
+            self.assertTrue(np.array_equal(SOC_p_prev[~active], solver.SOC_p[~active]))
+            self.assertTrue(np.allclose(T, solver.T, rtol=1e-13, atol=0))
+            t_prev += 1.0
+        self.assertNotEqual(298.15, solver.T[0])
+        self.assertEqual(T_prev[2], solver.T[2])
+
+    def test_eigen_rk4(self):
+        self.check_steps(electrode_SOC_solver='eigen', method='rk4')
+
+    def test_eigen_exact(self):
+        self.check_steps(electrode_SOC_solver='eigen', method='exact')
+
+    def test_poly(self):
+        self.check_steps(electrode_SOC_solver='poly', type='higher')
+        self.check_steps(electrode_SOC_solver='poly', type='two')
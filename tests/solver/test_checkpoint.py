@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import SPPy
+from SPPy.solvers.checkpoint import CheckpointControl, save_checkpoint, load_checkpoint
+
+
+class TestCheckpointControl(unittest.TestCase):
+    def test_constructor(self):
+        with self.assertRaises(ValueError):
+            CheckpointControl(file_path='checkpoint.pkl')
+        with self.assertRaises(ValueError):
+            CheckpointControl(file_path='checkpoint.pkl', interval_steps=0)
+        with self.assertRaises(ValueError):
+            CheckpointControl(file_path='checkpoint.pkl', interval_time=-1.0)
+
+    def test_is_due(self):
+        control = CheckpointControl(file_path='checkpoint.pkl', interval_steps=3)
+        self.assertEqual([False, False, True, False, False, True], [control.is_due() for _ in range(6)])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'checkpoint.pkl')
+            save_checkpoint(file_path=file_path, checkpoint={'array': np.arange(3)})
+            self.assertTrue(np.array_equal(np.arange(3), load_checkpoint(file_path)['array']))
+            self.assertFalse(os.path.exists(file_path + '.tmp'))
+
+
+class Interrupted(Exception):
+    pass
+
+
+class TestSPPySolverCheckpoint(unittest.TestCase):
+    @staticmethod
+    def solver(method='exact'):
+        cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=0.4956, SOC_init_n=0.7568, T=298.15)
+        return SPPy.SPPySolver(b_cell=cell, isothermal=False, degradation=False, method=method)
+
+    @staticmethod
+    def cycler():
+        return SPPy.DischargeRestCharge(discharge_current=1.656, charge_current=1.656, rest_time=20, V_min=4.0,
+                                        V_max=4.2, SOC_LIB_min=0.1, SOC_LIB=0.9, SOC_LIB_max=1.0)
+
+    @staticmethod
+    def interrupt_after(solver, num_checkpoints):
+        # raises an exception after the given number of checkpoints to emulate the preemption of the simulation.
+        save = solver._save_checkpoint
+        count = [0]
+
+        def func(**kwargs):
+            save(**kwargs)
+            count[0] += 1
+            if count[0] == num_checkpoints:
+                raise Interrupted
+
+        solver._save_checkpoint = func
+
+    def check_resume(self, num_checkpoints, interval_steps=100, **solve_kwargs):
+        sol = self.solver().solve(cycler_instance=self.cycler(), **solve_kwargs)
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'checkpoint.pkl')
+            solver = self.solver()
+            self.interrupt_after(solver, num_checkpoints=num_checkpoints)
+            with self.assertRaises(Interrupted):
+                solver.solve(cycler_instance=self.cycler(),
+                             checkpoint_control=CheckpointControl(file_path=file_path,
+                                                                  interval_steps=interval_steps),
+                             **solve_kwargs)
+            sol_resumed = self.solver().resume(file_path=file_path)
+        self.assertEqual(len(sol.t), len(sol_resumed.t))
+        self.assertTrue(np.allclose(sol.t, sol_resumed.t))
+        self.assertTrue(np.allclose(sol.V, sol_resumed.V))
+        self.assertTrue(np.allclose(sol.T, sol_resumed.T))
+        self.assertTrue(np.allclose(sol.cap_discharge, sol_resumed.cap_discharge))
+        self.assertEqual(list(sol.cycle_step), list(sol_resumed.cycle_step))
+
+    def test_resume_fixed_step(self):
+        self.check_resume(num_checkpoints=5)
+
+    def test_resume_at_step_end(self):
+        # the checkpoint is written at the last time step of the discharge step.
+        sol = self.solver().solve(cycler_instance=self.cycler())
+        num_discharge = int(np.sum(np.array(sol.cycle_step) == 'discharge'))
+        self.check_resume(num_checkpoints=1, interval_steps=num_discharge)
+
+    def test_resume_adaptive(self):
+        self.check_resume(num_checkpoints=2, interval_steps=5, step_control=SPPy.AdaptiveStepControl(dt_max=5.0))
+
+    def test_checkpoint_size(self):
+        # the checkpoints do not contain the recorded rows, which are appended to the row log instead.
+        lst_size = []
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'checkpoint.pkl')
+            for num_checkpoints in (1, 20):
+                solver = self.solver()
+                self.interrupt_after(solver, num_checkpoints=num_checkpoints)
+                with self.assertRaises(Interrupted):
+                    solver.solve(cycler_instance=self.cycler(),
+                                 checkpoint_control=CheckpointControl(file_path=file_path, interval_steps=10))
+                lst_size.append(os.path.getsize(file_path))
+                self.assertNotIn('recorder', load_checkpoint(file_path))
+                self.assertEqual(10 * num_checkpoints, load_checkpoint(file_path)['num_rows'])
+        self.assertAlmostEqual(lst_size[0], lst_size[1], delta=0.1 * lst_size[0])
+
+    def test_resume_with_sink(self):
+        sol = self.solver().solve(cycler_instance=self.cycler())
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'checkpoint.pkl')
+            sink_path = os.path.join(dir_path, 'sol')
+            solver = self.solver()
+            self.interrupt_after(solver, num_checkpoints=3)
+            with self.assertRaises(Interrupted):
+                solver.solve(cycler_instance=self.cycler(), sink=SPPy.SolutionSink(dir_path=sink_path, chunk_size=30),
+                             checkpoint_control=CheckpointControl(file_path=file_path, interval_steps=100))
+            sol_resumed = self.solver().resume(file_path=file_path)
+            self.assertIsInstance(sol_resumed.V, np.memmap)
+            self.assertTrue(np.allclose(sol.t, sol_resumed.t))
+            self.assertTrue(np.allclose(sol.V, sol_resumed.V))
+            del sol_resumed
+
+    def test_invalid_resume(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'checkpoint.pkl')
+            solver = self.solver()
+            self.interrupt_after(solver, num_checkpoints=1)
+            with self.assertRaises(Interrupted):
+                solver.solve(cycler_instance=self.cycler(),
+                             checkpoint_control=CheckpointControl(file_path=file_path, interval_steps=10))
+            cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=0.4956, SOC_init_n=0.7568, T=298.15)
+            with self.assertRaises(ValueError):
+                SPPy.SPPySolver(b_cell=cell, isothermal=True, degradation=False).resume(file_path=file_path)
@@ -1,8 +1,11 @@
+import copy
 import unittest
 import numpy as np
 
 import SPPy
 from SPPy.solvers.battery_solver import eSPSolver
+from SPPy.solvers.electrolyte_conc import ElectrolyteSettings
+from SPPy.warnings_and_exceptions.custom_exceptions import InvalidElectrolyteConcException
 
 
 class TestESPSolver(unittest.TestCase):
@@ -25,3 +28,79 @@ class TestESPSolver(unittest.TestCase):
         self.assertEqual(True, test_solver.bool_isothermal)
         self.assertEqual(False, test_solver.bool_degradation)
         self.assertEqual('poly', test_solver.electrode_SOC_solver)
+        self.assertEqual(30, len(test_solver.array_c_e))
+        self.assertTrue(np.all(self.test_cell.electrolyte.conc == test_solver.array_c_e))
+        self.assertAlmostEqual(1 - self.test_cell.elec_p.epsilon, test_solver.co_ords.epsilon_ep)
+
+        with self.assertRaises(TypeError):
+            eSPSolver(b_cell=self.test_cell, electrolyte_settings={'D_e': 1e-10})
+        with self.assertRaises(ValueError):
+            ElectrolyteSettings(t_c=1.0)
+        with self.assertRaises(ValueError):
+            ElectrolyteSettings(num_grid_s=0)
+
+    def test_large_diffusivity(self):
+        # the SPMe reduces to the SPM when the electrolyte concentration gradients vanish.
+        dc = SPPy.Discharge(discharge_current=1.65, V_min=2.5, SOC_LIB_min=0.0, SOC_LIB=1.0)
+        sol = SPPy.SPPySolver(b_cell=copy.deepcopy(self.test_cell), electrode_SOC_solver='poly').solve(
+            cycler_instance=dc, t_increment=1)
+        dc = SPPy.Discharge(discharge_current=1.65, V_min=2.5, SOC_LIB_min=0.0, SOC_LIB=1.0)
+        sol_e = eSPSolver(b_cell=copy.deepcopy(self.test_cell),
+                          electrolyte_settings=ElectrolyteSettings(D_e=1e-3)).solve(cycler_instance=dc, t_increment=1)
+        self.assertEqual(len(sol.t), len(sol_e.t))
+        self.assertTrue(np.allclose(sol.V, sol_e.V, rtol=0, atol=1e-5))
+
+    def test_electrolyte_dynamics(self):
+        array_t = np.arange(0, 121, 1.0)
+        cc = SPPy.CustomCycler(array_t=array_t, array_I=-8.25 * np.ones(len(array_t)), V_min=2.5, V_max=4.2)
+        solver = eSPSolver(b_cell=copy.deepcopy(self.test_cell))
+        sol_e = solver.solve(cycler_instance=cc, t_increment=1.0)
+
+        co_ords = solver.co_ords
+        array_c_e = solver.array_c_e
+        # lithium-ions are released in the negative electrode and consumed in the positive electrode during discharge.
+        self.assertTrue(np.all(np.diff(array_c_e) < 0))
+        self.assertGreater(array_c_e[0], 1000.0)
+        self.assertLess(array_c_e[-1], 1000.0)
+        # the electrolyte mass is conserved.
+        self.assertAlmostEqual(1.0, np.sum(array_c_e * co_ords.array_epsilon_e * co_ords.array_dx) /
+                               np.sum(1000.0 * co_ords.array_epsilon_e * co_ords.array_dx))
+
+        cc = SPPy.CustomCycler(array_t=array_t, array_I=-8.25 * np.ones(len(array_t)), V_min=2.5, V_max=4.2)
+        sol = SPPy.SPPySolver(b_cell=copy.deepcopy(self.test_cell), electrode_SOC_solver='poly').solve(
+            cycler_instance=cc, t_increment=1.0)
+        self.assertTrue(np.all(sol_e.V[1:] < sol.V[1:]))
+
+    def test_concentration_dependent_diffusivity(self):
+        def func_D_e(c_e, temp):
+            c_e = 0.001 * c_e
+            return (10 ** (-4.43 - 54 / (temp - (229 + 5 * c_e)) - 0.22 * c_e)) * 1e-4
+
+        lst_V = []
+        for nonlinear_method in ('picard', 'newton'):
+            solver = eSPSolver(b_cell=copy.deepcopy(self.test_cell),
+                               electrolyte_settings=ElectrolyteSettings(func_D_e=func_D_e,
+                                                                        nonlinear_method=nonlinear_method))
+            self.assertIs(func_D_e, solver.electrolyte_solver.func_D_e)
+            lst_V.append([solver.solve_iteration_one_step(t_prev=float(i), dt=1.0, I=-8.25) for i in range(60)])
+        self.assertTrue(np.allclose(lst_V[0], lst_V[1], rtol=0, atol=1e-4))
+
+        # the constant diffusivity is used when neither the settings nor the parameter set contain func_D_e.
+        self.assertIsNone(self.test_cell.electrolyte.func_D_e)
+        self.assertIsNone(eSPSolver(b_cell=copy.deepcopy(self.test_cell)).electrolyte_solver.func_D_e)
+
+    def test_state(self):
+        solver = eSPSolver(b_cell=copy.deepcopy(self.test_cell))
+        state = solver.get_state()
+        V = solver.solve_iteration_one_step(t_prev=0.0, dt=1.0, I=-8.25)
+        array_c_e = solver.array_c_e
+        solver.set_state(state)
+        self.assertTrue(np.all(1000.0 == solver.array_c_e))
+        self.assertEqual(V, solver.solve_iteration_one_step(t_prev=0.0, dt=1.0, I=-8.25))
+        self.assertTrue(np.array_equal(array_c_e, solver.array_c_e))
+
+    def test_electrolyte_depletion(self):
+        solver = eSPSolver(b_cell=copy.deepcopy(self.test_cell), electrolyte_settings=ElectrolyteSettings(D_e=1e-13))
+        with self.assertRaises(InvalidElectrolyteConcException):
+            for i in range(100):
+                solver.solve_iteration_one_step(t_prev=10.0 * i, dt=10.0, I=-16.5)
@@ -1,7 +1,9 @@
+import copy
 import unittest
 
+import numpy as np
 
-from SPPy.solvers.electrolyte_conc import ElectrolyteFVMCoordinates
+from SPPy.solvers.electrolyte_conc import ElectrolyteFVMCoordinates, ElectrolyteConcFVMSolver
 
 
 class TestElectrolyteFVMCoordinates(unittest.TestCase):
@@ -69,3 +71,122 @@ class TestElectrolyteFVMCoordinates(unittest.TestCase):
 
     def test_array_D_eff(self):
         print(self.instance.array_D_eff)
+
+    def test_cached_arrays(self):
+        co_ords = ElectrolyteFVMCoordinates(D_e=7.5e-10, epsilon_en=0.385, epsilon_esep=0.785, epsilon_ep=0.485,
+                                            L_n=8e-5, L_s=2.5e-5, L_p=8.8e-5, brugg=4)
+        self.assertIs(co_ords.array_x, co_ords.array_x)
+        self.assertFalse(co_ords.array_D_eff.flags.writeable)
+        self.assertAlmostEqual(7.5e-10 * 0.785 ** 4, co_ords.array_D_eff[15])
+        # setting a grid parameter rebuilds the arrays.
+        co_ords.D_e = 1.5e-9
+        co_ords.num_grid_s = 5
+        self.assertEqual(2, co_ords.version)
+        self.assertEqual(25, len(co_ords.array_x))
+        self.assertAlmostEqual(1.5e-9 * 0.785 ** 4, co_ords.array_D_eff[12])
+        self.assertEqual(2.5e-5 / 5, co_ords.dx_s)
+
+
+def func_D_e(c_e, temp):
+    """
+    Electrolyte diffusivity correlation of Han et al. (2021), see examples/eSP/general_analysis/D_e_func.py
+    """
+    c_e = 0.001 * c_e
+    return (10 ** (-4.43 - 54 / (temp - (229 + 5 * c_e)) - 0.22 * c_e)) * 1e-4
+
+
+class TestElectrolyteConcFVMSolver(unittest.TestCase):
+    co_ords = ElectrolyteFVMCoordinates(D_e=7.5e-10, epsilon_en=0.385, epsilon_esep=0.785, epsilon_ep=0.485,
+                                        L_n=8e-5, L_s=2.5e-5, L_p=8.8e-5, brugg=4, num_grid_n=7, num_grid_s=3,
+                                        num_grid_p=12)
+
+    def test_constructor(self):
+        with self.assertRaises(ValueError):
+            ElectrolyteConcFVMSolver(co_ords=self.co_ords, transference=0.354, face_mean='geometric')
+
+    def test_diags(self):
+        co_ords = copy.deepcopy(self.co_ords)
+        solver = ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354, face_mean='arithmetic')
+        l_diag, diag, u_diag = solver.diags(dt=0.1)
+        self.assertEqual((21, 22, 21), (len(l_diag), len(diag), len(u_diag)))
+        # compare against the element-wise expressions of the interior volumes.
+        x, dx, D, eps = co_ords.array_x, co_ords.array_dx, co_ords.array_D_eff, co_ords.array_epsilon_e
+        for i in range(1, 21):
+            A = 0.1 / (2 * dx[i])
+            dx1, dx2 = x[i] - x[i - 1], x[i + 1] - x[i]
+            self.assertAlmostEqual(1.0, diag[i] / (eps[i] + A * ((D[i - 1] + D[i]) / dx1 + (D[i] + D[i + 1]) / dx2)))
+            self.assertAlmostEqual(1.0, u_diag[i] / (-A * (D[i] + D[i + 1]) / dx2))
+            self.assertAlmostEqual(1.0, l_diag[i - 1] / (-A * (D[i - 1] + D[i]) / dx1))
+        # the diagonals are cached per dt and recalculated when the grid changes.
+        self.assertIs(diag, solver.diags(dt=0.1)[1])
+        self.assertIs(solver.tridiagonal_solver(dt=0.1), solver.tridiagonal_solver(dt=0.1))
+        self.assertIsNot(diag, solver.diags(dt=0.2)[1])
+        diag, tridiagonal_solver = solver.diags(dt=0.2)[1], solver.tridiagonal_solver(dt=0.2)
+        co_ords.D_e = 1.5e-9
+        self.assertIsNot(diag, solver.diags(dt=0.2)[1])
+        self.assertIsNot(tridiagonal_solver, solver.tridiagonal_solver(dt=0.2))
+
+        # the harmonic mean only differs at the region interfaces.
+        solver.face_mean = 'harmonic'
+        D_face = solver.face_D_eff()
+        D = co_ords.array_D_eff
+        self.assertTrue(np.allclose(D[:6], D_face[:6], rtol=1e-12, atol=0))
+        self.assertAlmostEqual(1.0, D_face[6] * (dx[6] / D[6] + dx[7] / D[7]) / (dx[6] + dx[7]))
+
+    def test_solve_ce(self):
+        co_ords = self.co_ords
+        solver = ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354)
+        x, dx, eps = co_ords.array_x, co_ords.array_dx, co_ords.array_epsilon_e
+        j = np.where(x < 8e-5, 1e-5 / 8e-5, np.where(x > 1.05e-4, -1e-5 / 8.8e-5, 0.0))
+        a_s = np.ones(len(x))
+        c_tdma = c_inv = 1000 * np.ones(len(x))
+        for i in range(100):
+            c_tdma = solver.solve_ce(c_prev=c_tdma, j=j, dt=0.1, a_s=a_s)
+            c_inv = solver.solve_ce(c_prev=c_inv, j=j, dt=0.1, a_s=a_s, solver_method='inverse')
+        self.assertTrue(np.allclose(c_tdma, c_inv, rtol=1e-12))
+        # the net flux is zero and hence, the electrolyte mass is conserved.
+        self.assertAlmostEqual(1.0, np.sum(c_tdma * eps * dx) / np.sum(1000 * eps * dx))
+        self.assertGreater(c_tdma[0], 1000)
+        self.assertLess(c_tdma[-1], 1000)
+
+    def test_concentration_dependent_diffusivity(self):
+        co_ords = self.co_ords
+        x, dx, eps = co_ords.array_x, co_ords.array_dx, co_ords.array_epsilon_e
+        c_prev = 1000 + 100 * np.sin(np.linspace(0, 3, len(x)))
+        j = np.where(x < 8e-5, 5.0, np.where(x > 1.05e-4, -5.0 * 8 / 8.8, 0.0))
+        a_s = np.ones(len(x))
+
+        with self.assertRaises(ValueError):
+            ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354, func_D_e=func_D_e,
+                                     nonlinear_method='secant')
+        solver_picard = ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354, func_D_e=func_D_e)
+        with self.assertRaises(ValueError):
+            solver_picard.solve_ce(c_prev=c_prev, j=j, dt=5.0, a_s=a_s)
+
+        # the constant function gives the same results as the constant diffusivity.
+        solver_const = ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354,
+                                                func_D_e=lambda c_e, temp: co_ords.D_e)
+        solver = ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354)
+        self.assertTrue(np.allclose(solver.solve_ce(c_prev=c_prev, j=j, dt=5.0, a_s=a_s),
+                                    solver_const.solve_ce(c_prev=c_prev, j=j, dt=5.0, a_s=a_s, temp=298.15),
+                                    rtol=1e-12))
+
+        c_picard = solver_picard.solve_ce(c_prev=c_prev, j=j, dt=5.0, a_s=a_s, temp=298.15)
+        self.assertEqual(0, solver_picard.num_iter)
+        solver_newton = ElectrolyteConcFVMSolver(co_ords=co_ords, transference=0.354, func_D_e=func_D_e,
+                                                 nonlinear_method='newton')
+        c_newton = solver_newton.solve_ce(c_prev=c_prev, j=j, dt=5.0, a_s=a_s, temp=298.15)
+        self.assertLess(solver_newton.num_iter, 10)
+        b = np.ndarray.flatten(solver_newton.ce_j_vec(c_prev=c_prev, j=j, dt=5.0, a_s=a_s))
+        self.assertLess(np.max(np.abs(solver_newton.residual(c=c_newton, b=b, dt=5.0, temp=298.15))),
+                        1e-10 * np.max(np.abs(b)))
+        self.assertGreater(np.max(np.abs(solver_picard.residual(c=c_picard, b=b, dt=5.0, temp=298.15))),
+                           1e-6 * np.max(np.abs(b)))
+        self.assertTrue(np.allclose(c_picard, c_newton, rtol=1e-2))
+        # both the linearizations conserve the electrolyte mass.
+        for c in (c_picard, c_newton):
+            self.assertAlmostEqual(1.0, np.sum(c * eps * dx) / np.sum(c_prev * eps * dx))
+
+        solver_newton.max_iter, solver_newton.tol = 1, 1e-16
+        with self.assertWarns(RuntimeWarning):
+            solver_newton.solve_ce(c_prev=c_prev, j=j, dt=5.0, a_s=a_s, temp=298.15)
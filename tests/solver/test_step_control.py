@@ -0,0 +1,35 @@
+import unittest
+
+from SPPy.solvers.step_control import AdaptiveStepControl
+
+
+class TestAdaptiveStepControl(unittest.TestCase):
+    def test_constructor(self):
+        step_control = AdaptiveStepControl(rel_tol=1e-3, dt_max=100.0)
+        self.assertEqual(1e-3, step_control.rel_tol)
+        self.assertEqual(100.0, step_control.dt_max)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AdaptiveStepControl(rel_tol=-1)
+        with self.assertRaises(ValueError):
+            AdaptiveStepControl(dt_min=1.0, dt_init=0.1)
+        with self.assertRaises(ValueError):
+            AdaptiveStepControl(safety=1.5)
+        with self.assertRaises(ValueError):
+            AdaptiveStepControl(max_growth=0.5)
+        with self.assertRaises(ValueError):
+            AdaptiveStepControl(event_tol=0.0)
+
+    def test_error_norm(self):
+        step_control = AdaptiveStepControl(rel_tol=1e-3, abs_tol=1e-6)
+        self.assertAlmostEqual(0.0, step_control.error_norm([1.0, 2.0], [1.0, 2.0]))
+        self.assertAlmostEqual(2e-3 / (1e-6 + 2e-3), step_control.error_norm([1.0, 2.002], [1.0, 2.0]))
+
+    def test_next_dt(self):
+        step_control = AdaptiveStepControl(dt_max=100.0, max_growth=5.0, min_shrink=0.2, safety=0.9, order=1)
+        self.assertEqual(5.0, step_control.next_dt(dt=1.0, err=0.0))
+        self.assertEqual(100.0, step_control.next_dt(dt=50.0, err=0.0))
+        self.assertAlmostEqual(0.9 * 0.25 ** -0.5, step_control.next_dt(dt=1.0, err=0.25))
+        self.assertEqual(0.2, step_control.next_dt(dt=1.0, err=1e6))
+        self.assertEqual(step_control.dt_min, step_control.next_dt(dt=step_control.dt_min, err=1e6))
@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+import SPPy
+from SPPy.sol_and_visualization.recording import RecordAll, RecordEveryNth, RecordTimeGrid, RecordOnChange, \
+    RecordStepBoundaries
+
+
+class TestRecordingPolicies(unittest.TestCase):
+    def test_record_all(self):
+        policy = RecordAll()
+        self.assertTrue(all(policy(t=0.1 * i, V=4.0, T=298.15) for i in range(5)))
+
+    def test_record_every_nth(self):
+        policy = RecordEveryNth(n=3)
+        lst_record = [policy(t=0.1 * i, V=4.0, T=298.15) for i in range(7)]
+        self.assertEqual([False, False, True, False, False, True, False], lst_record)
+        self.assertTrue(policy(t=0.7, V=4.0, T=298.15, step_end=True))
+        policy.reset()
+        self.assertFalse(policy(t=0.0, V=4.0, T=298.15))
+        with self.assertRaises(ValueError):
+            RecordEveryNth(n=0)
+
+    def test_record_time_grid(self):
+        policy = RecordTimeGrid(dt_output=1.0)
+        array_t = 0.25 * np.arange(1, 14)
+        array_recorded = np.array([t for t in array_t if policy(t=t, V=4.0, T=298.15)])
+        self.assertTrue(np.array_equal([0.25, 1.0, 2.0, 3.0], array_recorded))
+        with self.assertRaises(ValueError):
+            RecordTimeGrid(dt_output=0.0)
+
+    def test_record_on_change(self):
+        policy = RecordOnChange(V_threshold=0.01, T_threshold=0.5)
+        self.assertTrue(policy(t=0.0, V=4.0, T=298.15))
+        self.assertFalse(policy(t=0.1, V=3.995, T=298.15))
+        self.assertTrue(policy(t=0.2, V=3.989, T=298.15))
+        self.assertFalse(policy(t=0.3, V=3.989, T=298.5))
+        self.assertTrue(policy(t=0.4, V=3.989, T=298.7))
+        self.assertTrue(policy(t=0.5, V=3.989, T=298.7, step_end=True))
+
+    def test_record_step_boundaries(self):
+        policy = RecordStepBoundaries()
+        self.assertFalse(policy(t=0.0, V=4.0, T=298.15))
+        self.assertTrue(policy(t=0.1, V=4.0, T=298.15, step_end=True))
+
+
+class TestSPPySolverRecording(unittest.TestCase):
+    SOC_init_p = 0.4956
+    SOC_init_n = 0.7568
+    T = 298.15
+
+    def solve(self, recording_policy, discharge_current=1.656, V_min=4.0, SOC_LIB_min=0.1):
+        test_cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=self.SOC_init_p,
+                                     SOC_init_n=self.SOC_init_n, T=self.T)
+        test_solver = SPPy.SPPySolver(b_cell=test_cell, isothermal=True, degradation=False, method='exact')
+        dc = SPPy.DischargeRest(discharge_current=discharge_current, rest_time=60, V_min=V_min,
+                                SOC_LIB_min=SOC_LIB_min, SOC_LIB=0.9, SOC_LIB_max=1.0)
+        return test_solver.solve(cycler_instance=dc, recording_policy=recording_policy)
+
+    def test_policies(self):
+        sol_all = self.solve(recording_policy=None)
+        sol_nth = self.solve(recording_policy=RecordEveryNth(n=10))
+        sol_boundaries = self.solve(recording_policy=RecordStepBoundaries())
+
+        num_discharge = np.sum(sol_all.cycle_step == 'discharge')
+        array_V_nth = sol_all.V[9:num_discharge - 1:10]
+        self.assertTrue(np.allclose(array_V_nth, sol_nth.V[:len(array_V_nth)]))
+        # the step ends are always recorded.
+        index_step_ends = np.where(sol_all.cycle_step[:-1] != sol_all.cycle_step[1:])[0].tolist() + \
+            [len(sol_all.t) - 1]
+        self.assertTrue(np.allclose(sol_all.t[index_step_ends], sol_boundaries.t))
+        self.assertTrue(np.array_equal(['discharge', 'rest'], sol_boundaries.cycle_step))
+        self.assertAlmostEqual(sol_all.t[-1], sol_nth.t[-1])
+        self.assertAlmostEqual(sol_all.cap_discharge[index_step_ends[0]], sol_boundaries.cap_discharge[0])
+
+    def test_step_end_at_electrode_SOC_limit(self):
+        # the discharge ends when the negative electrode SOC goes beyond its limits, before reaching V_min.
+        sol_all = self.solve(recording_policy=None, discharge_current=8.28, V_min=0.5, SOC_LIB_min=0.0)
+        sol_boundaries = self.solve(recording_policy=RecordStepBoundaries(), discharge_current=8.28, V_min=0.5,
+                                    SOC_LIB_min=0.0)
+        index_discharge_end = np.sum(sol_all.cycle_step == 'discharge') - 1
+        self.assertTrue(np.array_equal(['discharge', 'rest'], sol_boundaries.cycle_step))
+        self.assertAlmostEqual(sol_all.t[index_discharge_end], sol_boundaries.t[0])
+        self.assertAlmostEqual(sol_all.V[index_discharge_end], sol_boundaries.V[0])
+        self.assertGreater(sol_boundaries.V[0], 0.5)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(TypeError):
+            self.solve(recording_policy=10)
@@ -1,6 +1,12 @@
+import pickle
+import tempfile
 import unittest
 
-from SPPy.sol_and_visualization.solution import SolutionInitializer
+import numpy as np
+
+from SPPy.sol_and_visualization.streaming import SolutionSink
+
+from SPPy.sol_and_visualization.solution import SolutionInitializer, SolutionRecorder, Solution, ECMSolution
 
 
 class TestSolutionInitializer(unittest.TestCase):
@@ -24,4 +30,105 @@ class TestSolutionInitializer(unittest.TestCase):
         self.assertEqual([], sol.lst_R_cell)
         self.assertEqual([], sol.lst_j_tot)
         self.assertEqual([], sol.lst_j_i)
-        self.assertEqual([], sol.lst_j_s)
\ No newline at end of file
+        self.assertEqual([], sol.lst_j_s)
+
+
+class TestSolutionRecorder(unittest.TestCase):
+    def test_constructor(self):
+        recorder = SolutionRecorder(capacity=4)
+        self.assertEqual(0, len(recorder))
+        self.assertEqual(4, recorder.capacity)
+        self.assertFalse(recorder.has_degradation)
+        with self.assertRaises(ValueError):
+            SolutionRecorder(capacity=0)
+        with self.assertRaises(ValueError):
+            SolutionRecorder(growth_factor=1.0)
+
+    def test_update_and_growth(self):
+        recorder = SolutionRecorder(capacity=2)
+        for i in range(5):
+            recorder.update(cycle_num=i // 2, cycle_step='discharge' if i < 3 else 'rest', t=0.1 * i, V=4.0 - i)
+        self.assertEqual(5, len(recorder))
+        self.assertGreaterEqual(recorder.capacity, 5)
+        self.assertEqual(['discharge', 'rest'], recorder.step_names)
+        self.assertTrue(np.array_equal([0, 0, 0, 1, 1], recorder.column('cycle_step')))
+        self.assertTrue(np.array_equal([0, 0, 1, 1, 2], recorder.column('cycle_num')))
+        self.assertTrue(np.allclose([4.0, 3.0, 2.0, 1.0, 0.0], recorder.column('V')))
+
+        recorder.update_fluxes(j_tot=1.0, j_i=0.5, j_s=0.5)
+        self.assertTrue(recorder.has_degradation)
+        self.assertEqual(1.0, recorder.column('j_tot')[-1])
+
+    def test_solution(self):
+        recorder = SolutionRecorder(capacity=2)
+        for i in range(3):
+            recorder.update(cycle_num=0, cycle_step='charge' if i < 2 else 'rest', t=0.1 * i, V=4.0, temp=298.15)
+        sol = Solution(base_solution_instance=recorder)
+        self.assertTrue(np.shares_memory(sol.V, recorder.dict_array['V']))
+        self.assertTrue(np.array_equal(['charge', 'charge', 'rest'], sol.cycle_step))
+        self.assertTrue(np.allclose([298.15, 298.15, 298.15], sol.T))
+        self.assertEqual(0, len(sol.js))
+        self.assertEqual(3, len(sol.create_df()))
+
+
+class TestECMSolution(unittest.TestCase):
+    @staticmethod
+    def update(sol: ECMSolution, i: int) -> None:
+        sol.update(t=float(i), i_app=0.1 * i, v=4.0 - 1e-4 * i, temp=298.15, soc=1.0 - 1e-4 * i, i_r1=0.01 * i)
+
+    def test_update_and_growth(self):
+        sol = ECMSolution()
+        num_rows = 3 * ECMSolution.INIT_CAPACITY + 7
+        for i in range(num_rows):
+            self.update(sol=sol, i=i)
+        self.assertTrue(np.array_equal(np.arange(num_rows, dtype=float), sol.array_t))
+        self.assertTrue(np.allclose(1.0 - 1e-4 * np.arange(num_rows), sol.array_soc))
+        self.assertTrue(np.allclose(0.01 * np.arange(num_rows), sol.array_I_R1))
+        for column in ECMSolution.COLUMNS:
+            self.assertEqual(num_rows, len(getattr(sol, column)))
+
+        sol.trim()
+        self.assertTrue(sol.array_V.flags['OWNDATA'])
+        self.assertTrue(np.array_equal(np.arange(num_rows, dtype=float), sol.array_t))
+        # the updates after the trim continue from the stored rows.
+        self.update(sol=sol, i=num_rows)
+        self.assertEqual(num_rows + 1, len(sol.array_t))
+        self.assertEqual(float(num_rows), sol.array_t[-1])
+
+    def test_assigned_arrays(self):
+        sol = ECMSolution.read_from_arrays(array_t=np.array([0.0, 1.0]), array_i=np.array([0.0, 1.0]),
+                                           array_v=np.array([4.0, 3.9]), array_temp=np.array([298.15, 298.15]),
+                                           array_soc=None)
+        self.update(sol=sol, i=2)
+        self.assertTrue(np.array_equal([0.0, 1.0, 2.0], sol.array_t))
+        self.assertTrue(np.array_equal([4.0, 3.9, 4.0 - 2e-4], sol.array_V))
+        self.assertTrue(np.all(np.isnan(sol.array_soc[:2])))
+        self.assertEqual(1.0 - 2e-4, sol.array_soc[-1])
+
+        sol.array_t = np.array([5.0, 6.0])
+        with self.assertRaises(ValueError):
+            self.update(sol=sol, i=3)
+
+    def test_write_to_sink(self):
+        sol = ECMSolution()
+        with tempfile.TemporaryDirectory() as dir_path:
+            sink = SolutionSink(dir_path=dir_path, chunk_size=4, overwrite=True)
+            for i in range(10):
+                self.update(sol=sol, i=i)
+                if len(sol.array_t) >= sink.chunk_size:
+                    sol.write_to_sink(sink=sink)
+            sol.write_to_sink(sink=sink)
+            self.assertEqual(0, len(sol.array_t))
+            sol_read = ECMSolution.read_from_sink(dir_path=dir_path)
+            self.assertTrue(np.array_equal(np.arange(10, dtype=float), sol_read.array_t))
+            self.assertTrue(np.allclose(0.1 * np.arange(10), sol_read.array_I))
+
+    def test_pickle(self):
+        sol = ECMSolution()
+        for i in range(5):
+            self.update(sol=sol, i=i)
+        sol_copy = pickle.loads(pickle.dumps(sol))
+        self.assertTrue(np.array_equal(sol.array_V, sol_copy.array_V))
+        self.update(sol=sol_copy, i=5)
+        self.assertEqual(6, len(sol_copy.array_t))
+        self.assertEqual(5, len(sol.array_t))
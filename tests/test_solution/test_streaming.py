@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import SPPy
+from SPPy.sol_and_visualization.streaming import SolutionSink
+
+
+class TestSolutionSink(unittest.TestCase):
+    def test_write_and_read(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            sink = SolutionSink(dir_path=dir_path, chunk_size=2)
+            sink.write(dict_columns={'t': np.array([0.1, 0.2]), 'code': np.array([0, 1], dtype=np.int8)},
+                       attrs={'step_names': ['charge', 'rest']})
+            sink.write(dict_columns={'t': np.array([0.3]), 'code': np.array([1], dtype=np.int8)})
+            self.assertEqual(3, sink.num_rows)
+            self.assertEqual(2, sink.num_chunks)
+
+            dict_columns, attrs = SolutionSink.read(dir_path)
+            self.assertTrue(np.allclose([0.1, 0.2, 0.3], dict_columns['t']))
+            self.assertTrue(np.array_equal([0, 1, 1], dict_columns['code']))
+            self.assertEqual(np.int8, dict_columns['code'].dtype)
+            self.assertEqual(['charge', 'rest'], attrs['step_names'])
+            del dict_columns
+
+    def test_invalid_inputs(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            with self.assertRaises(ValueError):
+                SolutionSink(dir_path=dir_path, chunk_size=0)
+            sink = SolutionSink(dir_path=dir_path)
+            with self.assertRaises(ValueError):
+                sink.write(dict_columns={'t': np.array([0.1, 0.2]), 'V': np.array([4.0])})
+            sink.write(dict_columns={'t': np.array([0.1])})
+            with self.assertRaises(ValueError):
+                sink.write(dict_columns={'V': np.array([0.1])})
+            with self.assertRaises(FileExistsError):
+                SolutionSink(dir_path=dir_path)
+            sink = SolutionSink(dir_path=dir_path, overwrite=True)
+            self.assertEqual(0, sink.num_rows)
+            self.assertFalse(os.path.exists(os.path.join(dir_path, 't.bin')))
+
+
+class TestSPPySolverStreaming(unittest.TestCase):
+    def solve(self, sink=None):
+        test_cell = SPPy.BatteryCell(parameter_set_name='test', SOC_init_p=0.4956, SOC_init_n=0.7568, T=298.15)
+        test_solver = SPPy.SPPySolver(b_cell=test_cell, isothermal=False, degradation=False, method='exact')
+        dc = SPPy.DischargeRest(discharge_current=1.656, rest_time=10, V_min=4.0, SOC_LIB_min=0.1, SOC_LIB=0.9,
+                                SOC_LIB_max=1.0)
+        return test_solver, test_solver.solve(cycler_instance=dc, sink=sink)
+
+    def test_solve(self):
+        sol = self.solve()[1]
+        with tempfile.TemporaryDirectory() as dir_path:
+            test_solver, sol_streamed = self.solve(sink=SolutionSink(dir_path=dir_path, chunk_size=100))
+            self.assertIsInstance(sol_streamed.V, np.memmap)
+            self.assertLessEqual(test_solver.sol_init.capacity, 1024)
+            self.assertTrue(np.allclose(sol.t, sol_streamed.t))
+            self.assertTrue(np.allclose(sol.V, sol_streamed.V))
+            self.assertTrue(np.allclose(sol.T, sol_streamed.T))
+            self.assertTrue(np.array_equal(sol.cycle_step, sol_streamed.cycle_step))
+
+            sol_read = SPPy.Solution.read_from_sink(dir_path=dir_path)
+            self.assertTrue(np.allclose(sol.cap_discharge, sol_read.cap_discharge))
+            del sol_streamed, sol_read
+
+
+class TestDTSolverStreaming(unittest.TestCase):
+    @staticmethod
+    def solve(sink=None):
+        cell = SPPy.ECMBatteryCell(R0_ref=0.005, R1_ref=0.001, C1=0.03, temp_ref=298.15, Ea_R0=4000, Ea_R1=4000,
+                                   rho=1626, vol=3.38e-5, c_p=750, h=1, area=0.085, cap=1.65, v_max=4.2, v_min=2.5,
+                                   soc_init=0.98, temp_init=298.15, func_eta=lambda SOC, temp: 1,
+                                   func_ocv=lambda SOC: 3.0 + SOC, func_docvdtemp=lambda SOC: 0.0)
+        dc = SPPy.Discharge(discharge_current=1.65, V_min=3.8, SOC_LIB_min=0.0, SOC_LIB=1.0)
+        return SPPy.DTSolver(battery_cell_instance=cell, isothermal=True).solve(cycling_step=dc, dt=1.0, sink=sink)
+
+    def test_solve(self):
+        sol = self.solve()
+        with tempfile.TemporaryDirectory() as dir_path:
+            sol_streamed = self.solve(sink=SolutionSink(dir_path=dir_path, chunk_size=50))
+            self.assertIsInstance(sol_streamed.array_V, np.memmap)
+            self.assertTrue(np.allclose(sol.array_t, sol_streamed.array_t))
+            self.assertTrue(np.allclose(sol.array_V, sol_streamed.array_V))
+            self.assertTrue(np.allclose(sol.array_soc, sol_streamed.array_soc))
+            del sol_streamed